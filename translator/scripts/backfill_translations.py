@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Rattrapage hors ligne des traductions de l'historique
+Parcourt les messages par identifiant croissant, ignore les traductions existantes de
+niveau suffisant, traduit le reste par lots triés (même paire de langues, longueurs
+voisines) directement avec TranslationMLService, puis écrit chaque page en masse.
+Sans passer par le serveur ZMQ: aucune concurrence avec le trafic en ligne, et une
+pause automatique quand la machine est occupée par le service en ligne.
+
+Usage:
+    python scripts/backfill_translations.py --languages en,es
+    python scripts/backfill_translations.py --languages de --model-type premium --max-cpu 40
+    python scripts/backfill_translations.py --languages en --reset   # repartir du début
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from config.settings import get_settings
+from services.database_service import DatabaseService, MODEL_HIERARCHY
+from services.translation_ml_service import TranslationMLService
+from utils.backfill import BackfillCheckpoint, LoadThrottle, chunked, plan_translation_work
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('backfill')
+
+
+async def translate_batch(service, items, model_type: str, concurrency: int):
+    """Traduit un lot trié; retourne les enregistrements à sauvegarder et le nombre d'échecs"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def translate(item):
+        async with semaphore:
+            try:
+                result = await service.translate_with_structure(
+                    text=item.text,
+                    source_language=item.source_language,
+                    target_language=item.target_language,
+                    model_type=model_type,
+                    source_channel='backfill'
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ [BACKFILL] {item.message_id} -> {item.target_language}: {e}")
+                return None
+            # Jamais de texte de secours en base
+            if not result or 'fallback' in str(result.get('model_used', '')):
+                return None
+            return {
+                'messageId': item.message_id,
+                'sourceLanguage': item.source_language,
+                'targetLanguage': item.target_language,
+                'translatedText': result['translated_text'],
+                'translatorModel': model_type,
+                'confidenceScore': result.get('confidence', 0.9)
+            }
+
+    results = await asyncio.gather(*(translate(item) for item in items))
+    records = [record for record in results if record]
+    return records, len(items) - len(records)
+
+
+async def run(args):
+    languages = [language.strip() for language in args.languages.split(',') if language.strip()]
+    if args.reset and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    checkpoint = BackfillCheckpoint.load(args.checkpoint, languages, args.model_type)
+    if checkpoint.last_message_id:
+        logger.info(f"▶️ [BACKFILL] Reprise après le message {checkpoint.last_message_id} "
+                    f"({checkpoint.messages_scanned} messages, {checkpoint.translated} traductions)")
+
+    database = DatabaseService()
+    if not await database.connect():
+        logger.error("❌ [BACKFILL] Base de données indisponible")
+        return 1
+
+    service = TranslationMLService(get_settings(), model_type='all', max_workers=args.concurrency)
+    if not await service.initialize() or not service.is_model_ready(args.model_type):
+        logger.error(f"❌ [BACKFILL] Modèle {args.model_type} indisponible")
+        await database.disconnect()
+        return 1
+
+    throttle = LoadThrottle(max_cpu_percent=args.max_cpu)
+    start_time = time.time()
+    translated_at_start = checkpoint.translated
+    try:
+        while args.limit is None or checkpoint.messages_scanned < args.limit:
+            page = await database.get_messages_page(checkpoint.last_message_id, args.page_size, args.conversation_id)
+            if not page:
+                break
+
+            existing = await database.get_translation_models([m['id'] for m in page], languages)
+            items, skipped = plan_translation_work(page, existing, languages, args.model_type, MODEL_HIERARCHY)
+
+            records = []
+            for batch in chunked(items, args.batch_size):
+                await throttle.wait_until_idle()
+                batch_records, failed = await translate_batch(service, batch, args.model_type, args.concurrency)
+                records.extend(batch_records)
+                checkpoint.failed += failed
+
+            # Écriture en masse de la page, puis seulement avancer le point de reprise
+            if records:
+                saved = await database.save_translations(records)
+                if saved < len(records):
+                    raise RuntimeError(f"Sauvegarde incomplète ({saved}/{len(records)}), reprise au message {checkpoint.last_message_id}")
+            checkpoint.last_message_id = page[-1]['id']
+            checkpoint.messages_scanned += len(page)
+            checkpoint.translated += len(records)
+            checkpoint.skipped += skipped
+            checkpoint.save(args.checkpoint)
+
+            elapsed = time.time() - start_time
+            rate = (checkpoint.translated - translated_at_start) / elapsed if elapsed > 0 else 0.0
+            logger.info(f"📦 [BACKFILL] {checkpoint.messages_scanned} messages, {checkpoint.translated} traduites, "
+                        f"{checkpoint.skipped} ignorées, {checkpoint.failed} échecs, {rate:.1f} trad/s, "
+                        f"{throttle.waited_seconds:.0f}s de pause")
+    finally:
+        await database.disconnect()
+
+    logger.info(f"✅ [BACKFILL] Terminé: {checkpoint.translated} traductions, dernier message {checkpoint.last_message_id}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rattrapage hors ligne des traductions de l'historique")
+    parser.add_argument('--languages', required=True, help="Langues cibles séparées par des virgules (ex: en,es)")
+    parser.add_argument('--model-type', default='basic', choices=sorted(MODEL_HIERARCHY, key=MODEL_HIERARCHY.get))
+    parser.add_argument('--page-size', type=int, default=500, help="Messages lus par page")
+    parser.add_argument('--batch-size', type=int, default=256, help="Traductions par lot trié")
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('ML_MAX_WORKERS', '16')),
+                        help="Traductions simultanées (voies d'inférence)")
+    parser.add_argument('--max-cpu', type=float, default=60.0,
+                        help="Pause tant que le CPU utilisé hors rattrapage dépasse ce pourcentage")
+    parser.add_argument('--conversation-id', default=None, help="Limiter à une conversation")
+    parser.add_argument('--limit', type=int, default=None, help="Nombre maximal de messages à parcourir")
+    parser.add_argument('--checkpoint', default='backfill_checkpoint.json', help="Fichier de point de reprise")
+    parser.add_argument('--reset', action='store_true', help="Ignorer le point de reprise existant")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
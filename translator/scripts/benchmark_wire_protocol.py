@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark du format de transport ZMQ
+Compare JSON (historique) et msgpack/1 sur un message translation_completed représentatif:
+octets par résultat et temps d'encodage/décodage en microsecondes
+"""
+
+import os
+import sys
+import time
+import uuid
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.wire_protocol import (
+    MSGPACK_AVAILABLE, PROTOCOL_JSON, PROTOCOL_MSGPACK_V1, decode_message, encode_message
+)
+
+
+def sample_result(text_length: int) -> dict:
+    """Message translation_completed tel que publié par ZMQTranslationServer"""
+    translated = ("Bonjour à tous, ceci est une traduction 🎉 " * (text_length // 40 + 1))[:text_length]
+    task_id = str(uuid.uuid4())
+    now = time.time()
+    return {
+        'type': 'translation_completed',
+        'taskId': task_id,
+        'result': {
+            'messageId': '66f1c2a9e4b0a1b2c3d4e5f6',
+            'translatedText': translated,
+            'sourceLanguage': 'en',
+            'targetLanguage': 'fr',
+            'confidenceScore': 0.95,
+            'processingTime': 0.412,
+            'modelType': 'medium',
+            'workerName': 'normal_worker_2',
+            'translatorModel': 'medium',
+            'workerId': 'normal_worker_2',
+            'poolType': 'normal',
+            'translationTime': 0.412,
+            'queueTime': 0.018,
+            'memoryUsage': 2431.7,
+            'cpuUsage': 312.5,
+            'timestamp': now,
+            'version': '1.0.0'
+        },
+        'targetLanguage': 'fr',
+        'timestamp': now,
+        'metadata': {
+            'translatorVersion': '1.0.0',
+            'modelVersion': 'medium',
+            'processingNode': 'translator-7f9c8d6b5-x2k4p',
+            'sessionId': str(uuid.uuid4()),
+            'requestId': task_id,
+            'protocol': 'ZMQ_PUB_SUB',
+            'encoding': 'UTF-8'
+        }
+    }
+
+
+def bench(protocol: str, message: dict, iterations: int) -> dict:
+    frames = encode_message(message, protocol)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encode_message(message, protocol)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode_message(frames)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    return {
+        'bytes': sum(len(frame) for frame in frames),
+        'encode_us': encode_us,
+        'decode_us': decode_us
+    }
+
+
+def main():
+    iterations = int(os.getenv('BENCH_ITERATIONS', '20000'))
+    protocols = [PROTOCOL_JSON] + ([PROTOCOL_MSGPACK_V1] if MSGPACK_AVAILABLE else [])
+    if not MSGPACK_AVAILABLE:
+        print("⚠️ msgpack non installé, seul JSON est mesuré")
+
+    print(f"📊 Benchmark format de transport ({iterations} itérations)")
+    print(f"{'texte':>7} {'format':>10} {'octets':>8} {'encode µs':>10} {'decode µs':>10}")
+    for text_length in (40, 400, 2000):
+        message = sample_result(text_length)
+        baseline = None
+        for protocol in protocols:
+            stats = bench(protocol, message, iterations)
+            baseline = baseline or stats['bytes']
+            ratio = f"({stats['bytes'] / baseline:.0%})"
+            print(f"{text_length:>7} {protocol:>10} {stats['bytes']:>8} {stats['encode_us']:>10.1f} {stats['decode_us']:>10.1f} {ratio}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Construction hors ligne du recueil de phrases fréquentes
+Parcourt les messages, retient par langue source les textes courts normalisés les plus
+fréquents, reprend leurs meilleures traductions existantes (niveau de modèle le plus
+élevé) et écrit la table projetée en mémoire (utils/phrasebook.py).
+
+Le fichier est remplacé atomiquement: les serveurs en cours d'exécution le rechargent
+d'eux-mêmes au prochain contrôle (PHRASEBOOK_RELOAD_INTERVAL), sans redémarrage.
+
+Usage:
+    python scripts/build_phrasebook.py
+    python scripts/build_phrasebook.py --per-language 5000 --max-length 60 --min-count 5
+    python scripts/build_phrasebook.py --output /data/models/phrasebook.bin --limit 2000000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from config.settings import get_settings
+from services.database_service import DatabaseService, MODEL_HIERARCHY
+from utils.backfill import chunked
+from utils.phrasebook import PhraseMiner, build_phrasebook, select_translations
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('phrasebook')
+
+
+async def run(args):
+    database = DatabaseService()
+    if not await database.connect():
+        logger.error("❌ [PHRASEBOOK] Base de données indisponible")
+        return 1
+
+    miner = PhraseMiner(max_length=args.max_length, max_tracked=args.max_tracked)
+    start_time = time.time()
+    translations = []
+    try:
+        last_id = None
+        while args.limit is None or miner.scanned < args.limit:
+            page = await database.get_messages_page(last_id, args.page_size)
+            if not page:
+                break
+            for message in page:
+                miner.add(message['id'], message['content'], message['originalLanguage'])
+            last_id = page[-1]['id']
+            if miner.scanned % (args.page_size * 100) == 0:
+                logger.info(f"📦 [PHRASEBOOK] {miner.scanned} messages, {len(miner.counts)} textes suivis")
+
+        phrases = miner.top(args.per_language, args.min_count)
+        message_ids = [message_id for *_, ids in phrases for message_id in ids]
+        for batch in chunked(message_ids, args.page_size):
+            translations.extend(await database.get_translations_for_messages(batch))
+    finally:
+        await database.disconnect()
+
+    entries = select_translations(phrases, translations, MODEL_HIERARCHY)
+    written = build_phrasebook(entries, args.output)
+    logger.info(f"✅ [PHRASEBOOK] {written} entrées ({len(phrases)} phrases, {miner.scanned} messages, "
+                f"{miner.prunes} élagages) écrites dans {args.output} "
+                f"({os.path.getsize(args.output) / 1024:.0f} Ko, {time.time() - start_time:.1f}s)")
+    return 0
+
+
+def main():
+    default_output = os.getenv('PHRASEBOOK_PATH') or os.path.join(get_settings().models_path, 'phrasebook.bin')
+    parser = argparse.ArgumentParser(description="Construction du recueil de phrases fréquentes")
+    parser.add_argument('--output', default=default_output, help="Fichier du recueil")
+    parser.add_argument('--per-language', type=int, default=5000, help="Phrases retenues par langue source")
+    parser.add_argument('--min-count', type=int, default=3, help="Occurrences minimales d'une phrase")
+    parser.add_argument('--max-length', type=int, default=80, help="Longueur maximale du texte normalisé")
+    parser.add_argument('--max-tracked', type=int, default=1_000_000,
+                        help="Textes suivis avant élagage (mémoire bornée)")
+    parser.add_argument('--page-size', type=int, default=1000, help="Messages lus par page")
+    parser.add_argument('--limit', type=int, default=None, help="Nombre maximal de messages à parcourir")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Banc de test local du mode cluster (broker ROUTER/DEALER + 1 à 4 nœuds)
+Lance le broker et N nœuds ZMQTranslationServer dans des processus séparés avec un
+service de traduction simulé (charge CPU fixe par traduction), envoie une rafale de
+requêtes comme la gateway et mesure le débit pour chaque taille de cluster.
+
+Usage:
+    python scripts/cluster_rig.py                 # 1, 2, 3 puis 4 nœuds
+    python scripts/cluster_rig.py --nodes 1 4 --requests 400 --work-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+
+class SimulatedTranslationService:
+    """Service de traduction factice: occupe un cœur pendant work_ms par traduction"""
+
+    def __init__(self, work_ms: float):
+        self.work_ms = work_ms
+        self.models = {'basic': None, 'medium': None}
+        self.is_initialized = True
+
+    def _burn(self):
+        deadline = time.perf_counter() + self.work_ms / 1000
+        while time.perf_counter() < deadline:
+            pass
+
+    async def translate_with_structure(self, text, source_language, target_language, model_type,
+                                       source_channel='zmq', cancel_check=None, **kwargs):
+        await asyncio.get_running_loop().run_in_executor(None, self._burn)
+        return {
+            'translated_text': f"{text} ⟶ {target_language}",
+            'detected_language': source_language,
+            'confidence': 0.9,
+            'model_used': f"{model_type}_simulated"
+        }
+
+
+async def run_node(args):
+    """Processus nœud: ZMQTranslationServer en mode cluster"""
+    from services.zmq_server import ZMQTranslationServer
+
+    server = ZMQTranslationServer(
+        normal_workers=args.workers,
+        any_workers=1,
+        translation_service=SimulatedTranslationService(args.work_ms)
+    )
+    # Pas de base de données dans le banc de test
+    async def no_database():
+        return False
+    server.database_service.connect = no_database
+    await server.start()
+
+
+def _spawn(extra_args, env):
+    return subprocess.Popen([sys.executable, *extra_args], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def measure(node_count: int, args, base_port: int) -> dict:
+    """Lance broker + nœuds, envoie la rafale et mesure le débit"""
+    import zmq
+    import zmq.asyncio
+
+    pull_port, pub_port, cluster_port = base_port, base_port + 1, base_port + 2
+    env = {
+        **os.environ,
+        'TRANSLATOR_ZMQ_PULL_PORT': str(pull_port),
+        'TRANSLATOR_ZMQ_PUB_PORT': str(pub_port),
+        'CLUSTER_BROKER_PORT': str(cluster_port),
+        'TRANSLATOR_CLUSTER_BROKER': f"tcp://127.0.0.1:{cluster_port}",
+        'TRANSLATION_JOURNAL_ENABLED': 'false',
+        'UPGRADE_SCHEDULER_ENABLED': 'false',
+        'NODE_ENV': 'production'
+    }
+    processes = [_spawn([str(SRC_DIR / 'cluster_broker.py')], env)]
+    processes += [_spawn([__file__, '--node', '--work-ms', str(args.work_ms), '--workers', str(args.workers)], env)
+                  for _ in range(node_count)]
+
+    context = zmq.asyncio.Context()
+    push = context.socket(zmq.PUSH)
+    push.connect(f"tcp://127.0.0.1:{pull_port}")
+    sub = context.socket(zmq.SUB)
+    sub.connect(f"tcp://127.0.0.1:{pub_port}")
+    sub.setsockopt(zmq.SUBSCRIBE, b'')
+
+    try:
+        # Attendre que tous les nœuds répondent au ping (enregistrés auprès du broker)
+        pongs = 0
+        deadline = time.time() + 60
+        while pongs < node_count and time.time() < deadline:
+            await push.send(json.dumps({'type': 'ping', 'timestamp': time.time()}).encode('utf-8'))
+            try:
+                while pongs < node_count:
+                    message = json.loads(await asyncio.wait_for(sub.recv(), 1.0))
+                    pongs += message.get('type') == 'pong'
+            except asyncio.TimeoutError:
+                pongs = 0
+        if pongs < node_count:
+            raise RuntimeError(f"seulement {pongs}/{node_count} nœud(s) prêts")
+
+        start = time.perf_counter()
+        for i in range(args.requests):
+            await push.send(json.dumps({
+                'messageId': f"msg-{i}",
+                'text': f"Message de test numéro {i}",
+                'sourceLanguage': 'fr',
+                'targetLanguages': ['en'],
+                'conversationId': f"conv-{i % args.conversations}",
+                'modelType': 'basic'
+            }).encode('utf-8'))
+
+        completed = 0
+        while completed < args.requests:
+            message = json.loads(await asyncio.wait_for(sub.recv(), 30))
+            completed += message.get('type') == 'translation_completed'
+        elapsed = time.perf_counter() - start
+        return {'nodes': node_count, 'elapsed': elapsed, 'throughput': args.requests / elapsed}
+    finally:
+        push.close(linger=0)
+        sub.close(linger=0)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+async def main(args):
+    results = []
+    for index, node_count in enumerate(args.nodes):
+        result = await measure(node_count, args, args.base_port + index * 10)
+        results.append(result)
+        print(f"🧪 {node_count} nœud(s): {args.requests} traductions en {result['elapsed']:.2f}s -> {result['throughput']:.1f}/s")
+
+    baseline = results[0]['throughput']
+    print("\n📊 Passage à l'échelle")
+    for result in results:
+        print(f"   {result['nodes']} nœud(s): x{result['throughput'] / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banc de test local du mode cluster")
+    parser.add_argument('--node', action='store_true', help="(interne) lance un nœud de traduction")
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1, 2, 3, 4])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--conversations', type=int, default=50)
+    parser.add_argument('--work-ms', type=float, default=20.0)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--base-port', type=int, default=16555)
+    args = parser.parse_args()
+
+    if args.node:
+        asyncio.run(run_node(args))
+    else:
+        asyncio.run(main(args))
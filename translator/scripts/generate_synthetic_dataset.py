@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Génération d'un jeu de données synthétique à grande échelle (bancs d'essai base et charge)
+Produit des utilisateurs, conversations, membres, messages et traductions aux
+distributions réalistes (utils/synthetic_data.py) et les charge par create_many
+concurrents. Même graine et mêmes paramètres = mêmes données.
+
+À lancer sur une base dédiée aux essais: les identifiants sont déterministes, une
+seconde exécution sur la même base échouerait sur les clés uniques.
+
+Usage:
+    python scripts/generate_synthetic_dataset.py --users 10000 --conversations 2000 --messages 200000
+    python scripts/generate_synthetic_dataset.py --users 2000000 --conversations 500000 \\
+        --messages 20000000 --concurrency 16 --seed 7
+    python scripts/generate_synthetic_dataset.py --messages 1000 --dry-run   # distributions seulement
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from config.settings import get_settings
+from utils.synthetic_data import SyntheticDataGenerator
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('synthetic')
+
+# Collections Prisma alimentées, dans l'ordre de création
+MODELS = ['user', 'conversation', 'conversationmember', 'message', 'messagetranslation']
+
+
+class BulkLoader:
+    """
+    Écriture par lots create_many, au plus `concurrency` lots en vol
+
+    Quand tous les lots sont en vol, add() attend: la génération avance au rythme de
+    la base et la mémoire reste bornée.
+    """
+
+    def __init__(self, prisma, batch_size: int, concurrency: int, dry_run: bool = False):
+        self.prisma = prisma
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._buffers: Dict[str, List[Dict]] = {model: [] for model in MODELS}
+        self._inflight = set()
+        self.rows = Counter()
+        self.batches = 0
+        self.started_at = time.time()
+        self._last_report = self.started_at
+
+    async def add(self, model: str, row: Dict):
+        buffer = self._buffers[model]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            await self._schedule(model)
+
+    async def _schedule(self, model: str):
+        rows, self._buffers[model] = self._buffers[model], []
+        if not rows:
+            return
+        await self._semaphore.acquire()
+        task = asyncio.create_task(self._write(model, rows))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _write(self, model: str, rows: List[Dict]):
+        try:
+            if not self.dry_run:
+                await getattr(self.prisma, model).create_many(data=rows)
+            self.rows[model] += len(rows)
+            self.batches += 1
+        finally:
+            self._semaphore.release()
+        self._report()
+
+    async def flush(self):
+        """Écrit les reliquats et attend tous les lots en vol (une erreur d'écriture est propagée)"""
+        for model in MODELS:
+            await self._schedule(model)
+        while self._inflight:
+            await asyncio.gather(*list(self._inflight))
+
+    def _report(self, force: bool = False):
+        now = time.time()
+        if not force and now - self._last_report < 5:
+            return
+        self._last_report = now
+        total = sum(self.rows.values())
+        elapsed = max(1e-6, now - self.started_at)
+        logger.info(f"📦 [SYNTHETIC] {total} lignes ({total / elapsed:.0f}/s) - " +
+                    ", ".join(f"{model}: {self.rows[model]}" for model in MODELS))
+
+
+async def run(args):
+    generator = SyntheticDataGenerator(
+        seed=args.seed,
+        users=args.users,
+        conversations=args.conversations,
+        messages=args.messages,
+        translation_coverage=args.translation_coverage,
+        max_targets=args.max_targets,
+        days=args.days
+    )
+
+    database = None
+    prisma = None
+    if not args.dry_run:
+        from services.database_service import DatabaseService
+        database = DatabaseService()
+        if not await database.connect():
+            logger.error("❌ [SYNTHETIC] Base de données indisponible")
+            return 1
+        prisma = database.prisma
+        if await prisma.user.find_unique(where={"username": "synth_0"}):
+            logger.error("❌ [SYNTHETIC] Données synthétiques déjà présentes: utiliser une base vide")
+            await database.disconnect()
+            return 1
+
+    loader = BulkLoader(prisma, args.batch_size, args.concurrency, args.dry_run)
+    lengths = []
+    languages = Counter()
+    try:
+        for user in generator.users():
+            await loader.add('user', user)
+        # Utilisateurs écrits avant les conversations qui les référencent
+        await loader.flush()
+
+        for conversation, members, member_ids, message_count in generator.conversations():
+            for member in members:
+                await loader.add('conversationmember', member)
+            for message, translations in generator.messages(conversation, member_ids, message_count):
+                await loader.add('message', message)
+                for translation in translations:
+                    await loader.add('messagetranslation', translation)
+                conversation['lastMessageAt'] = message['createdAt']
+                if len(lengths) < 100000:
+                    lengths.append(len(message['content']))
+                languages[message['originalLanguage']] += 1
+            # Écrite après ses messages pour porter la date du dernier (MongoDB ne
+            # vérifie pas les références)
+            await loader.add('conversation', conversation)
+        await loader.flush()
+    finally:
+        if database:
+            await database.disconnect()
+
+    loader._report(force=True)
+    elapsed = time.time() - loader.started_at
+    lengths.sort()
+    if lengths:
+        logger.info(f"📏 [SYNTHETIC] Longueur des messages: médiane {lengths[len(lengths) // 2]}, "
+                    f"p90 {lengths[int(len(lengths) * 0.9)]}, p99 {lengths[int(len(lengths) * 0.99)]}")
+    total_messages = max(1, sum(languages.values()))
+    logger.info("🌐 [SYNTHETIC] Langues: " + ", ".join(
+        f"{language} {count / total_messages:.0%}" for language, count in languages.most_common()))
+    logger.info(f"✅ [SYNTHETIC] Terminé en {elapsed:.1f}s (graine {args.seed}): {generator.counts}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génération d'un jeu de données synthétique à grande échelle")
+    parser.add_argument('--seed', type=int, default=42, help="Graine (reproductibilité)")
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--conversations', type=int, default=2000)
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--translation-coverage', type=float, default=0.9,
+                        help="Part des langues des membres déjà traduites")
+    parser.add_argument('--max-targets', type=int, default=6, help="Traductions maximales par message")
+    parser.add_argument('--days', type=int, default=365, help="Période couverte par l'historique")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Lignes par create_many")
+    parser.add_argument('--concurrency', type=int, default=max(1, get_settings().prisma_pool_size // 2),
+                        help="Lots create_many simultanés")
+    parser.add_argument('--dry-run', action='store_true', help="Générer sans écrire en base")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == '__main__':
+    main()
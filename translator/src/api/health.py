@@ -1,14 +1,20 @@
 """
 API de santé pour le service de traduction Meeshy
 Routes complètes de monitoring et health checks avec statut DB, ZMQ et ML
+
+Les composants sont sondés en arrière-plan (HealthMonitor), chacun à son intervalle:
+les sondes fréquentes de l'orchestrateur lisent l'état en cache et son âge.
 """
 
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any, Optional
+import os
 import time
 import logging
 import asyncio
 
+from utils.health_monitor import HealthMonitor
+
 logger = logging.getLogger(__name__)
 
 # Variables globales pour les services
@@ -19,6 +25,9 @@ zmq_server = None
 # Temps de démarrage
 startup_time = time.time()
 
+# États de santé rafraîchis en arrière-plan
+health_monitor = HealthMonitor(timeout=float(os.getenv('HEALTH_PROBE_TIMEOUT', '2')))
+
 def set_services(trans_service=None, db_service=None, zmq_srv=None):
     """Configure les références vers les services pour le monitoring"""
     global translation_service, database_service, zmq_server
@@ -28,6 +37,16 @@ def set_services(trans_service=None, db_service=None, zmq_srv=None):
         database_service = db_service
     if zmq_srv:
         zmq_server = zmq_srv
+    health_monitor.register('database', check_database_health, float(os.getenv('HEALTH_DB_INTERVAL', '10')))
+    health_monitor.register('zmq_server', check_zmq_health, float(os.getenv('HEALTH_ZMQ_INTERVAL', '5')))
+    health_monitor.register('translation_models', check_models_health, float(os.getenv('HEALTH_MODELS_INTERVAL', '15')))
+
+def start_health_monitor():
+    """Lance les sondes de fond (à appeler dans la boucle asyncio de l'API)"""
+    health_monitor.start()
+
+async def stop_health_monitor():
+    await health_monitor.stop()
 
 async def check_database_health() -> Dict[str, Any]:
     """Vérifie l'état de santé de la base de données"""
@@ -170,6 +189,10 @@ async def check_models_health() -> Dict[str, Any]:
             "error": str(e)
         }
 
+def _is_fresh(component: Dict[str, Any]) -> bool:
+    """Faux tant que le composant n'a pas été sondé ou si son état est périmé"""
+    return component.get("status") not in ("pending", "stale")
+
 # Router pour les routes de santé
 health_router = APIRouter(prefix="", tags=["health"])
 
@@ -177,25 +200,14 @@ health_router = APIRouter(prefix="", tags=["health"])
 async def comprehensive_health_check() -> Dict[str, Any]:
     """Health check complet avec état de tous les composants"""
     try:
-        # Exécuter les vérifications en parallèle
-        db_health, zmq_health, models_health = await asyncio.gather(
-            check_database_health(),
-            check_zmq_health(),
-            check_models_health(),
-            return_exceptions=True
-        )
-        
-        # Gérer les exceptions
-        if isinstance(db_health, Exception):
-            db_health = {"connected": False, "status": "error", "error": str(db_health)}
-        if isinstance(zmq_health, Exception):
-            zmq_health = {"running": False, "status": "error", "error": str(zmq_health)}
-        if isinstance(models_health, Exception):
-            models_health = {"loaded": False, "status": "error", "error": str(models_health)}
+        # Derniers états connus (sondes de fond), sans appel aux composants
+        db_health = health_monitor.snapshot('database')
+        zmq_health = health_monitor.snapshot('zmq_server')
+        models_health = health_monitor.snapshot('translation_models')
         
-        # Déterminer le statut global
-        db_ok = db_health.get("connected", False) or db_health.get("status") == "degraded_mode"
-        zmq_ok = zmq_health.get("running", False)
+        # Déterminer le statut global (un état périmé ne compte pas comme sain)
+        db_ok = _is_fresh(db_health) and (db_health.get("connected", False) or db_health.get("status") == "degraded_mode")
+        zmq_ok = _is_fresh(zmq_health) and zmq_health.get("running", False)
         models_ok = models_health.get("loaded", False) or models_health.get("status") == "degraded_mode"
         
         # Le service est "healthy" dès que le serveur démarre (même sans modèles)
@@ -221,6 +233,7 @@ async def comprehensive_health_check() -> Dict[str, Any]:
             "version": "1.0.0", 
             "timestamp": time.time(),
             "uptime_seconds": uptime_seconds,
+            "snapshot_age_seconds": health_monitor.oldest_age(),
             "models_loading": models_loading,  # Indicateur de chargement en cours
             "components": {
                 "database": db_health,
@@ -251,12 +264,12 @@ async def comprehensive_health_check() -> Dict[str, Any]:
 async def readiness_check() -> Dict[str, Any]:
     """Vérification de disponibilité - service prêt à traiter les requêtes"""
     try:
-        # Vérifications critiques pour la disponibilité
-        db_health = await check_database_health()
-        zmq_health = await check_zmq_health()
+        # Vérifications critiques pour la disponibilité (états en cache)
+        db_health = health_monitor.snapshot('database')
+        zmq_health = health_monitor.snapshot('zmq_server')
         
-        db_ready = db_health.get("connected", False) or db_health.get("status") == "degraded_mode"
-        zmq_ready = zmq_health.get("running", False)
+        db_ready = _is_fresh(db_health) and (db_health.get("connected", False) or db_health.get("status") == "degraded_mode")
+        zmq_ready = _is_fresh(zmq_health) and zmq_health.get("running", False)
         
         if not (db_ready and zmq_ready):
             raise HTTPException(
@@ -264,7 +277,10 @@ async def readiness_check() -> Dict[str, Any]:
                 detail={
                     "message": "Service not ready",
                     "database_ready": db_ready,
-                    "zmq_ready": zmq_ready
+                    "zmq_ready": zmq_ready,
+                    "database_status": db_health.get("status"),
+                    "zmq_status": zmq_health.get("status"),
+                    "snapshot_age_seconds": health_monitor.oldest_age()
                 }
             )
         
@@ -272,7 +288,8 @@ async def readiness_check() -> Dict[str, Any]:
             "status": "ready",
             "message": "Service ready to handle translation requests",
             "database_ready": db_ready,
-            "zmq_ready": zmq_ready
+            "zmq_ready": zmq_ready,
+            "snapshot_age_seconds": health_monitor.oldest_age()
         }
         
     except HTTPException:
@@ -288,5 +305,7 @@ async def liveness_check() -> Dict[str, Any]:
         "status": "alive",
         "service": "meeshy-translator",
         "timestamp": time.time(),
-        "uptime_seconds": time.time() - startup_time
+        "uptime_seconds": time.time() - startup_time,
+        "health_monitor_running": health_monitor.running,
+        "snapshot_age_seconds": health_monitor.oldest_age()
     }
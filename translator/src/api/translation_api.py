@@ -11,7 +11,7 @@ import logging
 import asyncio
 
 # Import du health router
-from api.health import health_router, set_services
+from api.health import health_router, set_services, start_health_monitor, stop_health_monitor
 from config.message_limits import can_translate_message, MessageLimits
 
 logger = logging.getLogger(__name__)
@@ -36,6 +36,26 @@ class TranslationResponse(BaseModel):
     processing_time_ms: int
     from_cache: bool
 
+class OnDemandTranslationRequest(BaseModel):
+    """Lecture d'une traduction, calculée si elle n'existe pas encore"""
+    message_id: str = Field(..., min_length=1)
+    target_language: str = Field(..., description="Langue cible")
+    model_type: str = Field(default="basic", description="Niveau minimal: basic, medium, premium")
+    text: Optional[str] = Field(default=None, description="Texte du message (relu en base si absent)")
+    source_language: Optional[str] = Field(default=None, description="Langue source (celle du message si absente)")
+
+class OnDemandTranslationResponse(BaseModel):
+    """Réponse d'une traduction à la lecture"""
+    message_id: str
+    translated_text: str
+    source_language: Optional[str]
+    target_language: str
+    model_used: str
+    confidence_score: float
+    processing_time_ms: int
+    from_database: bool
+    from_memory: bool
+
 class HealthResponse(BaseModel):
     """Réponse de santé du service"""
     status: str
@@ -99,10 +119,12 @@ class TranslationAPI:
         async def startup_event():
             import time
             self.start_time = time.time()
+            start_health_monitor()
             logger.info("[TRANSLATOR] 🚀 API FastAPI démarrée")
         
         @self.app.on_event("shutdown")
         async def shutdown_event():
+            await stop_health_monitor()
             logger.info("[TRANSLATOR] 🛑 API FastAPI arrêtée")
         
         # ===== ROUTES DE TRADUCTION =====
@@ -184,6 +206,34 @@ class TranslationAPI:
                     detail=f"Translation failed: {str(e)}"
                 )
         
+        @self.app.post("/translate/on-demand", response_model=OnDemandTranslationResponse)
+        async def get_or_translate(request: OnDemandTranslationRequest):
+            """Traduction existante en base, sinon calculée immédiatement (langues différées)"""
+            if not self.zmq_server:
+                raise HTTPException(status_code=503, detail="On-demand translation unavailable")
+            
+            result = await self.zmq_server.on_demand_translator.get_or_translate(
+                message_id=request.message_id,
+                target_language=request.target_language,
+                model_type=request.model_type,
+                text=request.text,
+                source_language=request.source_language
+            )
+            if result is None:
+                raise HTTPException(status_code=404, detail="Message not found or translation unavailable")
+            
+            return OnDemandTranslationResponse(
+                message_id=request.message_id,
+                translated_text=result['translatedText'],
+                source_language=result.get('sourceLanguage'),
+                target_language=request.target_language,
+                model_used=result.get('modelType', request.model_type),
+                confidence_score=result.get('confidenceScore', 0.9),
+                processing_time_ms=int(result.get('processingTime', 0.0) * 1000),
+                from_database=bool(result.get('fromDatabase')),
+                from_memory=bool(result.get('fromMemory'))
+            )
+        
         @self.app.post("/translate/batch")
         async def translate_batch(requests: List[TranslationRequest]):
             """Traduit plusieurs textes en lot"""
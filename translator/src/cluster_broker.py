@@ -0,0 +1,249 @@
+"""
+Broker du mode cluster Meeshy Translator
+Architecture: Gateway PUSH -> PULL [broker] PUB -> Gateway SUB
+                                   [broker] ROUTER <-> DEALER [nœuds de traduction]
+
+La gateway ne voit qu'un seul endpoint (mêmes ports qu'un translator seul). Les nœuds
+se connectent au ROUTER, annoncent leurs crédits et envoient des battements de cœur;
+le broker route chaque requête vers un nœud ayant du crédit (affinité de conversation)
+et republie leurs résultats tels quels sur le PUB.
+
+Protocole nœud -> broker: [READY|HB, statut JSON], [CREDIT, n], [PUB, trames...]
+Protocole broker -> nœud: [REQ, trames...] (consomme un crédit), [CMD, trames...]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import zmq
+import zmq.asyncio
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.cluster_dispatch import ClusterDispatcher
+from utils.wire_protocol import PROTOCOL_JSON, WireProtocolError, decode_message, encode_message
+
+logging.basicConfig(
+    level=logging.WARNING if os.getenv('NODE_ENV') == 'production' else logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Commandes diffusées à tous les nœuds (ne consomment pas de crédit)
+# ack/replay_since: chaque nœud tient l'outbox des résultats qu'il a publiés
+BROADCAST_TYPES = {'ping', 'cancel', 'ack', 'replay_since'}
+
+
+class ClusterBroker:
+    """Répartit les requêtes de la gateway entre les nœuds de traduction"""
+
+    def __init__(self,
+                 host: str = "0.0.0.0",
+                 gateway_push_port: int = 5555,
+                 gateway_sub_port: int = 5558,
+                 cluster_port: int = 5560):
+        self.host = host
+        self.gateway_push_port = gateway_push_port
+        self.gateway_sub_port = gateway_sub_port
+        self.cluster_port = cluster_port
+        self.context = zmq.asyncio.Context()
+
+        self.pull_socket = None
+        self.pub_socket = None
+        self.router_socket = None
+
+        self.dispatcher = ClusterDispatcher()
+        self.heartbeat_interval = float(os.getenv('CLUSTER_HEARTBEAT_INTERVAL', '1'))
+        self.max_pending = int(os.getenv('CLUSTER_BROKER_MAX_PENDING', '10000'))
+        # Requêtes en attente de crédit: (frames, conversationId, modelType)
+        self.pending = deque()
+
+        self.running = False
+        self.stats = {
+            'requests_received': 0,
+            'requests_dispatched': 0,
+            'requests_rejected': 0,
+            'broadcasts': 0,
+            'results_forwarded': 0,
+            'max_pending': 0
+        }
+
+    async def initialize(self):
+        self.pull_socket = self.context.socket(zmq.PULL)
+        self.pull_socket.setsockopt(zmq.RCVHWM, int(os.getenv('ZMQ_RCVHWM', '10000')))
+        self.pull_socket.bind(f"tcp://{self.host}:{self.gateway_push_port}")
+
+        self.pub_socket = self.context.socket(zmq.PUB)
+        self.pub_socket.setsockopt(zmq.SNDHWM, int(os.getenv('ZMQ_SNDHWM', '10000')))
+        self.pub_socket.bind(f"tcp://{self.host}:{self.gateway_sub_port}")
+
+        self.router_socket = self.context.socket(zmq.ROUTER)
+        self.router_socket.setsockopt(zmq.ROUTER_MANDATORY, 1)
+        self.router_socket.bind(f"tcp://{self.host}:{self.cluster_port}")
+
+        logger.info(f"[CLUSTER] 🔌 Gateway PULL {self.gateway_push_port}, PUB {self.gateway_sub_port}, nœuds ROUTER {self.cluster_port}")
+
+    async def start(self):
+        if not self.router_socket:
+            await self.initialize()
+        self.running = True
+        poller = zmq.asyncio.Poller()
+        poller.register(self.pull_socket, zmq.POLLIN)
+        poller.register(self.router_socket, zmq.POLLIN)
+        maintenance = asyncio.create_task(self._maintenance_loop())
+        logger.info("[CLUSTER] 🚀 Broker démarré")
+
+        try:
+            while self.running:
+                events = dict(await poller.poll())
+                # Résultats et crédits des nœuds d'abord: ils libèrent de la capacité
+                if self.router_socket in events:
+                    await self._drain(self.router_socket, self._handle_node_message)
+                if self.pull_socket in events:
+                    await self._drain(self.pull_socket, self._handle_gateway_message)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            maintenance.cancel()
+            await self.stop()
+
+    async def stop(self):
+        self.running = False
+        for sock in (self.pull_socket, self.pub_socket, self.router_socket):
+            if sock:
+                sock.close(linger=0)
+        self.pull_socket = self.pub_socket = self.router_socket = None
+
+    async def _drain(self, sock, handler, limit: int = 256):
+        """Traite sans bloquer les messages déjà disponibles sur un socket"""
+        for _ in range(limit):
+            try:
+                frames = await sock.recv_multipart(flags=zmq.NOBLOCK, copy=False)
+            except zmq.Again:
+                return
+            await handler(frames)
+
+    async def _handle_gateway_message(self, frames):
+        try:
+            request, _ = decode_message(frames)
+        except WireProtocolError as e:
+            logger.error(f"[CLUSTER] ❌ Requête illisible: {e}")
+            return
+        self.stats['requests_received'] += 1
+        payload = [frame.bytes for frame in frames]
+        request_type = request.get('type')
+
+        if request_type in BROADCAST_TYPES:
+            await self._broadcast(payload)
+            return
+        if request_type == 'supersede' and request.get('messageId'):
+            # Les autres nœuds abandonnent l'ancienne version, un seul traduit la nouvelle
+            cancel = encode_message({'type': 'cancel', 'messageId': request['messageId']}, PROTOCOL_JSON)
+            await self._broadcast(cancel)
+
+        self.pending.append((payload, request.get('conversationId'), request.get('modelType')))
+        if len(self.pending) > self.max_pending:
+            dropped, conversation_id, _ = self.pending.popleft()
+            await self._reject(dropped, 'cluster saturated')
+        self.stats['max_pending'] = max(self.stats['max_pending'], len(self.pending))
+        await self._dispatch_pending()
+
+    async def _handle_node_message(self, frames):
+        node_id = frames[0].bytes
+        kind = frames[1].bytes if len(frames) > 1 else b''
+        if kind == b'PUB':
+            await self.pub_socket.send_multipart(frames[2:], copy=False)
+            self.stats['results_forwarded'] += 1
+        elif kind == b'CREDIT':
+            self.dispatcher.add_credits(node_id, int(frames[2].bytes))
+            await self._dispatch_pending()
+        elif kind in (b'READY', b'HB'):
+            status = json.loads(frames[2].bytes)
+            if kind == b'READY' or node_id not in self.dispatcher.nodes:
+                self.dispatcher.register(node_id, status)
+                logger.info(f"[CLUSTER] ✅ Nœud {node_id.decode()} prêt: capacité {status.get('capacity')}, modèles {status.get('tiers')}")
+            else:
+                self.dispatcher.heartbeat(node_id, status)
+            await self._dispatch_pending()
+
+    async def _dispatch_pending(self):
+        """Route les requêtes en attente tant que des nœuds ont du crédit"""
+        while self.pending and self.dispatcher.has_credit():
+            payload, conversation_id, model_type = self.pending[0]
+            node_id = self.dispatcher.select(conversation_id, model_type)
+            if node_id is None:
+                return
+            self.pending.popleft()
+            try:
+                await self.router_socket.send_multipart([node_id, b'REQ', *payload])
+                self.stats['requests_dispatched'] += 1
+            except zmq.ZMQError as e:
+                # Nœud disparu entre deux battements de cœur: le retirer et réessayer
+                logger.warning(f"[CLUSTER] ⚠️ Nœud {node_id.decode()} injoignable: {e}")
+                self.dispatcher.nodes.pop(node_id, None)
+                self.pending.appendleft((payload, conversation_id, model_type))
+
+    async def _broadcast(self, payload):
+        self.stats['broadcasts'] += 1
+        for node_id in list(self.dispatcher.nodes):
+            try:
+                await self.router_socket.send_multipart([node_id, b'CMD', *payload])
+            except zmq.ZMQError:
+                self.dispatcher.nodes.pop(node_id, None)
+
+    async def _reject(self, payload, reason: str):
+        """Publie un translation_error pour une requête non routable"""
+        self.stats['requests_rejected'] += 1
+        try:
+            request, _ = decode_message(payload)
+        except WireProtocolError:
+            return
+        error_message = {
+            'type': 'translation_error',
+            'messageId': request.get('messageId'),
+            'error': reason,
+            'conversationId': request.get('conversationId', 'unknown')
+        }
+        await self.pub_socket.send_multipart(encode_message(error_message, PROTOCOL_JSON))
+
+    async def _maintenance_loop(self):
+        """Expiration des nœuds silencieux et journal périodique de l'état du cluster"""
+        last_report = time.time()
+        while self.running:
+            await asyncio.sleep(self.heartbeat_interval)
+            for node_id in self.dispatcher.expire():
+                logger.warning(f"[CLUSTER] 💀 Nœud {node_id.decode()} expiré (pas de battement de cœur)")
+            if time.time() - last_report >= 30:
+                last_report = time.time()
+                logger.info(f"[CLUSTER] 📊 {len(self.dispatcher.nodes)} nœud(s), {len(self.pending)} en attente, stats: {self.stats}")
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            'pending': len(self.pending),
+            'dispatcher': self.dispatcher.get_stats()
+        }
+
+
+async def main():
+    broker = ClusterBroker(
+        host=os.getenv('CLUSTER_BROKER_HOST', '0.0.0.0'),
+        gateway_push_port=int(os.getenv('TRANSLATOR_ZMQ_PULL_PORT', '5555')),
+        gateway_sub_port=int(os.getenv('TRANSLATOR_ZMQ_PUB_PORT', '5558')),
+        cluster_port=int(os.getenv('CLUSTER_BROKER_PORT', '5560'))
+    )
+    await broker.start()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("🛑 Arrêt du broker")
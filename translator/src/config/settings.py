@@ -44,6 +44,14 @@ class Settings:
             self.models_path = os.path.join(translator_dir, models_path_env)
             print(f"[SETTINGS] ✅ Chemin relatif calculé: '{self.models_path}'")
         
+        # Données locales du processus (journal des tâches...), indépendantes du répertoire courant
+        data_path_env = os.getenv("DATA_PATH", "data")
+        if os.path.isabs(data_path_env):
+            self.data_path = data_path_env
+        else:
+            translator_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            self.data_path = os.path.join(translator_dir, data_path_env)
+        
         # Configuration des langues
         self.default_language = os.getenv("DEFAULT_LANGUAGE", "fr")
         self.supported_languages = os.getenv("SUPPORTED_LANGUAGES", "af,ar,bg,bn,cs,da,de,el,en,es,fa,fi,fr,he,hi,hr,hu,hy,id,ig,it,ja,ko,ln,lt,ms,nl,no,pl,pt,ro,ru,sv,sw,th,tr,uk,ur,vi,zh")
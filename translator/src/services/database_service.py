@@ -6,11 +6,49 @@ Gère la sauvegarde et la récupération des traductions
 import asyncio
 import logging
 import os
-from typing import Optional, Dict, Any
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple
 from prisma import Prisma
 
+from config.settings import get_settings
+
 logger = logging.getLogger(__name__)
 
+# Hiérarchie des modèles de traduction (une traduction n'est remplacée que par un niveau >=)
+MODEL_HIERARCHY = {
+    "basic": 1,
+    "medium": 2,
+    "premium": 3
+}
+
+def model_tier(model_name: Optional[str]) -> Optional[str]:
+    """
+    Niveau de MODEL_HIERARCHY désigné par un nom de modèle ('premium', 'basic_ml_structured',
+    'nllb-medium'...), None s'il n'en désigne aucun
+    """
+    if not model_name:
+        return None
+    if model_name in MODEL_HIERARCHY:
+        return model_name
+    tokens = re.split(r'[_\-.:/]', model_name)
+    tiers = [tier for tier in MODEL_HIERARCHY if tier in tokens]
+    return max(tiers, key=MODEL_HIERARCHY.get) if tiers else None
+
+def effective_model_tier(model_used: Optional[str], requested: str) -> str:
+    """
+    Niveau réellement produit par une inférence (champ model_used du service de traduction)
+
+    Un repli (fallback) est enregistré au niveau le plus bas, pour être retraduit par le
+    planificateur d'amélioration; un nom sans niveau reconnu garde le niveau demandé
+    """
+    if 'fallback' in (model_used or ''):
+        return min(MODEL_HIERARCHY, key=MODEL_HIERARCHY.get)
+    return model_tier(model_used) or requested
+
+# ObjectId jamais attribué, pour la sonde de santé (lecture indexée qui ne trouve rien)
+HEALTH_PROBE_ID = "000000000000000000000000"
+
 class DatabaseService:
     """Service de base de données pour le Translator"""
     
@@ -42,12 +80,13 @@ class DatabaseService:
                 if not self.prisma:
                     # Le client Prisma est déjà généré dans l'image Docker
                     # CORRECTION: Configurer les timeouts pour éviter ReadTimeout
+                    pool_size = get_settings().prisma_pool_size
                     self.prisma = Prisma(
                         http={
                             'timeout': 60.0,  # Timeout global de 60 secondes
                             'limits': {
-                                'max_connections': 10,  # Limiter les connexions
-                                'max_keepalive_connections': 5
+                                'max_connections': pool_size,  # PRISMA_POOL_SIZE
+                                'max_keepalive_connections': max(1, pool_size // 2)
                             }
                         }
                     )
@@ -144,13 +183,7 @@ class DatabaseService:
             # Créer la clé de cache unique
             cache_key = f"{message_id}_{source_language}_{target_language}_{translator_model}"
             
-            # Définir la hiérarchie des modèles
-            model_hierarchy = {
-                "basic": 1,
-                "medium": 2,
-                "premium": 3
-            }
-            current_model_level = model_hierarchy.get(translator_model, 1)
+            current_model_level = MODEL_HIERARCHY.get(translator_model, 1)
             
             # Vérifier si la traduction existe déjà
             existing_translation = await self.prisma.messagetranslation.find_unique(
@@ -164,7 +197,7 @@ class DatabaseService:
             
             if existing_translation:
                 # Vérifier le niveau du modèle existant
-                existing_model_level = model_hierarchy.get(existing_translation.translationModel, 1)
+                existing_model_level = MODEL_HIERARCHY.get(existing_translation.translationModel, 1)
                 
                 # Ne mettre à jour que si le nouveau modèle est de niveau supérieur ou égal
                 if current_model_level >= existing_model_level:
@@ -179,7 +212,9 @@ class DatabaseService:
                             "translatedContent": translated_text,
                             "translationModel": translator_model,
                             "confidenceScore": confidence_score,
-                            "cacheKey": cache_key
+                            "cacheKey": cache_key,
+                            "sourceSegments": translation_data.get('sourceSegments') or [],
+                            "translatedSegments": translation_data.get('translatedSegments') or []
                         }
                     )
                     
@@ -201,7 +236,9 @@ class DatabaseService:
                         "translatedContent": translated_text,
                         "translationModel": translator_model,
                         "confidenceScore": confidence_score,
-                        "cacheKey": cache_key
+                        "cacheKey": cache_key,
+                        "sourceSegments": translation_data.get('sourceSegments') or [],
+                        "translatedSegments": translation_data.get('translatedSegments') or []
                     }
                 )
                 
@@ -213,6 +250,155 @@ class DatabaseService:
             logger.error(f"❌ [TRANSLATOR-DB] Erreur sauvegarde traduction: {e}")
             return False
     
+    async def save_translations(self, translations: List[Dict[str, Any]]) -> int:
+        """
+        Sauvegarde un lot de traductions en un seul aller-retour de lecture
+        
+        Une seule requête find_many récupère les traductions existantes du lot, les
+        nouvelles sont insérées par create_many et les mises à jour (hiérarchie des
+        modèles respectée) partent dans une seule transaction groupée (batch_).
+        
+        Une ligne créée entre la lecture et create_many (autre flush, save_translation,
+        autre nœud du cluster) fait échouer tout le create_many: le lot n'est pas perdu,
+        ses créations sont rejouées ligne par ligne (_upsert_translation). De même si la
+        transaction des mises à jour échoue: les lignes déjà créées restent comptées.
+        
+        Args:
+            translations: Liste de dictionnaires au format de save_translation
+        
+        Returns:
+            int: Nombre de traductions créées, mises à jour ou déjà de niveau supérieur
+        """
+        if not self.is_connected:
+            logger.warning("⚠️ [TRANSLATOR-DB] Base de données non connectée, pas de sauvegarde")
+            return 0
+        
+        # Normaliser et dédupliquer (dernier résultat conservé par message/langue)
+        records = {}
+        edited = set()
+        for translation_data in translations:
+            message_id = translation_data.get('messageId')
+            target_language = translation_data.get('targetLanguage')
+            translated_text = translation_data.get('translatedText')
+            if not all([message_id, target_language, translated_text]):
+                logger.warning(f"⚠️ [TRANSLATOR-DB] Données de traduction incomplètes: {translation_data}")
+                continue
+            source_language = translation_data.get('sourceLanguage', 'fr')
+            translator_model = translation_data.get('translatorModel', translation_data.get('modelType', 'basic'))
+            records[(message_id, target_language)] = {
+                "messageId": message_id,
+                "sourceLanguage": source_language,
+                "targetLanguage": target_language,
+                "translatedContent": translated_text,
+                "translationModel": translator_model,
+                "confidenceScore": translation_data.get('confidenceScore', 0.9),
+                "cacheKey": f"{message_id}_{source_language}_{target_language}_{translator_model}",
+                # Lignes alignées (vides pour un texte traduit d'un bloc)
+                "sourceSegments": translation_data.get('sourceSegments') or [],
+                "translatedSegments": translation_data.get('translatedSegments') or []
+            }
+            if translation_data.get('sourceEdited'):
+                edited.add((message_id, target_language))
+        if not records:
+            return 0
+        
+        try:
+            existing = await self.prisma.messagetranslation.find_many(
+                where={
+                    "messageId": {"in": list({key[0] for key in records})},
+                    "targetLanguage": {"in": list({key[1] for key in records})}
+                }
+            )
+            existing_models = {(t.messageId, t.targetLanguage): t.translationModel for t in existing}
+            
+            to_create = []
+            updates = []
+            kept = 0
+            # Upsert par lots: les créations en un create_many, les mises à jour en un batch_
+            for key, record in records.items():
+                if key not in existing_models:
+                    to_create.append(record)
+                elif key in edited or MODEL_HIERARCHY.get(record["translationModel"], 1) >= MODEL_HIERARCHY.get(existing_models[key], 1):
+                    updates.append((key, record))
+                else:
+                    kept += 1
+            
+            created = len(to_create)
+            if to_create:
+                try:
+                    await self.prisma.messagetranslation.create_many(data=to_create)
+                except Exception as e:
+                    logger.warning(f"⚠️ [TRANSLATOR-DB] create_many refusé ({e}), repli ligne par ligne sur {len(to_create)} traduction(s)")
+                    created = 0
+                    for record in to_create:
+                        key = (record["messageId"], record["targetLanguage"])
+                        if await self._upsert_translation(key, record, force=key in edited):
+                            created += 1
+            updated = len(updates)
+            if updates:
+                try:
+                    async with self.prisma.batch_() as batcher:
+                        for key, record in updates:
+                            batcher.messagetranslation.update(
+                                where={"messageId_targetLanguage": {"messageId": key[0], "targetLanguage": key[1]}},
+                                data={
+                                    "translatedContent": record["translatedContent"],
+                                    "translationModel": record["translationModel"],
+                                    "confidenceScore": record["confidenceScore"],
+                                    "cacheKey": record["cacheKey"],
+                                    "sourceSegments": record["sourceSegments"],
+                                    "translatedSegments": record["translatedSegments"]
+                                }
+                            )
+                except Exception as e:
+                    logger.warning(f"⚠️ [TRANSLATOR-DB] Transaction de mise à jour refusée ({e}), repli ligne par ligne sur {len(updates)} traduction(s)")
+                    updated = 0
+                    for key, record in updates:
+                        if await self._upsert_translation(key, record, force=key in edited):
+                            updated += 1
+            
+            logger.info(f"✅ [TRANSLATOR-DB] Lot sauvegardé: {created} créée(s), {updated} mise(s) à jour, {kept} de niveau supérieur conservée(s)")
+            return created + updated + kept
+            
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur sauvegarde du lot de traductions: {e}")
+            return 0
+    
+    async def _upsert_translation(self, key: tuple, record: Dict[str, Any], force: bool = False) -> bool:
+        """
+        Sauvegarde d'une ligne du lot par upsert (repli après un create_many ou un batch_ refusé)
+        
+        La ligne existante, relue, n'est remplacée que par un modèle de niveau supérieur
+        ou égal (ou si le texte source a été modifié).
+        
+        Returns:
+            bool: True si la traduction est enregistrée ou déjà de niveau supérieur
+        """
+        where = {"messageId_targetLanguage": {"messageId": key[0], "targetLanguage": key[1]}}
+        try:
+            existing = await self.prisma.messagetranslation.find_unique(where=where)
+            if (existing and not force
+                    and MODEL_HIERARCHY.get(record["translationModel"], 1) < MODEL_HIERARCHY.get(existing.translationModel, 1)):
+                return True
+            await self.prisma.messagetranslation.upsert(
+                where=where,
+                data={
+                    "create": record,
+                    "update": {
+                        "translatedContent": record["translatedContent"],
+                        "translationModel": record["translationModel"],
+                        "confidenceScore": record["confidenceScore"],
+                        "cacheKey": record["cacheKey"],
+                        "sourceSegments": record["sourceSegments"],
+                        "translatedSegments": record["translatedSegments"]
+                    }
+                }
+            )
+            return True
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur sauvegarde de la traduction {key[0]} -> {key[1]}: {e}")
+            return False
+    
     def is_db_connected(self) -> bool:
         """Vérifie si la connexion à la base de données est active"""
         return self.is_connected
@@ -260,6 +446,407 @@ class DatabaseService:
             logger.error(f"❌ [TRANSLATOR-DB] Erreur récupération traduction: {e}")
             return None
     
+    async def get_translations(self, message_id: str, target_languages: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Récupère en une seule requête les traductions existantes d'un message
+        
+        Args:
+            message_id: ID du message
+            target_languages: Langues cibles recherchées
+        
+        Returns:
+            Dict: langue cible -> données de traduction (format de get_translation)
+        """
+        if not self.is_connected or not target_languages:
+            return {}
+        
+        try:
+            translations = await self.prisma.messagetranslation.find_many(
+                where={
+                    "messageId": message_id,
+                    "targetLanguage": {"in": list(target_languages)}
+                }
+            )
+            return {
+                translation.targetLanguage: {
+                    "messageId": translation.messageId,
+                    "sourceLanguage": translation.sourceLanguage,
+                    "targetLanguage": translation.targetLanguage,
+                    "translatedText": translation.translatedContent,
+                    "translatorModel": translation.translationModel,
+                    "confidenceScore": translation.confidenceScore,
+                    "cacheKey": translation.cacheKey,
+                    "sourceSegments": translation.sourceSegments,
+                    "translatedSegments": translation.translatedSegments,
+                    "createdAt": translation.createdAt.isoformat() if translation.createdAt else None
+                }
+                for translation in translations
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur récupération des traductions du message {message_id}: {e}")
+            return {}
+    
+    async def get_messages_page(self, after_id: Optional[str] = None, limit: int = 500,
+                                conversation_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Page de messages texte non supprimés, par identifiant croissant (pagination par curseur)
+        
+        Args:
+            after_id: Dernier identifiant de la page précédente (None = début)
+            limit: Taille de la page
+            conversation_id: Restreindre à une conversation
+        
+        Returns:
+            List[Dict]: {'id', 'content', 'originalLanguage'}
+        """
+        if not self.is_connected:
+            return []
+        
+        where: Dict[str, Any] = {"isDeleted": False, "messageType": "text"}
+        if conversation_id:
+            where["conversationId"] = conversation_id
+        query: Dict[str, Any] = {"where": where, "take": limit, "order": {"id": "asc"}}
+        if after_id:
+            query.update(cursor={"id": after_id}, skip=1)
+        
+        # Pas de capture d'erreur: une page vide signifierait « fin de l'historique »
+        messages = await self.prisma.message.find_many(**query)
+        return [
+            {"id": m.id, "content": m.content, "originalLanguage": m.originalLanguage}
+            for m in messages
+        ]
+    
+    async def get_message(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Message texte non supprimé par identifiant
+
+        Returns:
+            Dict ou None: {'id', 'content', 'originalLanguage', 'conversationId'}
+        """
+        if not self.is_connected:
+            return None
+
+        try:
+            message = await self.prisma.message.find_unique(where={"id": message_id})
+            if not message or message.isDeleted or message.messageType != "text":
+                return None
+            return {
+                "id": message.id,
+                "content": message.content,
+                "originalLanguage": message.originalLanguage,
+                "conversationId": message.conversationId
+            }
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur lecture du message {message_id}: {e}")
+            return None
+
+    async def get_recent_messages(self, conversation_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Derniers messages texte non supprimés d'une conversation, du plus récent au plus ancien
+        
+        Returns:
+            List[Dict]: {'id', 'content', 'originalLanguage'}
+        """
+        if not self.is_connected:
+            return []
+        
+        try:
+            messages = await self.prisma.message.find_many(
+                where={"conversationId": conversation_id, "isDeleted": False, "messageType": "text"},
+                order={"createdAt": "desc"},
+                take=limit
+            )
+            return [
+                {"id": m.id, "content": m.content, "originalLanguage": m.originalLanguage}
+                for m in messages
+            ]
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur lecture des messages de {conversation_id}: {e}")
+            return []
+    
+    async def get_translation_models(self, message_ids: List[str], target_languages: List[str]) -> Dict[tuple, str]:
+        """
+        Modèle des traductions existantes pour un ensemble de messages (une seule requête)
+        
+        Returns:
+            Dict: (messageId, langue cible) -> modèle de traduction
+        """
+        if not self.is_connected or not message_ids or not target_languages:
+            return {}
+        
+        try:
+            translations = await self.prisma.messagetranslation.find_many(
+                where={
+                    "messageId": {"in": list(message_ids)},
+                    "targetLanguage": {"in": list(target_languages)}
+                }
+            )
+            return {(t.messageId, t.targetLanguage): t.translationModel for t in translations}
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur lecture des traductions existantes: {e}")
+            return {}
+
+    async def get_translations_for_messages(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Toutes les traductions d'un ensemble de messages (une seule requête)
+
+        Returns:
+            List[Dict]: {'messageId', 'targetLanguage', 'translatedText', 'translationModel'}
+        """
+        if not self.is_connected or not message_ids:
+            return []
+
+        # Pas de capture d'erreur: un recueil construit sur une lecture partielle serait faux
+        translations = await self.prisma.messagetranslation.find_many(
+            where={"messageId": {"in": list(message_ids)}}
+        )
+        return [
+            {
+                "messageId": t.messageId,
+                "targetLanguage": t.targetLanguage,
+                "translatedText": t.translatedContent,
+                "translationModel": t.translationModel
+            }
+            for t in translations
+        ]
+
+    async def get_memory_entries(self, memory_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Récupère en une seule requête les entrées de la mémoire de traduction
+        
+        Args:
+            memory_keys: Clés de contenu (texte normalisé + langues + niveau)
+        
+        Returns:
+            Dict: clé -> entrée de la mémoire
+        """
+        if not self.is_connected or not memory_keys:
+            return {}
+        
+        try:
+            entries = await self.prisma.translationmemory.find_many(
+                where={"memoryKey": {"in": list(memory_keys)}}
+            )
+            return {
+                entry.memoryKey: {
+                    "memoryKey": entry.memoryKey,
+                    "contentHash": entry.contentHash,
+                    "sourceLanguage": entry.sourceLanguage,
+                    "targetLanguage": entry.targetLanguage,
+                    "translatedContent": entry.translatedContent,
+                    "translationModel": entry.translationModel,
+                    "confidenceScore": entry.confidenceScore,
+                    "originMessageId": entry.originMessageId
+                }
+                for entry in entries
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur lecture de la mémoire de traduction: {e}")
+            return {}
+    
+    async def save_memory_entries(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Enregistre un lot d'entrées de la mémoire de traduction
+        
+        Les nouvelles clés sont insérées par create_many, les existantes mises à jour dans
+        un batch_; les entrées de niveau inférieur remplacées (supersedes) sont supprimées.
+        Une clé insérée entre la lecture et create_many (autre flush, autre nœud) fait
+        échouer tout le create_many: ses entrées sont alors rejouées une à une par upsert.
+        
+        Returns:
+            int: Nombre d'entrées enregistrées
+        """
+        if not self.is_connected or not entries:
+            return 0
+        
+        try:
+            records = {entry["memoryKey"]: entry for entry in entries}
+            existing = await self.prisma.translationmemory.find_many(
+                where={"memoryKey": {"in": list(records)}}
+            )
+            existing_keys = {entry.memoryKey for entry in existing}
+            
+            to_create = []
+            superseded = set()
+            failed = 0
+            for key, entry in records.items():
+                superseded.update(entry.get("supersedes", []))
+                if key not in existing_keys:
+                    to_create.append({
+                        "memoryKey": key,
+                        "contentHash": entry["contentHash"],
+                        "sourceLanguage": entry["sourceLanguage"],
+                        "targetLanguage": entry["targetLanguage"],
+                        "translatedContent": entry["translatedContent"],
+                        "translationModel": entry["translationModel"],
+                        "confidenceScore": entry.get("confidenceScore"),
+                        "originMessageId": entry.get("originMessageId")
+                    })
+            
+            if to_create:
+                try:
+                    await self.prisma.translationmemory.create_many(data=to_create)
+                except Exception as e:
+                    logger.warning(f"⚠️ [TRANSLATOR-DB] create_many refusé ({e}), repli entrée par entrée sur {len(to_create)} entrée(s) de mémoire")
+                    for entry in to_create:
+                        if not await self._upsert_memory_entry(entry):
+                            failed += 1
+            if existing_keys:
+                async with self.prisma.batch_() as batcher:
+                    for key in existing_keys:
+                        batcher.translationmemory.update(
+                            where={"memoryKey": key},
+                            data={
+                                "translatedContent": records[key]["translatedContent"],
+                                "confidenceScore": records[key].get("confidenceScore"),
+                                "lastUsedAt": datetime.now(timezone.utc)
+                            }
+                        )
+            if superseded:
+                await self.prisma.translationmemory.delete_many(
+                    where={"memoryKey": {"in": list(superseded)}}
+                )
+            return len(records) - failed
+            
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur sauvegarde de la mémoire de traduction: {e}")
+            return 0
+    
+    async def _upsert_memory_entry(self, entry: Dict[str, Any]) -> bool:
+        """Enregistre une entrée de la mémoire par upsert (repli après un create_many refusé)"""
+        try:
+            await self.prisma.translationmemory.upsert(
+                where={"memoryKey": entry["memoryKey"]},
+                data={
+                    "create": entry,
+                    "update": {
+                        "translatedContent": entry["translatedContent"],
+                        "confidenceScore": entry.get("confidenceScore"),
+                        "lastUsedAt": datetime.now(timezone.utc)
+                    }
+                }
+            )
+            return True
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur sauvegarde de l'entrée de mémoire {entry['memoryKey']}: {e}")
+            return False
+    
+    async def touch_memory_entries(self, memory_keys: List[str]) -> int:
+        """Met à jour la date d'utilisation et le compteur des entrées réutilisées"""
+        if not self.is_connected or not memory_keys:
+            return 0
+        
+        try:
+            return await self.prisma.translationmemory.update_many(
+                where={"memoryKey": {"in": list(memory_keys)}},
+                data={"lastUsedAt": datetime.now(timezone.utc), "hitCount": {"increment": 1}}
+            )
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur mise à jour de la mémoire de traduction: {e}")
+            return 0
+    
+    async def prune_translation_memory(self, max_age_seconds: float, max_entries: int) -> int:
+        """
+        Purge la mémoire de traduction
+        
+        Supprime les entrées inutilisées depuis max_age_seconds, puis les moins récemment
+        utilisées au-delà de max_entries.
+        
+        Returns:
+            int: Nombre d'entrées supprimées
+        """
+        if not self.is_connected:
+            return 0
+        
+        try:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+            deleted = await self.prisma.translationmemory.delete_many(
+                where={"lastUsedAt": {"lt": cutoff}}
+            )
+            excess = await self.prisma.translationmemory.count() - max_entries
+            if excess > 0:
+                oldest = await self.prisma.translationmemory.find_many(
+                    order={"lastUsedAt": "asc"},
+                    take=excess
+                )
+                deleted += await self.prisma.translationmemory.delete_many(
+                    where={"id": {"in": [entry.id for entry in oldest]}}
+                )
+            return deleted
+            
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur purge de la mémoire de traduction: {e}")
+            return 0
+    
+    async def get_upgradable_translations(self, models: List[str], max_age_hours: int = 24, limit: int = 20,
+                                          before: Optional[Tuple[datetime, str]] = None
+                                          ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, str]]]:
+        """
+        Récupère les traductions récentes produites par un modèle de niveau inférieur
+        
+        Parcours du plus récent au plus ancien, par page (pagination par curseur)
+        
+        Args:
+            models: Modèles considérés comme améliorables (ex: ['basic'])
+            max_age_hours: Ancienneté maximale des traductions
+            limit: Taille de la page
+            before: Curseur (createdAt, id) de la page précédente (None = plus récentes)
+        
+        Returns:
+            (traductions avec le texte source du message, curseur de la page suivante ou
+            None quand la fenêtre max_age_hours est entièrement parcourue)
+        """
+        if not self.is_connected or not models:
+            return [], None
+        
+        try:
+            since = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+            where: Dict[str, Any] = {
+                "translationModel": {"in": models},
+                "createdAt": {"gte": since}
+            }
+            if before:
+                # Strictement après le curseur dans l'ordre (createdAt, id) décroissant
+                created_at, translation_id = before
+                where["OR"] = [
+                    {"createdAt": {"lt": created_at}},
+                    {"createdAt": created_at, "id": {"lt": translation_id}}
+                ]
+            translations = await self.prisma.messagetranslation.find_many(
+                where=where,
+                include={"message": True},
+                order=[{"createdAt": "desc"}, {"id": "desc"}],
+                take=limit
+            )
+            
+            candidates = []
+            for translation in translations:
+                message = translation.message
+                if not message or message.isDeleted or not message.content:
+                    continue
+                candidates.append({
+                    "translationId": translation.id,
+                    "createdAt": translation.createdAt,
+                    "messageId": translation.messageId,
+                    "conversationId": message.conversationId,
+                    "sourceLanguage": translation.sourceLanguage,
+                    "targetLanguage": translation.targetLanguage,
+                    "translatorModel": translation.translationModel,
+                    "sourceText": message.content
+                })
+            
+            # Page incomplète: fin de la fenêtre, le prochain parcours repart des plus récentes
+            next_cursor = None
+            if len(translations) >= limit:
+                next_cursor = (translations[-1].createdAt, translations[-1].id)
+            return candidates, next_cursor
+            
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR-DB] Erreur récupération traductions améliorables: {e}")
+            return [], None
+    
     async def invalidate_message_translations(self, message_id: str) -> bool:
         """
         Invalide toutes les traductions d'un message (pour forcer la retraduction)
@@ -299,9 +886,8 @@ class DatabaseService:
                     "error": "Database not connected"
                 }
             
-            # Test simple de connexion (MongoDB ne supporte pas SELECT 1)
-            # Utiliser une requête MongoDB valide à la place
-            await self.prisma.user.count()
+            # Sonde légère: lecture ponctuelle sur l'index _id (aucun parcours de collection)
+            await self.prisma.messagetranslation.find_unique(where={"id": HEALTH_PROBE_ID})
             
             return {
                 "connected": True,
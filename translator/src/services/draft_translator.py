@@ -0,0 +1,220 @@
+"""
+Pré-traduction des brouillons pendant la saisie (commande ZMQ draft_translate)
+Le texte en cours de frappe est traduit en arrière-plan, avec une priorité inférieure à
+toute traduction réelle; quand le message envoyé correspond au dernier brouillon, la
+traduction mise en cache est publiée immédiatement, sans attendre le modèle.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .translation_ml_service import TranslationCancelledError
+from utils.result_outbox import text_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DraftState:
+    """Dernière version connue d'un brouillon"""
+    draft_id: str
+    request: Dict
+    generation: int = 0
+    timer: Optional[asyncio.Task] = None
+    running: Optional[asyncio.Task] = None
+    updated_at: float = field(default_factory=time.time)
+
+
+class DraftTranslator:
+    """
+    Traduction anticipée des brouillons
+
+    - Anti-rebond: seule la version stable depuis DRAFT_DEBOUNCE_MS est traduite
+    - Remplacement: une nouvelle version interrompt la traduction de la précédente
+    - Plafonds stricts: DRAFT_MAX_CONCURRENCY traductions au plus, aucune tant que des
+      tâches réelles sont en file ou en cours (interruption au segment suivant sinon),
+      ni quand le CPU machine dépasse DRAFT_MAX_CPU_PERCENT
+    - Cache (texte, langues, modèle) -> résultat, borné en taille et en durée
+    """
+
+    def __init__(self,
+                 translation_service,
+                 busy_check: Callable[[], bool],
+                 cpu_usage: Callable[[], float]):
+        self.translation_service = translation_service
+        self.busy_check = busy_check
+        self.cpu_usage = cpu_usage
+
+        self.enabled = (
+            translation_service is not None
+            and os.getenv('DRAFT_TRANSLATION_ENABLED', 'true').lower() == 'true'
+        )
+        self.debounce = float(os.getenv('DRAFT_DEBOUNCE_MS', '400')) / 1000
+        self.max_cpu_percent = float(os.getenv('DRAFT_MAX_CPU_PERCENT', '50'))
+        self.max_length = int(os.getenv('DRAFT_MAX_LENGTH', '2000'))
+        self.max_drafts = int(os.getenv('DRAFT_MAX_ACTIVE', '1000'))
+        self.draft_ttl = float(os.getenv('DRAFT_TTL', '120'))
+        self.cache_size = int(os.getenv('DRAFT_CACHE_SIZE', '2000'))
+        self.cache_ttl = float(os.getenv('DRAFT_CACHE_TTL', '300'))
+        self._semaphore = asyncio.Semaphore(int(os.getenv('DRAFT_MAX_CONCURRENCY', '1')))
+
+        self._drafts: Dict[str, DraftState] = {}
+        # (empreinte du texte, source, cible, modèle) -> (résultat, date)
+        self._cache: "OrderedDict[Tuple[str, str, str, str], Tuple[Dict, float]]" = OrderedDict()
+
+        self.stats = {
+            'drafts_received': 0,
+            'drafts_debounced': 0,
+            'drafts_started': 0,
+            'drafts_superseded': 0,
+            'drafts_yielded': 0,
+            'drafts_skipped_busy': 0,
+            'draft_translations': 0,
+            'cache_hits': 0,
+            'cache_misses': 0
+        }
+
+    @staticmethod
+    def _cache_key(text: str, source_language: str, target_language: str, model_type: str) -> Tuple[str, str, str, str]:
+        return (text_fingerprint(text.strip()), source_language, target_language, model_type)
+
+    def submit(self, request: Dict) -> bool:
+        """Enregistre une nouvelle version de brouillon (traduite après l'anti-rebond)"""
+        draft_id = request.get('draftId')
+        text = request.get('text') or ''
+        if not self.enabled or not draft_id or not text.strip() or not request.get('targetLanguages'):
+            return False
+        if len(text) > self.max_length:
+            return False
+
+        self.stats['drafts_received'] += 1
+        state = self._drafts.get(draft_id)
+        if state is None:
+            self._expire_drafts()
+            if len(self._drafts) >= self.max_drafts:
+                return False
+            state = self._drafts[draft_id] = DraftState(draft_id=draft_id, request=request)
+        else:
+            if state.timer and not state.timer.done():
+                state.timer.cancel()
+                self.stats['drafts_debounced'] += 1
+            state.request = request
+            state.updated_at = time.time()
+
+        # La génération invalide la traduction en cours de la version précédente
+        state.generation += 1
+        state.timer = asyncio.create_task(self._debounced(state, state.generation))
+        return True
+
+    def cancel(self, draft_id: Optional[str]):
+        """Brouillon abandonné ou message envoyé: plus aucune traduction pour ce brouillon"""
+        state = self._drafts.pop(draft_id, None) if draft_id else None
+        if state is None:
+            return
+        state.generation += 1
+        for task in (state.timer, state.running):
+            if task and not task.done():
+                task.cancel()
+
+    def lookup(self, text: str, source_language: str, target_language: str, model_type: str) -> Optional[Dict]:
+        """Traduction du brouillon correspondant exactement au texte envoyé"""
+        key = self._cache_key(text, source_language, target_language, model_type)
+        cached = self._cache.get(key)
+        if cached is None or time.time() - cached[1] > self.cache_ttl:
+            self.stats['cache_misses'] += 1
+            return None
+        self.stats['cache_hits'] += 1
+        return cached[0]
+
+    def _store(self, key: Tuple[str, str, str, str], result: Dict):
+        self._cache[key] = (result, time.time())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _expire_drafts(self):
+        cutoff = time.time() - self.draft_ttl
+        for draft_id in [d for d, state in self._drafts.items() if state.updated_at < cutoff]:
+            self.cancel(draft_id)
+
+    async def _debounced(self, state: DraftState, generation: int):
+        await asyncio.sleep(self.debounce)
+        if state.generation != generation:
+            return
+        state.running = asyncio.create_task(self._translate_draft(state, generation))
+
+    async def _translate_draft(self, state: DraftState, generation: int):
+        request = state.request
+        text = request['text']
+        source_language = request.get('sourceLanguage', 'fr')
+        model_type = request.get('modelType', 'basic')
+        # Interrompre dès qu'une version plus récente existe ou qu'une tâche réelle arrive
+        superseded = lambda: state.generation != generation
+        cancel_check = lambda: superseded() or self.busy_check()
+
+        async with self._semaphore:
+            if superseded():
+                return
+            if self.busy_check() or self.cpu_usage() > self.max_cpu_percent:
+                self.stats['drafts_skipped_busy'] += 1
+                return
+            self.stats['drafts_started'] += 1
+            for target_language in request.get('targetLanguages', []):
+                if target_language == source_language:
+                    continue
+                key = self._cache_key(text, source_language, target_language, model_type)
+                if key in self._cache:
+                    continue
+                try:
+                    start_time = time.time()
+                    result = await self.translation_service.translate_with_structure(
+                        text=text,
+                        source_language=source_language,
+                        target_language=target_language,
+                        model_type=model_type,
+                        source_channel='draft',
+                        cancel_check=cancel_check
+                    )
+                except TranslationCancelledError:
+                    self.stats['drafts_superseded' if superseded() else 'drafts_yielded'] += 1
+                    return
+                except Exception as e:
+                    logger.debug(f"[TRANSLATOR] Traduction du brouillon {state.draft_id} échouée: {e}")
+                    return
+                # Version devenue obsolète pendant la traduction (texte court non interruptible)
+                if superseded():
+                    self.stats['drafts_superseded'] += 1
+                    return
+                if not isinstance(result, dict) or not result.get('translated_text') or 'fallback' in str(result.get('model_used', '')):
+                    return
+                self._store(key, {**result, 'processing_time': time.time() - start_time})
+                self.stats['draft_translations'] += 1
+            logger.debug(f"✏️ [TRANSLATOR] Brouillon {state.draft_id} pré-traduit ({len(request.get('targetLanguages', []))} langues)")
+
+    async def stop(self):
+        """Abandonne les brouillons en attente ou en cours"""
+        tasks: List[asyncio.Task] = []
+        for state in self._drafts.values():
+            for task in (state.timer, state.running):
+                if task and not task.done():
+                    task.cancel()
+                    tasks.append(task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._drafts = {}
+
+    def get_stats(self) -> Dict:
+        lookups = self.stats['cache_hits'] + self.stats['cache_misses']
+        return {
+            **self.stats,
+            'enabled': self.enabled,
+            'active_drafts': len(self._drafts),
+            'cache_entries': len(self._cache),
+            'cache_hit_rate': self.stats['cache_hits'] / lookups if lookups else 0.0,
+            'debounce_ms': self.debounce * 1000,
+            'max_cpu_percent': self.max_cpu_percent
+        }
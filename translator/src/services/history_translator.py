@@ -0,0 +1,234 @@
+"""
+Traduction de l'historique d'une conversation (commande ZMQ translate_history)
+Quand un utilisateur rejoint une conversation ou change de langue, le translator charge
+lui-même les N derniers messages, ignore ceux déjà traduits et publie les autres du plus
+récent au plus ancien, avec une priorité inférieure au trafic en direct.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from .database_service import MODEL_HIERARCHY, effective_model_tier
+from utils.backfill import BackfillItem, chunked, plan_translation_work
+from utils.result_outbox import text_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryTranslator:
+    """
+    Tâches de traduction d'historique
+
+    - Une seule tâche par (conversation, langue): une nouvelle demande remplace l'ancienne
+    - Lots de HISTORY_BATCH_SIZE messages traduits en parallèle, publiés dans l'ordre
+      (les plus récents d'abord)
+    - Priorité basse: chaque lot attend que les files de traduction en direct soient vides
+    - Mémoire de traduction consultée avant toute inférence
+    """
+
+    def __init__(self,
+                 translation_service,
+                 database_service,
+                 publish_result: Callable[[str, dict, str], Awaitable[None]],
+                 publish_summary: Callable[[dict, Optional[str]], Awaitable[None]],
+                 live_queue_depth: Callable[[], int],
+                 translation_memory=None):
+        self.translation_service = translation_service
+        self.database_service = database_service
+        self.publish_result = publish_result
+        self.publish_summary = publish_summary
+        self.live_queue_depth = live_queue_depth
+        self.translation_memory = translation_memory
+
+        self.default_window = int(os.getenv('HISTORY_DEFAULT_WINDOW', '50'))
+        self.max_window = int(os.getenv('HISTORY_MAX_WINDOW', '500'))
+        self.batch_size = max(1, int(os.getenv('HISTORY_BATCH_SIZE', '4')))
+        self.max_jobs = int(os.getenv('HISTORY_MAX_JOBS', '8'))
+        self.yield_interval = float(os.getenv('HISTORY_YIELD_MS', '50')) / 1000
+
+        self._jobs: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = {
+            'requests': 0,
+            'requests_rejected': 0,
+            'jobs_superseded': 0,
+            'messages_loaded': 0,
+            'messages_skipped': 0,
+            'messages_translated': 0,
+            'memory_hits': 0,
+            'failures': 0,
+            'live_yields': 0,
+            'avg_time_to_first_result': 0.0,
+            'jobs_completed': 0
+        }
+
+    def submit(self, request: Dict, reply_topic: Optional[str] = None) -> bool:
+        """Démarre la traduction de l'historique demandée (remplace la tâche en cours)"""
+        conversation_id = request.get('conversationId')
+        target_language = request.get('targetLanguage')
+        if not conversation_id or not target_language or self.translation_service is None:
+            self.stats['requests_rejected'] += 1
+            logger.warning(f"⚠️ [TRANSLATOR] translate_history invalide: {request}")
+            return False
+        if not self.database_service.is_db_connected():
+            self.stats['requests_rejected'] += 1
+            logger.warning("⚠️ [TRANSLATOR] translate_history ignorée: base de données non connectée")
+            return False
+
+        key = (conversation_id, target_language)
+        previous = self._jobs.pop(key, None)
+        if previous and not previous.done():
+            previous.cancel()
+            self.stats['jobs_superseded'] += 1
+        if len(self._jobs) >= self.max_jobs:
+            self.stats['requests_rejected'] += 1
+            logger.warning(f"⚠️ [TRANSLATOR] translate_history rejetée: {self.max_jobs} historiques déjà en cours")
+            return False
+
+        self.stats['requests'] += 1
+        window = min(self.max_window, int(request.get('window') or self.default_window))
+        job = asyncio.create_task(self._run(request, window, reply_topic))
+        self._jobs[key] = job
+        job.add_done_callback(lambda done: self._jobs.pop(key, None) if self._jobs.get(key) is done else None)
+        return True
+
+    async def _wait_for_live_traffic(self):
+        """Priorité basse: laisser passer les tâches en direct en file"""
+        while self.live_queue_depth() > 0:
+            self.stats['live_yields'] += 1
+            await asyncio.sleep(self.yield_interval)
+
+    async def _run(self, request: Dict, window: int, reply_topic: Optional[str]):
+        started_at = time.time()
+        request_id = request.get('requestId') or str(uuid.uuid4())
+        conversation_id = request['conversationId']
+        target_language = request['targetLanguage']
+        model_type = request.get('modelType', 'basic')
+        summary = {
+            'type': 'history_translation_completed',
+            'requestId': request_id,
+            'conversationId': conversation_id,
+            'targetLanguage': target_language,
+            'window': window,
+            'loaded': 0,
+            'skipped': 0,
+            'translated': 0,
+            'failed': 0
+        }
+        first_result_at = None
+        try:
+            # Plus récents d'abord
+            messages = await self.database_service.get_recent_messages(conversation_id, window)
+            existing = await self.database_service.get_translation_models([m['id'] for m in messages], [target_language])
+            items, skipped = plan_translation_work(messages, existing, [target_language], model_type, MODEL_HIERARCHY)
+            order = {message['id']: index for index, message in enumerate(messages)}
+            items.sort(key=lambda item: order[item.message_id])
+            summary['loaded'] = len(messages)
+            summary['skipped'] = len(messages) - len(items)
+            self.stats['messages_loaded'] += len(messages)
+            self.stats['messages_skipped'] += summary['skipped']
+
+            for batch in chunked(items, self.batch_size):
+                await self._wait_for_live_traffic()
+                results = await asyncio.gather(*(self._translate(item, model_type) for item in batch))
+                # Publication dans l'ordre du lot (du plus récent au plus ancien)
+                for item, result in zip(batch, results):
+                    if result is None:
+                        summary['failed'] += 1
+                        continue
+                    if first_result_at is None:
+                        first_result_at = time.time()
+                        self._record_time_to_first_result(first_result_at - started_at)
+                    await self.publish_result(request_id, {
+                        'messageId': item.message_id,
+                        'translatedText': result['translated_text'],
+                        'sourceLanguage': item.source_language,
+                        'targetLanguage': target_language,
+                        'confidenceScore': result.get('confidence', 0.9),
+                        'processingTime': result.get('processing_time', 0.0),
+                        'modelType': result['model_type'],
+                        'workerName': 'history',
+                        'poolType': 'normal',
+                        'created_at': started_at,
+                        'conversationId': conversation_id,
+                        'replyTopic': reply_topic,
+                        'textHash': text_fingerprint(item.text),
+                        'historyRequestId': request_id,
+                        'fromMemory': result.get('from_memory', False)
+                    }, target_language)
+                    summary['translated'] += 1
+
+            self.stats['messages_translated'] += summary['translated']
+            self.stats['failures'] += summary['failed']
+            self.stats['jobs_completed'] += 1
+            summary['elapsed'] = time.time() - started_at
+            summary['timeToFirstResult'] = first_result_at - started_at if first_result_at else None
+            await self.publish_summary(summary, reply_topic)
+            logger.info(f"📜 [TRANSLATOR] Historique {conversation_id} -> {target_language}: {summary['translated']} traduit(s), "
+                        f"{summary['skipped']} déjà traduit(s) en {summary['elapsed']:.2f}s")
+        except asyncio.CancelledError:
+            logger.info(f"🚫 [TRANSLATOR] Historique {conversation_id} -> {target_language} remplacé ou arrêté")
+            raise
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR] Erreur traduction de l'historique {conversation_id}: {e}")
+
+    async def _translate(self, item: BackfillItem, model_type: str) -> Optional[Dict]:
+        if self.translation_memory:
+            found = await self.translation_memory.lookup(
+                item.text, item.source_language, [item.target_language], model_type, item.message_id
+            )
+            entry = found.get(item.target_language)
+            if entry:
+                self.stats['memory_hits'] += 1
+                return {
+                    'translated_text': entry['translatedContent'],
+                    'confidence': entry.get('confidenceScore') or 0.9,
+                    'model_type': effective_model_tier(entry.get('translationModel'), model_type),
+                    'from_memory': True
+                }
+        start_time = time.time()
+        try:
+            result = await self.translation_service.translate_with_structure(
+                text=item.text,
+                source_language=item.source_language,
+                target_language=item.target_language,
+                model_type=model_type,
+                source_channel='history'
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ [TRANSLATOR] Historique: traduction de {item.message_id} échouée: {e}")
+            return None
+        if not isinstance(result, dict) or not result.get('translated_text') or 'fallback' in str(result.get('model_used', '')):
+            return None
+        # Niveau du modèle réellement utilisé (le service peut en retenir un autre que celui demandé)
+        used_tier = effective_model_tier(result.get('model_used'), model_type)
+        if self.translation_memory:
+            await self.translation_memory.remember(
+                item.text, item.source_language, item.target_language, used_tier,
+                result['translated_text'], result.get('confidence'), item.message_id
+            )
+        return {**result, 'model_type': used_tier, 'processing_time': time.time() - start_time}
+
+    def _record_time_to_first_result(self, delay: float):
+        completed = self.stats['jobs_completed']
+        self.stats['avg_time_to_first_result'] = (
+            (self.stats['avg_time_to_first_result'] * completed + delay) / (completed + 1)
+        )
+
+    async def stop(self):
+        jobs = [job for job in self._jobs.values() if not job.done()]
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+        self._jobs = {}
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'active_jobs': len(self._jobs),
+            'batch_size': self.batch_size,
+            'max_window': self.max_window
+        }
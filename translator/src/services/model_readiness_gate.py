@@ -0,0 +1,217 @@
+"""
+Porte de disponibilité des modèles pour l'entrée ZMQ
+Retient les tâches arrivées pendant le chargement des modèles au lieu de les
+traduire en fallback (résultats [FALLBACK-…] rejetés, travail perdu)
+Les tâches retenues sont journalisées: elles survivent à un redémarrage pendant le chargement
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from dataclasses import asdict
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pool du journal des tâches retenues (jamais remontées par le pool manager)
+HELD_POOL = 'held'
+
+
+class ModelReadinessGate:
+    """
+    Retient les tâches jusqu'à ce que le niveau de modèle demandé soit chargé
+
+    - Une file par niveau (basic/medium/premium), ordonnée par (priorité, arrivée)
+    - Les tâches sont libérées dès que leur niveau est prêt, ou à la fin du chargement
+      si au moins un modèle est disponible (sélection automatique du modèle)
+    - Budget borné: nombre de tâches retenues et durée d'attente maximale
+    - Échec rapide (translation_error) uniquement si le chargement échoue
+    - Journal (optionnel): tâche journalisée à l'entrée, checkpoint à sa sortie
+      (libérée, échouée ou expirée), reprise par restore() au redémarrage
+    """
+
+    def __init__(self,
+                 translation_service,
+                 release_callback: Callable[..., Awaitable[None]],
+                 fail_callback: Callable[..., Awaitable[None]],
+                 journal=None):
+        self.translation_service = translation_service
+        self.release_callback = release_callback
+        self.fail_callback = fail_callback
+        self.journal = journal
+
+        self.enabled = (
+            translation_service is not None
+            and hasattr(translation_service, 'model_ready_events')
+            and os.getenv('READINESS_GATE_ENABLED', 'true').lower() == 'true'
+        )
+        self.max_held_tasks = int(os.getenv('READINESS_GATE_MAX_TASKS', '1000'))
+        self.hold_timeout = float(os.getenv('READINESS_GATE_TIMEOUT', '600'))
+
+        # Niveau -> tas de (priorité, séquence, tâche)
+        self._held: Dict[str, List[Tuple[int, int, object]]] = {}
+        self._sequence = itertools.count()
+        self._tasks: List[asyncio.Task] = []
+
+        self.stats = {
+            'tasks_held': 0,
+            'tasks_released': 0,
+            'tasks_failed': 0,
+            'tasks_timed_out': 0,
+            'budget_rejections': 0,
+            'tasks_restored': 0,
+            'max_hold_time': 0.0
+        }
+
+    @property
+    def held_count(self) -> int:
+        return sum(len(queue) for queue in self._held.values())
+
+    def should_hold(self, task) -> bool:
+        """Vrai si le modèle demandé par la tâche est encore en cours de chargement"""
+        if not self.enabled:
+            return False
+        service = self.translation_service
+        if service.loading_complete.is_set():
+            return False
+        return not service.is_model_ready(task.model_type)
+
+    def hold(self, task) -> bool:
+        """Retient une tâche, retourne False si le budget est épuisé"""
+        if self.held_count >= self.max_held_tasks:
+            self.stats['budget_rejections'] += 1
+            return False
+        if self.journal and not self.journal.append(asdict(task), HELD_POOL):
+            self.stats['budget_rejections'] += 1
+            logger.warning(f"⚠️ [TRANSLATOR] Journal plein, tâche {task.task_id} non retenue")
+            return False
+        queue = self._held.setdefault(task.model_type, [])
+        heapq.heappush(queue, (getattr(task, 'priority', 1), next(self._sequence), task))
+        self.stats['tasks_held'] += 1
+        logger.info(f"⏳ [TRANSLATOR] Tâche {task.task_id} retenue: modèle {task.model_type} en cours de chargement ({self.held_count} en attente)")
+        return True
+
+    async def restore(self, task_factory: Callable[..., object]) -> int:
+        """
+        Reprend les tâches retenues lors de l'arrêt précédent (après le rejeu du journal)
+
+        Retenues à nouveau si leur modèle charge encore, sinon libérées tout de suite.
+        """
+        if not self.journal:
+            return 0
+        # Lecture SQLite bloquante: hors de la boucle asyncio
+        loop = asyncio.get_running_loop()
+        payloads = await loop.run_in_executor(
+            None, self.journal.pull_spilled, HELD_POOL, self.journal.spilled_count(HELD_POOL)
+        )
+        for payload in payloads:
+            task = task_factory(**payload)
+            self.stats['tasks_restored'] += 1
+            if self.should_hold(task) and self.hold(task):
+                continue
+            self._checkpoint(task)
+            await self.release_callback(task)
+        if payloads:
+            logger.info(f"💾 [TRANSLATOR] {len(payloads)} tâche(s) retenue(s) reprise(s) depuis le journal")
+        return len(payloads)
+
+    def start(self) -> List[asyncio.Task]:
+        """Démarre la surveillance des événements de disponibilité"""
+        if not self.enabled or self._tasks:
+            return self._tasks
+        service = self.translation_service
+        for model_type, event in service.model_ready_events.items():
+            self._tasks.append(asyncio.create_task(self._release_on_ready(model_type, event)))
+        self._tasks.append(asyncio.create_task(self._release_on_complete()))
+        self._tasks.append(asyncio.create_task(self._expire_loop()))
+        return self._tasks
+
+    async def stop(self):
+        """Arrête la surveillance (les tâches encore retenues restent dans le journal)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _release_on_ready(self, model_type: str, event: asyncio.Event):
+        await event.wait()
+        logger.info(f"✅ [TRANSLATOR] Modèle {model_type} prêt, libération des tâches en attente")
+        await self._release(model_type)
+
+    async def _release_on_complete(self):
+        """Fin du chargement: libérer le reste si un modèle existe, sinon échouer"""
+        service = self.translation_service
+        await service.loading_complete.wait()
+        if service.models:
+            for model_type in list(self._held):
+                await self._release(model_type)
+        else:
+            errors = service.model_load_errors
+            reason = '; '.join(f"{k}: {v}" for k, v in errors.items()) or 'no model loaded'
+            for model_type in list(self._held):
+                await self._fail_all(model_type, f"model loading failed ({reason})")
+
+    async def _expire_loop(self):
+        """Échoue les tâches retenues au-delà du délai maximal"""
+        while True:
+            await asyncio.sleep(5)
+            if self.translation_service.loading_complete.is_set() and not self.held_count:
+                return
+            cutoff = time.time() - self.hold_timeout
+            for model_type, queue in list(self._held.items()):
+                expired = [entry for entry in queue if entry[2].created_at < cutoff]
+                if not expired:
+                    continue
+                self._held[model_type] = [entry for entry in queue if entry[2].created_at >= cutoff]
+                heapq.heapify(self._held[model_type])
+                for _, _, task in expired:
+                    self.stats['tasks_timed_out'] += 1
+                    self._checkpoint(task)
+                    await self.fail_callback(task, f"model {model_type} still loading after {self.hold_timeout:.0f}s")
+
+    async def _release(self, model_type: str):
+        queue = self._held.pop(model_type, [])
+        released = 0
+        while queue:
+            _, _, task = heapq.heappop(queue)
+            self._record_hold_time(task)
+            # Le pool manager journalise à nouveau la tâche en l'enfilant
+            self._checkpoint(task)
+            await self.release_callback(task)
+            released += 1
+        self.stats['tasks_released'] += released
+        if released:
+            logger.info(f"🚀 [TRANSLATOR] {released} tâche(s) {model_type} libérée(s) par ordre de priorité")
+
+    async def _fail_all(self, model_type: str, reason: str):
+        queue = self._held.pop(model_type, [])
+        for _, _, task in sorted(queue):
+            self.stats['tasks_failed'] += 1
+            self._checkpoint(task)
+            await self.fail_callback(task, reason)
+
+    def _checkpoint(self, task):
+        if not self.journal:
+            return
+        try:
+            self.journal.checkpoint(task.task_id)
+        except Exception as e:
+            logger.error(f"❌ [TRANSLATOR] Erreur journal pour la tâche retenue {task.task_id}: {e}")
+
+    def _record_hold_time(self, task):
+        self.stats['max_hold_time'] = max(self.stats['max_hold_time'], time.time() - task.created_at)
+
+    def get_stats(self) -> Dict:
+        """Statistiques de la porte de disponibilité"""
+        stats = {
+            **self.stats,
+            'enabled': self.enabled,
+            'held_now': self.held_count,
+            'held_by_model': {model_type: len(queue) for model_type, queue in self._held.items()}
+        }
+        if self.enabled:
+            stats['readiness'] = self.translation_service.get_readiness()
+        return stats
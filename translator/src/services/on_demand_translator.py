@@ -0,0 +1,260 @@
+"""
+Traduction à la lecture (commande ZMQ get_or_translate, route REST /translate/on-demand)
+Les langues cibles sans lecteur actif ne sont pas traduites à l'envoi du message: elles
+le sont à la première lecture, en relisant d'abord la base, puis en traduisant tout de
+suite, hors des files FIFO (un lecteur attend la réponse).
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .database_service import MODEL_HIERARCHY
+from utils.result_outbox import text_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class OnDemandTranslator:
+    """
+    Langues différées et traductions à la demande
+
+    - defer(): langues retirées d'une tâche faute de lecteur actif (comptées, suivies)
+    - get_or_translate(): traduction en base de niveau suffisant, sinon mémoire de
+      traduction, sinon inférence immédiate (au plus ON_DEMAND_CONCURRENCY à la fois)
+    - Demandes simultanées pour le même message et la même langue: une seule traduction
+    - Priorité haute: tant qu'une traduction à la demande est en cours, brouillons et
+      historiques attendent (voir `active`)
+    """
+
+    def __init__(self,
+                 translation_service,
+                 database_service,
+                 publish_result: Callable[[str, dict, str], Awaitable[None]],
+                 persist_result: Callable[[dict], Awaitable[None]],
+                 translation_memory=None):
+        self.translation_service = translation_service
+        self.database_service = database_service
+        self.publish_result = publish_result
+        self.persist_result = persist_result
+        self.translation_memory = translation_memory
+
+        self.max_concurrency = max(1, int(os.getenv('ON_DEMAND_CONCURRENCY', '4')))
+        self.tracked_limit = int(os.getenv('LAZY_TRACKED_TARGETS', '100000'))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self._requests: set = set()
+        # (message, langue) différés: longueur du texte, pour savoir lesquels ont été lus ensuite
+        self._deferred: OrderedDict = OrderedDict()
+        self._latencies = deque(maxlen=1000)
+        self.stats = {
+            'targets_deferred': 0,
+            'chars_deferred': 0,
+            'deferred_requested': 0,
+            'chars_requested': 0,
+            'requests': 0,
+            'database_hits': 0,
+            'memory_hits': 0,
+            'translated': 0,
+            'coalesced': 0,
+            'not_found': 0,
+            'failures': 0
+        }
+
+    @property
+    def active(self) -> int:
+        """Traductions à la demande en cours"""
+        return len(self._inflight)
+
+    def defer(self, message_id: str, text: str, languages: List[str]):
+        """Enregistre les langues non traduites à l'envoi (aucun lecteur actif)"""
+        self.stats['targets_deferred'] += len(languages)
+        self.stats['chars_deferred'] += len(text) * len(languages)
+        for language in languages:
+            self._deferred[(message_id, language)] = len(text)
+        while len(self._deferred) > self.tracked_limit:
+            self._deferred.popitem(last=False)
+
+    def submit(self, request: Dict, reply_topic: Optional[str] = None) -> bool:
+        """Commande ZMQ: résout la demande en tâche de fond, puis publie le résultat"""
+        if not request.get('messageId') or not request.get('targetLanguage'):
+            self.stats['failures'] += 1
+            logger.warning(f"⚠️ [TRANSLATOR] get_or_translate invalide: {request}")
+            return False
+        job = asyncio.create_task(self._serve(request, reply_topic))
+        self._requests.add(job)
+        job.add_done_callback(self._requests.discard)
+        return True
+
+    async def _serve(self, request: Dict, reply_topic: Optional[str]):
+        request_id = request.get('requestId') or str(uuid.uuid4())
+        try:
+            result = await self._resolve(
+                request['messageId'], request['targetLanguage'], request.get('modelType', 'basic'),
+                request.get('text'), request.get('sourceLanguage')
+            )
+            if result is None:
+                return
+            # La publication sauvegarde aussi les nouvelles traductions
+            await self.publish_result(request_id, {
+                **result,
+                'conversationId': request.get('conversationId') or result.get('conversationId') or 'unknown',
+                'replyTopic': reply_topic,
+                'onDemandRequestId': request_id
+            }, result['targetLanguage'])
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.error(f"❌ [TRANSLATOR] get_or_translate {request.get('messageId')} -> {request.get('targetLanguage')}: {e}")
+
+    async def get_or_translate(self, message_id: str, target_language: str, model_type: str = 'basic',
+                               text: Optional[str] = None, source_language: Optional[str] = None) -> Optional[Dict]:
+        """Route REST: traduction existante ou calculée maintenant (sauvegardée), None si impossible"""
+        result = await self._resolve(message_id, target_language, model_type, text, source_language)
+        if result and not result.get('fromDatabase'):
+            await self.persist_result(result)
+        return result
+
+    async def _resolve(self, message_id: str, target_language: str, model_type: str,
+                       text: Optional[str], source_language: Optional[str]) -> Optional[Dict]:
+        started_at = time.time()
+        self.stats['requests'] += 1
+        deferred_length = self._deferred.pop((message_id, target_language), None)
+        if deferred_length is not None:
+            self.stats['deferred_requested'] += 1
+            self.stats['chars_requested'] += deferred_length
+
+        existing = await self.database_service.get_translation(message_id, target_language)
+        if (existing and existing.get('translatedText')
+                and MODEL_HIERARCHY.get(existing.get('translatorModel'), 1) >= MODEL_HIERARCHY.get(model_type, 1)):
+            self.stats['database_hits'] += 1
+            self._record_latency(started_at)
+            return {
+                'messageId': message_id,
+                'targetLanguage': target_language,
+                'translatedText': existing['translatedText'],
+                'sourceLanguage': existing.get('sourceLanguage') or source_language,
+                'confidenceScore': existing.get('confidenceScore') or 0.9,
+                'modelType': existing.get('translatorModel', model_type),
+                'processingTime': time.time() - started_at,
+                'workerName': 'on_demand',
+                'poolType': 'normal',
+                'created_at': started_at,
+                'fromDatabase': True
+            }
+
+        key = (message_id, target_language, model_type)
+        job = self._inflight.get(key)
+        if job is not None:
+            self.stats['coalesced'] += 1
+        else:
+            job = asyncio.create_task(self._translate(message_id, target_language, model_type, text, source_language, started_at))
+            self._inflight[key] = job
+            job.add_done_callback(lambda done: self._inflight.pop(key, None) if self._inflight.get(key) is done else None)
+        result = await asyncio.shield(job)
+        if result is not None:
+            self._record_latency(started_at)
+        return result
+
+    async def _translate(self, message_id: str, target_language: str, model_type: str,
+                         text: Optional[str], source_language: Optional[str], started_at: float) -> Optional[Dict]:
+        conversation_id = None
+        if text is None:
+            message = await self.database_service.get_message(message_id)
+            if not message:
+                self.stats['not_found'] += 1
+                logger.warning(f"⚠️ [TRANSLATOR] get_or_translate: message {message_id} introuvable")
+                return None
+            text = message['content']
+            source_language = source_language or message['originalLanguage']
+            conversation_id = message['conversationId']
+        source_language = source_language or 'auto'
+
+        result = {
+            'messageId': message_id,
+            'targetLanguage': target_language,
+            'sourceLanguage': source_language,
+            'workerName': 'on_demand',
+            'poolType': 'normal',
+            'created_at': started_at,
+            'textHash': text_fingerprint(text),
+            'conversationId': conversation_id
+        }
+        if self.translation_memory:
+            found = await self.translation_memory.lookup(text, source_language, [target_language], model_type, message_id)
+            entry = found.get(target_language)
+            if entry:
+                self.stats['memory_hits'] += 1
+                return {
+                    **result,
+                    'translatedText': entry['translatedContent'],
+                    'confidenceScore': entry.get('confidenceScore') or 0.9,
+                    'modelType': entry.get('translationModel', model_type),
+                    'processingTime': time.time() - started_at,
+                    'fromMemory': True
+                }
+
+        if self.translation_service is None:
+            self.stats['failures'] += 1
+            return None
+        try:
+            async with self._semaphore:
+                translation = await self.translation_service.translate_with_structure(
+                    text=text,
+                    source_language=source_language,
+                    target_language=target_language,
+                    model_type=model_type,
+                    source_channel='on_demand'
+                )
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.warning(f"⚠️ [TRANSLATOR] get_or_translate: traduction de {message_id} -> {target_language} échouée: {e}")
+            return None
+        if (not isinstance(translation, dict) or not translation.get('translated_text')
+                or 'fallback' in str(translation.get('model_used', ''))):
+            self.stats['failures'] += 1
+            return None
+
+        self.stats['translated'] += 1
+        if self.translation_memory:
+            await self.translation_memory.remember(
+                text, source_language, target_language, model_type,
+                translation['translated_text'], translation.get('confidence'), message_id
+            )
+        return {
+            **result,
+            'sourceLanguage': translation.get('detected_language', source_language),
+            'translatedText': translation['translated_text'],
+            'confidenceScore': translation.get('confidence', 0.9),
+            'modelType': model_type,
+            'processingTime': time.time() - started_at
+        }
+
+    def _record_latency(self, started_at: float):
+        self._latencies.append((time.time() - started_at) * 1000)
+
+    async def stop(self):
+        jobs = [job for job in list(self._requests) + list(self._inflight.values()) if not job.done()]
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+        self._requests = set()
+        self._inflight = {}
+
+    def get_stats(self) -> Dict:
+        latencies = sorted(self._latencies)
+        return {
+            **self.stats,
+            # Traductions différées jamais demandées depuis: calcul évité à l'envoi
+            'eager_translations_avoided': self.stats['targets_deferred'] - self.stats['deferred_requested'],
+            'eager_chars_avoided': self.stats['chars_deferred'] - self.stats['chars_requested'],
+            # Délai demande -> traduction disponible (1000 dernières demandes)
+            'avg_latency_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50_latency_ms': latencies[len(latencies) // 2] if latencies else 0.0,
+            'p95_latency_ms': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            'active': self.active,
+            'max_concurrency': self.max_concurrency
+        }
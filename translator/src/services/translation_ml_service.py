@@ -8,7 +8,7 @@ import logging
 import time
 import asyncio
 import re
-from typing import Dict, Optional, List, Any, Union
+from typing import Dict, Optional, List, Any, Union, Callable, Awaitable
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
 import threading
@@ -44,6 +44,10 @@ print(f"🔧 [ML-SERVICE] Variables HuggingFace définies: {_settings.models_pat
 
 # Import du module de segmentation pour préservation de structure
 from utils.text_segmentation import TextSegmenter
+from utils.incremental_translation import line_texts, plan_segment_reuse
+
+# Voies d'inférence par niveau de modèle (topologie CPU / quota cgroup)
+from utils.inference_lanes import create_inference_lanes
 
 # Import des modèles ML optimisés
 try:
@@ -80,6 +84,10 @@ class TranslationResult:
     processing_time: float
     source_channel: str  # 'zmq', 'rest', 'websocket'
 
+class TranslationCancelledError(Exception):
+    """Traduction interrompue car la tâche a été annulée (message modifié ou supprimé)"""
+    pass
+
 class TranslationMLService:
     """
     Service de traduction ML unifié - Singleton
@@ -203,6 +211,15 @@ class TranslationMLService:
         self.is_loading = False
         self._startup_lock = asyncio.Lock()
         
+        # Disponibilité par modèle: un événement par niveau + fin du chargement global
+        self.model_ready_events = {model_type: asyncio.Event() for model_type in self.model_configs}
+        self.model_load_errors: Dict[str, str] = {}
+        self.loading_complete = asyncio.Event()
+
+        # Une voie d'inférence par niveau: concurrence et threads intra-op dédiés
+        # (self.executor reste réservé au chargement des modèles)
+        self.inference_lanes = create_inference_lanes(list(self.model_configs))
+        
         self._initialized = True
         self._configure_environment()
         logger.info(f"🤖 Service ML Unifié créé (Singleton) avec {max_workers} workers")
@@ -264,16 +281,19 @@ class TranslationMLService:
             
             if not ML_AVAILABLE:
                 logger.error("❌ Transformers non disponible. Service ML désactivé.")
+                self.model_load_errors = {model_type: "ML dependencies not available" for model_type in self.model_configs}
                 self.is_loading = False
+                self.loading_complete.set()
                 return False
             
             try:
                 logger.info("🚀 Initialisation du Service ML Unifié...")
                 
-                # Configuration optimale des threads PyTorch pour AMD multicore
+                # Threads PyTorch: le nombre intra-op est fixé par voie d'inférence (initialiseur
+                # de thread), le défaut global ne sert qu'au chargement des modèles
                 if ML_AVAILABLE:
-                    torch.set_num_threads(16)  # Utiliser 16 threads pour inference
-                    torch.set_num_interop_threads(2)  # 2 threads pour opérations inter-op
+                    torch.set_num_threads(max(lane.config.intra_op_threads for lane in self.inference_lanes.values()))
+                    torch.set_num_interop_threads(int(os.getenv('TORCH_INTEROP_THREADS', '2')))
                     logger.info(f"⚙️ PyTorch configuré: {torch.get_num_threads()} threads intra-op, {torch.get_num_interop_threads()} threads inter-op")
                 
                 logger.info("📚 Chargement des modèles NLLB...")
@@ -289,12 +309,14 @@ class TranslationMLService:
                         await self._load_model(model_type)
                     except Exception as e:
                         logger.error(f"❌ Erreur chargement {model_type}: {e}")
+                        self.model_load_errors[model_type] = str(e)
                         # Continuer avec les autres modèles
                 
                 # Vérifier qu'au moins un modèle est chargé
                 if not self.models:
                     logger.error("❌ Aucun modèle ML chargé")
                     self.is_loading = False
+                    self.loading_complete.set()
                     return False
                 
                 startup_time = time.time() - startup_start
@@ -302,6 +324,7 @@ class TranslationMLService:
                 self.stats['models_loaded'] = True
                 self.is_initialized = True
                 self.is_loading = False
+                self.loading_complete.set()
                 
                 logger.info(f"✅ Service ML Unifié initialisé en {startup_time:.2f}s")
                 logger.info(f"📊 Modèles chargés: {list(self.models.keys())}")
@@ -311,9 +334,28 @@ class TranslationMLService:
                 
             except Exception as e:
                 logger.error(f"❌ Erreur critique initialisation ML: {e}")
+                self.model_load_errors.setdefault('all', str(e))
                 self.is_loading = False
+                self.loading_complete.set()
                 return False
     
+    def is_model_ready(self, model_type: str) -> bool:
+        """Vérifie si un niveau de modèle est chargé et utilisable"""
+        return model_type in self.models
+    
+    def get_readiness(self) -> Dict[str, Any]:
+        """État de disponibilité par niveau de modèle"""
+        return {
+            'loading_complete': self.loading_complete.is_set(),
+            'models': {
+                model_type: 'ready' if model_type in self.models else (
+                    'failed' if model_type in self.model_load_errors else 'loading'
+                )
+                for model_type in self.model_configs
+            },
+            'errors': dict(self.model_load_errors)
+        }
+    
     def _get_thread_local_tokenizer(self, model_type: str) -> Optional[AutoTokenizer]:
         """Obtient ou crée un tokenizer pour le thread actuel (évite 'Already borrowed')"""
         import threading
@@ -401,6 +443,8 @@ class TranslationMLService:
         if model and tokenizer:
             self.tokenizers[model_type] = tokenizer
             self.models[model_type] = model
+            # Signaler la disponibilité de ce niveau (libère les tâches en attente)
+            self.model_ready_events[model_type].set()
             logger.info(f"✅ Modèle {model_type} chargé: {model_name}")
             if local_path.exists():
                 logger.info(f"📁 Modèle disponible en local: {local_path}")
@@ -465,7 +509,10 @@ class TranslationMLService:
 
     async def translate_with_structure(self, text: str, source_language: str = "auto",
                                       target_language: str = "en", model_type: str = "basic",
-                                      source_channel: str = "unknown") -> Dict[str, Any]:
+                                      source_channel: str = "unknown",
+                                      cancel_check: Optional[Callable[[], bool]] = None,
+                                      segment_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+                                      previous_segments: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
         """
         Traduction avec préservation de structure (paragraphes, emojis, sauts de ligne)
 
@@ -473,6 +520,19 @@ class TranslationMLService:
         puis réassemble en préservant la structure originale
 
         AMÉLIORATION: Sélection automatique du modèle selon la longueur du texte
+
+        cancel_check: callable optionnel vérifié entre chaque segment; s'il retourne True
+        la traduction est interrompue avec TranslationCancelledError
+
+        segment_callback: coroutine optionnelle appelée au fil de la traduction avec des
+        fragments ordonnés (chunkIndex, segments, text emojis restaurés, final); la
+        concaténation des fragments donne le texte final. Un texte simple (non segmenté)
+        n'appelle pas le callback: seul le résultat complet est disponible.
+
+        previous_segments: lignes source et traduites du texte précédent d'un message
+        modifié ({'source': [...], 'translated': [...]}); les lignes inchangées reprennent
+        leur traduction, seules les lignes modifiées sont traduites. Le résultat contient
+        toujours source_segments/translated_segments (à enregistrer) et segments_reused.
         """
         start_time = time.time()
 
@@ -481,6 +541,9 @@ class TranslationMLService:
             if not text.strip():
                 raise ValueError("Text cannot be empty")
 
+            if cancel_check and cancel_check():
+                raise TranslationCancelledError("Traduction annulée avant démarrage")
+
             # AMÉLIORATION: Sélection automatique du modèle selon la longueur
             # - Textes < 50 chars: basic (rapide)
             # - Textes >= 50 chars: medium (meilleure qualité)
@@ -502,7 +565,8 @@ class TranslationMLService:
                 logger.info(f"[STRUCTURED] Model switched: {original_model_type} → {model_type}")
 
             # Vérifier si le texte est court et sans structure complexe
-            if len(text) <= 100 and '\n\n' not in text and not self.text_segmenter.extract_emojis(text)[1]:
+            # (un message modifié passe par la segmentation pour réutiliser ses lignes)
+            if not previous_segments and len(text) <= 100 and '\n\n' not in text and not self.text_segmenter.extract_emojis(text)[1]:
                 # Texte simple, utiliser la traduction standard
                 logger.debug(f"[STRUCTURED] Text is simple, using standard translation")
                 return await self.translate(text, source_language, target_language, model_type, source_channel)
@@ -530,6 +594,13 @@ class TranslationMLService:
             segments, emojis_map = self.text_segmenter.segment_text(text)
             logger.info(f"[STRUCTURED] Text segmented into {len(segments)} parts with {len(emojis_map)} emojis")
 
+            # Message modifié: lignes inchangées reprises de la traduction enregistrée
+            source_lines = line_texts(self.text_segmenter, segments, emojis_map)
+            reused_lines = {}
+            if previous_segments:
+                reused_lines = plan_segment_reuse(previous_segments.get('source'), previous_segments.get('translated'), source_lines)
+                logger.info(f"[STRUCTURED] Edited text: {len(reused_lines)}/{len(source_lines)} lines reused")
+
             # XXX: PARALLÉLISATION OPPORTUNITÉ #1 - Traduction de segments indépendants
             # TODO: Les segments sont INDÉPENDANTS les uns des autres après segmentation
             # TODO: Chaque paragraphe/ligne peut être traduit en PARALLÈLE avec asyncio.gather()
@@ -553,8 +624,20 @@ class TranslationMLService:
             # 2. Traduire chaque segment (lignes uniquement, les séparateurs et code sont préservés)
             # XXX: ACTUELLEMENT SÉQUENTIEL - voir TODO ci-dessus pour parallélisation
             translated_segments = []
+            chunk_index = 0
+            emitted = 0
+            line_position = -1
             for segment in segments:
                 segment_type = segment['type']
+                if segment_type == 'line':
+                    line_position += 1
+
+                # Publication progressive: la ligne précédente et ses séparateurs forment
+                # un fragment, envoyé avant de traduire la ligne suivante
+                if segment_callback and segment_type == 'line' and emitted < len(translated_segments):
+                    await self._emit_fragment(segment_callback, translated_segments[emitted:], emojis_map, chunk_index, False)
+                    chunk_index += 1
+                    emitted = len(translated_segments)
 
                 # Préserver les séparateurs, lignes vides et blocs de code
                 if segment_type in ['paragraph_break', 'separator', 'empty_line', 'code']:
@@ -563,6 +646,15 @@ class TranslationMLService:
                         logger.debug(f"[STRUCTURED] Code block preserved (not translated): {segment['text'][:50]}...")
                     continue
 
+                # Ligne inchangée d'un message modifié (emojis déjà restaurés)
+                if line_position in reused_lines:
+                    translated_segments.append({**segment, 'text': reused_lines[line_position]})
+                    continue
+
+                # Annulation coopérative entre deux segments
+                if cancel_check and cancel_check():
+                    raise TranslationCancelledError(f"Traduction annulée au segment {segment['index']}/{len(segments)}")
+
                 # Traduire uniquement les lignes de texte normal
                 if segment_type == 'line':
                     segment_text = segment['text']
@@ -676,8 +768,14 @@ class TranslationMLService:
                         # Texte vide (ne devrait pas arriver)
                         translated_segments.append(segment)
 
-            # 3. Réassembler le texte traduit
-            final_text = self.text_segmenter.reassemble_text(translated_segments, emojis_map)
+            # 3. Réassembler le texte traduit (les lignes réutilisées n'ont plus de marqueurs
+            # d'emojis: restauration sans contrôle des marqueurs manquants)
+            if reused_lines:
+                final_text = self.text_segmenter.reassemble_fragment(translated_segments, emojis_map)
+            else:
+                final_text = self.text_segmenter.reassemble_text(translated_segments, emojis_map)
+            if segment_callback:
+                await self._emit_fragment(segment_callback, translated_segments[emitted:], emojis_map, chunk_index, True)
 
             processing_time = time.time() - start_time
             self._update_stats(processing_time, source_channel)
@@ -691,17 +789,37 @@ class TranslationMLService:
                 'processing_time': processing_time,
                 'source_channel': source_channel,
                 'segments_count': len(segments),
-                'emojis_count': len(emojis_map)
+                'emojis_count': len(emojis_map),
+                # Lignes source/traduites alignées, pour une future modification du message
+                'source_segments': source_lines,
+                'translated_segments': line_texts(self.text_segmenter, translated_segments, emojis_map),
+                'segments_reused': len(reused_lines)
             }
 
             logger.info(f"✅ [ML-STRUCTURED-{source_channel.upper()}] {len(text)}→{len(final_text)} chars, {len(segments)} segments, {len(emojis_map)} emojis ({processing_time:.3f}s)")
             return result
 
+        except TranslationCancelledError:
+            raise
         except Exception as e:
             logger.error(f"❌ Erreur traduction structurée [{source_channel}]: {e}")
             # Fallback vers traduction standard en cas d'erreur
             return await self.translate(text, source_language, target_language, model_type, source_channel)
 
+    async def _emit_fragment(self, segment_callback, fragment_segments: List[Dict], emojis_map: Dict[int, str],
+                             chunk_index: int, final: bool):
+        """Transmet un fragment traduit au callback de publication progressive"""
+        try:
+            await segment_callback({
+                'chunkIndex': chunk_index,
+                'segments': [fragment_segments[0]['index'], fragment_segments[-1]['index']] if fragment_segments else [],
+                'text': self.text_segmenter.reassemble_fragment(fragment_segments, emojis_map),
+                'final': final
+            })
+        except Exception as e:
+            # La publication d'un fragment ne doit jamais interrompre la traduction
+            logger.warning(f"[STRUCTURED] ⚠️ Publication du fragment {chunk_index} échouée: {e}")
+
     async def _ml_translate(self, text: str, source_lang: str, target_lang: str, model_type: str) -> str:
         """
         Traduction avec le vrai modèle ML - tokenizers thread-local pour éviter 'Already borrowed'
@@ -920,9 +1038,13 @@ class TranslationMLService:
                     logger.error(f"Erreur pipeline {original_model_name}: {e}")
                     return f"[ML-Pipeline-Error] {text}"
             
-            # Exécuter de manière asynchrone
-            loop = asyncio.get_event_loop()
-            translated = await loop.run_in_executor(self.executor, translate)
+            # Exécuter dans la voie d'inférence du niveau demandé
+            lane = self.inference_lanes.get(model_type)
+            if lane is not None:
+                translated = await lane.run(translate)
+            else:
+                loop = asyncio.get_event_loop()
+                translated = await loop.run_in_executor(self.executor, translate)
             
             return translated
             
@@ -1032,7 +1154,8 @@ class TranslationMLService:
             'startup_time': self.stats['startup_time'],
             'supported_languages': list(self.lang_codes.keys()),
             'models_path': str(self.models_path),
-            'device': self.device
+            'device': self.device,
+            'inference_lanes': {tier: lane.get_stats() for tier, lane in self.inference_lanes.items()}
         }
     
     async def get_health(self) -> Dict[str, Any]:
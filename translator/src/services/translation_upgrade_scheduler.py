@@ -0,0 +1,244 @@
+"""
+Planificateur d'amélioration des traductions en période d'inactivité
+Retraduit en arrière-plan les traductions de niveau inférieur (basic) avec un modèle supérieur
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from .database_service import MODEL_HIERARCHY, model_tier
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationUpgradeScheduler:
+    """
+    Améliore les traductions existantes uniquement quand le service est inactif
+
+    Conditions d'exécution:
+    - Les pools normal/any sont vides et aucun worker n'est actif
+    - L'usage CPU système (télémétrie du processus, dernière mesure) est sous le seuil configuré
+    - Les modèles ML sont chargés
+
+    Les traductions améliorées sont publiées (et sauvegardées) via le même chemin que
+    les traductions classiques, la hiérarchie basic < medium < premium est respectée.
+    """
+
+    def __init__(self,
+                 pool_manager,
+                 database_service,
+                 publish_callback: Callable,
+                 cpu_usage: Callable[[], float],
+                 translation_service=None):
+        self.pool_manager = pool_manager
+        self.database_service = database_service
+        self.publish_callback = publish_callback
+        self.cpu_usage = cpu_usage
+        self.translation_service = translation_service or pool_manager.translation_service
+
+        # Configuration
+        self.enabled = os.getenv('UPGRADE_SCHEDULER_ENABLED', 'true').lower() == 'true'
+        self.check_interval = float(os.getenv('UPGRADE_CHECK_INTERVAL', '30'))
+        self.cpu_threshold = float(os.getenv('UPGRADE_CPU_THRESHOLD', '30'))
+        self.batch_size = int(os.getenv('UPGRADE_BATCH_SIZE', '5'))
+        self.max_age_hours = int(os.getenv('UPGRADE_MAX_AGE_HOURS', '24'))
+        self.target_model = os.getenv('UPGRADE_TARGET_MODEL', 'premium')
+
+        # Position du parcours (createdAt, id): chaque exécution reprend après les lignes
+        # déjà examinées, jusqu'au bout de la fenêtre UPGRADE_MAX_AGE_HOURS
+        self._cursor = None
+        # Traductions déjà tentées (évite de retraiter les mêmes lignes au parcours suivant)
+        self._attempted: "OrderedDict[tuple, float]" = OrderedDict()
+        self._attempted_max = 10000
+
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'runs': 0,
+            'idle_checks_skipped': 0,
+            'candidates_scanned': 0,
+            'upgrades_completed': 0,
+            'upgrades_skipped': 0,
+            'upgrades_failed': 0,
+            'window_passes': 0,
+            'last_run': None
+        }
+
+    def start(self):
+        """Démarre la boucle de fond (no-op si désactivé)"""
+        if not self.enabled:
+            logger.info("[TRANSLATOR] ⏸️ Planificateur d'amélioration des traductions désactivé")
+            return None
+        if self._task is None or self._task.done():
+            self.running = True
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"[TRANSLATOR] ⬆️ Planificateur d'amélioration démarré (cible: {self.target_model}, CPU < {self.cpu_threshold}%)")
+        return self._task
+
+    async def stop(self):
+        """Arrête la boucle de fond"""
+        self.running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run_loop(self):
+        """Boucle principale: attend l'inactivité puis traite un petit lot"""
+        while self.running:
+            try:
+                await asyncio.sleep(self.check_interval)
+                if not self.is_idle():
+                    self.stats['idle_checks_skipped'] += 1
+                    continue
+                await self.run_once()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"[TRANSLATOR] ❌ Erreur dans le planificateur d'amélioration: {e}")
+
+    def is_idle(self) -> bool:
+        """Vérifie que les pools sont vides, les workers inactifs et le CPU sous le seuil"""
+        pm = self.pool_manager
+        if not pm.normal_pool.empty() or not pm.any_pool.empty():
+            return False
+        if pm.stats['normal_workers_active'] > 0 or pm.stats['any_workers_active'] > 0:
+            return False
+        return self.cpu_usage() < self.cpu_threshold
+
+    def _resolve_target_tier(self) -> Optional[str]:
+        """Retourne le meilleur modèle chargé, plafonné par UPGRADE_TARGET_MODEL"""
+        service = self.translation_service
+        if not service or not getattr(service, 'is_initialized', False):
+            return None
+        max_level = MODEL_HIERARCHY.get(self.target_model, 3)
+        loaded = [m for m in getattr(service, 'models', {}) if MODEL_HIERARCHY.get(m, 0) <= max_level]
+        if not loaded:
+            return None
+        return max(loaded, key=lambda m: MODEL_HIERARCHY.get(m, 0))
+
+    async def run_once(self) -> int:
+        """Traite un lot de traductions améliorables, retourne le nombre d'améliorations"""
+        if not self.database_service.is_db_connected():
+            return 0
+
+        target_tier = self._resolve_target_tier()
+        if target_tier is None:
+            return 0
+        target_level = MODEL_HIERARCHY[target_tier]
+        lower_models = [m for m, level in MODEL_HIERARCHY.items() if level < target_level]
+        if not lower_models:
+            return 0
+
+        self.stats['runs'] += 1
+        self.stats['last_run'] = time.time()
+
+        page, next_cursor = await self.database_service.get_upgradable_translations(
+            models=lower_models,
+            max_age_hours=self.max_age_hours,
+            limit=self.batch_size * 4,
+            before=self._cursor
+        )
+        candidates = [c for c in page if (c['messageId'], c['targetLanguage']) not in self._attempted]
+        self.stats['candidates_scanned'] += len(candidates)
+
+        upgraded = 0
+        processed = 0
+        for candidate in candidates[:self.batch_size]:
+            # Le trafic réel reste prioritaire: interrompre le lot dès qu'il reprend
+            if not self.running or not self.is_idle():
+                break
+            self._mark_attempted(candidate)
+            processed += 1
+            if await self._upgrade_translation(candidate, target_tier):
+                upgraded += 1
+
+        if processed == len(candidates):
+            # Page entièrement examinée: page suivante, ou retour aux plus récentes en fin de fenêtre
+            self._cursor = next_cursor
+            if next_cursor is None:
+                self.stats['window_passes'] += 1
+        elif processed:
+            # Lot interrompu ou limité à batch_size: reprendre après la dernière ligne tentée
+            last = candidates[processed - 1]
+            self._cursor = (last['createdAt'], last['translationId'])
+
+        if upgraded:
+            logger.info(f"[TRANSLATOR] ⬆️ {upgraded} traduction(s) améliorée(s) vers {target_tier}")
+        return upgraded
+
+    async def _upgrade_translation(self, candidate: Dict, target_tier: str) -> bool:
+        """Retraduit une traduction avec le modèle cible et publie le résultat"""
+        start_time = time.time()
+        target_language = candidate['targetLanguage']
+        try:
+            result = await self.translation_service.translate_with_structure(
+                text=candidate['sourceText'],
+                source_language=candidate['sourceLanguage'],
+                target_language=target_language,
+                model_type=target_tier,
+                source_channel='upgrade'
+            )
+            if not isinstance(result, dict) or not result.get('translated_text'):
+                self.stats['upgrades_failed'] += 1
+                return False
+
+            # translate_with_structure peut choisir un autre modèle (longueur, disponibilité)
+            model_used = result.get('model_used', '')
+            used_tier = model_tier(model_used)
+            stored_tier = model_tier(candidate['translatorModel']) or 'basic'
+            if ('fallback' in model_used or used_tier is None
+                    or MODEL_HIERARCHY[used_tier] <= MODEL_HIERARCHY[stored_tier]):
+                self.stats['upgrades_skipped'] += 1
+                return False
+
+            upgrade_result = {
+                'messageId': candidate['messageId'],
+                'translatedText': result['translated_text'],
+                'sourceLanguage': candidate['sourceLanguage'],
+                'targetLanguage': target_language,
+                'confidenceScore': result.get('confidence', 0.95),
+                'processingTime': time.time() - start_time,
+                'modelType': used_tier,
+                'workerName': 'upgrade_scheduler',
+                'poolType': 'upgrade',
+                'created_at': start_time,
+                'upgradedFrom': candidate['translatorModel'],
+                'conversationId': candidate['conversationId'],
+                'segmentsCount': result.get('segments_count', 0),
+                'emojisCount': result.get('emojis_count', 0)
+            }
+            await self.publish_callback(f"upgrade_{uuid.uuid4()}", upgrade_result, target_language)
+            self.stats['upgrades_completed'] += 1
+            return True
+
+        except Exception as e:
+            logger.error(f"[TRANSLATOR] ❌ Échec amélioration {candidate['messageId']} -> {target_language}: {e}")
+            self.stats['upgrades_failed'] += 1
+            return False
+
+    def _mark_attempted(self, candidate: Dict):
+        """Mémorise une traduction tentée (LRU borné)"""
+        key = (candidate['messageId'], candidate['targetLanguage'])
+        self._attempted[key] = time.time()
+        self._attempted.move_to_end(key)
+        while len(self._attempted) > self._attempted_max:
+            self._attempted.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        """Retourne les statistiques du planificateur"""
+        return {
+            **self.stats,
+            'enabled': self.enabled,
+            'target_model': self.target_model,
+            'cpu_threshold': self.cpu_threshold
+        }
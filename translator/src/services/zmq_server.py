@@ -6,22 +6,54 @@ Architecture: PUB/SUB + REQ/REP avec pool de connexions et traitement asynchrone
 import asyncio
 import json
 import logging
+import os
 import uuid
 import zmq
 import zmq.asyncio
 import re
-from dataclasses import dataclass
+import socket
+from dataclasses import dataclass, asdict
 from typing import Dict, List, Optional, Set
 from concurrent.futures import ThreadPoolExecutor
 import time
 import psutil
-from collections import defaultdict
+from collections import defaultdict, deque
 
 # Import du service de base de données
-from .database_service import DatabaseService
+from .database_service import DatabaseService, MODEL_HIERARCHY, effective_model_tier
+from .translation_upgrade_scheduler import TranslationUpgradeScheduler
+from .translation_ml_service import TranslationCancelledError
+from .model_readiness_gate import ModelReadinessGate
+from .draft_translator import DraftTranslator
+from .history_translator import HistoryTranslator
+from .on_demand_translator import OnDemandTranslator
+
+# Journal durable des tâches (rejeu au démarrage, débordement sur disque)
+from utils.task_journal import TaskJournal
+
+# Découpage des messages très longs en fragments traduits en parallèle
+from utils.message_sharding import plan_shards, shard_token_budget
+from utils.text_segmentation import TextSegmenter
+from utils.inference_lanes import detect_cpu_budget
+
+# Outbox des résultats publiés (acquittement et rejeu après reconnexion de la gateway)
+from utils.result_outbox import ResultOutbox, text_fingerprint
+
+# Télémétrie du processus échantillonnée en arrière-plan (lue sans coût à la publication)
+from utils.process_telemetry import ProcessTelemetry
+from utils.write_behind import WriteBehindBuffer
+from utils.translation_memory import TranslationMemory
+from utils.phrasebook import PhrasebookStore
+
+# Format de transport négocié (JSON historique ou msgpack multipart)
+from utils.wire_protocol import (
+    PROTOCOL_JSON, PROTOCOL_MSGPACK_V1, WireProtocolError, conversation_shard_topic,
+    decode_message, encode_message, is_valid_topic, negotiate_protocol, supported_protocols
+)
 
 # Import de la configuration des limites
 from config.message_limits import can_translate_message, MessageLimits
+from config.settings import get_settings
 
 # Configuration du logging
 logging.basicConfig(
@@ -30,6 +62,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Priorités des tâches (plus petit = plus prioritaire)
+TASK_PRIORITIES = {
+    'high': 0,
+    'normal': 1,
+    'low': 2
+}
+
 @dataclass
 class TranslationTask:
     """Tâche de traduction avec support multi-langues"""
@@ -41,6 +80,12 @@ class TranslationTask:
     conversation_id: str
     model_type: str = "basic"
     created_at: float = None
+    priority: int = TASK_PRIORITIES['normal']
+    reply_topic: Optional[str] = None  # Topic PUB de la gateway à l'origine de la requête
+    batch_results: bool = False  # Publier toutes les langues dans un translation_batch_completed
+    progressive: bool = False  # Publier des translation_partial au fil des segments traduits
+    read_through: bool = True  # Réutiliser les traductions déjà en base (niveau de modèle suffisant)
+    edited: bool = False  # Texte modifié: retraduire seulement les lignes changées, remplacer la traduction en base
     
     def __post_init__(self):
         if self.created_at is None:
@@ -136,6 +181,70 @@ class TranslationPoolManager:
         # Service de traduction partagé
         self.translation_service = translation_service
         
+        # Expiration et annulation des tâches (message modifié/supprimé)
+        # messageId -> timestamp d'annulation: toute tâche créée avant est abandonnée
+        self.max_queue_age = float(os.getenv('TRANSLATION_MAX_QUEUE_AGE', '300'))  # 0 = désactivé
+        self.cancellation_ttl = float(os.getenv('TRANSLATION_CANCELLATION_TTL', '3600'))
+        self.cancelled_messages: Dict[str, float] = {}
+        self.last_cancellation_cleanup = time.time()
+        
+        # Rappel optionnel à la fin de chaque tâche (retour de crédit en mode cluster)
+        self.task_done_callback = None
+        
+        # Messages très longs (> TRANSLATION_SHARD_THRESHOLD caractères, 0 = désactivé):
+        # découpés aux sauts de ligne en fragments traduits en parallèle puis réassemblés
+        self.shard_threshold = int(os.getenv('TRANSLATION_SHARD_THRESHOLD', '2000'))
+        self.shard_max_tokens = int(os.getenv('TRANSLATION_SHARD_TOKENS', '400'))
+        self.shard_parallelism = int(os.getenv('TRANSLATION_SHARD_PARALLELISM', '0')) or detect_cpu_budget()['effective_cores']
+        self.shard_retries = int(os.getenv('TRANSLATION_SHARD_RETRIES', '1'))
+        self._shard_semaphore = asyncio.Semaphore(self.shard_parallelism)
+        self.text_segmenter = TextSegmenter()
+        
+        # Lecture préalable des traductions déjà en base (messages renvoyés, requêtes répétées)
+        self.read_through_enabled = os.getenv('TRANSLATION_READ_THROUGH_ENABLED', 'true').lower() == 'true'
+        # Message modifié: lignes inchangées reprises de la traduction précédente
+        self.incremental_enabled = os.getenv('TRANSLATION_INCREMENTAL_ENABLED', 'true').lower() == 'true'
+        # Mémoire de traduction adressée par contenu (fournie par le serveur ZMQ, None = désactivée)
+        self.translation_memory = None
+        # Recueil des phrases fréquentes (scripts/build_phrasebook.py): fichier projeté en
+        # mémoire, consulté avant tout le reste, rechargé quand il est reconstruit
+        self.phrasebook = None
+        if os.getenv('PHRASEBOOK_ENABLED', 'true').lower() == 'true':
+            self.phrasebook = PhrasebookStore(
+                os.getenv('PHRASEBOOK_PATH') or os.path.join(get_settings().models_path, 'phrasebook.bin'),
+                check_interval=float(os.getenv('PHRASEBOOK_RELOAD_INTERVAL', '30'))
+            )
+        
+        # Journal durable: rejeu après redémarrage + débordement sur disque quand une pool est pleine
+        self.journal = None
+        if os.getenv('TRANSLATION_JOURNAL_ENABLED', 'true').lower() == 'true':
+            # Sous DATA_PATH par défaut: jamais relatif au répertoire courant du processus
+            journal_path = os.path.abspath(os.getenv('TRANSLATION_JOURNAL_PATH') or
+                                           os.path.join(get_settings().data_path, 'translation_journal.db'))
+            journal_dir = os.path.dirname(journal_path)
+            try:
+                os.makedirs(journal_dir, exist_ok=True)
+                writable = os.access(journal_dir, os.W_OK)
+            except OSError:
+                writable = False
+            if not writable:
+                logger.warning(f"[TRANSLATOR] ⚠️ Journal des tâches désactivé: répertoire {journal_dir} non accessible en écriture "
+                               f"(DATA_PATH ou TRANSLATION_JOURNAL_PATH); les tâches en file ne survivront pas à un redémarrage")
+            else:
+                try:
+                    self.journal = TaskJournal(
+                        journal_path,
+                        max_tasks=int(os.getenv('TRANSLATION_JOURNAL_MAX_TASKS', '100000')),
+                        compact_every=int(os.getenv('TRANSLATION_JOURNAL_COMPACT_EVERY', '5000')),
+                        flush_interval=float(os.getenv('TRANSLATION_JOURNAL_FLUSH_MS', '20')) / 1000
+                    )
+                    logger.info(f"[TRANSLATOR] 💾 Journal des tâches activé: {journal_path}")
+                except Exception as e:
+                    logger.error(f"[TRANSLATOR] ❌ Journal des tâches indisponible ({journal_path}): {e}")
+        
+        # Remplissage depuis le journal en cours par pool (lecture SQLite hors de la boucle asyncio)
+        self._refills: Dict[str, asyncio.Task] = {}
+        
         # Statistiques avancées
         self.stats = {
             'normal_pool_size': 0,
@@ -149,7 +258,26 @@ class TranslationPoolManager:
             'avg_processing_time': 0.0,
             'queue_growth_rate': 0.0,
             'worker_utilization': 0.0,
-            'dynamic_scaling_events': 0
+            'dynamic_scaling_events': 0,
+            'tasks_cancelled': 0,
+            'tasks_expired': 0,
+            'inflight_aborted': 0,
+            'results_suppressed': 0,
+            'sharded_translations': 0,
+            'shards_translated': 0,
+            'shard_failures': 0,
+            'progressive_translations': 0,
+            'partials_published': 0,
+            'avg_time_to_first_segment': 0.0,
+            'cpu_seconds_saved': 0.0,
+            'read_through_lookups': 0,
+            'read_through_lower_tier': 0,
+            'inference_calls_avoided': 0,
+            'incremental_translations': 0,
+            'segments_reused': 0,
+            'segments_translated': 0,
+            'tasks_spilled': 0,
+            'tasks_replayed': 0
         }
         
         # Workers actifs
@@ -166,21 +294,25 @@ class TranslationPoolManager:
         try:
             if task.conversation_id == "any":
                 # Pool spéciale pour conversation "any"
-                if self.any_pool.full():
-                    logger.warning(f"Pool 'any' pleine, rejet de la tâche {task.task_id}")
+                if self.any_pool.full() or self._has_spilled('any'):
+                    return self._spill_task(task, 'any')
+                
+                if self.journal and not self.journal.append(asdict(task), 'any'):
+                    logger.warning(f"Journal plein, rejet de la tâche {task.task_id}")
                     self.stats['pool_full_rejections'] += 1
                     return False
-                
                 await self.any_pool.put(task)
                 self.stats['any_pool_size'] = self.any_pool.qsize()
                 logger.info(f"Tâche {task.task_id} enfilée dans pool 'any' (taille: {self.stats['any_pool_size']})")
             else:
                 # Pool normale pour autres conversations
-                if self.normal_pool.full():
-                    logger.warning(f"Pool normale pleine, rejet de la tâche {task.task_id}")
+                if self.normal_pool.full() or self._has_spilled('normal'):
+                    return self._spill_task(task, 'normal')
+                
+                if self.journal and not self.journal.append(asdict(task), 'normal'):
+                    logger.warning(f"Journal plein, rejet de la tâche {task.task_id}")
                     self.stats['pool_full_rejections'] += 1
                     return False
-                
                 await self.normal_pool.put(task)
                 self.stats['normal_pool_size'] = self.normal_pool.qsize()
                 logger.info(f"Tâche {task.task_id} enfilée dans pool normale (taille: {self.stats['normal_pool_size']})")
@@ -191,9 +323,145 @@ class TranslationPoolManager:
             logger.error(f"Erreur lors de l'enfilage de la tâche {task.task_id}: {e}")
             return False
     
+    def _has_spilled(self, pool_name: str) -> bool:
+        """Vrai si des tâches de cette pool attendent sur disque ou y sont en cours de lecture (ordre FIFO)"""
+        if self.journal is None:
+            return False
+        return self.journal.spilled_count(pool_name) > 0 or pool_name in self._refills
+    
+    def _spill_task(self, task: TranslationTask, pool_name: str) -> bool:
+        """Déborde une tâche sur disque quand la pool en mémoire est pleine"""
+        if self.journal and self.journal.append(asdict(task), pool_name, spilled=True):
+            self.stats['tasks_spilled'] += 1
+            logger.info(f"💾 Pool '{pool_name}' pleine, tâche {task.task_id} débordée sur disque")
+            return True
+        
+        logger.warning(f"Pool '{pool_name}' pleine, rejet de la tâche {task.task_id}")
+        self.stats['pool_full_rejections'] += 1
+        return False
+    
+    def _refill_from_journal(self, pool_name: str):
+        """Remonte en mémoire les tâches débordées selon la capacité libérée (lecture en arrière-plan)"""
+        if pool_name in self._refills or not self._has_spilled(pool_name):
+            return
+        pool = self.any_pool if pool_name == 'any' else self.normal_pool
+        # Remplir par lots: attendre que la pool soit à moitié vide pour limiter les lectures disque
+        if pool.maxsize > 0 and pool.qsize() > pool.maxsize // 2:
+            return
+        free_slots = pool.maxsize - pool.qsize() if pool.maxsize > 0 else 100
+        refill = asyncio.create_task(self._pull_spilled(pool_name, pool, free_slots))
+        self._refills[pool_name] = refill
+        refill.add_done_callback(lambda done: self._refill_done(pool_name, done))
+    
+    def _refill_done(self, pool_name: str, refill: asyncio.Task):
+        """Fin d'un remplissage: relancer pour les tâches débordées pendant la lecture"""
+        self._refills.pop(pool_name, None)
+        if not refill.cancelled() and refill.result():
+            self._refill_from_journal(pool_name)
+    
+    async def _pull_spilled(self, pool_name: str, pool: asyncio.Queue, free_slots: int) -> int:
+        """
+        Lit les tâches débordées dans le thread de l'exécuteur puis les enfile
+        
+        Pendant la lecture, _has_spilled() reste vrai: les nouvelles tâches débordent à leur
+        tour, la pool ne fait que se vider et les places comptées restent libres
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            payloads = await loop.run_in_executor(None, self.journal.pull_spilled, pool_name, free_slots)
+            for payload in payloads:
+                pool.put_nowait(TranslationTask(**payload))
+            self.stats[f'{pool_name}_pool_size'] = pool.qsize()
+            return len(payloads)
+        except Exception as e:
+            logger.error(f"[TRANSLATOR] ❌ Erreur de lecture du journal pour la pool '{pool_name}': {e}")
+            return 0
+    
+    def _complete_task(self, task: TranslationTask, pool_name: str):
+        """Checkpoint d'une tâche terminée (ou abandonnée) puis remplissage depuis le disque"""
+        if self.task_done_callback:
+            self.task_done_callback(task)
+        if not self.journal:
+            return
+        try:
+            self.journal.checkpoint(task.task_id)
+            self._refill_from_journal(pool_name)
+        except Exception as e:
+            logger.error(f"[TRANSLATOR] ❌ Erreur journal pour la tâche {task.task_id}: {e}")
+    
+    def replay_journal(self) -> int:
+        """Rejoue au démarrage les tâches non terminées lors de l'arrêt précédent"""
+        if not self.journal:
+            return 0
+        pending = self.journal.replay()
+        for pool_name in ('normal', 'any'):
+            self._refill_from_journal(pool_name)
+        replayed = sum(pending.values())
+        self.stats['tasks_replayed'] += replayed
+        if replayed:
+            logger.info(f"[TRANSLATOR] 💾 {replayed} tâche(s) rejouée(s) depuis le journal: {pending}")
+        return replayed
+    
+    def cancel_message(self, message_id: str) -> float:
+        """
+        Annule toutes les tâches d'un message créées jusqu'à maintenant
+        
+        Les tâches en file sont abandonnées au moment du défilage, les traductions
+        en cours s'interrompent entre deux segments et leurs résultats ne sont pas publiés.
+        Une tâche créée après l'annulation (supersede) n'est pas concernée.
+        """
+        cancelled_at = time.time()
+        self.cancelled_messages[message_id] = cancelled_at
+        self._cleanup_cancellations()
+        return cancelled_at
+    
+    def is_task_cancelled(self, task: TranslationTask) -> bool:
+        """Vérifie si une tâche a été annulée (message modifié ou supprimé)"""
+        cancelled_at = self.cancelled_messages.get(task.message_id)
+        return cancelled_at is not None and task.created_at <= cancelled_at
+    
+    def is_task_expired(self, task: TranslationTask) -> bool:
+        """Vérifie si une tâche a dépassé l'âge maximal en file"""
+        return self.max_queue_age > 0 and (time.time() - task.created_at) > self.max_queue_age
+    
+    def _cleanup_cancellations(self):
+        """Purge les annulations plus anciennes que le TTL (au plus une fois par minute)"""
+        now = time.time()
+        if now - self.last_cancellation_cleanup < 60:
+            return
+        self.last_cancellation_cleanup = now
+        cutoff = now - self.cancellation_ttl
+        self.cancelled_messages = {
+            message_id: cancelled_at
+            for message_id, cancelled_at in self.cancelled_messages.items()
+            if cancelled_at >= cutoff
+        }
+    
+    def _estimated_task_cost(self, task: TranslationTask) -> float:
+        """Estimation du temps de calcul évité pour une tâche non traitée"""
+        return self.stats['avg_processing_time'] * max(1, len(task.target_languages))
+    
+    async def _drop_stale_task(self, task: TranslationTask, worker_name: str) -> bool:
+        """Abandonne une tâche annulée ou expirée avant traitement, retourne True si abandonnée"""
+        if self.is_task_cancelled(task):
+            self.stats['tasks_cancelled'] += 1
+            self.stats['cpu_seconds_saved'] += self._estimated_task_cost(task)
+            logger.info(f"🚫 [TRANSLATOR] Tâche {task.task_id} annulée (message {task.message_id}), ignorée par {worker_name}")
+            return True
+        
+        if self.is_task_expired(task):
+            self.stats['tasks_expired'] += 1
+            self.stats['cpu_seconds_saved'] += self._estimated_task_cost(task)
+            logger.warning(f"⌛ [TRANSLATOR] Tâche {task.task_id} expirée après {time.time() - task.created_at:.1f}s en file (max: {self.max_queue_age}s)")
+            await self._publish_task_skipped(task, 'queue_timeout')
+            return True
+        
+        return False
+    
     async def start_workers(self):
         """Démarre tous les workers avec gestion dynamique"""
         logger.info(f"[TRANSLATOR] 🔄 Début du démarrage des workers...")
+        self.replay_journal()
         self.normal_workers_running = True
         self.any_workers_running = True
         
@@ -221,8 +489,16 @@ class TranslationPoolManager:
         """Arrête tous les workers"""
         self.normal_workers_running = False
         self.any_workers_running = False
+        # Lectures du journal en cours: terminées avant sa fermeture
+        await asyncio.gather(*list(self._refills.values()), return_exceptions=True)
         logger.info("Arrêt des workers demandé")
     
+    def close_journal(self):
+        """Ferme le journal (les tâches non terminées seront rejouées au prochain démarrage)"""
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+    
     async def _dynamic_scaling_check(self):
         """Vérifie et ajuste dynamiquement le nombre de workers"""
         if not self.enable_dynamic_scaling:
@@ -309,14 +585,23 @@ class TranslationPoolManager:
                 except asyncio.TimeoutError:
                     continue
                 
+                # Abandonner les tâches annulées ou trop anciennes
+                if await self._drop_stale_task(task, worker_name):
+                    self.stats['normal_pool_size'] = self.normal_pool.qsize()
+                    self._complete_task(task, 'normal')
+                    continue
+                
                 self.stats['normal_workers_active'] += 1
                 self.stats['normal_pool_size'] = self.normal_pool.qsize()
                 
                 logger.debug(f"Worker {worker_name} traite la tâche {task.task_id} ({len(task.target_languages)} langues)")
                 
-                # Traiter la tâche
+                # Traiter la tâche (checkpoint même en cas d'échec pour ne pas la rejouer en boucle)
                 start_time = time.time()
-                await self._process_translation_task(task, worker_name)
+                try:
+                    await self._process_translation_task(task, worker_name)
+                finally:
+                    self._complete_task(task, 'normal')
                 processing_time = time.time() - start_time
                 
                 # Mettre à jour les stats de performance
@@ -351,14 +636,23 @@ class TranslationPoolManager:
                 except asyncio.TimeoutError:
                     continue
                 
+                # Abandonner les tâches annulées ou trop anciennes
+                if await self._drop_stale_task(task, worker_name):
+                    self.stats['any_pool_size'] = self.any_pool.qsize()
+                    self._complete_task(task, 'any')
+                    continue
+                
                 self.stats['any_workers_active'] += 1
                 self.stats['any_pool_size'] = self.any_pool.qsize()
                 
                 logger.debug(f"Worker {worker_name} traite la tâche {task.task_id} ({len(task.target_languages)} langues)")
                 
-                # Traiter la tâche
+                # Traiter la tâche (checkpoint même en cas d'échec pour ne pas la rejouer en boucle)
                 start_time = time.time()
-                await self._process_translation_task(task, worker_name)
+                try:
+                    await self._process_translation_task(task, worker_name)
+                finally:
+                    self._complete_task(task, 'any')
                 processing_time = time.time() - start_time
                 
                 # Mettre à jour les stats de performance
@@ -380,13 +674,33 @@ class TranslationPoolManager:
     
     async def _process_translation_task(self, task: TranslationTask, worker_name: str):
         """Traite une tâche de traduction avec traduction parallèle"""
+        processing_start = time.time()
         try:
+            # Mode lot: résultats accumulés puis publiés et sauvegardés en une fois
+            batch = [] if task.batch_results else None
+            
+            # Phrases fréquentes: recueil local, sans base ni inférence
+            target_languages = task.target_languages
+            if self.phrasebook:
+                target_languages = await self._serve_from_phrasebook(task, worker_name, batch, target_languages)
+            # Traductions déjà en base: publiées sans inférence, seules les absentes sont traduites
+            if task.read_through and self.read_through_enabled and target_languages:
+                target_languages = await self._serve_existing_translations(task, worker_name, batch, target_languages)
+            # Même contenu déjà traduit pour un autre message (transfert, copier-coller, bot)
+            if self.translation_memory and target_languages:
+                target_languages = await self._serve_from_memory(task, worker_name, batch, target_languages)
+            
+            # Message modifié: lignes source et traduites du texte précédent, par langue
+            previous = {}
+            if task.edited and self.incremental_enabled and target_languages:
+                previous = await self._previous_segments(task, target_languages)
+            
             # Lancer les traductions en parallèle
             translation_tasks = []
             
-            for target_language in task.target_languages:
+            for target_language in target_languages:
                 translation_task = asyncio.create_task(
-                    self._translate_single_language(task, target_language, worker_name)
+                    self._translate_single_language(task, target_language, worker_name, previous.get(target_language))
                 )
                 translation_tasks.append((target_language, translation_task))
             
@@ -394,38 +708,84 @@ class TranslationPoolManager:
             for target_language, translation_task in translation_tasks:
                 try:
                     result = await translation_task
-                    # Ajouter le type de pool au résultat
+                    # Message modifié/supprimé pendant la traduction: ne pas publier ni sauvegarder
+                    if self.is_task_cancelled(task):
+                        self.stats['results_suppressed'] += 1
+                        logger.info(f"🚫 [TRANSLATOR] Résultat {target_language} supprimé, tâche {task.task_id} annulée")
+                        continue
+                    # Ajouter le type de pool et le routage (topic) au résultat
                     result['poolType'] = 'any' if task.conversation_id == 'any' else 'normal'
                     result['created_at'] = task.created_at
+                    result['conversationId'] = task.conversation_id
+                    result['replyTopic'] = task.reply_topic
+                    result['textHash'] = text_fingerprint(task.text)
                     # Publier le résultat via PUB
-                    await self._publish_translation_result(task.task_id, result, target_language)
+                    if batch is not None:
+                        batch.append((result, target_language))
+                    else:
+                        await self._publish_translation_result(task.task_id, result, target_language)
                     self.stats['translations_completed'] += 1
                     
+                except TranslationCancelledError as e:
+                    self.stats['inflight_aborted'] += 1
+                    self.stats['cpu_seconds_saved'] += max(0.0, self.stats['avg_processing_time'] - (time.time() - processing_start))
+                    logger.info(f"🚫 [TRANSLATOR] Traduction {target_language} interrompue pour {task.task_id}: {e}")
                 except Exception as e:
                     logger.error(f"Erreur de traduction pour {target_language} dans {task.task_id}: {e}")
                     # Publier un résultat d'erreur
                     error_result = self._create_error_result(task, target_language, str(e))
-                    await self._publish_translation_result(task.task_id, error_result, target_language)
+                    if batch is not None:
+                        batch.append((error_result, target_language))
+                    else:
+                        await self._publish_translation_result(task.task_id, error_result, target_language)
+            
+            if batch:
+                await self._publish_translation_batch(task, batch)
             
         except Exception as e:
             logger.error(f"Erreur lors du traitement de la tâche {task.task_id}: {e}")
             self.stats['tasks_failed'] += 1
     
-    async def _translate_single_language(self, task: TranslationTask, target_language: str, worker_name: str):
+    async def _translate_single_language(self, task: TranslationTask, target_language: str, worker_name: str,
+                                         previous_segments: Optional[Dict[str, List[str]]] = None):
         """Traduit un texte vers une langue cible spécifique"""
         start_time = time.time()
         
         try:
             # Utiliser le service de traduction partagé
             if self.translation_service:
-                # Effectuer la vraie traduction avec préservation de structure (retours à la ligne, paragraphes, emojis)
-                result = await self.translation_service.translate_with_structure(
-                    text=task.text,
-                    source_language=task.source_language,
-                    target_language=target_language,
-                    model_type=task.model_type,
-                    source_channel='zmq'  # Identifier le canal source
-                )
+                # Mode progressif: fragments publiés au fil des segments (translation_partial)
+                progressive_kwargs = {}
+                first_segment_at = []
+                if task.progressive:
+                    async def on_fragment(fragment: dict):
+                        if self.is_task_cancelled(task):
+                            return
+                        if not first_segment_at:
+                            first_segment_at.append(time.time())
+                            self._record_time_to_first_segment(first_segment_at[0] - task.created_at)
+                        await self._publish_translation_partial(task, target_language, fragment)
+                    progressive_kwargs['segment_callback'] = on_fragment
+                
+                # Message modifié: les lignes inchangées ne coûtent rien, le découpage en
+                # fragments parallèles ne sert plus
+                if previous_segments:
+                    progressive_kwargs['previous_segments'] = previous_segments
+                
+                if not previous_segments and self.shard_threshold and len(task.text) > self.shard_threshold:
+                    # Message très long: fragments traduits en parallèle
+                    result = await self._translate_sharded(task, target_language, progressive_kwargs.get('segment_callback'))
+                else:
+                    # Effectuer la vraie traduction avec préservation de structure (retours à la ligne, paragraphes, emojis)
+                    result = await self.translation_service.translate_with_structure(
+                        text=task.text,
+                        source_language=task.source_language,
+                        target_language=target_language,
+                        model_type=task.model_type,
+                        source_channel='zmq',  # Identifier le canal source
+                        cancel_check=lambda: self.is_task_cancelled(task),
+                        **progressive_kwargs
+                    )
                 
                 processing_time = time.time() - start_time
                 
@@ -439,6 +799,21 @@ class TranslationPoolManager:
                     logger.error(f"❌ [TRANSLATOR] Résultat invalide pour {worker_name}: {result}")
                     raise Exception(f"Résultat de traduction invalide: {result}")
                 
+                # Niveau réellement produit (modèle de repli, repli dégradé sous charge): c'est lui
+                # qui est enregistré, pour que le planificateur d'amélioration retrouve la ligne
+                used_tier = effective_model_tier(result.get('model_used'), task.model_type)
+                
+                # Alimenter la mémoire de traduction (jamais avec un fallback ou un fragment non traduit)
+                if (self.translation_memory and 'fallback' not in str(result.get('model_used', ''))
+                        and not result.get('shard_failures')):
+                    await self.translation_memory.remember(
+                        task.text, task.source_language, target_language, used_tier,
+                        result['translated_text'], result.get('confidence'), task.message_id
+                    )
+                
+                if task.edited and 'source_segments' in result:
+                    self._record_segment_reuse(result, previous_segments)
+                
                 return {
                     'messageId': task.message_id,
                     'translatedText': result['translated_text'],
@@ -446,11 +821,18 @@ class TranslationPoolManager:
                     'targetLanguage': target_language,
                     'confidenceScore': result.get('confidence', 0.95),
                     'processingTime': processing_time,
-                    'modelType': task.model_type,
+                    'modelType': used_tier,
                     'workerName': worker_name,
+                    # Lignes alignées enregistrées avec la traduction (modifications futures)
+                    'sourceSegments': result.get('source_segments'),
+                    'translatedSegments': result.get('translated_segments'),
+                    'sourceEdited': task.edited,
                     # Métriques de préservation de structure
                     'segmentsCount': result.get('segments_count', 0),
-                    'emojisCount': result.get('emojis_count', 0)
+                    'emojisCount': result.get('emojis_count', 0),
+                    'shardsCount': result.get('shards_count', 0),
+                    # Publication progressive: délai entre la requête et le premier fragment
+                    'timeToFirstSegment': first_segment_at[0] - task.created_at if first_segment_at else None
                 }
             else:
                 # Fallback si pas de service de traduction
@@ -469,6 +851,8 @@ class TranslationPoolManager:
                     'error': 'No translation service available'
                 }
             
+        except TranslationCancelledError:
+            raise
         except Exception as e:
             logger.error(f"Erreur de traduction dans {worker_name}: {e}")
             # Fallback en cas d'erreur
@@ -487,6 +871,244 @@ class TranslationPoolManager:
                 'error': str(e)
             }
     
+    async def _translate_sharded(self, task: TranslationTask, target_language: str, segment_callback=None) -> dict:
+        """
+        Traduit un message très long en fragments parallèles puis les réassemble dans l'ordre
+        
+        - Coupures aux sauts de ligne hors blocs de code, budget de tokens par fragment réduit
+          pour occuper TRANSLATION_SHARD_PARALLELISM cœurs sur ce seul message
+        - Les fragments s'exécutent en parallèle sur les voies d'inférence (sémaphore global);
+          ils ne repassent pas par les files de tâches, où un worker attendant ses propres
+          fragments pourrait bloquer la pool
+        - Échec d'un fragment: nouvel essai (TRANSLATION_SHARD_RETRIES) puis texte original
+          conservé pour ce fragment; échec de tous les fragments: exception (fallback habituel)
+        """
+        budget = shard_token_budget(task.text, self.shard_max_tokens, self.shard_parallelism)
+        segments = plan_shards(task.text, budget)
+        shards = [segment for segment in segments if segment['type'] == 'line']
+        cancel_check = lambda: self.is_task_cancelled(task)
+        translations: Dict[int, dict] = {}
+        failures = []
+        
+        # Publication progressive: un fragment dès que tous les précédents sont traduits
+        emit_lock = asyncio.Lock()
+        emit_state = {'position': 0, 'chunk': 0}
+        
+        async def emit_ready(final: bool = False):
+            async with emit_lock:
+                start = emit_state['position']
+                position = start
+                while position < len(segments) and (segments[position]['type'] == 'separator' or segments[position]['index'] in translations):
+                    position += 1
+                ready = [{**segment, 'text': translations[segment['index']]['text']} if segment['type'] == 'line' else segment
+                         for segment in segments[start:position]]
+                if not final and not any(segment['type'] == 'line' for segment in ready):
+                    return
+                emit_state['position'] = position
+                await segment_callback({
+                    'chunkIndex': emit_state['chunk'],
+                    'segments': [ready[0]['index'], ready[-1]['index']] if ready else [],
+                    'text': self.text_segmenter.reassemble_fragment(ready, {}),
+                    'final': final
+                })
+                emit_state['chunk'] += 1
+        
+        async def translate_shard(shard: dict):
+            last_error = None
+            for attempt in range(self.shard_retries + 1):
+                async with self._shard_semaphore:
+                    if cancel_check():
+                        raise TranslationCancelledError(f"Traduction annulée au fragment {shard['index']}")
+                    try:
+                        result = await self.translation_service.translate_with_structure(
+                            text=shard['text'],
+                            source_language=task.source_language,
+                            target_language=target_language,
+                            model_type=task.model_type,
+                            source_channel='zmq',
+                            cancel_check=cancel_check
+                        )
+                        if isinstance(result, dict) and result.get('translated_text'):
+                            translations[shard['index']] = {**result, 'text': result['translated_text']}
+                            self.stats['shards_translated'] += 1
+                            break
+                        last_error = f"résultat invalide: {result}"
+                    except TranslationCancelledError:
+                        raise
+                    except Exception as e:
+                        last_error = str(e)
+            else:
+                # Échec définitif: conserver le texte original de ce fragment
+                failures.append(shard['index'])
+                self.stats['shard_failures'] += 1
+                translations[shard['index']] = {'text': shard['text']}
+                logger.error(f"❌ [TRANSLATOR] Fragment {shard['index']} de {task.task_id} -> {target_language} non traduit: {last_error}")
+            if segment_callback:
+                await emit_ready()
+        
+        outcomes = await asyncio.gather(*(translate_shard(shard) for shard in shards), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        if len(failures) == len(shards):
+            raise Exception(f"Aucun des {len(shards)} fragments n'a pu être traduit")
+        if segment_callback:
+            await emit_ready(final=True)
+        
+        # Jointure: fragments traduits et séparateurs d'origine, dans l'ordre
+        translated_segments = [{**segment, 'text': translations[segment['index']]['text']} if segment['type'] == 'line' else segment
+                               for segment in segments]
+        results = [translations[shard['index']] for shard in shards if shard['index'] not in failures]
+        models_used = sorted({r.get('model_used', task.model_type) for r in results})
+        self.stats['sharded_translations'] += 1
+        logger.info(f"🧩 [TRANSLATOR] {task.task_id} -> {target_language}: {len(shards)} fragments (~{budget} tokens), {len(failures)} échec(s)")
+        return {
+            'translated_text': self.text_segmenter.reassemble_text(translated_segments, {}),
+            'detected_language': results[0].get('detected_language', task.source_language),
+            'confidence': min(r.get('confidence', 0.95) for r in results) * (len(results) / len(shards)),
+            'model_used': f"{'+'.join(models_used)}_sharded",
+            'segments_count': sum(r.get('segments_count', 1) for r in results),
+            'emojis_count': sum(r.get('emojis_count', 0) for r in results),
+            'shards_count': len(shards),
+            'shard_failures': len(failures)
+        }
+    
+    async def _serve_from_phrasebook(self, task: TranslationTask, worker_name: str, batch: Optional[list], target_languages: List[str]) -> List[str]:
+        """Publie les traductions du recueil de phrases fréquentes, retourne les autres langues"""
+        if task.edited or not target_languages or not self.phrasebook.may_contain(task.text):
+            return target_languages
+        requested_level = MODEL_HIERARCHY.get(task.model_type, 1)
+        remaining = []
+        for target_language in target_languages:
+            found = self.phrasebook.lookup(task.text, task.source_language, target_language, requested_level)
+            if found is None:
+                remaining.append(target_language)
+                continue
+            translated, level = found
+            await self._publish_reused_translation(task, worker_name, batch, target_language, {
+                'translatedText': translated,
+                'sourceLanguage': task.source_language,
+                'confidenceScore': 0.95,
+                # Niveau du modèle qui a produit la traduction du recueil, pas celui demandé
+                'modelType': next((name for name, value in MODEL_HIERARCHY.items() if value == level), task.model_type),
+                'fromPhrasebook': True
+            })
+        return remaining
+    
+    async def _serve_existing_translations(self, task: TranslationTask, worker_name: str, batch: Optional[list],
+                                           target_languages: List[str]) -> List[str]:
+        """Publie les traductions existantes de niveau suffisant, retourne les langues à traduire"""
+        self.stats['read_through_lookups'] += 1
+        existing = await self._lookup_existing_translations(task.message_id, target_languages)
+        if not existing:
+            return target_languages
+        
+        requested_level = MODEL_HIERARCHY.get(task.model_type, 1)
+        remaining = []
+        for target_language in target_languages:
+            translation = existing.get(target_language)
+            if not translation or not translation.get('translatedText'):
+                remaining.append(target_language)
+                continue
+            if MODEL_HIERARCHY.get(translation.get('translatorModel'), 1) < requested_level:
+                self.stats['read_through_lower_tier'] += 1
+                remaining.append(target_language)
+                continue
+            if self.is_task_cancelled(task):
+                return []
+            await self._publish_reused_translation(task, worker_name, batch, target_language, {
+                'translatedText': translation['translatedText'],
+                'sourceLanguage': translation.get('sourceLanguage', task.source_language),
+                'confidenceScore': translation.get('confidenceScore', 0.9),
+                'modelType': translation.get('translatorModel', task.model_type),
+                'fromDatabase': True
+            })
+        
+        if len(remaining) < len(target_languages):
+            logger.info(f"📚 [TRANSLATOR] {len(target_languages) - len(remaining)} traduction(s) existante(s) réutilisée(s) pour {task.message_id}")
+        return remaining
+    
+    async def _serve_from_memory(self, task: TranslationTask, worker_name: str, batch: Optional[list], target_languages: List[str]) -> List[str]:
+        """Publie les traductions trouvées dans la mémoire de traduction, retourne les autres langues"""
+        found = await self.translation_memory.lookup(
+            task.text, task.source_language, target_languages, task.model_type, task.message_id
+        )
+        # Tâche annulée: plus rien à traduire, comme pour la relecture en base
+        if self.is_task_cancelled(task):
+            return []
+        if not found:
+            return target_languages
+        for target_language, entry in found.items():
+            await self._publish_reused_translation(task, worker_name, batch, target_language, {
+                'translatedText': entry['translatedContent'],
+                'sourceLanguage': entry.get('sourceLanguage', task.source_language),
+                'confidenceScore': entry.get('confidenceScore') or 0.9,
+                'modelType': entry.get('translationModel', task.model_type),
+                'fromMemory': True
+            })
+        logger.info(f"🧠 [TRANSLATOR] {len(found)} traduction(s) issue(s) de la mémoire de traduction pour {task.message_id}")
+        return [language for language in target_languages if language not in found]
+    
+    async def _publish_reused_translation(self, task: TranslationTask, worker_name: str, batch: Optional[list],
+                                          target_language: str, fields: dict):
+        """Publie une traduction obtenue sans inférence (base ou mémoire de traduction)"""
+        result = {
+            'messageId': task.message_id,
+            'targetLanguage': target_language,
+            'processingTime': 0.0,
+            'workerName': worker_name,
+            'poolType': 'any' if task.conversation_id == 'any' else 'normal',
+            'created_at': task.created_at,
+            'conversationId': task.conversation_id,
+            'replyTopic': task.reply_topic,
+            'textHash': text_fingerprint(task.text),
+            **fields
+        }
+        if batch is not None:
+            batch.append((result, target_language))
+        else:
+            await self._publish_translation_result(task.task_id, result, target_language)
+        self.stats['inference_calls_avoided'] += 1
+        self.stats['translations_completed'] += 1
+    
+    async def _lookup_existing_translations(self, message_id: str, target_languages: List[str]) -> Dict[str, dict]:
+        """Méthode de recherche des traductions existantes (remplacée par le serveur ZMQ)"""
+        return {}
+    
+    async def _previous_segments(self, task: TranslationTask, target_languages: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """Lignes alignées des traductions précédentes d'un message modifié (niveau de modèle suffisant)"""
+        existing = await self._lookup_existing_translations(task.message_id, target_languages)
+        requested_level = MODEL_HIERARCHY.get(task.model_type, 1)
+        return {
+            target_language: {'source': translation['sourceSegments'], 'translated': translation['translatedSegments']}
+            for target_language, translation in existing.items()
+            if translation.get('sourceSegments') and translation.get('translatedSegments')
+            and MODEL_HIERARCHY.get(translation.get('translatorModel'), 1) >= requested_level
+        }
+    
+    def _record_segment_reuse(self, result: dict, previous_segments: Optional[Dict[str, List[str]]]):
+        reused = result.get('segments_reused', 0)
+        if previous_segments:
+            self.stats['incremental_translations'] += 1
+        self.stats['segments_reused'] += reused
+        self.stats['segments_translated'] += len(result['source_segments']) - reused
+    
+    def has_pending_work(self) -> bool:
+        """Vrai si des tâches réelles sont en file ou en cours de traduction"""
+        if not self.normal_pool.empty() or not self.any_pool.empty():
+            return True
+        return self.stats['normal_workers_active'] > 0 or self.stats['any_workers_active'] > 0
+    
+    def queued_tasks(self) -> int:
+        """Nombre de tâches réelles en attente dans les pools"""
+        return self.normal_pool.qsize() + self.any_pool.qsize()
+    
+    def _record_time_to_first_segment(self, delay: float):
+        """Moyenne du délai requête -> premier fragment publié (mode progressif)"""
+        count = self.stats['progressive_translations']
+        self.stats['avg_time_to_first_segment'] = (self.stats['avg_time_to_first_segment'] * count + delay) / (count + 1)
+        self.stats['progressive_translations'] = count + 1
+    
     def _create_error_result(self, task: TranslationTask, target_language: str, error_message: str):
         """Crée un résultat d'erreur pour une traduction échouée"""
         return {
@@ -497,7 +1119,9 @@ class TranslationPoolManager:
             'confidenceScore': 0.0,
             'processingTime': 0.0,
             'modelType': task.model_type,
-            'error': error_message
+            'error': error_message,
+            'conversationId': task.conversation_id,
+            'replyTopic': task.reply_topic
         }
     
     async def _publish_translation_result(self, task_id: str, result: dict, target_language: str):
@@ -510,10 +1134,28 @@ class TranslationPoolManager:
         except Exception as e:
             logger.error(f"Erreur lors de la publication du résultat {task_id}: {e}")
     
+    async def _publish_task_skipped(self, task: TranslationTask, reason: str):
+        """Publie un message translation_skipped (remplacée par le serveur ZMQ principal)"""
+        pass
+    
+    async def _publish_translation_partial(self, task: TranslationTask, target_language: str, fragment: dict):
+        """Publie un fragment de traduction progressive (remplacée par le serveur ZMQ principal)"""
+        pass
+    
+    async def _publish_translation_batch(self, task: TranslationTask, results: list):
+        """Publie les résultats de toutes les langues d'une tâche (remplacée par le serveur ZMQ principal)"""
+        for result, target_language in results:
+            await self._publish_translation_result(task.task_id, result, target_language)
+    
     def get_stats(self) -> dict:
         """Retourne les statistiques actuelles"""
+        segments_total = self.stats['segments_reused'] + self.stats['segments_translated']
         return {
             **self.stats,
+            'segment_reuse_rate': self.stats['segments_reused'] / segments_total if segments_total else 0.0,
+            'pending_cancellations': len(self.cancelled_messages),
+            'journal': self.journal.get_stats() if self.journal else None,
+            'phrasebook': self.phrasebook.get_stats() if self.phrasebook else None,
             'memory_usage_mb': psutil.Process().memory_info().rss / 1024 / 1024,
             'uptime_seconds': time.time() - getattr(self, '_start_time', time.time())
         }
@@ -550,11 +1192,168 @@ class ZMQTranslationServer:
             translation_service=translation_service
         )
         
-        # Remplacer la méthode de publication du pool manager
+        # Remplacer les méthodes de publication du pool manager
         self.pool_manager._publish_translation_result = self._publish_translation_result
+        self.pool_manager._publish_task_skipped = self._publish_task_skipped
+        self.pool_manager._publish_translation_batch = self._publish_translation_batch
+        self.pool_manager._publish_translation_partial = self._publish_translation_partial
         
         # Service de base de données
         self.database_service = DatabaseService(database_url)
+        self.pool_manager._lookup_existing_translations = self._lookup_existing_translations
+        
+        # Rétention des tâches tant que le modèle demandé est en cours de chargement
+        self.readiness_gate = ModelReadinessGate(
+            translation_service=translation_service,
+            release_callback=self._enqueue_task,
+            fail_callback=self._publish_task_error,
+            journal=self.pool_manager.journal
+        )
+        
+        # Amélioration des traductions basic en période d'inactivité
+        self.upgrade_scheduler = TranslationUpgradeScheduler(
+            pool_manager=self.pool_manager,
+            database_service=self.database_service,
+            publish_callback=self._publish_translation_result,
+            # Même mesure que les brouillons: dernière valeur de l'échantillonneur, sans appel système
+            cpu_usage=lambda: self.telemetry.system_cpu_usage
+        )
+        
+        # Format de transport: chaque gateway négocie via ping, le PUB étant diffusé à tous
+        # les abonnés, le binaire n'est utilisé que si tous les pairs connus l'ont accepté
+        self.wire_protocols = supported_protocols()
+        self.peer_protocols: Dict[str, Dict] = {}
+        self.peer_protocol_ttl = float(os.getenv('ZMQ_WIRE_PEER_TTL', '300'))
+        self.processing_node = socket.gethostname()
+        
+        # Topics PUB: 'reply' = topic fourni par la requête (replyTopic), sinon trame unique
+        # historique; 'shard' = tout message est préfixé par le shard de sa conversation
+        self.topic_mode = os.getenv('ZMQ_PUB_TOPIC_MODE', 'reply').lower()
+        self.topic_shards = int(os.getenv('ZMQ_PUB_TOPIC_SHARDS', '16'))
+        self.wire_stats = {
+            'messages_received': 0,
+            'bytes_received': 0,
+            'messages_sent': 0,
+            'bytes_sent': 0,
+            'decode_errors': 0,
+            'invalid_topics': 0,
+            'sent_by_protocol': defaultdict(int),
+            'sent_by_topic_kind': defaultdict(int)
+        }
+        
+        # Publication groupée (opt-in): translation_batch_completed par tâche, ou pour tous
+        # les résultats d'un même topic terminés dans la fenêtre TRANSLATION_BATCH_FLUSH_MS
+        self.batch_results_default = os.getenv('TRANSLATION_BATCH_RESULTS', 'false').lower() == 'true'
+        self.batch_flush_window = float(os.getenv('TRANSLATION_BATCH_FLUSH_MS', '0')) / 1000
+        self.batch_max_results = int(os.getenv('TRANSLATION_BATCH_MAX_RESULTS', '100'))
+        self._batch_buffers: Dict[Optional[str], List[dict]] = {}
+        self._batch_flush_tasks: Dict[Optional[str], asyncio.Task] = {}
+        self.batch_stats = {
+            'batches_published': 0,
+            'batched_results': 0,
+            'batch_persist_calls': 0
+        }
+        
+        # Mode cluster: nœud DEALER connecté au broker (cluster_broker.py) au lieu de PULL/PUB
+        # Une requête REQ consomme un crédit, rendu à la fin de la tâche ou à son rejet
+        self.cluster_broker = os.getenv('TRANSLATOR_CLUSTER_BROKER')
+        self.cluster_socket = None
+        self.cluster_capacity = int(os.getenv('CLUSTER_NODE_CREDITS', str((normal_workers + any_workers) * 2)))
+        self.cluster_heartbeat_interval = float(os.getenv('CLUSTER_HEARTBEAT_INTERVAL', '1'))
+        self.node_id = f"{self.processing_node}-{os.getpid()}"
+        self._credit_tasks: Set[str] = set()
+        self._credits_to_return = 0
+        self._credit_event = asyncio.Event()
+        self._cluster_tasks: List[asyncio.Task] = []
+        if self.cluster_broker:
+            self.pool_manager.task_done_callback = self._release_cluster_credit
+        
+        # Outbox des résultats: conservés jusqu'à l'acquittement de la gateway (ack) et
+        # renvoyés sur replay_since, une reconnexion du SUB ne coûte plus de réinférence
+        self.result_outbox = None
+        if os.getenv('RESULT_OUTBOX_ENABLED', 'true').lower() == 'true':
+            outbox_path = os.getenv('RESULT_OUTBOX_PATH') or None
+            try:
+                self.result_outbox = ResultOutbox(
+                    max_entries=int(os.getenv('RESULT_OUTBOX_MAX_ENTRIES', '50000')),
+                    ttl=float(os.getenv('RESULT_OUTBOX_TTL', '3600')),
+                    path=outbox_path
+                )
+                logger.info(f"[TRANSLATOR] 📮 Outbox des résultats activée ({outbox_path or 'mémoire'})")
+            except Exception as e:
+                logger.error(f"[TRANSLATOR] ❌ Outbox des résultats indisponible ({outbox_path}): {e}")
+        
+        # Publication d'abord: la sauvegarde passe par une file bornée vidée en arrière-plan,
+        # les métriques CPU/RSS viennent d'un échantillonneur de fond
+        self.telemetry = ProcessTelemetry()
+        # Sauvegarde différée: fusion par (messageId, langue), écriture en lots bornée
+        # par une part des connexions Prisma (le reste sert aux lectures)
+        self.persist_buffer = WriteBehindBuffer(
+            flush_fn=self.database_service.save_translations,
+            rank=lambda model: MODEL_HIERARCHY.get(model, 1),
+            batch_size=int(os.getenv('TRANSLATION_PERSIST_BATCH', '200')),
+            flush_interval=float(os.getenv('TRANSLATION_PERSIST_FLUSH_MS', '200')) / 1000,
+            max_pending=int(os.getenv('TRANSLATION_PERSIST_QUEUE_SIZE', '10000')),
+            concurrency=int(os.getenv('TRANSLATION_PERSIST_CONCURRENCY', str(max(1, get_settings().prisma_pool_size // 4))))
+        )
+        self.persist_drain_timeout = float(os.getenv('TRANSLATION_PERSIST_DRAIN_TIMEOUT', '10'))
+        
+        # Mémoire de traduction adressée par contenu (collection translation_memory)
+        self.translation_memory = None
+        if os.getenv('TRANSLATION_MEMORY_ENABLED', 'true').lower() == 'true':
+            self.translation_memory = TranslationMemory(
+                lookup_fn=self.database_service.get_memory_entries,
+                store_fn=self.database_service.save_memory_entries,
+                hierarchy=MODEL_HIERARCHY,
+                touch_fn=self.database_service.touch_memory_entries,
+                prune_fn=self.database_service.prune_translation_memory,
+                local_size=int(os.getenv('TRANSLATION_MEMORY_LOCAL_SIZE', '10000')),
+                ttl=float(os.getenv('TRANSLATION_MEMORY_TTL_DAYS', '30')) * 86400,
+                max_entries=int(os.getenv('TRANSLATION_MEMORY_MAX_ENTRIES', '1000000')),
+                max_length=int(os.getenv('TRANSLATION_MEMORY_MAX_LENGTH', '5000')),
+                prune_interval=float(os.getenv('TRANSLATION_MEMORY_PRUNE_INTERVAL', '3600'))
+            )
+            self.pool_manager.translation_memory = self.translation_memory
+        # Langues sans lecteur actif (activeLanguages): traduites à la première lecture
+        # (get_or_translate), en priorité sur les brouillons et les historiques
+        self.lazy_targets_enabled = os.getenv('TRANSLATION_LAZY_TARGETS_ENABLED', 'true').lower() == 'true'
+        self.on_demand_translator = OnDemandTranslator(
+            translation_service=translation_service,
+            database_service=self.database_service,
+            publish_result=self._publish_translation_result,
+            persist_result=lambda result: self._enqueue_persistence([self._build_save_data(result)]),
+            translation_memory=self.translation_memory
+        )
+        # Pré-traduction des brouillons (draft_translate): cède toujours la place aux tâches réelles
+        self.draft_translator = DraftTranslator(
+            translation_service=translation_service,
+            busy_check=lambda: self.pool_manager.has_pending_work() or self.on_demand_translator.active > 0,
+            cpu_usage=lambda: self.telemetry.system_cpu_usage
+        )
+        # Historique d'une conversation (translate_history): lu en base par le translator,
+        # publié du plus récent au plus ancien, cède la place aux tâches en file
+        self.history_translator = HistoryTranslator(
+            translation_service=translation_service,
+            database_service=self.database_service,
+            publish_result=self._publish_translation_result,
+            publish_summary=self._publish_history_summary,
+            live_queue_depth=lambda: self.pool_manager.queued_tasks() + self.on_demand_translator.active,
+            translation_memory=self.translation_memory
+        )
+        self.persist_skipped_no_db = 0
+        
+        # Entrée: vidage par lots du socket PULL, transport ipc:// optionnel
+        self.ingress_batch_size = max(1, int(os.getenv('ZMQ_INGRESS_BATCH', '64')))
+        self.ipc_dir = os.getenv('ZMQ_IPC_DIR')
+        self._ingress_window = deque()
+        self.ingress_stats = {
+            'messages': 0,
+            'batches': 0,
+            'max_batch_size': 0,
+            'drain_time': 0.0,
+            'decode_time': 0.0,
+            'dispatch_time': 0.0
+        }
         
         # État du serveur
         self.running = False
@@ -584,13 +1383,10 @@ class ZMQTranslationServer:
             asyncio.create_task(self._connect_database_background())
             logger.info("[TRANSLATOR] ✅ Connexion DB lancée en arrière-plan, le serveur continue son démarrage...")
             
-            # Socket PULL pour recevoir les commandes du Gateway (remplace SUB)
-            self.pull_socket = self.context.socket(zmq.PULL)
-            self.pull_socket.bind(f"tcp://{self.host}:{self.gateway_push_port}")
-            
-            # Socket PUB pour publier les résultats vers le Gateway (inchangé)
-            self.pub_socket = self.context.socket(zmq.PUB)
-            self.pub_socket.bind(f"tcp://{self.host}:{self.gateway_sub_port}")
+            if self.cluster_broker:
+                await self._initialize_cluster_node()
+            else:
+                self._bind_gateway_sockets()
             
             # Petit délai pour établir les connexions ZMQ
             await asyncio.sleep(0.1)
@@ -600,14 +1396,140 @@ class ZMQTranslationServer:
             self.worker_tasks = await self.pool_manager.start_workers()
             logger.info(f"[TRANSLATOR] ✅ Workers démarrés: {len(self.worker_tasks)} tâches")
             
+            # Télémétrie et sauvegarde en arrière-plan (hors du chemin de publication)
+            self.telemetry.start()
+            self.persist_buffer.start()
+            if self.translation_memory:
+                self.translation_memory.start()
+            
+            # Libérer les tâches retenues au fur et à mesure du chargement des modèles
+            # (celles retenues avant un redémarrage sont reprises du journal)
+            await self.readiness_gate.restore(TranslationTask)
+            self.readiness_gate.start()
+            
+            # Démarrer le planificateur d'amélioration (ne s'exécute qu'en période d'inactivité)
+            self.upgrade_scheduler.start()
+            
+            # Mode cluster: annoncer la capacité puis battements de cœur et retour des crédits
+            if self.cluster_socket:
+                await self._send_cluster_status(b'READY')
+                self._cluster_tasks = [
+                    asyncio.create_task(self._cluster_heartbeat_loop()),
+                    asyncio.create_task(self._cluster_credit_loop())
+                ]
+            
             logger.info("ZMQTranslationServer initialisé avec succès")
-            logger.info(f"🔌 Socket PULL lié au port: {self.host}:{self.gateway_push_port}")
-            logger.info(f"🔌 Socket PUB lié au port: {self.host}:{self.gateway_sub_port}")
+            if self.cluster_socket:
+                logger.info(f"🔌 Nœud cluster {self.node_id} connecté au broker: {self.cluster_broker}")
+            else:
+                logger.info(f"🔌 Socket PULL lié au port: {self.host}:{self.gateway_push_port}")
+                logger.info(f"🔌 Socket PUB lié au port: {self.host}:{self.gateway_sub_port}")
             
         except Exception as e:
             logger.error(f"Erreur lors de l'initialisation: {e}")
             raise
     
+    def _bind_gateway_sockets(self):
+        """Mode autonome: PULL et PUB liés directement pour la gateway"""
+        # Socket PULL pour recevoir les commandes du Gateway (remplace SUB)
+        self.pull_socket = self.context.socket(zmq.PULL)
+        self._apply_socket_options(self.pull_socket, [
+            (zmq.RCVHWM, 'ZMQ_RCVHWM', '10000'),
+            (zmq.RCVBUF, 'ZMQ_RCVBUF', None),
+            (zmq.LINGER, 'ZMQ_LINGER', '1000')
+        ])
+        for endpoint in self._endpoints(self.gateway_push_port, 'translator-pull'):
+            self.pull_socket.bind(endpoint)
+        
+        # Socket PUB pour publier les résultats vers le Gateway (inchangé)
+        self.pub_socket = self.context.socket(zmq.PUB)
+        self._apply_socket_options(self.pub_socket, [
+            (zmq.SNDHWM, 'ZMQ_SNDHWM', '10000'),
+            (zmq.SNDBUF, 'ZMQ_SNDBUF', None),
+            (zmq.LINGER, 'ZMQ_LINGER', '1000')
+        ])
+        for endpoint in self._endpoints(self.gateway_sub_port, 'translator-pub'):
+            self.pub_socket.bind(endpoint)
+    
+    async def _initialize_cluster_node(self):
+        """Mode cluster: un seul socket DEALER vers le broker pour les requêtes et les résultats"""
+        self.cluster_socket = self.context.socket(zmq.DEALER)
+        self.cluster_socket.setsockopt(zmq.IDENTITY, self.node_id.encode('utf-8'))
+        self._apply_socket_options(self.cluster_socket, [
+            (zmq.RCVHWM, 'ZMQ_RCVHWM', '10000'),
+            (zmq.SNDHWM, 'ZMQ_SNDHWM', '10000'),
+            (zmq.LINGER, 'ZMQ_LINGER', '1000')
+        ])
+        self.cluster_socket.connect(self.cluster_broker)
+        self.pull_socket = self.cluster_socket
+        self.pub_socket = self.cluster_socket
+    
+    def _cluster_status(self) -> dict:
+        """Capacité, modèles chargés et profondeur de file annoncés au broker"""
+        pm = self.pool_manager
+        service = pm.translation_service
+        return {
+            'nodeId': self.node_id,
+            'capacity': self.cluster_capacity,
+            'credits': max(0, self.cluster_capacity - len(self._credit_tasks)),
+            'tiers': list(getattr(service, 'models', {}) or {}),
+            'queueDepth': pm.normal_pool.qsize() + pm.any_pool.qsize(),
+            'activeWorkers': pm.stats['normal_workers_active'] + pm.stats['any_workers_active']
+        }
+    
+    async def _send_cluster_status(self, kind: bytes):
+        await self.cluster_socket.send_multipart([kind, json.dumps(self._cluster_status()).encode('utf-8')])
+    
+    async def _cluster_heartbeat_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.cluster_heartbeat_interval)
+                await self._send_cluster_status(b'HB')
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"[TRANSLATOR] ❌ Erreur battement de cœur cluster: {e}")
+    
+    async def _cluster_credit_loop(self):
+        """Rend au broker les crédits libérés (regroupés entre deux envois)"""
+        while True:
+            try:
+                await self._credit_event.wait()
+                self._credit_event.clear()
+                credits, self._credits_to_return = self._credits_to_return, 0
+                if credits:
+                    await self.cluster_socket.send_multipart([b'CREDIT', str(credits).encode('ascii')])
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"[TRANSLATOR] ❌ Erreur retour de crédit cluster: {e}")
+    
+    def _return_cluster_credits(self, count: int = 1):
+        self._credits_to_return += count
+        self._credit_event.set()
+    
+    def _release_cluster_credit(self, task: TranslationTask):
+        """Tâche terminée ou rejetée: rendre le crédit consommé par sa requête"""
+        if task.task_id in self._credit_tasks:
+            self._credit_tasks.discard(task.task_id)
+            self._return_cluster_credits()
+    
+    def _endpoints(self, port: int, ipc_name: str) -> List[str]:
+        """Endpoint TCP, plus un endpoint ipc:// si ZMQ_IPC_DIR est défini (gateways co-localisées)"""
+        endpoints = [f"tcp://{self.host}:{port}"]
+        if self.ipc_dir:
+            os.makedirs(self.ipc_dir, exist_ok=True)
+            endpoints.append(f"ipc://{os.path.join(self.ipc_dir, ipc_name)}.ipc")
+        return endpoints
+    
+    @staticmethod
+    def _apply_socket_options(sock, options: list):
+        """Applique les options de socket (option, variable d'environnement, défaut) avant le bind"""
+        for option, env_name, default in options:
+            value = os.getenv(env_name, default)
+            if value is not None:
+                sock.setsockopt(option, int(value))
+    
     async def start(self):
         """Démarre le serveur"""
         if not self.pull_socket or not self.pub_socket:
@@ -619,9 +1541,9 @@ class ZMQTranslationServer:
         try:
             while self.running:
                 try:
-                    # Recevoir une commande de traduction via PULL
-                    message = await self.pull_socket.recv()
-                    await self._handle_translation_request(message)
+                    # Attendre une commande puis vider les trames déjà prêtes (PULL, sans copie)
+                    frames = await self.pull_socket.recv_multipart(copy=False)
+                    await self._process_ingress_batch(await self._drain_ingress(frames))
                     
                 except zmq.ZMQError as e:
                     if self.running:
@@ -637,7 +1559,52 @@ class ZMQTranslationServer:
         finally:
             await self.stop()
     
-    async def _handle_translation_request(self, message: bytes):
+    async def _drain_ingress(self, first_frames) -> list:
+        """Récupère sans bloquer jusqu'à ZMQ_INGRESS_BATCH messages déjà disponibles"""
+        drain_start = time.perf_counter()
+        messages = [first_frames]
+        while len(messages) < self.ingress_batch_size:
+            try:
+                messages.append(await self.pull_socket.recv_multipart(flags=zmq.NOBLOCK, copy=False))
+            except zmq.Again:
+                break
+        self.ingress_stats['drain_time'] += time.perf_counter() - drain_start
+        return messages
+    
+    async def _process_ingress_batch(self, messages: list):
+        """Décode tout le lot puis distribue les requêtes (étapes chronométrées)"""
+        decode_start = time.perf_counter()
+        if self.cluster_socket:
+            # Trames du broker: [REQ|CMD, message...], REQ consomme un crédit
+            credits = [message[0].bytes == b'REQ' for message in messages]
+            messages = [message[1:] for message in messages]
+        else:
+            credits = [False] * len(messages)
+        requests = [self._decode_request(message) for message in messages]
+        dispatch_start = time.perf_counter()
+        for request_data, consumes_credit in zip(requests, credits):
+            if request_data is not None:
+                await self._dispatch_request(request_data, consumes_credit)
+            elif consumes_credit:
+                self._return_cluster_credits()
+        dispatch_end = time.perf_counter()
+        
+        stats = self.ingress_stats
+        stats['decode_time'] += dispatch_start - decode_start
+        stats['dispatch_time'] += dispatch_end - dispatch_start
+        stats['messages'] += len(messages)
+        stats['batches'] += 1
+        stats['max_batch_size'] = max(stats['max_batch_size'], len(messages))
+        self._ingress_window.append((time.time(), len(messages)))
+    
+    def _ingress_rate(self) -> float:
+        """Messages/s reçus sur les 10 dernières secondes"""
+        cutoff = time.time() - 10
+        while self._ingress_window and self._ingress_window[0][0] < cutoff:
+            self._ingress_window.popleft()
+        return sum(count for _, count in self._ingress_window) / 10
+    
+    async def _handle_translation_request(self, message):
         """
         Traite une requête de traduction reçue via SUB
         
@@ -668,27 +1635,91 @@ class ZMQTranslationServer:
               - Option A: N workers × vitesse (si N workers disponibles)
               - Option B: 2-3x plus rapide (overhead réduit, batch processing)
         """
+        request_data = self._decode_request(message)
+        if request_data is not None:
+            await self._dispatch_request(request_data)
+    
+    def _decode_request(self, message) -> Optional[dict]:
+        """Décode une requête reçue, None si elle est illisible"""
+        try:
+            request_data, _ = decode_message(message)
+        except WireProtocolError as e:
+            self.wire_stats['decode_errors'] += 1
+            logger.error(f"Erreur de décodage du message: {e}")
+            return None
+        self.wire_stats['messages_received'] += 1
+        self.wire_stats['bytes_received'] += self._message_size(message)
+        return request_data
+    
+    async def _dispatch_request(self, request_data: dict, consumes_credit: bool = False):
+        """Traite une requête décodée: ping, annulation ou création de tâche"""
+        task = None
         try:
-            request_data = json.loads(message.decode('utf-8'))
-            
             # Vérifier si c'est un message de ping
             if request_data.get('type') == 'ping':
                 logger.info(f"🏓 [TRANSLATOR] Ping reçu, timestamp: {request_data.get('timestamp')}")
-                # Répondre au ping via PUB
+                # Négociation du format: le pair annonce les formats qu'il sait lire
+                protocol = self._register_peer_protocol(request_data)
+                # Répondre au ping via PUB (toujours en JSON, lisible par toute gateway)
                 ping_response = {
                     'type': 'pong',
                     'timestamp': time.time(),
                     'translator_status': 'alive',
                     'translator_port_pub': self.gateway_sub_port,
-                    'translator_port_pull': self.gateway_push_port
+                    'translator_port_pull': self.gateway_push_port,
+                    'protocol': protocol,
+                    'protocols': self.wire_protocols,
+                    'processingNode': self.processing_node
                 }
                 if self.pub_socket:
-                    await self.pub_socket.send(json.dumps(ping_response).encode('utf-8'))
+                    await self._send_message(ping_response, PROTOCOL_JSON, topic=self._topic_for(self._reply_topic(request_data)))
                     logger.info(f"🏓 [TRANSLATOR] Pong envoyé via port {self.gateway_sub_port}")
                 else:
                     logger.error(f"❌ [TRANSLATOR] Socket PUB non disponible pour pong (port {self.gateway_sub_port})")
                 return
             
+            # Outbox: acquittement des résultats reçus et rejeu des résultats non acquittés
+            request_type = request_data.get('type')
+            if request_type == 'ack':
+                self._handle_outbox_ack(request_data)
+                return
+            if request_type == 'replay_since':
+                await self._replay_outbox(request_data)
+                return
+            
+            # Brouillon en cours de saisie: pré-traduction basse priorité, rien n'est publié
+            if request_type == 'draft_translate':
+                self.draft_translator.submit(request_data)
+                return
+            if request_type == 'draft_cancel':
+                self.draft_translator.cancel(request_data.get('draftId'))
+                return
+            
+            # Historique d'une conversation: tâche de fond, résultats publiés au fil de l'eau
+            if request_type == 'translate_history':
+                self.history_translator.submit(request_data, self._reply_topic(request_data))
+                return
+            
+            # Lecture d'une langue différée: traduction en base, sinon calculée immédiatement
+            if request_type == 'get_or_translate':
+                self.on_demand_translator.submit(request_data, self._reply_topic(request_data))
+                return
+            
+            # Annulation des traductions d'un message modifié ou supprimé
+            # - cancel: abandonne les tâches en file et interrompt celles en cours
+            # - supersede: idem, puis traduit le nouveau texte fourni dans la même requête
+            if request_type in ('cancel', 'supersede'):
+                message_id = request_data.get('messageId')
+                if not message_id:
+                    logger.warning(f"⚠️ [TRANSLATOR] Commande {request_type} sans messageId ignorée")
+                    return
+                self.pool_manager.cancel_message(message_id)
+                if self.result_outbox:
+                    self.result_outbox.discard(message_id)
+                logger.info(f"🚫 [TRANSLATOR] Commande {request_type} reçue pour le message {message_id}")
+                if request_type == 'cancel':
+                    return
+            
             # Vérifier que c'est une requête de traduction valide
             if not request_data.get('text') or not request_data.get('targetLanguages'):
                 logger.warning(f"⚠️ [TRANSLATOR] Requête invalide reçue: {request_data}")
@@ -709,90 +1740,127 @@ class ZMQTranslationServer:
                     'conversationId': request_data.get('conversationId', 'unknown')
                 }
                 if self.pub_socket:
-                    await self.pub_socket.send(json.dumps(no_translation_message).encode('utf-8'))
+                    await self._send_message(no_translation_message, topic=self._topic_for(
+                        self._reply_topic(request_data), no_translation_message['conversationId']))
                     logger.info(f"[TRANSLATOR] translation message ignored for message {request_data.get('messageId')}")
                 return
             
+            # Langues déjà traduites et encore dans l'outbox (gateway qui redemande après
+            # une reconnexion): renvoyées sans nouvelle inférence
+            target_languages = request_data.get('targetLanguages', [])
+            if self.result_outbox and request_type != 'supersede':
+                target_languages = await self._serve_from_outbox(request_data, target_languages)
+                if not target_languages:
+                    return
+            
+            # Message envoyé depuis un brouillon: sa pré-traduction s'arrête, les langues
+            # déjà traduites pour exactement ce texte sont publiées immédiatement
+            self.draft_translator.cancel(request_data.get('draftId'))
+            target_languages = await self._serve_from_drafts(request_data, target_languages)
+            if not target_languages:
+                return
+            
+            # Langues sans lecteur actif: différées jusqu'à leur première lecture. Jamais pour
+            # un texte modifié: les traductions en base décrivent l'ancien texte
+            active_languages = request_data.get('activeLanguages')
+            if self.lazy_targets_enabled and active_languages is not None and request_type != 'supersede':
+                lazy_languages = [language for language in target_languages if language not in active_languages]
+                if lazy_languages:
+                    self.on_demand_translator.defer(request_data.get('messageId'), message_text, lazy_languages)
+                    target_languages = [language for language in target_languages if language in active_languages]
+                    logger.info(f"💤 [TRANSLATOR] {len(lazy_languages)} langue(s) différée(s) pour {request_data.get('messageId')}: {lazy_languages}")
+                if not target_languages:
+                    return
+            
             # Créer la tâche de traduction
             task = TranslationTask(
                 task_id=str(uuid.uuid4()),
                 message_id=request_data.get('messageId'),
                 text=message_text,
                 source_language=request_data.get('sourceLanguage', 'fr'),
-                target_languages=request_data.get('targetLanguages', []),
+                target_languages=target_languages,
                 conversation_id=request_data.get('conversationId', 'unknown'),
-                model_type=request_data.get('modelType', 'basic')
+                model_type=request_data.get('modelType', 'basic'),
+                priority=TASK_PRIORITIES.get(request_data.get('priority', 'normal'), TASK_PRIORITIES['normal']),
+                reply_topic=self._reply_topic(request_data),
+                batch_results=bool(request_data.get('batchResults', self.batch_results_default)),
+                progressive=bool(request_data.get('progressive', False)),
+                # Texte modifié (supersede): les traductions en base décrivent l'ancien texte,
+                # seules leurs lignes inchangées sont reprises
+                read_through=request_type != 'supersede',
+                edited=request_type == 'supersede'
             )
             
+            if consumes_credit:
+                self._credit_tasks.add(task.task_id)
+            
             logger.info(f"🔧 [TRANSLATOR] Tâche créée: {task.task_id} pour {task.conversation_id} ({len(task.target_languages)} langues)")
-            logger.info(f"📝 [TRANSLATOR] Détails: texte='{task.text[:50]}...', source={task.source_language}, target={task.target_languages}, modèle={task.model_type}")
+            logger.debug(f"📝 [TRANSLATOR] Détails: texte='{task.text[:50]}...', source={task.source_language}, target={task.target_languages}, modèle={task.model_type}")
             
-            # Enfiler la tâche dans la pool appropriée
-            success = await self.pool_manager.enqueue_task(task)
+            # Modèle encore en chargement: retenir la tâche plutôt que de la traduire en fallback
+            if self.readiness_gate.should_hold(task):
+                if not self.readiness_gate.hold(task):
+                    await self._publish_task_error(task, 'models loading, hold budget exhausted')
+                return
             
-            if not success:
-                # Pool pleine, publier un message d'erreur vers la gateway
-                error_message = {
-                    'type': 'translation_error',
-                    'taskId': task.task_id,
-                    'messageId': task.message_id,
-                    'error': 'translation pool full',
-                    'conversationId': task.conversation_id
-                }
-                # Utiliser le socket PUB configuré pour envoyer l'erreur à la gateway
-                if self.pub_socket:
-                    await self.pub_socket.send(json.dumps(error_message).encode('utf-8'))
-                    logger.warning(f"Pool pleine, rejet de la tâche {task.task_id}")
-                else:
-                    logger.error("❌ Socket PUB non initialisé pour envoyer l'erreur")
+            # Enfiler la tâche dans la pool appropriée
+            await self._enqueue_task(task)
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Erreur de décodage JSON: {e}")
         except Exception as e:
             logger.error(f"Erreur lors du traitement de la requête: {e}")
+            if task is not None:
+                self._release_cluster_credit(task)
+        finally:
+            # Requête sans tâche (ping, annulation, invalide): crédit rendu immédiatement
+            if consumes_credit and task is None:
+                self._return_cluster_credits()
+    
+    async def _enqueue_task(self, task: TranslationTask):
+        """Enfile une tâche, publie une erreur vers la gateway si la pool est pleine"""
+        success = await self.pool_manager.enqueue_task(task)
+        if not success:
+            await self._publish_task_error(task, 'translation pool full')
+    
+    async def _publish_task_error(self, task: TranslationTask, error: str):
+        """Publie un message translation_error pour une tâche rejetée"""
+        self._release_cluster_credit(task)
+        error_message = {
+            'type': 'translation_error',
+            'taskId': task.task_id,
+            'messageId': task.message_id,
+            'error': error,
+            'conversationId': task.conversation_id
+        }
+        # Utiliser le socket PUB configuré pour envoyer l'erreur à la gateway
+        if self.pub_socket:
+            await self._send_message(error_message, topic=self._topic_for(task.reply_topic, task.conversation_id))
+            logger.warning(f"Rejet de la tâche {task.task_id}: {error}")
+        else:
+            logger.error("❌ Socket PUB non initialisé pour envoyer l'erreur")
     
     async def _publish_translation_result(self, task_id: str, result: dict, target_language: str):
         """Publie un résultat de traduction via PUB vers la gateway avec informations techniques complètes"""
         try:
-            # DEBUG: Logs réduits de 60% - Suppression des vérifications détaillées
-            
-            # Récupérer les informations techniques du système
-            import socket
-            import uuid
-            
-            # Calculer le temps d'attente en queue
-            queue_time = time.time() - result.get('created_at', time.time())
+            # VÉRIFICATION DE LA QUALITÉ DE LA TRADUCTION
+            translated_text = result.get('translatedText', '')
+            is_valid_translation = self._is_valid_translation(translated_text, result)
             
-            # Récupérer les métriques système
-            memory_usage = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-            cpu_usage = psutil.Process().cpu_percent()
-            # Attendre un peu pour avoir une mesure CPU valide
-            await asyncio.sleep(0.1)
-            cpu_usage = psutil.Process().cpu_percent()
+            if not is_valid_translation:
+                # Traduction invalide - NE PAS ENVOYER à la Gateway
+                logger.error(f"❌ [TRANSLATOR] Traduction invalide détectée - PAS D'ENVOI à la Gateway:")
+                logger.error(f"   📋 Task ID: {task_id}")
+                logger.error(f"   📋 Message ID: {result.get('messageId')}")
+                logger.error(f"   📋 Source: {result.get('sourceLanguage')} -> Target: {target_language}")
+                logger.error(f"   📋 Texte original: {result.get('originalText', 'N/A')}")
+                logger.error(f"   📋 Texte traduit: '{translated_text}'")
+                logger.error(f"   📋 Modèle utilisé: {result.get('modelType', 'unknown')}")
+                logger.error(f"   📋 Worker: {result.get('workerName', 'unknown')}")
+                logger.error(f"   📋 Raison: {self._get_translation_error_reason(translated_text)}")
+                return  # Sortir sans envoyer à la Gateway
             
             # Enrichir le résultat avec toutes les informations techniques
-            enriched_result = {
-                # Informations applicatives existantes
-                'messageId': result.get('messageId'),
-                'translatedText': result.get('translatedText'),
-                'sourceLanguage': result.get('sourceLanguage'),
-                'targetLanguage': result.get('targetLanguage'),
-                'confidenceScore': result.get('confidenceScore', 0.0),
-                'processingTime': result.get('processingTime', 0.0),
-                'modelType': result.get('modelType', 'basic'),
-                'workerName': result.get('workerName', 'unknown'),
-                
-                # NOUVELLES INFORMATIONS TECHNIQUES
-                'translatorModel': result.get('modelType', 'basic'),  # Modèle ML utilisé
-                'workerId': result.get('workerName', 'unknown'),      # Worker qui a traité
-                'poolType': result.get('poolType', 'normal'),         # Pool utilisée (normal/any)
-                'translationTime': result.get('processingTime', 0.0), # Temps de traduction
-                'queueTime': queue_time,                              # Temps d'attente en queue
-                'memoryUsage': memory_usage,                          # Usage mémoire (MB)
-                'cpuUsage': cpu_usage,                                # Usage CPU (%)
-                'timestamp': time.time(),
-                'version': '1.0.0'  # Version du Translator
-            }
+            # (métriques système: dernière mesure de l'échantillonneur, sans appel système)
+            enriched_result = self._build_enriched_result(result, self.telemetry.memory_usage, self.telemetry.cpu_usage)
             
             # Créer le message enrichi
             message = {
@@ -805,7 +1873,7 @@ class ZMQTranslationServer:
                 'metadata': {
                     'translatorVersion': '1.0.0',
                     'modelVersion': result.get('modelType', 'basic'),
-                    'processingNode': socket.gethostname(),
+                    'processingNode': self.processing_node,
                     'sessionId': str(uuid.uuid4()),
                     'requestId': task_id,
                     'protocol': 'ZMQ_PUB_SUB',
@@ -813,65 +1881,439 @@ class ZMQTranslationServer:
                 }
             }
             
-            # DEBUG: Logs réduits de 60% - Suppression des détails techniques
-            
-            # VÉRIFICATION DE LA QUALITÉ DE LA TRADUCTION
-            translated_text = result.get('translatedText', '')
-            is_valid_translation = self._is_valid_translation(translated_text, result)
-            
-            if not is_valid_translation:
-                # Traduction invalide - NE PAS ENVOYER à la Gateway
-                logger.error(f"❌ [TRANSLATOR] Traduction invalide détectée - PAS D'ENVOI à la Gateway:")
-                logger.error(f"   📋 Task ID: {task_id}")
-                logger.error(f"   📋 Message ID: {result.get('messageId')}")
-                logger.error(f"   📋 Source: {result.get('sourceLanguage')} -> Target: {target_language}")
-                logger.error(f"   📋 Texte original: {result.get('originalText', 'N/A')}")
-                logger.error(f"   📋 Texte traduit: '{translated_text}'")
-                logger.error(f"   📋 Modèle utilisé: {result.get('modelType', 'unknown')}")
-                logger.error(f"   📋 Worker: {result.get('workerName', 'unknown')}")
-                logger.error(f"   📋 Raison: {self._get_translation_error_reason(translated_text)}")
-                return  # Sortir sans envoyer à la Gateway
-            
-            # Traduction valide - SAUVEGARDE ET ENVOI
-            try:
-                # Préparer les données pour la sauvegarde
-                save_data = {
-                    'messageId': result.get('messageId'),
-                    'sourceLanguage': result.get('sourceLanguage'),
-                    'targetLanguage': result.get('targetLanguage'),
-                    'translatedText': result.get('translatedText'),
-                    'translatorModel': result.get('translatorModel', result.get('modelType', 'basic')),
-                    'confidenceScore': result.get('confidenceScore', 0.9),
-                    'processingTime': result.get('processingTime', 0.0),
-                    'workerName': result.get('workerName', 'unknown'),
-                    'poolType': result.get('poolType', 'normal')
-                }
-                
-                # Sauvegarder en base de données (si connecté)
-                if self.database_service.is_db_connected():
-                    save_success = await self.database_service.save_translation(save_data)
-                    if save_success:
-                        logger.info(f"💾 [TRANSLATOR] Traduction sauvegardée en base: {result.get('messageId')} -> {target_language}")
-                    else:
-                        logger.warning(f"⚠️ [TRANSLATOR] Échec sauvegarde en base: {result.get('messageId')} -> {target_language}")
-                else:
-                    logger.info(f"📋 [TRANSLATOR] Base de données non connectée, pas de sauvegarde pour: {result.get('messageId')} -> {target_language}")
-                    
-            except Exception as e:
-                logger.error(f"❌ [TRANSLATOR] Erreur sauvegarde base de données: {e}")
-            
-            # ENVOI À LA GATEWAY (seulement si traduction valide)
+            # ENVOI À LA GATEWAY en premier (seulement si traduction valide)
+            topic = self._topic_for(result.get('replyTopic'), result.get('conversationId'))
+            seq = self._record_result(message, result, target_language, topic)
+            if seq is not None:
+                message['outboxSeq'] = seq
             if self.pub_socket:
-                await self.pub_socket.send(json.dumps(message).encode('utf-8'))
+                await self._send_message(message, topic=topic)
                 logger.info(f"📤 [TRANSLATOR] Résultat envoyé à la Gateway: {task_id} -> {target_language}")
             else:
                 logger.error("❌ Socket PUB non initialisé")
             
+            # SAUVEGARDE en arrière-plan (file bornée), inutile pour une traduction relue en base
+            if not result.get('fromDatabase'):
+                await self._enqueue_persistence([self._build_save_data(result)])
+            
         except Exception as e:
             logger.error(f"Erreur lors de la publication du résultat enrichi: {e}")
             import traceback
             traceback.print_exc()
     
+    async def _publish_translation_batch(self, task: TranslationTask, results: list):
+        """
+        Publie toutes les langues d'une tâche dans un translation_batch_completed
+        
+        Un seul envoi PUB (ou un envoi par fenêtre de regroupement si
+        TRANSLATION_BATCH_FLUSH_MS > 0), puis une seule sauvegarde groupée en arrière-plan
+        """
+        try:
+            memory_usage = self.telemetry.memory_usage
+            cpu_usage = self.telemetry.cpu_usage
+            
+            topic = self._topic_for(task.reply_topic, task.conversation_id)
+            entries = []
+            save_items = []
+            for result, target_language in results:
+                translated_text = result.get('translatedText', '')
+                if not self._is_valid_translation(translated_text, result):
+                    logger.error(f"❌ [TRANSLATOR] Traduction invalide exclue du lot {task.task_id} -> {target_language}: {self._get_translation_error_reason(translated_text)}")
+                    continue
+                enriched_result = self._build_enriched_result(result, memory_usage, cpu_usage)
+                # Métriques système portées une seule fois par le lot
+                enriched_result.pop('memoryUsage', None)
+                enriched_result.pop('cpuUsage', None)
+                entry = {'taskId': task.task_id, 'targetLanguage': target_language, 'result': enriched_result}
+                # Chaque langue entre dans l'outbox sous la forme d'un translation_completed
+                seq = self._record_result({
+                    'type': 'translation_completed',
+                    'taskId': task.task_id,
+                    'result': enriched_result,
+                    'targetLanguage': target_language,
+                    'timestamp': time.time()
+                }, result, target_language, topic)
+                if seq is not None:
+                    entry['outboxSeq'] = seq
+                entries.append(entry)
+                if not result.get('fromDatabase'):
+                    save_items.append(self._build_save_data(result))
+            
+            if not entries:
+                return
+            
+            buffer = self._batch_buffers.setdefault(topic, [])
+            buffer.extend(entries)
+            if self.batch_flush_window <= 0 or len(buffer) >= self.batch_max_results:
+                await self._flush_batch(topic)
+            elif topic not in self._batch_flush_tasks:
+                self._batch_flush_tasks[topic] = asyncio.create_task(self._flush_batch_later(topic))
+            
+            if save_items and await self._enqueue_persistence(save_items):
+                self.batch_stats['batch_persist_calls'] += 1
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la publication du lot {task.task_id}: {e}")
+    
+    async def _flush_batch_later(self, topic: Optional[str]):
+        await asyncio.sleep(self.batch_flush_window)
+        self._batch_flush_tasks.pop(topic, None)
+        await self._flush_batch(topic)
+    
+    async def _flush_batch(self, topic: Optional[str]):
+        """Envoie les résultats accumulés pour un topic dans un seul message"""
+        entries = self._batch_buffers.pop(topic, [])
+        if not entries:
+            return
+        message = {
+            'type': 'translation_batch_completed',
+            'batchId': str(uuid.uuid4()),
+            'results': entries,
+            'count': len(entries),
+            'timestamp': time.time(),
+            'memoryUsage': self.telemetry.memory_usage,
+            'cpuUsage': self.telemetry.cpu_usage,
+            'processingNode': self.processing_node,
+            'version': '1.0.0'
+        }
+        if self.pub_socket:
+            await self._send_message(message, topic=topic)
+            self.batch_stats['batches_published'] += 1
+            self.batch_stats['batched_results'] += len(entries)
+            logger.info(f"📤 [TRANSLATOR] Lot de {len(entries)} résultat(s) envoyé à la Gateway")
+        else:
+            logger.error("❌ Socket PUB non initialisé")
+    
+    async def _flush_all_batches(self):
+        for task in self._batch_flush_tasks.values():
+            task.cancel()
+        self._batch_flush_tasks = {}
+        for topic in list(self._batch_buffers):
+            await self._flush_batch(topic)
+    
+    async def _lookup_existing_translations(self, message_id: str, target_languages: List[str]) -> Dict[str, dict]:
+        """Traductions déjà en base pour ce message (une seule requête pour toutes les langues)"""
+        if not message_id or not self.database_service.is_db_connected():
+            return {}
+        return await self.database_service.get_translations(message_id, target_languages)
+    
+    async def _enqueue_persistence(self, items: List[dict]) -> bool:
+        """Confie des traductions publiées au tampon de sauvegarde (attend s'il est plein)"""
+        if not self.database_service.is_db_connected():
+            self.persist_skipped_no_db += len(items)
+            logger.debug(f"📋 [TRANSLATOR] Base de données non connectée, pas de sauvegarde pour {len(items)} traduction(s)")
+            return False
+        for item in items:
+            await self.persist_buffer.put(item)
+        return True
+    
+    def _build_enriched_result(self, result: dict, memory_usage: float, cpu_usage: float) -> dict:
+        """Résultat enrichi des informations techniques publié vers la gateway"""
+        # Calculer le temps d'attente en queue
+        queue_time = time.time() - result.get('created_at', time.time())
+        
+        enriched_result = {
+            # Informations applicatives existantes
+            'messageId': result.get('messageId'),
+            'translatedText': result.get('translatedText'),
+            'sourceLanguage': result.get('sourceLanguage'),
+            'targetLanguage': result.get('targetLanguage'),
+            'confidenceScore': result.get('confidenceScore', 0.0),
+            'processingTime': result.get('processingTime', 0.0),
+            'modelType': result.get('modelType', 'basic'),
+            'workerName': result.get('workerName', 'unknown'),
+
+            # NOUVELLES INFORMATIONS TECHNIQUES
+            'translatorModel': result.get('modelType', 'basic'),  # Modèle ML utilisé
+            'workerId': result.get('workerName', 'unknown'),      # Worker qui a traité
+            'poolType': result.get('poolType', 'normal'),         # Pool utilisée (normal/any)
+            'translationTime': result.get('processingTime', 0.0), # Temps de traduction
+            'queueTime': queue_time,                              # Temps d'attente en queue
+            'memoryUsage': memory_usage,                          # Usage mémoire (MB)
+            'cpuUsage': cpu_usage,                                # Usage CPU (%)
+            'timestamp': time.time(),
+            'version': '1.0.0'  # Version du Translator
+        }
+
+        # Amélioration d'une traduction existante (planificateur d'inactivité)
+        if result.get('upgradedFrom'):
+            enriched_result['upgradedFrom'] = result['upgradedFrom']
+        # Traduction anticipée pendant la saisie (brouillon)
+        if result.get('fromDraft'):
+            enriched_result['fromDraft'] = True
+        # Traduction existante relue en base (aucune inférence)
+        if result.get('fromDatabase'):
+            enriched_result['fromDatabase'] = True
+        # Même contenu déjà traduit pour un autre message (mémoire de traduction)
+        if result.get('fromMemory'):
+            enriched_result['fromMemory'] = True
+        # Phrase fréquente servie par le recueil local
+        if result.get('fromPhrasebook'):
+            enriched_result['fromPhrasebook'] = True
+        # Traduction à la lecture d'une langue différée (get_or_translate)
+        if result.get('onDemandRequestId'):
+            enriched_result['onDemandRequestId'] = result['onDemandRequestId']
+        # Traduction de l'historique d'une conversation (translate_history)
+        if result.get('historyRequestId'):
+            enriched_result['historyRequestId'] = result['historyRequestId']
+        # Traduction progressive: délai jusqu'au premier fragment publié
+        if result.get('timeToFirstSegment') is not None:
+            enriched_result['timeToFirstSegment'] = result['timeToFirstSegment']
+        return enriched_result
+    
+    @staticmethod
+    def _build_save_data(result: dict) -> dict:
+        """Données de sauvegarde d'une traduction en base"""
+        return {
+            'messageId': result.get('messageId'),
+            'sourceLanguage': result.get('sourceLanguage'),
+            'targetLanguage': result.get('targetLanguage'),
+            'translatedText': result.get('translatedText'),
+            'translatorModel': result.get('translatorModel', result.get('modelType', 'basic')),
+            'confidenceScore': result.get('confidenceScore', 0.9),
+            'processingTime': result.get('processingTime', 0.0),
+            'workerName': result.get('workerName', 'unknown'),
+            'poolType': result.get('poolType', 'normal'),
+            'sourceSegments': result.get('sourceSegments'),
+            'translatedSegments': result.get('translatedSegments'),
+            'sourceEdited': result.get('sourceEdited', False)
+        }
+    
+    async def _publish_translation_partial(self, task: TranslationTask, target_language: str, fragment: dict):
+        """
+        Publie un fragment ordonné d'une traduction progressive (translation_partial)
+        
+        La concaténation des fragments (chunkIndex croissant) donne le texte final; le
+        dernier porte final=True et précède le translation_completed habituel
+        """
+        partial_message = {
+            'type': 'translation_partial',
+            'taskId': task.task_id,
+            'messageId': task.message_id,
+            'conversationId': task.conversation_id,
+            'targetLanguage': target_language,
+            'chunkIndex': fragment['chunkIndex'],
+            'segments': fragment['segments'],
+            'text': fragment['text'],
+            'final': fragment['final'],
+            'elapsed': time.time() - task.created_at,
+            'timestamp': time.time()
+        }
+        if self.pub_socket:
+            await self._send_message(partial_message, topic=self._topic_for(task.reply_topic, task.conversation_id))
+            self.pool_manager.stats['partials_published'] += 1
+        else:
+            logger.error("❌ Socket PUB non initialisé")
+    
+    async def _publish_task_skipped(self, task: TranslationTask, reason: str):
+        """Publie un message translation_skipped pour une tâche abandonnée"""
+        skipped_message = {
+            'type': 'translation_skipped',
+            'taskId': task.task_id,
+            'messageId': task.message_id,
+            'reason': reason,
+            'queueTime': time.time() - task.created_at,
+            'maxQueueAge': self.pool_manager.max_queue_age,
+            'targetLanguages': task.target_languages,
+            'conversationId': task.conversation_id
+        }
+        try:
+            if self.pub_socket:
+                await self._send_message(skipped_message, topic=self._topic_for(task.reply_topic, task.conversation_id))
+            else:
+                logger.error("❌ Socket PUB non initialisé")
+        except Exception as e:
+            logger.error(f"Erreur lors de la publication de translation_skipped: {e}")
+    
+    async def _publish_history_summary(self, summary: dict, reply_topic: Optional[str] = None):
+        """Publie le bilan history_translation_completed d'une traduction d'historique"""
+        try:
+            if self.pub_socket:
+                await self._send_message(summary, topic=self._topic_for(reply_topic, summary.get('conversationId')))
+            else:
+                logger.error("❌ Socket PUB non initialisé")
+        except Exception as e:
+            logger.error(f"Erreur lors de la publication de history_translation_completed: {e}")
+    
+    def _record_result(self, message: dict, result: dict, target_language: str, topic: Optional[str]) -> Optional[int]:
+        """Conserve un résultat publié dans l'outbox, retourne son numéro de séquence"""
+        if not self.result_outbox or not result.get('messageId'):
+            return None
+        return self.result_outbox.add(
+            result['messageId'], target_language, message, topic=topic,
+            text_hash=result.get('textHash'), model_type=result.get('modelType')
+        )
+    
+    def _handle_outbox_ack(self, request_data: dict):
+        """
+        Acquittement de la gateway, sous l'une des formes:
+        - {messageId, targetLanguage|targetLanguages?}: un message (toutes ses langues par défaut)
+        - {acks: [{messageId, targetLanguage?}, ...]}: acquittements groupés
+        - {upToSeq}: acquittement cumulatif jusqu'à un outboxSeq
+        """
+        if not self.result_outbox:
+            return
+        acks = list(request_data.get('acks') or [])
+        if request_data.get('messageId'):
+            acks.append(request_data)
+        acked = 0
+        for ack in acks:
+            languages = ack.get('targetLanguages')
+            if languages is None and ack.get('targetLanguage'):
+                languages = [ack['targetLanguage']]
+            acked += self.result_outbox.ack(ack.get('messageId'), languages)
+        if request_data.get('upToSeq') is not None:
+            acked += self.result_outbox.ack_through(int(request_data['upToSeq']))
+        logger.debug(f"📮 [TRANSLATOR] {acked} résultat(s) acquitté(s), {self.result_outbox.pending} en attente")
+    
+    async def _replay_outbox(self, request_data: dict):
+        """
+        replay_since: renvoie les résultats non acquittés de séquence > sinceSeq
+        (et publiés après 'since' si fourni), puis un replay_completed
+        """
+        reply_topic = self._reply_topic(request_data)
+        since_seq = int(request_data.get('sinceSeq') or 0)
+        entries = []
+        if self.result_outbox:
+            entries = self.result_outbox.since(
+                since_seq,
+                since_time=request_data.get('since'),
+                topic=reply_topic,
+                limit=request_data.get('limit')
+            )
+        for entry in entries:
+            await self._send_message({**entry.message, 'outboxSeq': entry.seq, 'replayed': True}, topic=entry.topic)
+        await self._send_message({
+            'type': 'replay_completed',
+            'sinceSeq': since_seq,
+            'count': len(entries),
+            'lastSeq': self.result_outbox.last_seq if self.result_outbox else 0,
+            'processingNode': self.processing_node,
+            'timestamp': time.time()
+        }, topic=self._topic_for(reply_topic))
+        logger.info(f"📮 [TRANSLATOR] Rejeu depuis {since_seq}: {len(entries)} résultat(s) renvoyé(s)")
+    
+    async def _serve_from_drafts(self, request_data: dict, target_languages: List[str]) -> List[str]:
+        """Publie les langues pré-traduites pendant la saisie, retourne celles à traduire"""
+        text = request_data.get('text', '')
+        source_language = request_data.get('sourceLanguage', 'fr')
+        model_type = request_data.get('modelType', 'basic')
+        conversation_id = request_data.get('conversationId', 'unknown')
+        task_id = None
+        remaining = []
+        for target_language in target_languages:
+            cached = self.draft_translator.lookup(text, source_language, target_language, model_type)
+            if cached is None:
+                remaining.append(target_language)
+                continue
+            task_id = task_id or str(uuid.uuid4())
+            await self._publish_translation_result(task_id, {
+                'messageId': request_data.get('messageId'),
+                'translatedText': cached['translated_text'],
+                'sourceLanguage': cached.get('detected_language', source_language),
+                'targetLanguage': target_language,
+                'confidenceScore': cached.get('confidence', 0.95),
+                'processingTime': cached.get('processing_time', 0.0),
+                'modelType': model_type,
+                'workerName': 'draft',
+                'segmentsCount': cached.get('segments_count', 0),
+                'emojisCount': cached.get('emojis_count', 0),
+                'poolType': 'any' if conversation_id == 'any' else 'normal',
+                'created_at': time.time(),
+                'conversationId': conversation_id,
+                'replyTopic': self._reply_topic(request_data),
+                'textHash': text_fingerprint(text),
+                'fromDraft': True
+            }, target_language)
+        served = len(target_languages) - len(remaining)
+        if served:
+            logger.info(f"✏️ [TRANSLATOR] {served} langue(s) publiée(s) depuis le brouillon pour {request_data.get('messageId')}")
+        return remaining
+    
+    async def _serve_from_outbox(self, request_data: dict, target_languages: List[str]) -> List[str]:
+        """Renvoie les langues déjà présentes dans l'outbox, retourne celles à traduire"""
+        message_id = request_data.get('messageId')
+        if not message_id:
+            return target_languages
+        text_hash = text_fingerprint(request_data.get('text'))
+        requested_level = MODEL_HIERARCHY.get(request_data.get('modelType', 'basic'), 1)
+        topic = self._topic_for(self._reply_topic(request_data), request_data.get('conversationId', 'unknown'))
+        remaining = []
+        for target_language in target_languages:
+            entry = self.result_outbox.find(message_id, target_language, text_hash)
+            # Un résultat d'un modèle inférieur à celui demandé est retraduit
+            if entry is None or MODEL_HIERARCHY.get(entry.model_type, 0) < requested_level:
+                remaining.append(target_language)
+                continue
+            await self._send_message({**entry.message, 'outboxSeq': entry.seq, 'replayed': True}, topic=topic)
+        served = len(target_languages) - len(remaining)
+        if served:
+            logger.info(f"📮 [TRANSLATOR] {served} langue(s) servie(s) depuis l'outbox pour {message_id}")
+        return remaining
+    
+    def _register_peer_protocol(self, ping: dict) -> str:
+        """Enregistre le format négocié par une gateway (absent = gateway historique, JSON)"""
+        protocol = negotiate_protocol(ping.get('protocols'), self.wire_protocols)
+        peer_id = ping.get('gatewayId', 'default')
+        previous = self.peer_protocols.get(peer_id, {}).get('protocol')
+        self.peer_protocols[peer_id] = {'protocol': protocol, 'last_seen': time.time()}
+        if previous != protocol:
+            logger.info(f"🔀 [TRANSLATOR] Format négocié avec {peer_id}: {protocol} (sortie: {self._output_protocol()})")
+        return protocol
+    
+    def _output_protocol(self) -> str:
+        """Format de publication: binaire seulement si tous les pairs actifs l'ont négocié"""
+        cutoff = time.time() - self.peer_protocol_ttl
+        for peer_id in [p for p, info in self.peer_protocols.items() if info['last_seen'] < cutoff]:
+            del self.peer_protocols[peer_id]
+        if self.peer_protocols and all(info['protocol'] == PROTOCOL_MSGPACK_V1 for info in self.peer_protocols.values()):
+            return PROTOCOL_MSGPACK_V1
+        return PROTOCOL_JSON
+    
+    def _reply_topic(self, request_data: dict) -> Optional[str]:
+        """Topic de réponse demandé par la gateway (ignoré s'il est invalide)"""
+        reply_topic = request_data.get('replyTopic')
+        if reply_topic is None:
+            return None
+        if not is_valid_topic(reply_topic):
+            self.wire_stats['invalid_topics'] += 1
+            logger.warning(f"⚠️ [TRANSLATOR] replyTopic invalide ignoré: {str(reply_topic)[:64]!r}")
+            return None
+        return reply_topic
+    
+    def _topic_for(self, reply_topic: Optional[str] = None, conversation_id: Optional[str] = None) -> Optional[str]:
+        """Topic PUB d'un message: topic de réponse, shard de conversation ou aucun (trame unique)"""
+        if reply_topic:
+            return reply_topic
+        if self.topic_mode == 'shard':
+            return conversation_shard_topic(conversation_id, self.topic_shards) if conversation_id else 'all'
+        return None
+    
+    @staticmethod
+    def _message_size(message) -> int:
+        frames = [message] if isinstance(message, (bytes, bytearray, memoryview)) or hasattr(message, 'buffer') else message
+        return sum(len(getattr(frame, 'buffer', frame)) for frame in frames)
+    
+    async def _send_message(self, message: dict, protocol: Optional[str] = None, topic: Optional[str] = None):
+        """Publie un message via PUB dans le format négocié (trames multipart sans copie)"""
+        protocol = protocol or self._output_protocol()
+        frames = encode_message(message, protocol, topic)
+        if self.cluster_socket:
+            # Le broker republie les trames telles quelles sur son PUB
+            await self.pub_socket.send_multipart([b'PUB', *frames], copy=False)
+        else:
+            await self.pub_socket.send_multipart(frames, copy=False)
+        self.wire_stats['messages_sent'] += 1
+        self.wire_stats['bytes_sent'] += sum(len(frame) for frame in frames)
+        self.wire_stats['sent_by_protocol'][protocol] += 1
+        if not topic:
+            topic_kind = 'none'
+        elif topic == 'all':
+            topic_kind = 'broadcast'
+        else:
+            topic_kind = 'shard' if topic.startswith('conv.') else 'reply'
+        self.wire_stats['sent_by_topic_kind'][topic_kind] += 1
+    
     def _is_valid_translation(self, translated_text: str, result: dict) -> bool:
         """
         Vérifie si une traduction est valide et peut être envoyée à la Gateway
@@ -969,13 +2411,38 @@ class ZMQTranslationServer:
         """Arrête le serveur"""
         self.running = False
         
-        # Arrêter les workers
+        # Arrêter les boucles du mode cluster
+        for task in self._cluster_tasks:
+            task.cancel()
+        await asyncio.gather(*self._cluster_tasks, return_exceptions=True)
+        self._cluster_tasks = []
+        
+        # Arrêter les brouillons, l'historique, les traductions à la demande, la porte de disponibilité, le planificateur d'amélioration puis les workers
+        await self.draft_translator.stop()
+        await self.history_translator.stop()
+        await self.on_demand_translator.stop()
+        await self.readiness_gate.stop()
+        await self.upgrade_scheduler.stop()
         await self.pool_manager.stop_workers()
         
         # Attendre que tous les workers se terminent
         if self.worker_tasks:
             await asyncio.gather(*self.worker_tasks, return_exceptions=True)
         
+        # Envoyer les lots de résultats encore en attente puis terminer les sauvegardes
+        await self._flush_all_batches()
+        if self.translation_memory:
+            await self.translation_memory.stop(timeout=self.persist_drain_timeout)
+        await self.persist_buffer.stop(timeout=self.persist_drain_timeout)
+        await self.telemetry.stop()
+        
+        # Fermer le journal des tâches après l'arrêt des workers
+        self.pool_manager.close_journal()
+        if self.pool_manager.phrasebook:
+            self.pool_manager.phrasebook.close()
+        if self.result_outbox:
+            self.result_outbox.close()
+        
         # Fermer la connexion à la base de données
         await self.database_service.disconnect()
         
@@ -997,6 +2464,48 @@ class ZMQTranslationServer:
             'gateway_sub_port': self.gateway_sub_port,
             'normal_workers': self.pool_manager.normal_workers,
             'any_workers': self.pool_manager.any_workers,
+            'upgrade_scheduler': self.upgrade_scheduler.get_stats(),
+            'readiness_gate': self.readiness_gate.get_stats(),
+            'cluster': {
+                'enabled': bool(self.cluster_broker),
+                'broker': self.cluster_broker,
+                'node_id': self.node_id,
+                'credits_in_use': len(self._credit_tasks),
+                'capacity': self.cluster_capacity
+            },
+            'ingress': {
+                **self.ingress_stats,
+                'messages_per_sec': self._ingress_rate(),
+                'avg_batch_size': self.ingress_stats['messages'] / max(1, self.ingress_stats['batches']),
+                'batch_limit': self.ingress_batch_size,
+                'ipc_dir': self.ipc_dir
+            },
+            'outbox': self.result_outbox.get_stats() if self.result_outbox else None,
+            'persistence': {
+                **self.persist_buffer.get_stats(),
+                'skipped_no_db': self.persist_skipped_no_db
+            },
+            'telemetry': self.telemetry.get_stats(),
+            'drafts': self.draft_translator.get_stats(),
+            'history': self.history_translator.get_stats(),
+            'on_demand': self.on_demand_translator.get_stats(),
+            'translation_memory': self.translation_memory.get_stats() if self.translation_memory else None,
+            'batching': {
+                **self.batch_stats,
+                'default_enabled': self.batch_results_default,
+                'flush_window_ms': self.batch_flush_window * 1000,
+                'pending_results': sum(len(entries) for entries in self._batch_buffers.values())
+            },
+            'wire': {
+                **self.wire_stats,
+                'sent_by_protocol': dict(self.wire_stats['sent_by_protocol']),
+                'sent_by_topic_kind': dict(self.wire_stats['sent_by_topic_kind']),
+                'topic_mode': self.topic_mode,
+                'topic_shards': self.topic_shards,
+                'output_protocol': self._output_protocol(),
+                'supported_protocols': self.wire_protocols,
+                'peers': {peer_id: info['protocol'] for peer_id, info in self.peer_protocols.items()}
+            },
             **pool_stats
         }
     
@@ -0,0 +1,141 @@
+"""
+Traduction en masse de l'historique (rattrapage hors ligne)
+Planification des traductions manquantes, point de reprise et ralentissement quand
+le service en ligne est chargé; utilisés par scripts/backfill_translations.py.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackfillItem:
+    """Une traduction à produire"""
+    message_id: str
+    text: str
+    source_language: str
+    target_language: str
+
+
+def plan_translation_work(messages: Iterable[Dict],
+                          existing: Dict[Tuple[str, str], str],
+                          target_languages: List[str],
+                          model_type: str,
+                          hierarchy: Dict[str, int]) -> Tuple[List[BackfillItem], int]:
+    """
+    Traductions manquantes d'une page de messages
+
+    Args:
+        messages: {'id', 'content', 'originalLanguage'}
+        existing: (messageId, langue) -> modèle de la traduction en base
+        target_languages: Langues à produire
+        model_type: Niveau demandé (une traduction de niveau >= est conservée)
+        hierarchy: Niveau de chaque modèle
+
+    Returns:
+        (travail trié par paire de langues puis longueur, nombre de traductions ignorées)
+    """
+    requested = hierarchy.get(model_type, 1)
+    items = []
+    skipped = 0
+    for message in messages:
+        text = message.get('content') or ''
+        source_language = message.get('originalLanguage') or 'fr'
+        if not text.strip():
+            continue
+        for target_language in target_languages:
+            if target_language == source_language:
+                continue
+            current = existing.get((message['id'], target_language))
+            if current is not None and hierarchy.get(current, 1) >= requested:
+                skipped += 1
+                continue
+            items.append(BackfillItem(message['id'], text, source_language, target_language))
+    # Lots homogènes: même paire de langues, longueurs voisines (moins de remplissage)
+    items.sort(key=lambda item: (item.source_language, item.target_language, len(item.text)))
+    return items, skipped
+
+
+def chunked(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), max(1, size)):
+        yield items[start:start + size]
+
+
+@dataclass
+class BackfillCheckpoint:
+    """Point de reprise: dernier message traité et compteurs cumulés"""
+    languages: List[str]
+    model_type: str
+    last_message_id: Optional[str] = None
+    messages_scanned: int = 0
+    translated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    updated_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def load(cls, path: str, languages: List[str], model_type: str) -> 'BackfillCheckpoint':
+        """Reprend le point enregistré s'il correspond aux mêmes langues et niveau"""
+        if not os.path.exists(path):
+            return cls(languages=sorted(languages), model_type=model_type)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        checkpoint = cls(**data)
+        if checkpoint.languages != sorted(languages) or checkpoint.model_type != model_type:
+            raise ValueError(
+                f"Point de reprise {path} créé pour {checkpoint.languages}/{checkpoint.model_type}, "
+                f"utiliser --reset pour {sorted(languages)}/{model_type}"
+            )
+        return checkpoint
+
+    def save(self, path: str):
+        """Écriture atomique (fichier temporaire puis remplacement)"""
+        self.updated_at = time.time()
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+
+
+class LoadThrottle:
+    """
+    Ralentit le rattrapage quand la machine est occupée par d'autres processus
+
+    La charge propre du rattrapage est retirée de la charge machine: seul le CPU
+    consommé par le reste (service en ligne, base) déclenche la pause.
+    """
+
+    def __init__(self, max_cpu_percent: float = 60.0, pause: float = 2.0):
+        self.max_cpu_percent = max_cpu_percent
+        self.pause = pause
+        self.cpu_count = psutil.cpu_count() or 1
+        self._process = psutil.Process()
+        self._process.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None)
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    def other_load(self) -> float:
+        """CPU machine utilisé hors de ce processus (% de la capacité totale)"""
+        own = self._process.cpu_percent(interval=None) / self.cpu_count
+        return max(0.0, psutil.cpu_percent(interval=None) - own)
+
+    async def wait_until_idle(self):
+        load = self.other_load()
+        while load > self.max_cpu_percent:
+            self.waits += 1
+            logger.info(f"⏸️ [BACKFILL] Charge externe {load:.0f}% > {self.max_cpu_percent:.0f}%, pause {self.pause:.0f}s")
+            await asyncio.sleep(self.pause)
+            self.waited_seconds += self.pause
+            load = self.other_load()
@@ -0,0 +1,151 @@
+"""
+Politique de répartition du mode cluster (broker ROUTER <-> nœuds DEALER)
+- Crédits: chaque nœud annonce sa capacité, une requête consomme un crédit,
+  le nœud le rend quand la tâche est terminée ou rejetée
+- Battements de cœur: capacité, niveaux de modèle chargés, profondeur de file
+- Affinité: une conversation retourne sur le dernier nœud qui l'a traitée
+  (localité des caches) sauf si celui-ci est surchargé
+"""
+
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class NodeState:
+    """État connu d'un nœud de traduction"""
+    node_id: bytes
+    capacity: int = 0
+    credits: int = 0
+    tiers: List[str] = field(default_factory=list)
+    queue_depth: int = 0
+    active_workers: int = 0
+    last_seen: float = field(default_factory=time.time)
+    dispatched: int = 0
+
+    @property
+    def load(self) -> float:
+        """Charge relative: tâches engagées (crédits consommés) / capacité"""
+        if self.capacity <= 0:
+            return 1.0
+        return (self.capacity - self.credits) / self.capacity
+
+
+class ClusterDispatcher:
+    """Choisit le nœud destinataire d'une requête de traduction"""
+
+    def __init__(self,
+                 heartbeat_timeout: Optional[float] = None,
+                 affinity_max_load: Optional[float] = None,
+                 affinity_size: Optional[int] = None):
+        self.heartbeat_timeout = heartbeat_timeout or float(os.getenv('CLUSTER_HEARTBEAT_TIMEOUT', '5'))
+        self.affinity_max_load = affinity_max_load or float(os.getenv('CLUSTER_AFFINITY_MAX_LOAD', '0.8'))
+        self.affinity_size = affinity_size or int(os.getenv('CLUSTER_AFFINITY_SIZE', '100000'))
+
+        self.nodes: Dict[bytes, NodeState] = {}
+        self._affinity: "OrderedDict[str, bytes]" = OrderedDict()
+
+        self.stats = {
+            'dispatched': 0,
+            'affinity_hits': 0,
+            'affinity_overridden': 0,
+            'tier_misses': 0,
+            'no_credit': 0,
+            'nodes_expired': 0
+        }
+
+    def register(self, node_id: bytes, status: Dict) -> NodeState:
+        """Nœud (re)connecté: ses crédits repartent de sa capacité annoncée"""
+        capacity = int(status.get('capacity', 0))
+        node = NodeState(node_id=node_id, capacity=capacity, credits=int(status.get('credits', capacity)))
+        self.nodes[node_id] = node
+        self.heartbeat(node_id, status)
+        return node
+
+    def heartbeat(self, node_id: bytes, status: Dict) -> Optional[NodeState]:
+        node = self.nodes.get(node_id)
+        if node is None:
+            return None
+        node.tiers = list(status.get('tiers', node.tiers))
+        node.queue_depth = int(status.get('queueDepth', node.queue_depth))
+        node.active_workers = int(status.get('activeWorkers', node.active_workers))
+        node.last_seen = time.time()
+        return node
+
+    def add_credits(self, node_id: bytes, credits: int) -> Optional[NodeState]:
+        node = self.nodes.get(node_id)
+        if node is None:
+            return None
+        node.credits = min(node.capacity, node.credits + credits)
+        node.last_seen = time.time()
+        return node
+
+    def expire(self) -> List[bytes]:
+        """Retire les nœuds sans battement de cœur récent"""
+        cutoff = time.time() - self.heartbeat_timeout
+        expired = [node_id for node_id, node in self.nodes.items() if node.last_seen < cutoff]
+        for node_id in expired:
+            del self.nodes[node_id]
+        self.stats['nodes_expired'] += len(expired)
+        return expired
+
+    def has_credit(self) -> bool:
+        return any(node.credits > 0 for node in self.nodes.values())
+
+    def select(self, conversation_id: Optional[str], model_type: Optional[str] = None) -> Optional[bytes]:
+        """Nœud à utiliser (crédit consommé), None si aucun nœud n'a de crédit"""
+        available = [node for node in self.nodes.values() if node.credits > 0]
+        if not available:
+            self.stats['no_credit'] += 1
+            return None
+
+        # Préférer les nœuds ayant chargé le niveau demandé
+        if model_type:
+            with_tier = [node for node in available if model_type in node.tiers]
+            if with_tier:
+                available = with_tier
+            else:
+                self.stats['tier_misses'] += 1
+
+        chosen = None
+        preferred = self._affinity.get(conversation_id) if conversation_id else None
+        if preferred is not None:
+            node = self.nodes.get(preferred)
+            if node in available and node.load < self.affinity_max_load:
+                chosen = node
+                self.stats['affinity_hits'] += 1
+            else:
+                self.stats['affinity_overridden'] += 1
+
+        if chosen is None:
+            chosen = min(available, key=lambda n: (n.load, n.queue_depth, -n.credits))
+
+        chosen.credits -= 1
+        chosen.dispatched += 1
+        self.stats['dispatched'] += 1
+        if conversation_id:
+            self._affinity[conversation_id] = chosen.node_id
+            self._affinity.move_to_end(conversation_id)
+            while len(self._affinity) > self.affinity_size:
+                self._affinity.popitem(last=False)
+        return chosen.node_id
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'nodes': {
+                node_id.decode('utf-8', 'replace'): {
+                    'capacity': node.capacity,
+                    'credits': node.credits,
+                    'tiers': node.tiers,
+                    'queueDepth': node.queue_depth,
+                    'activeWorkers': node.active_workers,
+                    'dispatched': node.dispatched,
+                    'load': node.load
+                } for node_id, node in self.nodes.items()
+            },
+            'affinity_entries': len(self._affinity)
+        }
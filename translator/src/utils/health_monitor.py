@@ -0,0 +1,110 @@
+"""
+Surveillance de santé en arrière-plan
+Chaque composant (base, ZMQ, modèles) est sondé à son propre intervalle par une tâche de
+fond; les routes /health, /ready et /live lisent le dernier état connu et son âge, sans
+aucun appel vers les composants pendant la requête.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    États de santé mis en cache par composant
+
+    - Sonde bornée par un délai: une sonde qui ne répond pas donne un état 'error'
+    - Un état plus vieux que stale_factor intervalles est signalé 'stale'
+      (boucle de sonde bloquée ou arrêtée)
+    """
+
+    def __init__(self, default_interval: float = 10.0, timeout: float = 2.0, stale_factor: float = 3.0):
+        self.default_interval = default_interval
+        self.timeout = timeout
+        self.stale_factor = stale_factor
+        self._probes: Dict[str, Dict[str, Any]] = {}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {'probes_run': 0, 'probe_errors': 0, 'probe_timeouts': 0}
+
+    def register(self, name: str, probe: Callable[[], Awaitable[Dict[str, Any]]], interval: Optional[float] = None):
+        """Déclare un composant (sonde lue à chaque tour: remplaçable à chaud)"""
+        self._probes[name] = {'probe': probe, 'interval': interval or self.default_interval}
+
+    def start(self):
+        for name in self._probes:
+            if name not in self._tasks:
+                self._tasks[name] = asyncio.create_task(self._probe_loop(name))
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks.values())
+
+    async def _probe_loop(self, name: str):
+        while True:
+            await self.refresh(name)
+            await asyncio.sleep(self._probes[name]['interval'])
+
+    async def refresh(self, name: str) -> Dict[str, Any]:
+        """Exécute la sonde d'un composant et met à jour son état"""
+        started = time.time()
+        try:
+            status = await asyncio.wait_for(self._probes[name]['probe'](), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.stats['probe_timeouts'] += 1
+            status = {'status': 'error', 'error': f"probe timeout ({self.timeout:.1f}s)"}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats['probe_errors'] += 1
+            logger.warning(f"⚠️ [TRANSLATOR] Sonde de santé {name} en échec: {e}")
+            status = {'status': 'error', 'error': str(e)}
+        self.stats['probes_run'] += 1
+        self._snapshots[name] = {
+            'status': status,
+            'checked_at': time.time(),
+            'probe_ms': (time.time() - started) * 1000
+        }
+        return status
+
+    def snapshot(self, name: str) -> Dict[str, Any]:
+        """Dernier état connu d'un composant, avec son âge"""
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            return {'status': 'pending', 'checked_at': None, 'age_seconds': None}
+        age = time.time() - snapshot['checked_at']
+        status = dict(snapshot['status'])
+        interval = self._probes.get(name, {}).get('interval', self.default_interval)
+        if age > interval * self.stale_factor:
+            status['status'] = 'stale'
+        return {
+            **status,
+            'checked_at': snapshot['checked_at'],
+            'age_seconds': age,
+            'probe_ms': snapshot['probe_ms']
+        }
+
+    def oldest_age(self) -> Optional[float]:
+        """Âge de l'état le plus ancien (None tant qu'un composant n'a jamais été sondé)"""
+        if not self._probes or len(self._snapshots) < len(self._probes):
+            return None
+        now = time.time()
+        return max(now - snapshot['checked_at'] for snapshot in self._snapshots.values())
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'components': {name: probe['interval'] for name, probe in self._probes.items()},
+            'running': self.running
+        }
@@ -0,0 +1,56 @@
+"""
+Retraduction incrémentale des messages modifiés
+Les lignes traduisibles (segments 'line' de TextSegmenter) du nouveau texte sont comparées
+à celles du texte précédent, conservées avec la traduction en base: seules les lignes
+modifiées repassent par le modèle, les autres reprennent leur traduction enregistrée.
+"""
+
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+
+def line_texts(segmenter, segments: List[Dict], emojis_map: Dict[int, str]) -> List[str]:
+    """
+    Texte des segments traduisibles, emojis restaurés
+
+    Les marqueurs d'emojis sont numérotés dans tout le message: un emoji ajouté plus haut
+    décale les suivants, d'où la comparaison sur le texte restauré.
+    """
+    return [
+        segmenter.restore_segment_emojis(segment['text'], emojis_map)
+        for segment in segments if segment['type'] == 'line'
+    ]
+
+
+def plan_segment_reuse(previous_source: Optional[List[str]],
+                       previous_translated: Optional[List[str]],
+                       new_lines: List[str]) -> Dict[int, str]:
+    """
+    Traductions réutilisables pour les lignes du nouveau texte
+
+    Args:
+        previous_source: Lignes du texte précédent (ordre d'origine)
+        previous_translated: Traduction de chacune de ces lignes
+        new_lines: Lignes du nouveau texte
+
+    Returns:
+        Dict: position de la ligne dans new_lines -> traduction enregistrée
+    """
+    if not previous_source or not previous_translated or len(previous_source) != len(previous_translated):
+        return {}
+
+    reused = {}
+    matcher = SequenceMatcher(None, previous_source, new_lines, autojunk=False)
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == 'equal':
+            for offset in range(new_end - new_start):
+                reused[new_start + offset] = previous_translated[old_start + offset]
+
+    # Lignes déplacées (paragraphes réordonnés): même texte, traduction identique
+    by_text = {}
+    for source, translated in zip(previous_source, previous_translated):
+        by_text.setdefault(source, translated)
+    for position, line in enumerate(new_lines):
+        if position not in reused and line in by_text:
+            reused[position] = by_text[line]
+    return reused
@@ -0,0 +1,258 @@
+"""
+Voies d'inférence par niveau de modèle (basic/medium/premium)
+Chaque voie a sa propre concurrence, son nombre de threads intra-op et une affinité CPU
+optionnelle, dérivés du nombre de cœurs détectés et du quota CPU du cgroup
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Part du budget CPU et plafond de threads intra-op par niveau
+DEFAULT_LANE_SHARES = {
+    'basic': 0.25,
+    'medium': 0.35,
+    'premium': 0.40
+}
+DEFAULT_MAX_INTRA_OP = {
+    'basic': 1,
+    'medium': 2,
+    'premium': 4
+}
+
+
+def _read_cgroup_cpu_limit() -> Optional[float]:
+    """Quota CPU du cgroup en nombre de cœurs (v2 puis v1), None si illimité"""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+            if quota != 'max':
+                return int(quota) / int(period)
+            return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read().strip())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read().strip())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def detect_cpu_budget() -> Dict[str, Any]:
+    """Cœurs utilisables: affinité du processus, plafonnée par le quota du cgroup"""
+    try:
+        available_cpus = sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        available_cpus = list(range(os.cpu_count() or 1))
+    cgroup_limit = _read_cgroup_cpu_limit()
+    effective = len(available_cpus)
+    if cgroup_limit is not None:
+        effective = max(1, min(effective, math.floor(cgroup_limit)))
+    return {
+        'available_cpus': available_cpus,
+        'cgroup_limit': cgroup_limit,
+        'effective_cores': effective
+    }
+
+
+def _parse_cpu_list(value: str) -> List[int]:
+    """Parse une liste de CPUs au format '0-3,6,8-9'"""
+    cpus = []
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+@dataclass
+class LaneConfig:
+    """Configuration d'une voie d'inférence"""
+    name: str
+    concurrency: int
+    intra_op_threads: int
+    cpus: List[int] = field(default_factory=list)
+
+
+def _group_tiers(tiers: List[str], cores: int) -> List[List[str]]:
+    """Une voie par niveau, ou moins de cœurs que de niveaux: les niveaux inférieurs partagent une voie"""
+    if cores >= len(tiers):
+        return [[tier] for tier in tiers]
+    lanes = max(1, cores)
+    merged = len(tiers) - lanes + 1
+    return [tiers[:merged]] + [[tier] for tier in tiers[merged:]]
+
+
+def _allocate_cores(cores: int, shares: List[float]) -> List[int]:
+    """Cœurs par voie proportionnels aux parts (au moins un chacun), somme égale au budget"""
+    total_share = sum(shares) or 1.0
+    exact = [cores * share / total_share for share in shares]
+    allocation = [max(1, math.floor(value)) for value in exact]
+    # Reste distribué par plus grande partie fractionnaire, excédent retiré aux plus grandes voies
+    by_remainder = sorted(range(len(shares)), key=lambda i: exact[i] - math.floor(exact[i]), reverse=True)
+    i = 0
+    while sum(allocation) < cores:
+        allocation[by_remainder[i % len(shares)]] += 1
+        i += 1
+    while sum(allocation) > cores and max(allocation) > 1:
+        allocation[allocation.index(max(allocation))] -= 1
+    return allocation
+
+
+def plan_lanes(tiers: List[str], budget: Optional[Dict[str, Any]] = None) -> Dict[str, LaneConfig]:
+    """
+    Répartit le budget CPU entre les niveaux de modèle
+
+    Par défaut la somme concurrence x threads intra-op des voies est égale au budget
+    (au plus): avec moins de cœurs que de niveaux, les niveaux inférieurs partagent une
+    même voie (le même LaneConfig est alors retourné pour chacun d'eux).
+    Surcharges possibles par variables d'environnement:
+    INFERENCE_LANE_<TIER>_CONCURRENCY, INFERENCE_LANE_<TIER>_THREADS, INFERENCE_LANE_<TIER>_CPUS
+    (pour une voie partagée, celles du niveau le plus élevé) et INFERENCE_LANE_AFFINITY=true
+    pour épingler chaque voie sur des cœurs disjoints.
+    """
+    budget = budget or detect_cpu_budget()
+    cores = max(1, budget['effective_cores'])
+    available_cpus = budget['available_cpus']
+    pin = os.getenv('INFERENCE_LANE_AFFINITY', 'false').lower() == 'true'
+
+    groups = _group_tiers(tiers, cores)
+    shares = [sum(DEFAULT_LANE_SHARES.get(tier, 1.0 / len(tiers)) for tier in group) for group in groups]
+    allocation = _allocate_cores(cores, shares)
+
+    lanes = {}
+    next_cpu = 0
+    for group, lane_cores in zip(groups, allocation):
+        top_tier = group[-1]
+        env_prefix = f"INFERENCE_LANE_{top_tier.upper()}"
+
+        threads = int(os.getenv(f"{env_prefix}_THREADS", '0')) or max(1, min(DEFAULT_MAX_INTRA_OP.get(top_tier, 2), lane_cores))
+        concurrency = int(os.getenv(f"{env_prefix}_CONCURRENCY", '0')) or max(1, lane_cores // threads)
+
+        cpus: List[int] = []
+        explicit_cpus = os.getenv(f"{env_prefix}_CPUS")
+        if explicit_cpus:
+            cpus = _parse_cpu_list(explicit_cpus)
+        elif pin and available_cpus:
+            # Tranche disjointe de cœurs (reboucle si le budget est dépassé)
+            cpus = [available_cpus[(next_cpu + i) % len(available_cpus)] for i in range(lane_cores)]
+            next_cpu += lane_cores
+
+        config = LaneConfig(name='+'.join(group), concurrency=concurrency, intra_op_threads=threads, cpus=cpus)
+        for tier in group:
+            lanes[tier] = config
+    return lanes
+
+
+def _configure_lane_thread(lane: LaneConfig):
+    """Initialiseur de thread: threads intra-op (OpenMP par thread) et affinité CPU"""
+    try:
+        import torch
+        torch.set_num_threads(lane.intra_op_threads)
+    except Exception:
+        pass
+    if lane.cpus and hasattr(os, 'sched_setaffinity'):
+        try:
+            # Sous Linux, pid 0 désigne le thread appelant
+            os.sched_setaffinity(0, set(lane.cpus))
+        except OSError as e:
+            logger.warning(f"[INFERENCE-LANES] ⚠️ Affinité CPU impossible pour {lane.name}: {e}")
+
+
+class InferenceLane:
+    """Exécuteur dédié à un niveau de modèle avec mesure d'attente et d'utilisation"""
+
+    def __init__(self, config: LaneConfig):
+        self.config = config
+        self.executor = ThreadPoolExecutor(
+            max_workers=config.concurrency,
+            thread_name_prefix=f"lane-{config.name}",
+            initializer=_configure_lane_thread,
+            initargs=(config,)
+        )
+        self._lock = threading.Lock()
+        self._created_at = time.time()
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'active': 0,
+            'queued': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'busy_time': 0.0
+        }
+
+    async def run(self, func: Callable[[], Any]) -> Any:
+        """Exécute une fonction bloquante dans la voie"""
+        submitted_at = time.time()
+        with self._lock:
+            self.stats['submitted'] += 1
+            self.stats['queued'] += 1
+
+        def timed():
+            started_at = time.time()
+            wait_time = started_at - submitted_at
+            with self._lock:
+                self.stats['queued'] -= 1
+                self.stats['active'] += 1
+                self.stats['total_wait_time'] += wait_time
+                self.stats['max_wait_time'] = max(self.stats['max_wait_time'], wait_time)
+            try:
+                return func()
+            finally:
+                with self._lock:
+                    self.stats['active'] -= 1
+                    self.stats['completed'] += 1
+                    self.stats['busy_time'] += time.time() - started_at
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, timed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        elapsed = max(time.time() - self._created_at, 1e-6)
+        with self._lock:
+            stats = dict(self.stats)
+        completed = stats['completed'] or 1
+        return {
+            **stats,
+            'concurrency': self.config.concurrency,
+            'intra_op_threads': self.config.intra_op_threads,
+            'cpus': self.config.cpus,
+            'avg_wait_time': stats['total_wait_time'] / completed,
+            'utilization': stats['busy_time'] / (elapsed * self.config.concurrency)
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+def create_inference_lanes(tiers: List[str]) -> Dict[str, InferenceLane]:
+    """Crée une voie d'inférence par niveau de modèle"""
+    budget = detect_cpu_budget()
+    plan = plan_lanes(tiers, budget)
+    logger.info(f"[INFERENCE-LANES] 🧮 Budget CPU: {budget['effective_cores']} cœurs (cgroup: {budget['cgroup_limit']})")
+    # Une voie partagée par plusieurs niveaux n'a qu'un exécuteur
+    executors: Dict[int, InferenceLane] = {}
+    for config in plan.values():
+        if id(config) not in executors:
+            logger.info(f"[INFERENCE-LANES] 🛣️ {config.name}: concurrence={config.concurrency}, threads intra-op={config.intra_op_threads}, cpus={config.cpus or 'tous'}")
+            executors[id(config)] = InferenceLane(config)
+    return {tier: executors[id(config)] for tier, config in plan.items()}
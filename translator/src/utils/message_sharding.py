@@ -0,0 +1,82 @@
+"""
+Découpage des messages très longs en fragments traduisibles en parallèle
+Les coupures se font uniquement aux sauts de ligne hors blocs de code, chaque fragment
+respecte un budget de tokens; les séparateurs entre fragments sont conservés tels quels
+pour que TextSegmenter.reassemble_text recompose le texte dans l'ordre.
+"""
+
+import math
+import re
+from typing import Dict, List
+
+# Approximation SentencePiece/BPE: ~4 caractères par token pour les langues latines
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation grossière du nombre de tokens d'un texte"""
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+def shard_token_budget(text: str, max_tokens: int, parallelism: int, min_tokens: int = 64) -> int:
+    """
+    Budget par fragment: au plus max_tokens, mais assez petit pour occuper
+    `parallelism` cœurs sur ce message (jamais sous min_tokens)
+    """
+    per_core = math.ceil(estimate_tokens(text) / max(1, parallelism))
+    return max(min_tokens, min(max_tokens, per_core))
+
+
+def plan_shards(text: str, token_budget: int) -> List[Dict]:
+    """
+    Découpe un texte en segments {'type': 'line'|'separator', 'text', 'index'}
+
+    - 'line': fragment à traduire (plusieurs lignes, jamais coupé dans un bloc ```)
+    - 'separator': sauts de ligne exacts entre deux fragments
+    Une ligne plus longue que le budget forme un fragment à elle seule.
+    """
+    parts = re.split(r'(\n+)', text)
+    segments: List[Dict] = []
+    current: List[str] = []
+    current_tokens = 0
+    in_code_block = False
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            segments.append({'type': 'line', 'text': ''.join(current), 'index': len(segments)})
+        current, current_tokens = [], 0
+
+    for i, part in enumerate(parts):
+        if not part:
+            continue
+        if i % 2 == 1:
+            # Séparateur: point de coupure si le fragment courant a atteint son budget
+            if not in_code_block and current_tokens >= token_budget:
+                flush()
+                segments.append({'type': 'separator', 'text': part, 'index': len(segments)})
+            elif current:
+                current.append(part)
+            else:
+                # Sauts de ligne en tête de texte ou juste après une coupure
+                segments.append({'type': 'separator', 'text': part, 'index': len(segments)})
+            continue
+
+        inside_code = in_code_block
+        if part.strip().startswith('```'):
+            in_code_block = not in_code_block
+        part_tokens = estimate_tokens(part)
+        # Ne pas dépasser le budget en ajoutant la ligne (jamais de coupure dans un bloc de code)
+        if current and not inside_code and current_tokens + part_tokens > token_budget and current[-1].startswith('\n'):
+            separator = current.pop()
+            flush()
+            segments.append({'type': 'separator', 'text': separator, 'index': len(segments)})
+        current.append(part)
+        current_tokens += part_tokens
+
+    # Séparateurs finaux: hors du dernier fragment
+    trailing = current.pop() if current and current[-1].startswith('\n') else None
+    flush()
+    if trailing:
+        segments.append({'type': 'separator', 'text': trailing, 'index': len(segments)})
+    return segments
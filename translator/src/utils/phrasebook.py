@@ -0,0 +1,299 @@
+"""
+Recueil de phrases fréquentes: table de traductions en lecture seule, projetée en mémoire
+Construit hors ligne (scripts/build_phrasebook.py) à partir des textes courts les plus
+fréquents par paire de langues, consulté avant toute autre source de traduction.
+
+Format (petit-boutiste):
+    en-tête     MAGIC, version, nombre d'entrées, bits du répertoire, longueur maximale
+                des textes sources normalisés (0: inconnue), position du blob
+    répertoire  2^bits + 1 index (uint32): première entrée de chaque préfixe d'empreinte
+    entrées     empreinte (uint64), position (uint32), longueur (uint16), niveau (uint16),
+                triées par empreinte
+    blob        traductions UTF-8 concaténées
+
+Le répertoire indexé par les bits de poids fort de l'empreinte donne en O(1) la petite
+plage d'entrées à parcourir. Le fichier est projeté (mmap) en lecture seule: ouverture
+quasi instantanée, pages partagées par tous les processus via le cache du noyau.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .translation_memory import content_hash, normalize_source_text
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'MSHYPB01'
+HEADER = struct.Struct('<8sIIIIQ')  # magic, version, entrées, bits, longueur max, position du blob
+ENTRY = struct.Struct('<QIHH')      # empreinte, position, longueur, niveau
+DIRECTORY_SLOT = struct.Struct('<I')
+FORMAT_VERSION = 1
+MAX_TRANSLATION_BYTES = 0xFFFF
+
+
+def phrase_hash(text: str, source_language: str, target_language: str) -> int:
+    """Empreinte 64 bits du texte normalisé et de la paire de langues"""
+    return int(content_hash(text, source_language, target_language)[:16], 16)
+
+
+def build_phrasebook(entries: Iterable[Tuple[str, str, str, str, int]], path: str) -> int:
+    """
+    Écrit un recueil (remplacement atomique: fichier temporaire puis os.replace)
+
+    Args:
+        entries: (texte source, langue source, langue cible, traduction, niveau du modèle);
+                 pour un même texte et une même paire, le niveau le plus élevé est gardé
+
+    Returns:
+        int: Nombre d'entrées écrites
+    """
+    best: Dict[int, Tuple[int, bytes]] = {}
+    max_length = 0
+    for text, source_language, target_language, translation, level in entries:
+        encoded = translation.encode('utf-8')
+        if not text or not encoded or len(encoded) > MAX_TRANSLATION_BYTES:
+            continue
+        key = phrase_hash(text, source_language, target_language)
+        if key not in best or level > best[key][0]:
+            best[key] = (level, encoded)
+            max_length = max(max_length, len(normalize_source_text(text)))
+
+    keys = sorted(best)
+    bits = max(4, min(20, (len(keys) - 1).bit_length()))
+    directory = [0] * ((1 << bits) + 1)
+    for key in keys:
+        directory[(key >> (64 - bits)) + 1] += 1
+    for slot in range(1, len(directory)):
+        directory[slot] += directory[slot - 1]
+
+    blob_offset = HEADER.size + DIRECTORY_SLOT.size * len(directory) + ENTRY.size * len(keys)
+    directory_dir = os.path.dirname(path)
+    if directory_dir:
+        os.makedirs(directory_dir, exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(keys), bits, max_length, blob_offset))
+        f.write(struct.pack(f'<{len(directory)}I', *directory))
+        position = 0
+        for key in keys:
+            level, encoded = best[key]
+            f.write(ENTRY.pack(key, position, len(encoded), level))
+            position += len(encoded)
+        for key in keys:
+            f.write(best[key][1])
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    return len(keys)
+
+
+class PhraseMiner:
+    """
+    Comptage des textes courts les plus fréquents par langue source, à mémoire bornée
+
+    Au-delà de `max_tracked` textes suivis, ceux vus une seule fois sont oubliés: les
+    phrases réellement fréquentes reviennent vite et survivent aux élagages. Quelques
+    identifiants de messages sont gardés par texte pour retrouver ses traductions.
+    """
+
+    def __init__(self, max_length: int = 80, max_tracked: int = 1_000_000, samples: int = 5):
+        self.max_length = max_length
+        self.max_tracked = max_tracked
+        self.samples = samples
+        self.counts: Counter = Counter()
+        self.message_ids: Dict[Tuple[str, str], List[str]] = {}
+        self.scanned = 0
+        self.prunes = 0
+
+    def add(self, message_id: str, text: str, source_language: str):
+        self.scanned += 1
+        normalized = normalize_source_text(text or '')
+        if not normalized or len(normalized) > self.max_length:
+            return
+        key = (source_language, normalized)
+        self.counts[key] += 1
+        ids = self.message_ids.setdefault(key, [])
+        if len(ids) < self.samples:
+            ids.append(message_id)
+        if len(self.counts) > self.max_tracked:
+            self._prune()
+
+    def _prune(self):
+        self.prunes += 1
+        for key in [key for key, count in self.counts.items() if count <= 1]:
+            del self.counts[key]
+            del self.message_ids[key]
+
+    def top(self, per_language: int, min_count: int = 2) -> List[Tuple[str, str, int, List[str]]]:
+        """(langue source, texte normalisé, occurrences, identifiants de messages), par langue"""
+        by_language: Dict[str, List[Tuple[int, str]]] = {}
+        for (language, text), count in self.counts.items():
+            if count >= min_count:
+                by_language.setdefault(language, []).append((count, text))
+        phrases = []
+        for language, items in by_language.items():
+            items.sort(key=lambda item: (-item[0], item[1]))
+            for count, text in items[:per_language]:
+                phrases.append((language, text, count, self.message_ids[(language, text)]))
+        return phrases
+
+
+def select_translations(phrases: List[Tuple[str, str, int, List[str]]],
+                        translations: Iterable[Dict],
+                        hierarchy: Dict[str, int]) -> List[Tuple[str, str, str, str, int]]:
+    """
+    Traduction retenue par phrase et langue cible: niveau de modèle le plus élevé, puis
+    texte le plus fréquent parmi les messages échantillons
+
+    Returns:
+        List: entrées pour build_phrasebook
+    """
+    phrase_of = {}
+    for language, text, _, message_ids in phrases:
+        for message_id in message_ids:
+            phrase_of[message_id] = (language, text)
+
+    votes: Dict[Tuple[str, str, str], Counter] = {}
+    for translation in translations:
+        phrase = phrase_of.get(translation['messageId'])
+        if not phrase or translation['targetLanguage'] == phrase[0]:
+            continue
+        level = hierarchy.get(translation.get('translationModel'), 0)
+        if not level or not translation.get('translatedText'):
+            continue
+        key = (phrase[0], phrase[1], translation['targetLanguage'])
+        votes.setdefault(key, Counter())[(level, translation['translatedText'])] += 1
+
+    entries = []
+    for (source_language, text, target_language), candidates in votes.items():
+        (level, translated), _ = max(candidates.items(), key=lambda item: (item[0][0], item[1]))
+        entries.append((text, source_language, target_language, translated, level))
+    return entries
+
+
+class Phrasebook:
+    """Recueil ouvert en lecture seule (projection mémoire)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.bits, self.max_length, self._blob = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"Recueil {path} invalide (format {magic!r} v{version})")
+        self._directory = HEADER.size
+        self._entries = self._directory + DIRECTORY_SLOT.size * ((1 << self.bits) + 1)
+
+    @property
+    def identity(self) -> Tuple[int, int, int]:
+        """Fichier projeté (inode, taille, date): change quand le recueil est remplacé"""
+        return self._stat.st_ino, self._stat.st_size, self._stat.st_mtime_ns
+
+    def lookup(self, text: str, source_language: str, target_language: str,
+               min_level: int = 1) -> Optional[Tuple[str, int]]:
+        """(traduction, niveau du modèle qui l'a produite) de niveau >= min_level, ou None"""
+        if not self.size:
+            return None
+        key = phrase_hash(text, source_language, target_language)
+        slot = self._directory + DIRECTORY_SLOT.size * (key >> (64 - self.bits))
+        start, end = struct.unpack_from('<II', self._map, slot)
+        for index in range(start, end):
+            entry_key, position, length, level = ENTRY.unpack_from(self._map, self._entries + ENTRY.size * index)
+            if entry_key == key:
+                if level < min_level:
+                    return None
+                offset = self._blob + position
+                return self._map[offset:offset + length].decode('utf-8'), level
+            if entry_key > key:
+                break
+        return None
+
+    def close(self):
+        self._map.close()
+
+
+class PhrasebookStore:
+    """
+    Recueil courant, remplacé à chaud quand le fichier change
+
+    Le fichier est vérifié (un stat) au plus toutes les `check_interval` secondes pendant
+    les recherches; le nouveau recueil est ouvert puis substitué d'un coup, l'ancien
+    fermé. Recherches synchrones: aucune ne peut être en cours pendant la substitution.
+    """
+
+    def __init__(self, path: str, check_interval: float = 30.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.current: Optional[Phrasebook] = None
+        self._checked_at = 0.0
+        self.stats = {'lookups': 0, 'hits': 0, 'too_long': 0, 'reloads': 0, 'reload_errors': 0}
+        self.reload()
+
+    def reload(self) -> bool:
+        """Ouvre le fichier s'il a changé; retourne True si un nouveau recueil est actif"""
+        self._checked_at = time.time()
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if self.current and self.current.identity == (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+            return False
+        try:
+            phrasebook = Phrasebook(self.path)
+        except (OSError, ValueError, struct.error) as e:
+            self.stats['reload_errors'] += 1
+            logger.error(f"❌ [TRANSLATOR] Recueil de phrases illisible ({self.path}): {e}")
+            return False
+        previous, self.current = self.current, phrasebook
+        if previous:
+            previous.close()
+        self.stats['reloads'] += 1
+        logger.info(f"📖 [TRANSLATOR] Recueil de phrases chargé: {phrasebook.size} entrées ({self.path})")
+        return True
+
+    def may_contain(self, text: str) -> bool:
+        """
+        Faux si le texte est plus long que toutes les phrases du recueil: un message long
+        n'est pas haché une fois par langue cible pour rien
+        """
+        limit = self.current.max_length if self.current else 0
+        if not limit or len(text) <= limit:
+            return True
+        # Texte brut trop long: sa forme normalisée (espaces réduits) peut encore convenir
+        if len(normalize_source_text(text)) <= limit:
+            return True
+        self.stats['too_long'] += 1
+        return False
+
+    def lookup(self, text: str, source_language: str, target_language: str,
+               min_level: int = 1) -> Optional[Tuple[str, int]]:
+        if time.time() - self._checked_at >= self.check_interval:
+            self.reload()
+        if not self.current:
+            return None
+        self.stats['lookups'] += 1
+        found = self.current.lookup(text, source_language, target_language, min_level)
+        if found is not None:
+            self.stats['hits'] += 1
+        return found
+
+    def close(self):
+        if self.current:
+            self.current.close()
+            self.current = None
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / self.stats['lookups'] if self.stats['lookups'] else 0.0,
+            'entries': self.current.size if self.current else 0,
+            'max_length': self.current.max_length if self.current else 0,
+            'path': self.path
+        }
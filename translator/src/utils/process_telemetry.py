@@ -0,0 +1,103 @@
+"""
+Échantillonneur de télémétrie du processus (CPU / mémoire RSS)
+Une tâche de fond mesure le processus à intervalle fixe et conserve les dernières
+mesures dans un buffer circulaire: le chemin de publication lit la dernière valeur
+sans appel système ni attente.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TelemetrySample:
+    timestamp: float
+    cpu_percent: float
+    memory_mb: float
+    system_cpu_percent: float = 0.0
+
+
+class ProcessTelemetry:
+    """Mesures CPU/RSS du processus courant, lues sans coût par le chemin chaud"""
+
+    def __init__(self, interval: Optional[float] = None, size: Optional[int] = None):
+        self.interval = interval or float(os.getenv('TELEMETRY_SAMPLE_INTERVAL', '1.0'))
+        self.samples = deque(maxlen=size or int(os.getenv('TELEMETRY_RING_SIZE', '60')))
+        # Un seul objet Process: cpu_percent() mesure l'écart depuis l'appel précédent
+        # (sur un nouvel objet, le premier appel retourne toujours 0.0)
+        self._process = psutil.Process()
+        self._process.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None)
+        self._task: Optional[asyncio.Task] = None
+        self.sample()
+
+    def sample(self) -> TelemetrySample:
+        """Prend une mesure et l'ajoute au buffer circulaire"""
+        sample = TelemetrySample(
+            timestamp=time.time(),
+            cpu_percent=self._process.cpu_percent(interval=None),
+            memory_mb=self._process.memory_info().rss / 1024 / 1024,
+            system_cpu_percent=psutil.cpu_percent(interval=None)
+        )
+        self.samples.append(sample)
+        return sample
+
+    @property
+    def latest(self) -> TelemetrySample:
+        return self.samples[-1]
+
+    @property
+    def cpu_usage(self) -> float:
+        return self.samples[-1].cpu_percent
+
+    @property
+    def memory_usage(self) -> float:
+        return self.samples[-1].memory_mb
+
+    @property
+    def system_cpu_usage(self) -> float:
+        """CPU de la machine (tous processus), en % de la capacité totale"""
+        return self.samples[-1].system_cpu_percent
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._sampling_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sampling_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.sample()
+            except psutil.Error as e:
+                logger.warning(f"[TRANSLATOR] ⚠️ Mesure de télémétrie impossible: {e}")
+
+    def get_stats(self) -> Dict:
+        samples = list(self.samples)
+        return {
+            'cpu_percent': samples[-1].cpu_percent,
+            'memory_mb': samples[-1].memory_mb,
+            'system_cpu_percent': samples[-1].system_cpu_percent,
+            'avg_cpu_percent': sum(s.cpu_percent for s in samples) / len(samples),
+            'max_memory_mb': max(s.memory_mb for s in samples),
+            'window_seconds': samples[-1].timestamp - samples[0].timestamp,
+            'samples': len(samples),
+            'interval': self.interval
+        }
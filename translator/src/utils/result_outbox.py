@@ -0,0 +1,266 @@
+"""
+Outbox des résultats de traduction publiés
+Le PUB ZMQ perd silencieusement les messages pendant une reconnexion de la gateway:
+les derniers résultats sont conservés (clé messageId/langue cible) jusqu'à leur
+acquittement pour être renvoyés sur demande (replay_since) au lieu d'être retraduits.
+Persistance optionnelle sur disque (SQLite WAL) pour survivre à un redémarrage.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def text_fingerprint(text: Optional[str]) -> str:
+    """Empreinte courte du texte source (un résultat n'est réutilisé que pour le même texte)"""
+    return hashlib.blake2b((text or '').encode('utf-8'), digest_size=8).hexdigest()
+
+
+@dataclass
+class OutboxEntry:
+    """Résultat publié en attente d'acquittement"""
+    seq: int
+    message_id: str
+    target_language: str
+    message: Dict[str, Any]
+    topic: Optional[str] = None
+    text_hash: Optional[str] = None
+    model_type: Optional[str] = None
+    created_at: float = 0.0
+
+
+class ResultOutbox:
+    """
+    Résultats publiés non acquittés, ordonnés par numéro de séquence
+
+    - add(): enregistre un résultat publié (remplace la version précédente de la même clé)
+    - ack() / ack_through(): la gateway confirme la réception
+    - since(): résultats non acquittés postérieurs à une séquence (rejeu)
+    - find(): résultat réutilisable pour une nouvelle requête identique
+    - discard(): message modifié ou supprimé, ses résultats ne doivent plus être servis
+    """
+
+    def __init__(self, max_entries: int = 50000, ttl: float = 3600, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+
+        self._entries: "OrderedDict[Tuple[str, str], OutboxEntry]" = OrderedDict()
+        # Index messageId -> langues présentes (acquittement sans liste de langues)
+        self._languages: Dict[str, Set[str]] = {}
+        self._seq = 0
+
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    message_id TEXT NOT NULL,
+                    target_language TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    topic TEXT,
+                    text_hash TEXT,
+                    model_type TEXT,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (message_id, target_language)
+                )
+                """
+            )
+            self._load()
+
+        self.stats = {
+            'stored': 0,
+            'acked': 0,
+            'replayed': 0,
+            'reused': 0,
+            'discarded': 0,
+            'expired': 0,
+            'evicted': 0
+        }
+
+    def _execute(self, query: str, params: tuple = ()):
+        if self._conn is None:
+            return None
+        with self._lock:
+            return self._conn.execute(query, params)
+
+    def _executemany(self, query: str, rows: Iterable[tuple]):
+        if self._conn is None:
+            return
+        rows = list(rows)
+        if rows:
+            with self._lock:
+                self._conn.executemany(query, rows)
+
+    def _load(self):
+        """Recharge les résultats non acquittés encore valides après un redémarrage"""
+        cutoff = time.time() - self.ttl
+        self._execute("DELETE FROM results WHERE created_at < ?", (cutoff,))
+        rows = self._execute(
+            "SELECT message_id, target_language, seq, topic, text_hash, model_type, payload, created_at "
+            "FROM results ORDER BY seq"
+        ).fetchall()
+        for message_id, target_language, seq, topic, text_hash, model_type, payload, created_at in rows:
+            self._entries[(message_id, target_language)] = OutboxEntry(
+                seq=seq, message_id=message_id, target_language=target_language,
+                message=json.loads(payload), topic=topic, text_hash=text_hash,
+                model_type=model_type, created_at=created_at
+            )
+            self._languages.setdefault(message_id, set()).add(target_language)
+            self._seq = max(self._seq, seq)
+        if rows:
+            logger.info(f"[TRANSLATOR-OUTBOX] 💾 {len(rows)} résultat(s) non acquitté(s) rechargé(s) depuis {self.path}")
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    @property
+    def pending(self) -> int:
+        """Nombre de résultats en attente d'acquittement"""
+        return len(self._entries)
+
+    def add(self, message_id: str, target_language: str, message: Dict[str, Any],
+            topic: Optional[str] = None, text_hash: Optional[str] = None,
+            model_type: Optional[str] = None) -> int:
+        """Enregistre un résultat publié, retourne son numéro de séquence"""
+        self.expire()
+        self._seq += 1
+        key = (message_id, target_language)
+        entry = OutboxEntry(
+            seq=self._seq, message_id=message_id, target_language=target_language,
+            message=message, topic=topic, text_hash=text_hash,
+            model_type=model_type, created_at=time.time()
+        )
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        self._languages.setdefault(message_id, set()).add(target_language)
+        self._execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (message_id, target_language, entry.seq, topic, text_hash, model_type,
+             json.dumps(message, ensure_ascii=False), entry.created_at)
+        )
+        self.stats['stored'] += 1
+
+        # Capacité bornée: les plus anciens résultats non acquittés sont abandonnés
+        if len(self._entries) > self.max_entries:
+            oldest = list(islice(self._entries, len(self._entries) - self.max_entries))
+            self.stats['evicted'] += self._remove(oldest)
+        return entry.seq
+
+    def _remove(self, keys: List[Tuple[str, str]]) -> int:
+        removed = [key for key in keys if self._entries.pop(key, None) is not None]
+        for message_id, target_language in removed:
+            languages = self._languages.get(message_id)
+            if languages is not None:
+                languages.discard(target_language)
+                if not languages:
+                    del self._languages[message_id]
+        self._executemany("DELETE FROM results WHERE message_id = ? AND target_language = ?", removed)
+        return len(removed)
+
+    def _keys_for(self, message_id: str, target_languages: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+        if target_languages is not None:
+            return [(message_id, language) for language in target_languages]
+        return [(message_id, language) for language in self._languages.get(message_id, ())]
+
+    def ack(self, message_id: str, target_languages: Optional[Iterable[str]] = None) -> int:
+        """Acquitte les résultats d'un message (toutes les langues si non précisées)"""
+        acked = self._remove(self._keys_for(message_id, target_languages))
+        self.stats['acked'] += acked
+        return acked
+
+    def ack_through(self, seq: int) -> int:
+        """Acquittement cumulatif: tout résultat de séquence <= seq"""
+        keys = []
+        for key, entry in self._entries.items():
+            if entry.seq > seq:
+                break
+            keys.append(key)
+        acked = self._remove(keys)
+        self.stats['acked'] += acked
+        return acked
+
+    def discard(self, message_id: str) -> int:
+        """Message modifié ou supprimé: ses résultats ne doivent plus être rejoués ni réutilisés"""
+        discarded = self._remove(self._keys_for(message_id))
+        self.stats['discarded'] += discarded
+        return discarded
+
+    def find(self, message_id: str, target_language: str, text_hash: Optional[str] = None) -> Optional[OutboxEntry]:
+        """Résultat non acquitté réutilisable pour une nouvelle requête du même texte"""
+        entry = self._entries.get((message_id, target_language))
+        if entry is None or time.time() - entry.created_at > self.ttl:
+            return None
+        if text_hash and entry.text_hash and text_hash != entry.text_hash:
+            return None
+        self.stats['reused'] += 1
+        return entry
+
+    def since(self, seq: int = 0, since_time: Optional[float] = None,
+              topic: Optional[str] = None, limit: Optional[int] = None) -> List[OutboxEntry]:
+        """Résultats non acquittés de séquence > seq (et publiés après since_time), dans l'ordre"""
+        self.expire()
+        entries = []
+        for entry in self._entries.values():
+            if entry.seq <= seq:
+                continue
+            if since_time is not None and entry.created_at < since_time:
+                continue
+            if topic is not None and entry.topic != topic:
+                continue
+            entries.append(entry)
+            if limit and len(entries) >= limit:
+                break
+        self.stats['replayed'] += len(entries)
+        return entries
+
+    def expire(self) -> int:
+        """Retire les résultats plus vieux que le TTL (ordre de séquence = ordre d'insertion)"""
+        cutoff = time.time() - self.ttl
+        keys = []
+        for key, entry in self._entries.items():
+            if entry.created_at >= cutoff:
+                break
+            keys.append(key)
+        expired = self._remove(keys)
+        self.stats['expired'] += expired
+        return expired
+
+    def close(self):
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"[TRANSLATOR-OUTBOX] ❌ Erreur fermeture outbox: {e}")
+        self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'pending': len(self._entries),
+            'last_seq': self._seq,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'path': self.path
+        }
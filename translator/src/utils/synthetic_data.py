@@ -0,0 +1,287 @@
+"""
+Génération reproductible d'un jeu de données synthétique (bancs d'essai base et charge)
+Utilisateurs, conversations, membres, messages et traductions aux distributions proches
+de la production: mélange de langues, longueurs log-normales, conversations très
+inégalement actives, emojis, listes, paragraphes et blocs de code. Utilisé par
+scripts/generate_synthetic_dataset.py.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Répartition des langues des utilisateurs (et donc des messages)
+LANGUAGE_WEIGHTS = {
+    'en': 0.34, 'fr': 0.16, 'es': 0.12, 'pt': 0.08, 'de': 0.07,
+    'ar': 0.05, 'zh': 0.05, 'ru': 0.04, 'it': 0.04, 'ja': 0.05
+}
+
+# Types de conversation: (part, membres min, membres max)
+CONVERSATION_TYPES = {
+    'direct': (0.70, 2, 2),
+    'group': (0.25, 3, 50),
+    'public': (0.05, 50, 2000)
+}
+
+# Niveau des traductions existantes
+MODEL_WEIGHTS = {'basic': 0.70, 'medium': 0.25, 'premium': 0.05}
+
+VOCABULARY = {
+    'en': "the meeting is moved to tomorrow please check your messages thanks for the update "
+          "I will send the file later can we talk about the project today see you soon great idea "
+          "let me know when you are ready".split(),
+    'fr': "la réunion est déplacée à demain merci pour le message je vous envoie le fichier "
+          "plus tard on peut en parler aujourd'hui bonne idée à bientôt dites-moi quand vous êtes prêts "
+          "le projet avance bien".split(),
+    'es': "la reunión se mueve a mañana gracias por el mensaje te envío el archivo más tarde "
+          "podemos hablar hoy buena idea hasta pronto avísame cuando estés listo el proyecto va bien".split(),
+    'pt': "a reunião foi adiada para amanhã obrigado pela mensagem envio o arquivo mais tarde "
+          "podemos conversar hoje boa ideia até logo me avise quando estiver pronto o projeto vai bem".split(),
+    'de': "das Treffen ist auf morgen verschoben danke für die Nachricht ich schicke die Datei "
+          "später können wir heute reden gute Idee bis bald sag Bescheid wenn du bereit bist".split(),
+    'it': "la riunione è spostata a domani grazie per il messaggio ti mando il file più tardi "
+          "possiamo parlarne oggi buona idea a presto fammi sapere quando sei pronto".split(),
+    'ru': "встреча перенесена на завтра спасибо за сообщение я отправлю файл позже "
+          "можем поговорить сегодня отличная идея до скорого дай знать когда будешь готов".split(),
+    'ar': "تم تأجيل الاجتماع إلى الغد شكرا على الرسالة سأرسل الملف لاحقا "
+          "هل يمكننا التحدث اليوم فكرة رائعة إلى اللقاء أخبرني عندما تكون جاهزا".split(),
+    'zh': list("会议改到明天了谢谢你的消息我稍后发文件今天可以聊聊这个项目好主意回头见准备好了告诉我"),
+    'ja': list("会議は明日に変更になりましたメッセージありがとうございます後でファイルを送ります今日話せますか"),
+}
+# Langues écrites sans espaces entre les mots
+NO_SPACE_LANGUAGES = {'zh', 'ja'}
+
+EMOJIS = ["😊", "👍", "🎉", "😂", "🙏", "❤️", "🔥", "🚀", "👋🏽", "👨‍💻", "✅", "🇫🇷"]
+FIRST_NAMES = ["Alice", "Bob", "Carlos", "Dieter", "Li", "Yuki", "Maria", "Omar", "Olga", "Giulia", "Amina", "Ravi"]
+LAST_NAMES = ["Dubois", "Johnson", "García", "Schmidt", "Wei", "Tanaka", "Silva", "Haddad", "Ivanova", "Rossi"]
+# Empreinte bcrypt de « password123 » (même valeur que seed_database.py)
+PASSWORD_HASH = "$2b$10$UxJ6jmYYODq6QnsTm8TZMu9AlWUDlY/fZdw/e0YA1gjqz9Cjmwlqq"
+
+# Octet de type dans les identifiants générés (unicité entre collections)
+KIND_USER, KIND_CONVERSATION, KIND_MEMBER, KIND_MESSAGE, KIND_TRANSLATION = range(1, 6)
+
+
+def object_id(kind: int, index: int, created_at: datetime) -> str:
+    """ObjectId déterministe: horodatage (tri chronologique comme MongoDB), type et rang"""
+    return f"{int(created_at.timestamp()) & 0xFFFFFFFF:08x}{kind:02x}{index:014x}"
+
+
+def _weighted(rng: random.Random, weights: Dict[str, float]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class SyntheticDataGenerator:
+    """
+    Générateur de lignes prêtes pour create_many
+
+    Toutes les valeurs viennent d'un seul random.Random(seed) consommé dans un ordre fixe:
+    même graine et mêmes paramètres = mêmes lignes, quelle que soit la concurrence d'écriture.
+    Les langues des utilisateurs sont gardées dans un tableau compact (un octet par
+    utilisateur) et leurs identifiants recalculés à partir du rang: mémoire bornée
+    avec des millions d'utilisateurs.
+    """
+
+    def __init__(self, seed: int = 42, users: int = 1000, conversations: int = 200, messages: int = 10000,
+                 translation_coverage: float = 0.9, max_targets: int = 6, days: int = 365,
+                 now: Optional[datetime] = None):
+        self.rng = random.Random(seed)
+        self.user_count = users
+        self.conversation_count = conversations
+        self.message_count = messages
+        self.translation_coverage = translation_coverage
+        self.max_targets = max_targets
+        self.now = now or datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.start = self.now - timedelta(days=days)
+        self.languages = list(LANGUAGE_WEIGHTS)
+        self._user_languages = bytearray()
+        self.counts = {'users': 0, 'conversations': 0, 'members': 0, 'messages': 0, 'translations': 0}
+
+    # ===== Utilisateurs =====
+
+    def users(self) -> Iterator[Dict]:
+        for index in range(self.user_count):
+            language = _weighted(self.rng, LANGUAGE_WEIGHTS)
+            regional = language if self.rng.random() < 0.6 else _weighted(self.rng, LANGUAGE_WEIGHTS)
+            self._user_languages.append(self.languages.index(language))
+            created_at = self._user_created_at(index)
+            first_name, last_name = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            self.counts['users'] += 1
+            yield {
+                'id': self._user_id(index),
+                'username': f"synth_{index}",
+                'email': f"synth_{index}@synthetic.meeshy.me",
+                'firstName': first_name,
+                'lastName': last_name,
+                'password': PASSWORD_HASH,
+                'systemLanguage': language,
+                'regionalLanguage': regional,
+                'createdAt': created_at
+            }
+
+    def user_language(self, user_index: int) -> str:
+        return self.languages[self._user_languages[user_index]]
+
+    # ===== Conversations et messages =====
+
+    def conversations(self) -> Iterator[Tuple[Dict, List[Dict], List[int], int]]:
+        """
+        Conversations avec leurs membres et leur nombre de messages
+
+        Activité très inégale (loi de Pareto): quelques conversations concentrent
+        l'essentiel des messages, comme les salons publics en production.
+
+        Yields:
+            (conversation, membres, rangs des utilisateurs membres, nombre de messages)
+        """
+        if not self._user_languages:
+            raise RuntimeError("users() doit être parcouru avant conversations()")
+        activity = [self.rng.paretovariate(1.2) for _ in range(self.conversation_count)]
+        total_activity = sum(activity)
+        allocated = 0
+        member_index = 0
+        for index in range(self.conversation_count):
+            kind = _weighted(self.rng, {name: spec[0] for name, spec in CONVERSATION_TYPES.items()})
+            _, low, high = CONVERSATION_TYPES[kind]
+            size = min(self.user_count, low if low == high else min(high, int(low * self.rng.paretovariate(1.5))))
+            member_ids = self.rng.sample(range(self.user_count), max(1, size))
+            created_at = self._random_date()
+            conversation_id = object_id(KIND_CONVERSATION, index, created_at)
+
+            # Le reste de l'arrondi va à la dernière conversation: total exact
+            if index == self.conversation_count - 1:
+                message_count = self.message_count - allocated
+            else:
+                message_count = min(self.message_count - allocated, round(self.message_count * activity[index] / total_activity))
+            allocated += message_count
+
+            members = []
+            for position, user_index in enumerate(member_ids):
+                members.append({
+                    'id': object_id(KIND_MEMBER, member_index, created_at),
+                    'conversationId': conversation_id,
+                    'userId': self._user_id(user_index),
+                    'role': 'admin' if position == 0 else 'member',
+                    'joinedAt': created_at
+                })
+                member_index += 1
+            self.counts['conversations'] += 1
+            self.counts['members'] += len(members)
+            yield ({
+                'id': conversation_id,
+                'identifier': f"synth-{index}",
+                'type': kind,
+                'title': None if kind == 'direct' else f"Synthetic {kind} {index}",
+                'createdAt': created_at,
+                'lastMessageAt': created_at
+            }, members, member_ids, message_count)
+
+    def messages(self, conversation: Dict, member_ids: List[int], count: int) -> Iterator[Tuple[Dict, List[Dict]]]:
+        """Messages d'une conversation (ordre chronologique) et leurs traductions"""
+        member_languages = sorted({self.user_language(user_index) for user_index in member_ids})
+        created_at = conversation['createdAt']
+        span = max(1.0, (self.now - created_at).total_seconds())
+        # Intervalles exponentiels: rafales et silences
+        mean_gap = span / max(1, count)
+        for _ in range(count):
+            created_at = min(self.now, created_at + timedelta(seconds=self.rng.expovariate(1 / mean_gap)))
+            sender = self.rng.choice(member_ids)
+            language = self.user_language(sender) if self.rng.random() < 0.85 else _weighted(self.rng, LANGUAGE_WEIGHTS)
+            text = self.message_text(language)
+            index = self.counts['messages']
+            message = {
+                'id': object_id(KIND_MESSAGE, index, created_at),
+                'conversationId': conversation['id'],
+                'senderId': self._user_id(sender),
+                'content': text,
+                'originalLanguage': language,
+                'messageType': 'text',
+                'isEdited': self.rng.random() < 0.03,
+                'isDeleted': self.rng.random() < 0.01,
+                'createdAt': created_at
+            }
+            self.counts['messages'] += 1
+            yield message, self._translations(message, member_languages)
+
+    def _translations(self, message: Dict, member_languages: List[str]) -> List[Dict]:
+        targets = [language for language in member_languages if language != message['originalLanguage']]
+        if len(targets) > self.max_targets:
+            targets = self.rng.sample(targets, self.max_targets)
+        translations = []
+        for target in targets:
+            if self.rng.random() > self.translation_coverage:
+                continue
+            model = _weighted(self.rng, MODEL_WEIGHTS)
+            translated = self.message_text(target, length=max(1, int(len(message['content']) * self.rng.uniform(0.8, 1.3))))
+            translations.append({
+                'id': object_id(KIND_TRANSLATION, self.counts['translations'], message['createdAt']),
+                'messageId': message['id'],
+                'sourceLanguage': message['originalLanguage'],
+                'targetLanguage': target,
+                'translatedContent': translated,
+                'translationModel': model,
+                'confidenceScore': round(self.rng.uniform(0.8, 0.99), 3),
+                'cacheKey': f"{message['id']}_{message['originalLanguage']}_{target}_{model}",
+                'createdAt': message['createdAt']
+            })
+            self.counts['translations'] += 1
+        return translations
+
+    # ===== Textes =====
+
+    def message_length(self) -> int:
+        """Longueur log-normale (médiane ~40 caractères) avec quelques longs messages"""
+        if self.rng.random() < 0.01:
+            return self.rng.randint(500, 4000)
+        return max(2, min(2000, int(self.rng.lognormvariate(3.7, 0.9))))
+
+    def message_text(self, language: str, length: Optional[int] = None) -> str:
+        """Texte dans la langue donnée: structure (lignes, listes, code) et emojis réalistes"""
+        length = length or self.message_length()
+        roll = self.rng.random()
+        if roll < 0.01 and length > 40:
+            text = self._sentence(language, length // 2) + "\n```\nprint(\"hello\")\n```\n" + self._sentence(language, length // 2)
+        elif roll < 0.03 and length > 30:
+            items = self.rng.randint(2, 6)
+            bullet = self.rng.choice(["- ", "• ", "1. "])
+            text = "\n".join(
+                (f"{i + 1}. " if bullet == "1. " else bullet) + self._sentence(language, max(5, length // items))
+                for i in range(items)
+            )
+        elif roll < 0.11 and length > 60:
+            lines = self.rng.randint(2, 6)
+            separator = self.rng.choice(["\n", "\n\n"])
+            text = separator.join(self._sentence(language, max(5, length // lines)) for _ in range(lines))
+        else:
+            text = self._sentence(language, length)
+        if self.rng.random() < 0.2:
+            for _ in range(self.rng.randint(1, 3)):
+                emoji = self.rng.choice(EMOJIS)
+                text = f"{emoji} {text}" if self.rng.random() < 0.3 else f"{text} {emoji}"
+        return text
+
+    def _sentence(self, language: str, length: int) -> str:
+        words = VOCABULARY[language]
+        joiner = '' if language in NO_SPACE_LANGUAGES else ' '
+        parts = []
+        size = 0
+        while size < length:
+            word = self.rng.choice(words)
+            parts.append(word)
+            size += len(word) + len(joiner)
+        sentence = joiner.join(parts)
+        if language not in NO_SPACE_LANGUAGES:
+            sentence = sentence[0].upper() + sentence[1:]
+        return sentence + ('。' if language in NO_SPACE_LANGUAGES else self.rng.choice(['.', '!', '?', '']))
+
+    # ===== Outils =====
+
+    def _random_date(self) -> datetime:
+        return self.start + timedelta(seconds=self.rng.uniform(0, (self.now - self.start).total_seconds()))
+
+    def _user_created_at(self, user_index: int) -> datetime:
+        # Inscriptions régulières sur la période: date (et donc identifiant) recalculée à
+        # partir du rang, aucune table d'identifiants en mémoire
+        return self.start + (self.now - self.start) * (user_index / max(1, self.user_count))
+
+    def _user_id(self, user_index: int) -> str:
+        return object_id(KIND_USER, user_index, self._user_created_at(user_index))
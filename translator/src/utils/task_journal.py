@@ -0,0 +1,299 @@
+"""
+Journal durable des tâches de traduction (SQLite WAL)
+Persiste les tâches acceptées pour les rejouer après un redémarrage et
+sert de zone de débordement quand les pools en mémoire sont pleines
+
+Les écritures sont groupées: append() et checkpoint() ne font que noter l'opération,
+un thread d'écriture la valide avec les autres dans une seule transaction toutes
+les `flush_interval` secondes (jamais de commit SQLite sur la boucle asyncio).
+Les lectures (pull_spilled, count, replay) sont bloquantes: depuis la boucle asyncio,
+les appeler via run_in_executor.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# États d'une tâche dans le journal
+STATE_QUEUED = 'queued'    # Présente dans une pool en mémoire
+STATE_SPILLED = 'spilled'  # En attente sur disque (pool pleine)
+
+# Opérations en attente d'écriture
+_OP_INSERT = 'insert'
+_OP_DELETE = 'delete'
+
+
+class TaskJournal:
+    """
+    Journal append-only des tâches de traduction
+
+    - append(): journalise une tâche acceptée (en mémoire ou débordée sur disque)
+    - checkpoint(): marque une tâche comme terminée (elle ne sera plus rejouée)
+    - replay(): prépare le rejeu des tâches non terminées au démarrage
+    - pull_spilled(): récupère les tâches débordées quand de la place se libère
+    - compact(): tronque le WAL et récupère l'espace des tâches terminées
+    - flush(): écrit tout de suite les opérations en attente (fait aussi par le thread d'écriture)
+    """
+
+    def __init__(self, path: str, max_tasks: int = 100000, compact_every: int = 5000,
+                 flush_interval: float = 0.02, flush_batch: int = 1000):
+        self.path = path
+        self.max_tasks = max_tasks
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Une seule connexion partagée, protégée par un verrou (thread d'écriture et lectures)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT NOT NULL UNIQUE,
+                pool TEXT NOT NULL,
+                state TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_pool_state ON tasks (pool, state, seq)")
+
+        # Compteurs en mémoire (évite un COUNT(*) à chaque tâche)
+        self._pending_ids = {row[0] for row in self._execute("SELECT task_id FROM tasks").fetchall()}
+        self._pending = len(self._pending_ids)
+        self._spilled: Dict[str, int] = {
+            pool: n for pool, n in self._execute(
+                "SELECT pool, COUNT(*) FROM tasks WHERE state = ? GROUP BY pool", (STATE_SPILLED,)
+            ).fetchall()
+        }
+
+        self._checkpoints_since_compact = 0
+        self.stats = {
+            'journaled': 0,
+            'spilled': 0,
+            'unspilled': 0,
+            'checkpointed': 0,
+            'replayed': 0,
+            'rejected_full': 0,
+            'compactions': 0,
+            'flushes': 0,
+            'rows_written': 0,
+            'ops_coalesced': 0,
+            'flush_errors': 0
+        }
+
+        # Opérations en attente par task_id (la dernière l'emporte), dans l'ordre d'arrivée
+        self._ops: "OrderedDict[str, tuple]" = OrderedDict()
+        self._ops_lock = threading.Lock()
+        # Débordements notés mais pas encore écrits: pull_spilled() doit les écrire avant de lire
+        self._spills_unwritten = False
+        self._compact_requested = False
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._writer: Optional[threading.Thread] = None
+        if self.flush_interval > 0:
+            self._writer = threading.Thread(target=self._writer_loop, name='task-journal-writer', daemon=True)
+            self._writer.start()
+
+    def _execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(query, params)
+
+    def count(self, pool: Optional[str] = None, state: Optional[str] = None) -> int:
+        """Nombre de tâches non terminées (filtrables par pool et état), lecture disque bloquante"""
+        self.flush()
+        query = "SELECT COUNT(*) FROM tasks WHERE 1=1"
+        params: List[Any] = []
+        if pool is not None:
+            query += " AND pool = ?"
+            params.append(pool)
+        if state is not None:
+            query += " AND state = ?"
+            params.append(state)
+        return self._execute(query, tuple(params)).fetchone()[0]
+
+    def append(self, task: Dict[str, Any], pool: str, spilled: bool = False) -> bool:
+        """Journalise une tâche acceptée, retourne False si le journal est plein"""
+        if self._pending >= self.max_tasks:
+            self.stats['rejected_full'] += 1
+            return False
+
+        state = STATE_SPILLED if spilled else STATE_QUEUED
+        task_id = task['task_id']
+        self._queue_op(task_id, (_OP_INSERT, (task_id, pool, state, json.dumps(task), task.get('created_at') or time.time())),
+                       spill=spilled)
+        if task_id not in self._pending_ids:
+            self._pending_ids.add(task_id)
+            self._pending += 1
+        self.stats['journaled'] += 1
+        if spilled:
+            self._spilled[pool] = self._spilled.get(pool, 0) + 1
+            self.stats['spilled'] += 1
+        return True
+
+    def spilled_count(self, pool: str) -> int:
+        """Nombre de tâches débordées sur disque pour une pool"""
+        return self._spilled.get(pool, 0)
+
+    def checkpoint(self, task_id: str):
+        """Marque une tâche comme terminée (traitée, abandonnée ou en échec)"""
+        self._queue_op(task_id, (_OP_DELETE, (task_id,)))
+        if task_id in self._pending_ids:
+            self._pending_ids.discard(task_id)
+            self._pending = max(0, self._pending - 1)
+        self.stats['checkpointed'] += 1
+        self._checkpoints_since_compact += 1
+        if self._checkpoints_since_compact >= self.compact_every:
+            self._checkpoints_since_compact = 0
+            self._compact_requested = True
+            self._wakeup.set()
+
+    def _queue_op(self, task_id: str, op: tuple, spill: bool = False):
+        with self._ops_lock:
+            if task_id in self._ops:
+                # Tâche terminée avant d'avoir été écrite: seul le DELETE reste (sans effet sur disque)
+                self.stats['ops_coalesced'] += 1
+                del self._ops[task_id]
+            self._ops[task_id] = op
+            self._spills_unwritten = self._spills_unwritten or spill
+            backlog = len(self._ops)
+        if self._writer is None:
+            self.flush()
+        elif backlog >= self.flush_batch:
+            self._wakeup.set()
+
+    def _writer_loop(self):
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Écrit les opérations en attente dans une seule transaction (et compacte si demandé)"""
+        with self._lock:
+            # Échange sous le verrou de connexion: les lots sont écrits dans l'ordre
+            with self._ops_lock:
+                ops, self._ops = self._ops, OrderedDict()
+                spills, self._spills_unwritten = self._spills_unwritten, False
+            if ops:
+                inserts = [params for kind, params in ops.values() if kind == _OP_INSERT]
+                deletes = [params for kind, params in ops.values() if kind == _OP_DELETE]
+                try:
+                    self._conn.execute("BEGIN")
+                    if inserts:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO tasks (task_id, pool, state, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                            inserts
+                        )
+                    if deletes:
+                        self._conn.executemany("DELETE FROM tasks WHERE task_id = ?", deletes)
+                    self._conn.execute("COMMIT")
+                    self.stats['flushes'] += 1
+                    self.stats['rows_written'] += len(ops)
+                except sqlite3.Error as e:
+                    if self._conn.in_transaction:
+                        self._conn.execute("ROLLBACK")
+                    self.stats['flush_errors'] += 1
+                    logger.error(f"[TRANSLATOR-JOURNAL] ❌ Écriture de {len(ops)} opérations échouée: {e}")
+                    # Les opérations arrivées depuis l'échange restent prioritaires
+                    with self._ops_lock:
+                        for task_id, op in ops.items():
+                            self._ops.setdefault(task_id, op)
+                        self._spills_unwritten = self._spills_unwritten or spills
+                    return
+        if self._compact_requested:
+            self._compact_requested = False
+            self.compact()
+
+    def replay(self) -> Dict[str, int]:
+        """
+        Prépare le rejeu des tâches non terminées au démarrage
+
+        Toutes les tâches sont repassées à l'état 'spilled': l'appelant les remet
+        en mémoire dans l'ordre d'arrivée via pull_spilled() selon la capacité disponible.
+
+        Returns:
+            Dict[str, int]: nombre de tâches à rejouer par pool
+        """
+        self.flush()
+        self._execute("UPDATE tasks SET state = ?", (STATE_SPILLED,))
+        rows = self._execute("SELECT pool, COUNT(*) FROM tasks GROUP BY pool").fetchall()
+        self._spilled = {pool: count for pool, count in rows}
+        self.stats['replayed'] += sum(self._spilled.values())
+        return dict(self._spilled)
+
+    def pull_spilled(self, pool: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Récupère jusqu'à `limit` tâches débordées d'une pool (FIFO) et les marque en mémoire
+
+        Lecture disque bloquante: depuis la boucle asyncio, appeler via run_in_executor.
+        Les opérations en attente ne sont écrites d'abord que si des débordements en font partie.
+        """
+        if limit <= 0:
+            return []
+        if self._spills_unwritten:
+            self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, payload FROM tasks WHERE pool = ? AND state = ? ORDER BY seq LIMIT ?",
+                (pool, STATE_SPILLED, limit)
+            ).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE tasks SET state = ? WHERE seq = ?",
+                    [(STATE_QUEUED, seq) for seq, _ in rows]
+                )
+        self._spilled[pool] = max(0, self._spilled.get(pool, 0) - len(rows))
+        self.stats['unspilled'] += len(rows)
+        return [json.loads(payload) for _, payload in rows]
+
+    def compact(self):
+        """Tronque le WAL et libère les pages des tâches terminées"""
+        try:
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.execute("PRAGMA incremental_vacuum")
+            self._checkpoints_since_compact = 0
+            self.stats['compactions'] += 1
+        except sqlite3.Error as e:
+            logger.warning(f"[TRANSLATOR-JOURNAL] ⚠️ Compaction échouée: {e}")
+
+    def close(self):
+        """Écrit les opérations en attente, compacte puis ferme le journal"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+        try:
+            self.flush()
+            self.compact()
+            with self._lock:
+                self._conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"[TRANSLATOR-JOURNAL] ❌ Erreur fermeture journal: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques du journal"""
+        return {
+            **self.stats,
+            'path': self.path,
+            'pending': self._pending,
+            'spilled_pending': sum(self._spilled.values()),
+            'write_backlog': len(self._ops),
+            'max_tasks': self.max_tasks
+        }
@@ -176,6 +176,26 @@ class TextSegmenter:
 
         return result
 
+    def restore_segment_emojis(self, text: str, emojis_map: Dict[int, str]) -> str:
+        """
+        Restaure les emojis d'un fragment de texte (publication progressive)
+
+        Contrairement à restore_emojis(), seuls les marqueurs présents dans le fragment
+        sont attendus: les emojis des autres segments ne sont pas signalés comme perdus
+        """
+        for index in map(int, re.findall(r'🔹EMOJI_(\d+)🔹', text)):
+            if index in emojis_map:
+                text = text.replace(EMOJI_PLACEHOLDER.format(index=index), emojis_map[index])
+        return text
+
+    def reassemble_fragment(self, translated_segments: List[Dict], emojis_map: Dict[int, str]) -> str:
+        """Texte d'une suite de segments consécutifs, emojis restaurés (sans journalisation)"""
+        fragment = ''.join(
+            segment['text'] for segment in translated_segments
+            if segment['type'] in ('separator', 'line', 'code')
+        )
+        return self.restore_segment_emojis(fragment, emojis_map)
+
     def is_list_item(self, line: str) -> bool:
         """
         Détecte si une ligne est un élément de liste
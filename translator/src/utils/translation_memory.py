@@ -0,0 +1,237 @@
+"""
+Mémoire de traduction adressée par contenu
+Une traduction est retrouvée par l'empreinte du texte source normalisé, des langues et
+du niveau de modèle, quel que soit le message d'origine: messages transférés, annonces
+copiées-collées ou publications de bots ne sont traduits qu'une fois.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from .write_behind import WriteBehindBuffer
+
+logger = logging.getLogger(__name__)
+
+_INNER_SPACES = re.compile(r'(?<=\S)[ \t\u00a0]+')
+
+
+def normalize_source_text(text: str) -> str:
+    """
+    Forme canonique du texte source
+
+    Unicode NFC, espaces multiples réduits à un seul, espaces de fin de ligne et
+    blancs autour du texte retirés; l'indentation des lignes suivantes et la casse
+    sont conservées.
+    """
+    lines = [_INNER_SPACES.sub(' ', line).rstrip() for line in unicodedata.normalize('NFC', text).split('\n')]
+    return '\n'.join(lines).strip()
+
+
+def content_hash(text: str, source_language: str, target_language: str) -> str:
+    """Empreinte d'un contenu et de sa paire de langues, indépendante du niveau de modèle"""
+    payload = f"{source_language}\x1f{target_language}\x1f{normalize_source_text(text)}"
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def memory_key(text: str, source_language: str, target_language: str, model_type: str) -> str:
+    """Clé de la mémoire: contenu normalisé + langue source + langue cible + niveau"""
+    return memory_key_for(content_hash(text, source_language, target_language), model_type)
+
+
+def memory_key_for(content: str, model_type: str) -> str:
+    return hashlib.blake2b(f"{content}\x1f{model_type}".encode('utf-8'), digest_size=16).hexdigest()
+
+
+class TranslationMemory:
+    """
+    Mémoire de traduction partagée entre messages
+
+    - lookup(): cherche, pour chaque langue, le meilleur niveau >= niveau demandé
+      (cache local LRU puis une seule requête pour toutes les clés manquantes)
+    - remember(): enregistre une traduction (écriture différée par lots); une entrée
+      de niveau supérieur remplace celles des niveaux inférieurs pour le même contenu
+    - Maintenance en arrière-plan: dates d'utilisation mises à jour par lots, purge des
+      entrées inutilisées depuis `ttl` secondes et au-delà de `max_entries`
+    """
+
+    def __init__(self,
+                 lookup_fn: Callable[[List[str]], Awaitable[Dict[str, Dict]]],
+                 store_fn: Callable[[List[Dict]], Awaitable[int]],
+                 hierarchy: Dict[str, int],
+                 touch_fn: Optional[Callable[[List[str]], Awaitable[int]]] = None,
+                 prune_fn: Optional[Callable[[float, int], Awaitable[int]]] = None,
+                 local_size: int = 10000,
+                 ttl: float = 30 * 86400,
+                 max_entries: int = 1000000,
+                 max_length: int = 5000,
+                 maintenance_interval: float = 30.0,
+                 prune_interval: float = 3600.0):
+        self.lookup_fn = lookup_fn
+        self.touch_fn = touch_fn
+        self.prune_fn = prune_fn
+        self.hierarchy = hierarchy
+        self.local_size = local_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_length = max_length
+        self.maintenance_interval = maintenance_interval
+        self.prune_interval = prune_interval
+
+        self.writer = WriteBehindBuffer(
+            flush_fn=store_fn,
+            rank=lambda model: self.hierarchy.get(model, 1),
+            key_fn=lambda entry: entry['contentHash'],
+            flush_interval=1.0
+        )
+        self._local: "OrderedDict[str, Dict]" = OrderedDict()
+        self._touched: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_prune = time.time()
+
+        self.stats = {
+            'lookups': 0,
+            'hits': 0,
+            'local_hits': 0,
+            'cross_message_hits': 0,
+            'misses': 0,
+            'stored': 0,
+            'upgrades': 0,
+            'pruned': 0
+        }
+
+    def tiers_for(self, model_type: str) -> List[str]:
+        """Niveaux acceptables pour une demande, du meilleur au niveau demandé"""
+        requested = self.hierarchy.get(model_type, 1)
+        return sorted((tier for tier, level in self.hierarchy.items() if level >= requested),
+                      key=lambda tier: self.hierarchy[tier], reverse=True)
+
+    def _cache(self, key: str, entry: Dict):
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def lookup(self, text: str, source_language: str, target_languages: List[str],
+                     model_type: str, message_id: Optional[str] = None) -> Dict[str, Dict]:
+        """Traductions mémorisées par langue cible (niveau >= model_type)"""
+        if not text or len(text) > self.max_length:
+            return {}
+        tiers = self.tiers_for(model_type)
+        keys_by_language = {
+            language: [memory_key_for(content_hash(text, source_language, language), tier) for tier in tiers]
+            for language in target_languages
+        }
+        missing = [key for keys in keys_by_language.values() for key in keys if key not in self._local]
+        fetched: Dict[str, Dict] = {}
+        if missing:
+            try:
+                fetched = await self.lookup_fn(missing)
+            except Exception as e:
+                logger.warning(f"⚠️ [TRANSLATOR] Mémoire de traduction indisponible: {e}")
+
+        found = {}
+        for language, keys in keys_by_language.items():
+            self.stats['lookups'] += 1
+            for key in keys:
+                entry = self._local.get(key)
+                if entry is not None:
+                    self.stats['local_hits'] += 1
+                    self._local.move_to_end(key)
+                else:
+                    entry = fetched.get(key)
+                    if entry is not None:
+                        self._cache(key, entry)
+                if entry is not None:
+                    found[language] = entry
+                    self._touched.add(key)
+                    self.stats['hits'] += 1
+                    if message_id and entry.get('originMessageId') != message_id:
+                        self.stats['cross_message_hits'] += 1
+                    break
+            else:
+                self.stats['misses'] += 1
+        return found
+
+    async def remember(self, text: str, source_language: str, target_language: str, model_type: str,
+                       translated_text: str, confidence: Optional[float] = None,
+                       message_id: Optional[str] = None):
+        """Mémorise une traduction réelle (jamais un fallback)"""
+        if not text or not translated_text or len(text) > self.max_length or model_type not in self.hierarchy:
+            return
+        content = content_hash(text, source_language, target_language)
+        level = self.hierarchy[model_type]
+        lower_keys = [memory_key_for(content, tier) for tier, tier_level in self.hierarchy.items() if tier_level < level]
+        if any(key in self._local for key in lower_keys):
+            self.stats['upgrades'] += 1
+        for key in lower_keys:
+            self._local.pop(key, None)
+
+        key = memory_key_for(content, model_type)
+        entry = {
+            'memoryKey': key,
+            'contentHash': content,
+            'sourceLanguage': source_language,
+            'targetLanguage': target_language,
+            'translationModel': model_type,
+            'translatedContent': translated_text,
+            'confidenceScore': confidence,
+            'originMessageId': message_id,
+            # Niveaux inférieurs remplacés en base par cette entrée
+            'supersedes': lower_keys
+        }
+        self._cache(key, entry)
+        await self.writer.put(entry)
+        self.stats['stored'] += 1
+
+    def start(self):
+        self.writer.start()
+        if self._task is None:
+            self._task = asyncio.create_task(self._maintenance_loop())
+
+    async def _maintenance_loop(self):
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            try:
+                await self._flush_touched()
+                if self.prune_fn and time.time() - self._last_prune >= self.prune_interval:
+                    self._last_prune = time.time()
+                    pruned = await self.prune_fn(self.ttl, self.max_entries)
+                    self.stats['pruned'] += pruned
+                    if pruned:
+                        logger.info(f"🧹 [TRANSLATOR] Mémoire de traduction: {pruned} entrée(s) purgée(s)")
+            except Exception as e:
+                logger.warning(f"⚠️ [TRANSLATOR] Maintenance de la mémoire de traduction échouée: {e}")
+
+    async def _flush_touched(self):
+        if self.touch_fn and self._touched:
+            keys, self._touched = list(self._touched), set()
+            await self.touch_fn(keys)
+
+    async def stop(self, timeout: Optional[float] = None):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.writer.stop(timeout=timeout)
+        try:
+            await self._flush_touched()
+        except Exception as e:
+            logger.warning(f"⚠️ [TRANSLATOR] Dates d'utilisation de la mémoire non enregistrées: {e}")
+
+    def get_stats(self) -> Dict:
+        lookups = self.stats['lookups']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'cross_message_hit_rate': self.stats['cross_message_hits'] / lookups if lookups else 0.0,
+            'local_entries': len(self._local),
+            'pending_writes': self.writer.pending,
+            'ttl_days': self.ttl / 86400,
+            'max_entries': self.max_entries
+        }
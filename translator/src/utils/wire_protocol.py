@@ -0,0 +1,160 @@
+"""
+Format de transport des messages ZMQ Gateway <-> Translator
+- json: une trame UTF-8 (format historique, toujours accepté)
+- msgpack/1: trames multipart [en-tête, charge utile msgpack], résultats compactés
+Le format binaire est négocié via ping/pong, JSON reste le repli par défaut
+Une trame de topic optionnelle ('<topic>|') précède le message pour le filtrage SUB
+"""
+
+import json
+import os
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+PROTOCOL_JSON = 'json'
+PROTOCOL_MSGPACK_V1 = 'msgpack/1'
+HEADER_PREFIX = b'mshy/'
+# Terminateur de topic: évite qu'un abonnement 'gw-1' reçoive aussi 'gw-10'
+TOPIC_SUFFIX = b'|'
+TOPIC_MAX_LENGTH = 128
+
+TRANSLATOR_VERSION = '1.0.0'
+
+# Champs dupliqués de translation_completed, reconstruits côté lecteur en msgpack/1
+_DUPLICATED_RESULT_FIELDS = {
+    'translatorModel': 'modelType',
+    'workerId': 'workerName',
+    'translationTime': 'processingTime'
+}
+
+
+class WireProtocolError(ValueError):
+    """Message illisible ou format de transport inconnu"""
+    pass
+
+
+def supported_protocols() -> List[str]:
+    """Formats acceptés par ce translator, par ordre de préférence (ZMQ_WIRE_PROTOCOLS)"""
+    configured = os.getenv('ZMQ_WIRE_PROTOCOLS', f"{PROTOCOL_MSGPACK_V1},{PROTOCOL_JSON}")
+    protocols = [p.strip() for p in configured.split(',') if p.strip()]
+    if not MSGPACK_AVAILABLE:
+        protocols = [p for p in protocols if p != PROTOCOL_MSGPACK_V1]
+    if PROTOCOL_JSON not in protocols:
+        protocols.append(PROTOCOL_JSON)
+    return protocols
+
+
+def is_valid_topic(topic: Any) -> bool:
+    """Topic ASCII imprimable, sans terminateur, de longueur bornée"""
+    return (
+        isinstance(topic, str)
+        and 0 < len(topic) <= TOPIC_MAX_LENGTH
+        and topic.isascii()
+        and topic.isprintable()
+        and TOPIC_SUFFIX.decode('ascii') not in topic
+    )
+
+
+def conversation_shard_topic(conversation_id: str, shards: int) -> str:
+    """Topic de shard stable d'une conversation (crc32, largeur fixe)"""
+    shard = zlib.crc32(conversation_id.encode('utf-8')) % max(1, shards)
+    return f"conv.{shard:03d}"
+
+
+def negotiate_protocol(offered: Optional[Sequence[str]], supported: Optional[Sequence[str]] = None) -> str:
+    """Premier format supporté (ordre de préférence du translator) proposé par le pair"""
+    supported = supported or supported_protocols()
+    offered = set(offered or ())
+    for protocol in supported:
+        if protocol in offered:
+            return protocol
+    return PROTOCOL_JSON
+
+
+def compact_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Retire les champs dupliqués et les métadonnées par message (nœud, sessionId...)"""
+    if message.get('type') != 'translation_completed':
+        return message
+    compact = {key: value for key, value in message.items() if key != 'metadata'}
+    result = message.get('result')
+    if isinstance(result, dict):
+        compact['result'] = {
+            key: value for key, value in result.items()
+            if not (key in _DUPLICATED_RESULT_FIELDS and value == result.get(_DUPLICATED_RESULT_FIELDS[key]))
+        }
+    return compact
+
+
+def expand_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Reconstruit la forme historique d'un translation_completed compacté"""
+    if message.get('type') != 'translation_completed' or 'metadata' in message:
+        return message
+    result = message.get('result')
+    if isinstance(result, dict):
+        for field, source in _DUPLICATED_RESULT_FIELDS.items():
+            if field not in result and source in result:
+                result[field] = result[source]
+        message['metadata'] = {
+            'translatorVersion': result.get('version', TRANSLATOR_VERSION),
+            'modelVersion': result.get('modelType', 'basic'),
+            'requestId': message.get('taskId'),
+            'protocol': 'ZMQ_PUB_SUB',
+            'encoding': PROTOCOL_MSGPACK_V1
+        }
+    return message
+
+
+def encode_message(message: Dict[str, Any], protocol: str = PROTOCOL_JSON, topic: Optional[str] = None) -> List[bytes]:
+    """Encode un message en trames ZMQ selon le format négocié, précédé du topic éventuel"""
+    if protocol == PROTOCOL_MSGPACK_V1 and MSGPACK_AVAILABLE:
+        payload = msgpack.packb(compact_message(message), use_bin_type=True)
+        frames = [HEADER_PREFIX + protocol.encode('ascii'), payload]
+    else:
+        frames = [json.dumps(message).encode('utf-8')]
+    if topic:
+        frames.insert(0, topic.encode('ascii') + TOPIC_SUFFIX)
+    return frames
+
+
+def _frame_buffer(frame: Any) -> Union[bytes, memoryview]:
+    """Accès sans copie au contenu d'une trame (zmq.Frame avec copy=False ou bytes)"""
+    buffer = getattr(frame, 'buffer', None)
+    return buffer if buffer is not None else frame
+
+
+def decode_message(frames: Union[bytes, Sequence[Any]], expand: bool = False) -> Tuple[Dict[str, Any], str]:
+    """Décode un message reçu (trame unique JSON ou multipart binaire), retourne (message, format)"""
+    if isinstance(frames, (bytes, bytearray, memoryview)) or hasattr(frames, 'buffer'):
+        frames = [frames]
+    frames = list(frames)
+    if len(frames) > 1 and bytes(_frame_buffer(frames[0])).endswith(TOPIC_SUFFIX):
+        frames = frames[1:]
+    if not frames:
+        raise WireProtocolError("message vide")
+
+    try:
+        if len(frames) == 1:
+            data = _frame_buffer(frames[0])
+            return json.loads(bytes(data)), PROTOCOL_JSON
+
+        header = bytes(_frame_buffer(frames[0]))
+        if not header.startswith(HEADER_PREFIX):
+            raise WireProtocolError(f"en-tête inconnu: {header[:32]!r}")
+        protocol = header[len(HEADER_PREFIX):].decode('ascii')
+        if protocol != PROTOCOL_MSGPACK_V1 or not MSGPACK_AVAILABLE:
+            raise WireProtocolError(f"format non supporté: {protocol}")
+        message = msgpack.unpackb(_frame_buffer(frames[1]), raw=False)
+    except WireProtocolError:
+        raise
+    except Exception as e:
+        raise WireProtocolError(str(e)) from e
+
+    if not isinstance(message, dict):
+        raise WireProtocolError("le message n'est pas un objet")
+    return (expand_message(message) if expand else message), protocol
@@ -0,0 +1,181 @@
+"""
+Sauvegarde différée (write-behind) des traductions publiées
+Les résultats sont regroupés par clé (par défaut messageId, targetLanguage) dans un tampon borné:
+une nouvelle version remplace la précédente sauf si son modèle est de niveau inférieur,
+et le tampon est écrit en base par lots (taille atteinte ou délai écoulé).
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Tampon de sauvegarde coalescent
+
+    - put(): attend tant que le tampon (en attente + en cours d'écriture) est plein
+    - Vidage quand batch_size clés sont en attente ou toutes les flush_interval secondes
+    - Au plus `concurrency` lots écrits en parallèle (connexions Prisma partagées)
+    - stop(): écrit tout ce qui reste avant de rendre la main
+    """
+
+    def __init__(self,
+                 flush_fn: Callable[[List[Dict]], Awaitable[int]],
+                 rank: Optional[Callable[[str], int]] = None,
+                 key_fn: Optional[Callable[[Dict], Hashable]] = None,
+                 batch_size: int = 200,
+                 flush_interval: float = 0.2,
+                 max_pending: int = 10000,
+                 concurrency: int = 2):
+        self.flush_fn = flush_fn
+        self.rank = rank or (lambda model: 1)
+        self.key_fn = key_fn or (lambda item: (item.get('messageId'), item.get('targetLanguage')))
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(self.batch_size, max_pending)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.concurrency = max(1, concurrency)
+
+        self._pending: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._in_flight = 0
+        self._batch_ready = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+
+        self.stats = {
+            'enqueued': 0,
+            'coalesced': 0,
+            'kept_higher_tier': 0,
+            'backpressure_waits': 0,
+            'max_pending': 0,
+            'flushes': 0,
+            'rows_flushed': 0,
+            'rows_failed': 0,
+            'total_flush_time': 0.0,
+            'max_flush_time': 0.0
+        }
+
+    @property
+    def pending(self) -> int:
+        """Traductions non encore confirmées en base (en attente + en cours d'écriture)"""
+        return len(self._pending) + self._in_flight
+
+    @staticmethod
+    def _model(item: Dict) -> str:
+        return item.get('translatorModel') or item.get('translationModel') or item.get('modelType', 'basic')
+
+    async def put(self, item: Dict):
+        """Ajoute (ou fusionne) une traduction, en attendant de la place si nécessaire"""
+        key = self.key_fn(item)
+        self.stats['enqueued'] += 1
+
+        if key not in self._pending and self.pending >= self.max_pending:
+            self.stats['backpressure_waits'] += 1
+            async with self._space:
+                await self._space.wait_for(lambda: key in self._pending or self.pending < self.max_pending)
+
+        existing = self._pending.get(key)
+        if existing is not None:
+            self.stats['coalesced'] += 1
+            # Même règle que la base: jamais remplacée par un modèle de niveau inférieur,
+            # sauf par la traduction d'un texte modifié (l'ancienne ne lui correspond plus)
+            if not item.get('sourceEdited') and self.rank(self._model(item)) < self.rank(self._model(existing)):
+                self.stats['kept_higher_tier'] += 1
+                return
+        self._pending[key] = item
+
+        self.stats['max_pending'] = max(self.stats['max_pending'], self.pending)
+        if len(self._pending) >= self.batch_size:
+            self._batch_ready.set()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            # Lots pleins tout de suite, reliquat à l'échéance du délai
+            while self._pending:
+                await self._semaphore.acquire()
+                batch = self._take_batch()
+                flush = asyncio.create_task(self._flush(batch))
+                self._flushes.add(flush)
+                flush.add_done_callback(self._flushes.discard)
+                if len(self._pending) < self.batch_size:
+                    break
+
+    def _take_batch(self) -> List[Dict]:
+        batch = []
+        while self._pending and len(batch) < self.batch_size:
+            batch.append(self._pending.popitem(last=False)[1])
+        self._in_flight += len(batch)
+        return batch
+
+    async def _flush(self, batch: List[Dict]):
+        """Écrit un lot (le sémaphore est déjà acquis) et libère la place réservée"""
+        start_time = time.time()
+        try:
+            saved = await self.flush_fn(batch)
+        except Exception as e:
+            saved = 0
+            logger.error(f"❌ [TRANSLATOR] Erreur sauvegarde d'un lot de {len(batch)} traduction(s): {e}")
+        finally:
+            self._semaphore.release()
+        elapsed = time.time() - start_time
+
+        self.stats['flushes'] += 1
+        self.stats['rows_flushed'] += saved
+        self.stats['rows_failed'] += len(batch) - saved
+        self.stats['total_flush_time'] += elapsed
+        self.stats['max_flush_time'] = max(self.stats['max_flush_time'], elapsed)
+        logger.debug(f"💾 [TRANSLATOR] {saved}/{len(batch)} traduction(s) sauvegardée(s) en {elapsed * 1000:.1f}ms")
+
+        self._in_flight -= len(batch)
+        async with self._space:
+            self._space.notify_all()
+
+    async def flush(self):
+        """Écrit immédiatement tout le tampon et attend la fin des écritures en cours"""
+        while self._pending:
+            await self._semaphore.acquire()
+            flush = asyncio.create_task(self._flush(self._take_batch()))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+        if self._flushes:
+            await asyncio.gather(*list(self._flushes), return_exceptions=True)
+
+    async def stop(self, timeout: Optional[float] = None):
+        """Arrête la boucle de vidage puis écrit le reliquat (borné par timeout)"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ [TRANSLATOR] {self.pending} traduction(s) non sauvegardée(s) à l'arrêt")
+
+    def get_stats(self) -> Dict:
+        flushes = self.stats['flushes']
+        return {
+            **self.stats,
+            'pending': self.pending,
+            'capacity': self.max_pending,
+            'batch_size': self.batch_size,
+            'flush_interval_ms': self.flush_interval * 1000,
+            'concurrency': self.concurrency,
+            'avg_rows_per_flush': self.stats['rows_flushed'] / flushes if flushes else 0.0,
+            'avg_flush_ms': self.stats['total_flush_time'] * 1000 / flushes if flushes else 0.0,
+            'max_flush_ms': self.stats['max_flush_time'] * 1000
+        }
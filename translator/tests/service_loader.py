@@ -0,0 +1,55 @@
+"""
+Chargement d'un module de src/services pour les tests, sans services/__init__.py
+
+Le paquet importe le serveur ZMQ complet (Prisma, torch, transformers). Les tests de
+comportement n'ont besoin que d'un module: il est chargé seul, et les dépendances lourdes
+absentes de l'environnement sont remplacées par le strict nécessaire à l'import (les
+tests fournissent leurs propres fausses bases et faux services de traduction).
+"""
+
+import importlib
+import os
+import sys
+import types
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+class TranslationCancelledError(Exception):
+    """Substitut de services.translation_ml_service.TranslationCancelledError"""
+
+
+def _ensure_package():
+    if 'services' not in sys.modules:
+        package = types.ModuleType('services')
+        package.__path__ = [os.path.join(SRC_DIR, 'services')]
+        sys.modules['services'] = package
+
+
+def _ensure_prisma():
+    try:
+        importlib.import_module('prisma')
+    except ImportError:
+        prisma = types.ModuleType('prisma')
+        prisma.Prisma = type('Prisma', (), {})
+        sys.modules['prisma'] = prisma
+
+
+def _ensure_translation_ml_service():
+    try:
+        importlib.import_module('services.translation_ml_service')
+    except Exception:
+        # Sans transformers, le module échoue à l'import (ImportError ou NameError)
+        stub = types.ModuleType('services.translation_ml_service')
+        stub.TranslationCancelledError = TranslationCancelledError
+        sys.modules['services.translation_ml_service'] = stub
+
+
+def load_service(name: str):
+    """Importe services.<name> sans exécuter services/__init__.py"""
+    _ensure_package()
+    _ensure_prisma()
+    _ensure_translation_ml_service()
+    return importlib.import_module(f'services.{name}')
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Test 06 - Journal durable des tâches de traduction
+Niveau: Simple - Journalisation, débordement, checkpoint et rejeu
+"""
+
+import sys
+import os
+import logging
+import tempfile
+import time
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from utils.task_journal import TaskJournal
+    JOURNAL_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Journal non disponible: {e}")
+    JOURNAL_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def _make_task(task_id: str, conversation_id: str = "conv") -> dict:
+    return {
+        'task_id': task_id,
+        'message_id': f"msg_{task_id}",
+        'text': "Bonjour",
+        'source_language': 'fr',
+        'target_languages': ['en'],
+        'conversation_id': conversation_id,
+        'model_type': 'basic',
+        'created_at': time.time()
+    }
+
+def test_checkpoint_and_replay():
+    """Les tâches non terminées sont rejouées après réouverture"""
+    logger.info("🧪 Test 06.1: Checkpoint et rejeu")
+    
+    if not JOURNAL_AVAILABLE:
+        logger.warning("⚠️ Journal non disponible, test ignoré")
+        return True
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'journal.db')
+        journal = TaskJournal(path)
+        journal.append(_make_task('t1'), 'normal')
+        journal.append(_make_task('t2'), 'normal')
+        journal.append(_make_task('t3', 'any'), 'any')
+        journal.checkpoint('t1')
+        journal.close()
+        
+        # Simuler un redémarrage
+        journal = TaskJournal(path)
+        pending = journal.replay()
+        assert pending == {'normal': 1, 'any': 1}
+        
+        replayed = journal.pull_spilled('normal', 10)
+        assert [t['task_id'] for t in replayed] == ['t2']
+        assert replayed[0]['target_languages'] == ['en']
+        assert journal.spilled_count('normal') == 0
+        journal.close()
+    
+    logger.info("✅ Rejeu du journal validé")
+    return True
+
+def test_spill_fifo_and_bound():
+    """Le débordement respecte l'ordre FIFO et la taille maximale du journal"""
+    logger.info("🧪 Test 06.2: Débordement FIFO et taille bornée")
+    
+    if not JOURNAL_AVAILABLE:
+        logger.warning("⚠️ Journal non disponible, test ignoré")
+        return True
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = TaskJournal(os.path.join(tmp, 'journal.db'), max_tasks=3, compact_every=2)
+        assert journal.append(_make_task('a'), 'normal', spilled=True)
+        assert journal.append(_make_task('b'), 'normal', spilled=True)
+        assert journal.append(_make_task('c'), 'normal', spilled=True)
+        assert not journal.append(_make_task('d'), 'normal', spilled=True)
+        assert journal.get_stats()['rejected_full'] == 1
+        
+        first = journal.pull_spilled('normal', 2)
+        assert [t['task_id'] for t in first] == ['a', 'b']
+        assert journal.spilled_count('normal') == 1
+        
+        journal.checkpoint('a')
+        journal.checkpoint('b')
+        # La compaction est faite par le thread d'écriture: flush() l'attend
+        journal.flush()
+        stats = journal.get_stats()
+        assert stats['pending'] == 1
+        assert stats['compactions'] >= 1
+        assert journal.append(_make_task('d'), 'normal', spilled=True)
+        assert [t['task_id'] for t in journal.pull_spilled('normal', 10)] == ['c', 'd']
+        journal.close()
+    
+    logger.info("✅ Débordement FIFO validé")
+    return True
+
+def test_group_commit():
+    """Écritures groupées hors de l'appelant; tâche terminée avant écriture: jamais sur disque"""
+    logger.info("🧪 Test 06.3: Écritures groupées")
+    
+    if not JOURNAL_AVAILABLE:
+        logger.warning("⚠️ Journal non disponible, test ignoré")
+        return True
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'journal.db')
+        # Intervalle long: rien n'est écrit tant que flush() n'est pas appelé
+        journal = TaskJournal(path, flush_interval=60)
+        for i in range(50):
+            journal.append(_make_task(f't{i}'), 'normal')
+        for i in range(40):
+            journal.checkpoint(f't{i}')
+        stats = journal.get_stats()
+        assert stats['flushes'] == 0 and stats['pending'] == 10
+        assert stats['ops_coalesced'] == 40 and stats['write_backlog'] == 50
+        
+        journal.flush()
+        stats = journal.get_stats()
+        assert stats['flushes'] == 1 and stats['write_backlog'] == 0
+        assert journal.count() == 10
+        journal.close()
+        
+        # Intervalle court: le thread d'écriture valide seul
+        journal = TaskJournal(path, flush_interval=0.01)
+        journal.append(_make_task('late'), 'any')
+        deadline = time.time() + 2
+        while not journal.get_stats()['flushes'] and time.time() < deadline:
+            time.sleep(0.01)
+        assert journal.get_stats()['flushes'] >= 1
+        assert journal.count() == 11
+        journal.close()
+    
+    logger.info("✅ Écritures groupées validées")
+    return True
+
+def test_pull_spilled_flushes_only_for_spills():
+    """pull_spilled n'écrit d'abord que si des débordements sont en attente d'écriture"""
+    logger.info("🧪 Test 06.4: Lecture des débordements sans écriture forcée")
+    
+    if not JOURNAL_AVAILABLE:
+        logger.warning("⚠️ Journal non disponible, test ignoré")
+        return True
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = TaskJournal(os.path.join(tmp, 'journal.db'), flush_interval=60)
+        for task_id in ('a', 'b', 'c'):
+            assert journal.append(_make_task(task_id), 'normal', spilled=True)
+        assert [t['task_id'] for t in journal.pull_spilled('normal', 1)] == ['a']
+        assert journal.get_stats()['flushes'] == 1
+        
+        # Seuls des checkpoints en attente: lecture sans écriture
+        journal.checkpoint('a')
+        assert [t['task_id'] for t in journal.pull_spilled('normal', 1)] == ['b']
+        stats = journal.get_stats()
+        assert stats['flushes'] == 1 and stats['write_backlog'] == 1
+        
+        # Nouveau débordement: écrit avant la lecture pour rester visible
+        assert journal.append(_make_task('d'), 'normal', spilled=True)
+        assert [t['task_id'] for t in journal.pull_spilled('normal', 10)] == ['c', 'd']
+        assert journal.get_stats()['flushes'] == 2
+        journal.close()
+    
+    logger.info("✅ Lecture des débordements sans écriture forcée validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests du journal"""
+    logger.info("🚀 Démarrage des tests du journal des tâches (Test 06)")
+    logger.info("=" * 50)
+    
+    tests = [
+        ("Checkpoint et rejeu", test_checkpoint_and_replay),
+        ("Débordement FIFO", test_spill_fifo_and_bound),
+        ("Écritures groupées", test_group_commit),
+        ("Lecture des débordements sans écriture forcée", test_pull_spilled_flushes_only_for_spills),
+    ]
+    
+    passed = 0
+    total = len(tests)
+    
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+    
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 06: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test 08 - Format de transport ZMQ
+Niveau: Simple - Négociation, encodage multipart msgpack, repli JSON et topics PUB
+"""
+
+import sys
+import os
+import logging
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from utils.wire_protocol import (
+        MSGPACK_AVAILABLE, PROTOCOL_JSON, PROTOCOL_MSGPACK_V1, WireProtocolError,
+        conversation_shard_topic, decode_message, encode_message, is_valid_topic, negotiate_protocol
+    )
+    WIRE_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Format de transport non disponible: {e}")
+    WIRE_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def _completed_message() -> dict:
+    return {
+        'type': 'translation_completed',
+        'taskId': 'task-1',
+        'result': {
+            'messageId': 'msg-1',
+            'translatedText': 'Hello 👋',
+            'modelType': 'basic',
+            'translatorModel': 'basic',
+            'workerName': 'normal_worker_0',
+            'workerId': 'normal_worker_0',
+            'processingTime': 0.2,
+            'translationTime': 0.2,
+            'version': '1.0.0'
+        },
+        'targetLanguage': 'en',
+        'metadata': {'sessionId': 'random', 'processingNode': 'host'}
+    }
+
+def test_negotiation():
+    """Le format préféré commun est choisi, JSON sinon"""
+    logger.info("🧪 Test 08.1: Négociation du format")
+
+    if not WIRE_AVAILABLE:
+        logger.warning("⚠️ Format de transport non disponible, test ignoré")
+        return True
+
+    supported = [PROTOCOL_MSGPACK_V1, PROTOCOL_JSON]
+    assert negotiate_protocol([PROTOCOL_JSON, PROTOCOL_MSGPACK_V1], supported) == PROTOCOL_MSGPACK_V1
+    assert negotiate_protocol(None, supported) == PROTOCOL_JSON
+    assert negotiate_protocol(['protobuf/9'], supported) == PROTOCOL_JSON
+
+    logger.info("✅ Négociation validée")
+    return True
+
+def test_json_fallback_roundtrip():
+    """JSON reste une trame unique au format historique"""
+    logger.info("🧪 Test 08.2: Repli JSON")
+
+    if not WIRE_AVAILABLE:
+        logger.warning("⚠️ Format de transport non disponible, test ignoré")
+        return True
+
+    message = _completed_message()
+    frames = encode_message(message, PROTOCOL_JSON)
+    assert len(frames) == 1
+    decoded, protocol = decode_message(frames[0])
+    assert protocol == PROTOCOL_JSON
+    assert decoded == message
+
+    try:
+        decode_message(b'{not json')
+        assert False, "un message invalide doit lever WireProtocolError"
+    except WireProtocolError:
+        pass
+
+    logger.info("✅ Repli JSON validé")
+    return True
+
+def test_msgpack_compact_roundtrip():
+    """msgpack/1: multipart, champs dupliqués retirés puis reconstruits"""
+    logger.info("🧪 Test 08.3: msgpack compact")
+
+    if not WIRE_AVAILABLE or not MSGPACK_AVAILABLE:
+        logger.warning("⚠️ msgpack non disponible, test ignoré")
+        return True
+
+    message = _completed_message()
+    frames = encode_message(message, PROTOCOL_MSGPACK_V1)
+    assert len(frames) == 2
+    assert sum(len(f) for f in frames) < len(encode_message(message, PROTOCOL_JSON)[0])
+
+    compact, protocol = decode_message(frames)
+    assert protocol == PROTOCOL_MSGPACK_V1
+    assert 'metadata' not in compact
+    assert 'workerId' not in compact['result']
+    assert compact['result']['translatedText'] == 'Hello 👋'
+
+    expanded, _ = decode_message(frames, expand=True)
+    assert expanded['result']['workerId'] == 'normal_worker_0'
+    assert expanded['result']['translatorModel'] == 'basic'
+    assert expanded['metadata']['requestId'] == 'task-1'
+
+    try:
+        decode_message([b'mshy/unknown', frames[1]])
+        assert False, "un format inconnu doit lever WireProtocolError"
+    except WireProtocolError:
+        pass
+
+    logger.info("✅ msgpack compact validé")
+    return True
+
+def test_topic_frames():
+    """Le topic précède le message et n'altère pas le décodage"""
+    logger.info("🧪 Test 08.4: Trame de topic")
+
+    if not WIRE_AVAILABLE:
+        logger.warning("⚠️ Format de transport non disponible, test ignoré")
+        return True
+
+    message = _completed_message()
+    protocols = [PROTOCOL_JSON] + ([PROTOCOL_MSGPACK_V1] if MSGPACK_AVAILABLE else [])
+    for protocol in protocols:
+        frames = encode_message(message, protocol, topic='gw-1')
+        # Terminateur: un abonnement 'gw-1|' ne reçoit pas 'gw-10|'
+        assert frames[0] == b'gw-1|'
+        assert not frames[0].startswith(b'gw-10|')
+        decoded, decoded_protocol = decode_message(frames)
+        assert decoded_protocol == protocol
+        assert decoded['result']['translatedText'] == 'Hello 👋'
+
+    shard = conversation_shard_topic('conversation-42', 16)
+    assert shard == conversation_shard_topic('conversation-42', 16)
+    assert shard.startswith('conv.') and len(shard) == len('conv.000')
+    assert is_valid_topic('gateway-a.replica-3')
+    assert not is_valid_topic('bad|topic')
+    assert not is_valid_topic('')
+    assert not is_valid_topic('x' * 500)
+
+    logger.info("✅ Trame de topic validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests du format de transport"""
+    logger.info("🚀 Démarrage des tests du format de transport (Test 08)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Négociation", test_negotiation),
+        ("Repli JSON", test_json_fallback_roundtrip),
+        ("msgpack compact", test_msgpack_compact_roundtrip),
+        ("Trame de topic", test_topic_frames),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 08: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test 09 - Répartition du mode cluster
+Niveau: Simple - Crédits, affinité de conversation, niveaux de modèle et expiration
+"""
+
+import sys
+import os
+import logging
+import time
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from utils.cluster_dispatch import ClusterDispatcher
+    DISPATCH_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Répartition cluster non disponible: {e}")
+    DISPATCH_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def _dispatcher() -> ClusterDispatcher:
+    dispatcher = ClusterDispatcher(heartbeat_timeout=5, affinity_max_load=0.75, affinity_size=100)
+    dispatcher.register(b'node-a', {'capacity': 4, 'tiers': ['basic', 'medium']})
+    dispatcher.register(b'node-b', {'capacity': 4, 'tiers': ['basic']})
+    return dispatcher
+
+def test_credits():
+    """Une requête consomme un crédit, le retour de crédit libère le nœud"""
+    logger.info("🧪 Test 09.1: Crédits")
+
+    if not DISPATCH_AVAILABLE:
+        logger.warning("⚠️ Répartition cluster non disponible, test ignoré")
+        return True
+
+    dispatcher = _dispatcher()
+    chosen = [dispatcher.select(f"conv-{i}") for i in range(8)]
+    assert chosen.count(b'node-a') == 4 and chosen.count(b'node-b') == 4
+    assert dispatcher.select('conv-x') is None
+    assert not dispatcher.has_credit()
+
+    dispatcher.add_credits(b'node-b', 1)
+    assert dispatcher.select('conv-x') == b'node-b'
+    # Les crédits ne dépassent jamais la capacité annoncée
+    dispatcher.add_credits(b'node-a', 100)
+    assert dispatcher.nodes[b'node-a'].credits == 4
+
+    logger.info("✅ Crédits validés")
+    return True
+
+def test_affinity_and_overload():
+    """Une conversation reste sur son nœud tant qu'il n'est pas surchargé"""
+    logger.info("🧪 Test 09.2: Affinité de conversation")
+
+    if not DISPATCH_AVAILABLE:
+        logger.warning("⚠️ Répartition cluster non disponible, test ignoré")
+        return True
+
+    dispatcher = _dispatcher()
+    first = dispatcher.select('conv-1')
+    assert dispatcher.select('conv-1') == first
+    assert dispatcher.select('conv-1') == first
+    assert dispatcher.stats['affinity_hits'] == 2
+
+    # Charge 3/4 >= 0.75: la conversation bascule sur l'autre nœud
+    other = dispatcher.select('conv-1')
+    assert other != first
+    assert dispatcher.stats['affinity_overridden'] == 1
+    assert dispatcher.select('conv-1') == other
+
+    logger.info("✅ Affinité de conversation validée")
+    return True
+
+def test_tiers_and_expiry():
+    """Les nœuds ayant chargé le niveau demandé sont préférés, les nœuds muets expirent"""
+    logger.info("🧪 Test 09.3: Niveaux de modèle et expiration")
+
+    if not DISPATCH_AVAILABLE:
+        logger.warning("⚠️ Répartition cluster non disponible, test ignoré")
+        return True
+
+    dispatcher = _dispatcher()
+    assert all(dispatcher.select(f"conv-{i}", 'medium') == b'node-a' for i in range(4))
+    # node-a épuisé: repli sur un nœud sans le niveau plutôt que d'attendre
+    assert dispatcher.select('conv-9', 'medium') == b'node-b'
+    assert dispatcher.stats['tier_misses'] == 1
+
+    dispatcher.nodes[b'node-b'].last_seen = time.time() - 60
+    assert dispatcher.expire() == [b'node-b']
+    assert set(dispatcher.nodes) == {b'node-a'}
+
+    logger.info("✅ Niveaux de modèle et expiration validés")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de répartition cluster"""
+    logger.info("🚀 Démarrage des tests de répartition cluster (Test 09)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Crédits", test_credits),
+        ("Affinité de conversation", test_affinity_and_overload),
+        ("Niveaux et expiration", test_tiers_and_expiry),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 09: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
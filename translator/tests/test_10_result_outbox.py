@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test 10 - Outbox des résultats publiés
+Niveau: Simple - Acquittement, rejeu, réutilisation et persistance sur disque
+"""
+
+import sys
+import os
+import logging
+import tempfile
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from utils.result_outbox import ResultOutbox, text_fingerprint
+    OUTBOX_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Outbox non disponible: {e}")
+    OUTBOX_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def _completed(message_id: str, language: str) -> dict:
+    return {
+        'type': 'translation_completed',
+        'taskId': f"task-{message_id}",
+        'result': {'messageId': message_id, 'translatedText': f"{message_id} ({language})"},
+        'targetLanguage': language
+    }
+
+def _fill(outbox) -> list:
+    return [
+        outbox.add(message_id, language, _completed(message_id, language), topic=topic,
+                   text_hash=text_fingerprint(message_id), model_type='basic')
+        for message_id, language, topic in [
+            ('msg-1', 'en', 'gw-a'), ('msg-1', 'es', 'gw-a'), ('msg-2', 'en', 'gw-b'), ('msg-3', 'de', None)
+        ]
+    ]
+
+def test_ack_and_replay():
+    """Seuls les résultats non acquittés postérieurs à la séquence sont rejoués"""
+    logger.info("🧪 Test 10.1: Acquittement et rejeu")
+
+    if not OUTBOX_AVAILABLE:
+        logger.warning("⚠️ Outbox non disponible, test ignoré")
+        return True
+
+    outbox = ResultOutbox(max_entries=100, ttl=3600)
+    seqs = _fill(outbox)
+    assert seqs == [1, 2, 3, 4]
+
+    assert outbox.ack('msg-1', ['es']) == 1
+    assert [e.seq for e in outbox.since(0)] == [1, 3, 4]
+    assert [e.seq for e in outbox.since(1)] == [3, 4]
+    assert [e.message_id for e in outbox.since(0, topic='gw-a')] == ['msg-1']
+
+    # Acquittement cumulatif puis acquittement de toutes les langues d'un message
+    assert outbox.ack_through(3) == 2
+    assert outbox.ack('msg-3') == 1
+    assert outbox.pending == 0
+    assert outbox.since(0) == []
+
+    logger.info("✅ Acquittement et rejeu validés")
+    return True
+
+def test_reuse_and_discard():
+    """Un résultat n'est réutilisé que pour le même texte et jamais après modification"""
+    logger.info("🧪 Test 10.2: Réutilisation et invalidation")
+
+    if not OUTBOX_AVAILABLE:
+        logger.warning("⚠️ Outbox non disponible, test ignoré")
+        return True
+
+    outbox = ResultOutbox(max_entries=3, ttl=3600)
+    _fill(outbox)
+    # Capacité 3: le plus ancien résultat est abandonné
+    assert outbox.find('msg-1', 'en') is None
+    assert outbox.stats['evicted'] == 1
+
+    assert outbox.find('msg-2', 'en', text_fingerprint('msg-2')) is not None
+    assert outbox.find('msg-2', 'en', text_fingerprint('texte modifié')) is None
+
+    assert outbox.discard('msg-2') == 1
+    assert outbox.find('msg-2', 'en') is None
+
+    logger.info("✅ Réutilisation et invalidation validées")
+    return True
+
+def test_disk_backed():
+    """Les résultats non acquittés survivent à un redémarrage, la séquence continue"""
+    logger.info("🧪 Test 10.3: Persistance sur disque")
+
+    if not OUTBOX_AVAILABLE:
+        logger.warning("⚠️ Outbox non disponible, test ignoré")
+        return True
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'outbox.db')
+        outbox = ResultOutbox(max_entries=100, ttl=3600, path=path)
+        _fill(outbox)
+        outbox.ack('msg-2')
+        outbox.close()
+
+        reopened = ResultOutbox(max_entries=100, ttl=3600, path=path)
+        assert [e.seq for e in reopened.since(0)] == [1, 2, 4]
+        assert reopened.since(0)[0].message['result']['translatedText'] == 'msg-1 (en)'
+        assert reopened.add('msg-4', 'en', _completed('msg-4', 'en')) == 5
+        reopened.close()
+
+    logger.info("✅ Persistance sur disque validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de l'outbox"""
+    logger.info("🚀 Démarrage des tests de l'outbox des résultats (Test 10)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Acquittement et rejeu", test_ack_and_replay),
+        ("Réutilisation et invalidation", test_reuse_and_discard),
+        ("Persistance sur disque", test_disk_backed),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 10: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
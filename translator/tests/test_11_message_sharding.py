@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test 11 - Découpage des messages très longs
+Niveau: Simple - Budget de tokens, blocs de code et réassemblage dans l'ordre
+"""
+
+import sys
+import os
+import logging
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from utils.message_sharding import estimate_tokens, plan_shards, shard_token_budget
+    from utils.text_segmentation import TextSegmenter
+    SHARDING_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Découpage des messages non disponible: {e}")
+    SHARDING_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+LONG_TEXT = (
+    "\n\nIntroduction du message 😊\n"
+    + "\n".join(f"Ligne {i}: " + "contenu " * (i % 7 + 1) for i in range(120))
+    + "\n```\nprint('a')\n\nprint('b')\n```\n\nConclusion 🚀\n\n"
+)
+
+def test_budget():
+    """Le budget par fragment occupe les cœurs disponibles sans dépasser le maximum"""
+    logger.info("🧪 Test 11.1: Budget de tokens")
+
+    if not SHARDING_AVAILABLE:
+        logger.warning("⚠️ Découpage non disponible, test ignoré")
+        return True
+
+    text = "x" * 40000  # ~10000 tokens
+    assert estimate_tokens(text) == 10000
+    assert shard_token_budget(text, max_tokens=400, parallelism=4) == 400
+    assert shard_token_budget(text, max_tokens=4000, parallelism=4) == 2500
+    assert shard_token_budget("court", max_tokens=400, parallelism=4) == 64
+
+    logger.info("✅ Budget de tokens validé")
+    return True
+
+def test_shard_boundaries():
+    """Coupures aux sauts de ligne uniquement, jamais dans un bloc de code"""
+    logger.info("🧪 Test 11.2: Frontières des fragments")
+
+    if not SHARDING_AVAILABLE:
+        logger.warning("⚠️ Découpage non disponible, test ignoré")
+        return True
+
+    segments = plan_shards(LONG_TEXT, token_budget=80)
+    shards = [s for s in segments if s['type'] == 'line']
+    assert len(shards) > 5
+    assert [s['index'] for s in segments] == list(range(len(segments)))
+    for segment in segments:
+        if segment['type'] == 'separator':
+            assert set(segment['text']) == {'\n'}
+        else:
+            assert not segment['text'].startswith('\n') and not segment['text'].endswith('\n')
+            assert segment['text'].count('```') % 2 == 0
+    # Une ligne seule plus longue que le budget reste un fragment unique
+    assert len([s for s in plan_shards("a" * 1000, token_budget=10) if s['type'] == 'line']) == 1
+
+    logger.info("✅ Frontières des fragments validées")
+    return True
+
+def test_reassemble_in_order():
+    """La jointure via reassemble_text restitue exactement le texte (ordre et séparateurs)"""
+    logger.info("🧪 Test 11.3: Réassemblage")
+
+    if not SHARDING_AVAILABLE:
+        logger.warning("⚠️ Découpage non disponible, test ignoré")
+        return True
+
+    segments = plan_shards(LONG_TEXT, token_budget=80)
+    assert TextSegmenter().reassemble_text(segments, {}) == LONG_TEXT
+
+    translated = [{**s, 'text': s['text'].upper()} if s['type'] == 'line' else s for s in segments]
+    assert TextSegmenter().reassemble_text(translated, {}) == LONG_TEXT.upper()
+
+    logger.info("✅ Réassemblage validé")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de découpage"""
+    logger.info("🚀 Démarrage des tests de découpage des messages longs (Test 11)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Budget de tokens", test_budget),
+        ("Frontières des fragments", test_shard_boundaries),
+        ("Réassemblage", test_reassemble_in_order),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 11: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
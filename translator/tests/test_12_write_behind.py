@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test 12 - Sauvegarde différée des traductions
+Niveau: Simple - Fusion par message/langue, vidage par lots et contre-pression
+"""
+
+import sys
+import os
+import asyncio
+import logging
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from utils.write_behind import WriteBehindBuffer
+    WRITE_BEHIND_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Sauvegarde différée non disponible: {e}")
+    WRITE_BEHIND_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+HIERARCHY = {'basic': 1, 'medium': 2, 'premium': 3}
+
+def _translation(message_id: str, language: str, model: str = 'basic') -> dict:
+    return {
+        'messageId': message_id,
+        'targetLanguage': language,
+        'translatedText': f"{message_id} ({language}, {model})",
+        'translatorModel': model
+    }
+
+class _FakeDatabase:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches = []
+
+    async def save_translations(self, items):
+        await asyncio.sleep(self.delay)
+        self.batches.append(list(items))
+        return len(items)
+
+def test_coalesce_model_hierarchy():
+    """Une seule ligne par message/langue, jamais remplacée par un modèle inférieur"""
+    logger.info("🧪 Test 12.1: Fusion et hiérarchie des modèles")
+
+    if not WRITE_BEHIND_AVAILABLE:
+        logger.warning("⚠️ Sauvegarde différée non disponible, test ignoré")
+        return True
+
+    async def scenario():
+        database = _FakeDatabase()
+        buffer = WriteBehindBuffer(database.save_translations, rank=lambda m: HIERARCHY.get(m, 1),
+                                   batch_size=100, flush_interval=60)
+        await buffer.put(_translation('msg-1', 'en', 'basic'))
+        await buffer.put(_translation('msg-1', 'en', 'premium'))
+        await buffer.put(_translation('msg-1', 'en', 'medium'))
+        await buffer.put(_translation('msg-1', 'es', 'medium'))
+        await buffer.stop()
+        return database, buffer
+
+    database, buffer = asyncio.run(scenario())
+    assert len(database.batches) == 1
+    saved = {(t['messageId'], t['targetLanguage']): t['translatorModel'] for t in database.batches[0]}
+    assert saved == {('msg-1', 'en'): 'premium', ('msg-1', 'es'): 'medium'}
+    assert buffer.stats['coalesced'] == 2
+    assert buffer.stats['kept_higher_tier'] == 1
+
+    logger.info("✅ Fusion et hiérarchie validées")
+    return True
+
+def test_size_trigger_and_shutdown_flush():
+    """Lots pleins écrits sans attendre le délai, reliquat écrit à l'arrêt"""
+    logger.info("🧪 Test 12.2: Vidage par taille et à l'arrêt")
+
+    if not WRITE_BEHIND_AVAILABLE:
+        logger.warning("⚠️ Sauvegarde différée non disponible, test ignoré")
+        return True
+
+    async def scenario():
+        database = _FakeDatabase()
+        buffer = WriteBehindBuffer(database.save_translations, batch_size=10, flush_interval=60)
+        buffer.start()
+        for i in range(25):
+            await buffer.put(_translation(f"msg-{i}", 'en'))
+        await asyncio.sleep(0.05)
+        flushed_before_stop = sum(len(b) for b in database.batches)
+        await buffer.stop()
+        return database, buffer, flushed_before_stop
+
+    database, buffer, flushed_before_stop = asyncio.run(scenario())
+    assert flushed_before_stop == 20
+    assert [len(b) for b in database.batches] == [10, 10, 5]
+    stats = buffer.get_stats()
+    assert stats['rows_flushed'] == 25 and stats['pending'] == 0
+    assert stats['avg_rows_per_flush'] == 25 / 3
+
+    logger.info("✅ Vidage par taille et à l'arrêt validé")
+    return True
+
+def test_backpressure():
+    """Tampon plein: put() attend la fin d'une écriture au lieu de grossir sans limite"""
+    logger.info("🧪 Test 12.3: Contre-pression")
+
+    if not WRITE_BEHIND_AVAILABLE:
+        logger.warning("⚠️ Sauvegarde différée non disponible, test ignoré")
+        return True
+
+    async def scenario():
+        database = _FakeDatabase(delay=0.02)
+        buffer = WriteBehindBuffer(database.save_translations, batch_size=5, flush_interval=0.01,
+                                   max_pending=5, concurrency=1)
+        buffer.start()
+        for i in range(30):
+            await buffer.put(_translation(f"msg-{i}", 'en'))
+            assert buffer.pending <= 5
+        await buffer.stop()
+        return database, buffer
+
+    database, buffer = asyncio.run(scenario())
+    assert sum(len(b) for b in database.batches) == 30
+    assert buffer.stats['backpressure_waits'] > 0
+    assert buffer.stats['max_pending'] <= 5
+
+    logger.info("✅ Contre-pression validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de sauvegarde différée"""
+    logger.info("🚀 Démarrage des tests de sauvegarde différée (Test 12)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Fusion et hiérarchie des modèles", test_coalesce_model_hierarchy),
+        ("Vidage par taille et à l'arrêt", test_size_trigger_and_shutdown_flush),
+        ("Contre-pression", test_backpressure),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 12: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test 13 - Mémoire de traduction adressée par contenu
+Niveau: Simple - Normalisation, niveaux de modèle, réutilisation entre messages et purge
+"""
+
+import sys
+import os
+import asyncio
+import logging
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from utils.translation_memory import TranslationMemory, memory_key, normalize_source_text
+    MEMORY_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Mémoire de traduction non disponible: {e}")
+    MEMORY_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+HIERARCHY = {'basic': 1, 'medium': 2, 'premium': 3}
+
+class _FakeStore:
+    """Collection translation_memory simulée"""
+    def __init__(self):
+        self.rows = {}
+        self.lookups = 0
+        self.touched = []
+
+    async def lookup(self, keys):
+        self.lookups += 1
+        return {key: self.rows[key] for key in keys if key in self.rows}
+
+    async def store(self, entries):
+        for entry in entries:
+            for key in entry['supersedes']:
+                self.rows.pop(key, None)
+            self.rows[entry['memoryKey']] = entry
+        return len(entries)
+
+    async def touch(self, keys):
+        self.touched.extend(keys)
+        return len(keys)
+
+    async def prune(self, max_age, max_entries):
+        excess = max(0, len(self.rows) - max_entries)
+        for key in list(self.rows)[:excess]:
+            del self.rows[key]
+        return excess
+
+def _memory(store, **kwargs):
+    return TranslationMemory(store.lookup, store.store, HIERARCHY, touch_fn=store.touch,
+                             prune_fn=store.prune, **kwargs)
+
+def test_normalized_keys():
+    """Les variantes d'espacement partagent une clé, pas les langues ni les niveaux"""
+    logger.info("🧪 Test 13.1: Clés de contenu")
+
+    if not MEMORY_AVAILABLE:
+        logger.warning("⚠️ Mémoire de traduction non disponible, test ignoré")
+        return True
+
+    assert normalize_source_text("  Réunion   demain \n\n") == "Réunion demain"
+    assert normalize_source_text("code:\n    x = 1") == "code:\n    x = 1"
+    key = memory_key("Réunion demain", 'fr', 'en', 'basic')
+    assert memory_key(" Réunion  demain\n", 'fr', 'en', 'basic') == key
+    assert memory_key("réunion demain", 'fr', 'en', 'basic') != key
+    assert memory_key("Réunion demain", 'fr', 'es', 'basic') != key
+    assert memory_key("Réunion demain", 'fr', 'en', 'premium') != key
+
+    logger.info("✅ Clés de contenu validées")
+    return True
+
+def test_cross_message_reuse_and_tiers():
+    """Un autre message réutilise la traduction; un niveau supérieur remplace l'inférieur"""
+    logger.info("🧪 Test 13.2: Réutilisation entre messages et niveaux")
+
+    if not MEMORY_AVAILABLE:
+        logger.warning("⚠️ Mémoire de traduction non disponible, test ignoré")
+        return True
+
+    async def scenario():
+        store = _FakeStore()
+        memory = _memory(store)
+        await memory.remember("Annonce", 'fr', 'en', 'basic', "Announcement", 0.9, 'msg-1')
+        await memory.writer.flush()
+
+        # Cache local vide: une seule requête pour toutes les langues et tous les niveaux
+        fresh = _memory(store)
+        found = await fresh.lookup("Annonce ", 'fr', ['en', 'es'], 'basic', 'msg-2')
+        assert list(found) == ['en'] and store.lookups == 1
+        assert fresh.stats['cross_message_hits'] == 1 and fresh.stats['misses'] == 1
+        # Niveau demandé supérieur à celui mémorisé: pas de réutilisation
+        assert await fresh.lookup("Annonce", 'fr', ['en'], 'premium', 'msg-3') == {}
+
+        await fresh.remember("Annonce", 'fr', 'en', 'premium', "Notice", 0.95, 'msg-3')
+        await fresh.stop()
+        assert fresh.stats['upgrades'] == 1
+        assert [row['translationModel'] for row in store.rows.values()] == ['premium']
+        found = await _memory(store).lookup("Annonce", 'fr', ['en'], 'medium', 'msg-4')
+        assert found['en']['translatedContent'] == "Notice"
+        assert store.touched
+        return fresh
+
+    memory = asyncio.run(scenario())
+    stats = memory.get_stats()
+    assert stats['hit_rate'] == 1 / 3
+    assert stats['cross_message_hit_rate'] == 1 / 3
+
+    logger.info("✅ Réutilisation entre messages et niveaux validées")
+    return True
+
+def test_prune_and_limits():
+    """Purge par taille en arrière-plan, textes trop longs jamais mémorisés"""
+    logger.info("🧪 Test 13.3: Purge et limites")
+
+    if not MEMORY_AVAILABLE:
+        logger.warning("⚠️ Mémoire de traduction non disponible, test ignoré")
+        return True
+
+    async def scenario():
+        store = _FakeStore()
+        memory = _memory(store, max_entries=3, max_length=100,
+                         maintenance_interval=0.01, prune_interval=0)
+        for i in range(5):
+            await memory.remember(f"Message {i}", 'fr', 'en', 'basic', f"Message {i} (en)")
+        await memory.remember("x" * 200, 'fr', 'en', 'basic', "long")
+        await memory.writer.flush()
+        assert len(store.rows) == 5
+        memory.start()
+        await asyncio.sleep(0.05)
+        await memory.stop()
+        return store, memory
+
+    store, memory = asyncio.run(scenario())
+    assert len(store.rows) == 3
+    assert memory.stats['pruned'] == 2
+    assert memory.stats['stored'] == 5
+
+    logger.info("✅ Purge et limites validées")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de la mémoire de traduction"""
+    logger.info("🚀 Démarrage des tests de la mémoire de traduction (Test 13)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Clés de contenu", test_normalized_keys),
+        ("Réutilisation entre messages et niveaux", test_cross_message_reuse_and_tiers),
+        ("Purge et limites", test_prune_and_limits),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 13: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test 15 - Retraduction incrémentale des messages modifiés
+Niveau: Simple - Comparaison des lignes et réutilisation des traductions enregistrées
+"""
+
+import sys
+import os
+import logging
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from utils.incremental_translation import line_texts, plan_segment_reuse
+    from utils.text_segmentation import TextSegmenter
+    INCREMENTAL_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Retraduction incrémentale non disponible: {e}")
+    INCREMENTAL_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def test_changed_lines_only():
+    """Seules les lignes modifiées ou ajoutées sont à traduire"""
+    logger.info("🧪 Test 15.1: Lignes modifiées")
+
+    if not INCREMENTAL_AVAILABLE:
+        logger.warning("⚠️ Retraduction incrémentale non disponible, test ignoré")
+        return True
+
+    previous = ["Bonjour", "Réunion à 10h", "Salle B", "Merci"]
+    translated = ["Hello", "Meeting at 10", "Room B", "Thanks"]
+    new_lines = ["Bonjour", "Réunion à 11h", "Salle B", "Ordre du jour", "Merci"]
+    reused = plan_segment_reuse(previous, translated, new_lines)
+    assert reused == {0: "Hello", 2: "Room B", 4: "Thanks"}
+
+    # Paragraphes réordonnés: même texte, même traduction
+    assert plan_segment_reuse(previous, translated, ["Merci", "Bonjour"]) == {0: "Thanks", 1: "Hello"}
+    # Traduction sans lignes alignées (texte court traduit d'un bloc): rien à réutiliser
+    assert plan_segment_reuse([], [], new_lines) == {}
+    assert plan_segment_reuse(previous, translated[:2], new_lines) == {}
+
+    logger.info("✅ Lignes modifiées validées")
+    return True
+
+def test_emoji_shift_keeps_lines():
+    """Un emoji ajouté plus haut ne rend pas les lignes suivantes différentes"""
+    logger.info("🧪 Test 15.2: Emojis décalés")
+
+    if not INCREMENTAL_AVAILABLE:
+        logger.warning("⚠️ Retraduction incrémentale non disponible, test ignoré")
+        return True
+
+    segmenter = TextSegmenter()
+    before = line_texts(segmenter, *segmenter.segment_text("Salut\nBravo 🎉\n```\ncode()\n```"))
+    after = line_texts(segmenter, *segmenter.segment_text("Salut 😊\nBravo 🎉\n```\ncode()\n```"))
+    # Le code n'est pas une ligne traduisible
+    assert before == ["Salut", "Bravo 🎉"]
+    assert after == ["Salut 😊", "Bravo 🎉"]
+    assert plan_segment_reuse(before, ["Hi", "Well done 🎉"], after) == {1: "Well done 🎉"}
+
+    logger.info("✅ Emojis décalés validés")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de la retraduction incrémentale"""
+    logger.info("🚀 Démarrage des tests de la retraduction incrémentale (Test 15)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Lignes modifiées", test_changed_lines_only),
+        ("Emojis décalés", test_emoji_shift_keeps_lines),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 15: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test 17 - Jeu de données synthétique
+Niveau: Simple - Reproductibilité, identifiants et distributions
+"""
+
+import sys
+import os
+import logging
+from collections import Counter
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    from utils.synthetic_data import SyntheticDataGenerator
+    SYNTHETIC_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Générateur synthétique non disponible: {e}")
+    SYNTHETIC_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def _generate(seed):
+    generator = SyntheticDataGenerator(seed=seed, users=300, conversations=40, messages=3000)
+    rows = {'users': list(generator.users()), 'members': [], 'messages': [], 'translations': []}
+    for conversation, members, member_ids, count in generator.conversations():
+        rows['members'].extend(members)
+        for message, translations in generator.messages(conversation, member_ids, count):
+            rows['messages'].append(message)
+            rows['translations'].extend(translations)
+    return generator, rows
+
+def test_reproducible():
+    """Même graine: mêmes lignes; autre graine: autres contenus"""
+    logger.info("🧪 Test 17.1: Reproductibilité")
+
+    if not SYNTHETIC_AVAILABLE:
+        logger.warning("⚠️ Générateur synthétique non disponible, test ignoré")
+        return True
+
+    _, first = _generate(7)
+    _, second = _generate(7)
+    _, other = _generate(8)
+    assert first == second
+    assert [m['content'] for m in first['messages']] != [m['content'] for m in other['messages']]
+
+    logger.info("✅ Reproductibilité validée")
+    return True
+
+def test_ids_and_distributions():
+    """Identifiants ObjectId uniques et cohérents, total de messages exact, mélange réaliste"""
+    logger.info("🧪 Test 17.2: Identifiants et distributions")
+
+    if not SYNTHETIC_AVAILABLE:
+        logger.warning("⚠️ Générateur synthétique non disponible, test ignoré")
+        return True
+
+    generator, rows = _generate(3)
+    ids = [row['id'] for table in rows.values() for row in table]
+    assert len(ids) == len(set(ids))
+    assert all(len(i) == 24 and int(i, 16) >= 0 for i in ids)
+    assert len(rows['messages']) == 3000 == generator.counts['messages']
+
+    user_ids = {user['id'] for user in rows['users']}
+    assert all(member['userId'] in user_ids for member in rows['members'])
+    assert all(message['senderId'] in user_ids for message in rows['messages'])
+    message_ids = {message['id'] for message in rows['messages']}
+    assert all(t['messageId'] in message_ids and t['targetLanguage'] != t['sourceLanguage'] for t in rows['translations'])
+
+    languages = Counter(message['originalLanguage'] for message in rows['messages'])
+    assert languages.most_common(1)[0][0] == 'en' and len(languages) >= 8
+    lengths = sorted(len(message['content']) for message in rows['messages'])
+    assert 20 <= lengths[len(lengths) // 2] <= 80
+    assert any('\n' in message['content'] for message in rows['messages'])
+
+    logger.info("✅ Identifiants et distributions validés")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests du générateur synthétique"""
+    logger.info("🚀 Démarrage des tests du jeu de données synthétique (Test 17)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Reproductibilité", test_reproducible),
+        ("Identifiants et distributions", test_ids_and_distributions),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 17: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
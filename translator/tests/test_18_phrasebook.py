@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test 18 - Recueil de phrases fréquentes
+Niveau: Simple - Extraction, recherche par empreinte et remplacement à chaud
+"""
+
+import sys
+import os
+import asyncio
+import logging
+import tempfile
+from types import SimpleNamespace
+
+# Ajouter le répertoire src et celui des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+
+try:
+    from utils.phrasebook import PhraseMiner, select_translations, build_phrasebook, Phrasebook, PhrasebookStore
+    PHRASEBOOK_AVAILABLE = True
+except ImportError as e:
+    logger = logging.getLogger(__name__)
+    logger.warning(f"⚠️ Recueil de phrases non disponible: {e}")
+    PHRASEBOOK_AVAILABLE = False
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+HIERARCHY = {'basic': 1, 'medium': 2, 'premium': 3}
+
+def test_mining():
+    """Textes courts les plus fréquents par langue, meilleure traduction retenue"""
+    logger.info("🧪 Test 18.1: Extraction des phrases fréquentes")
+
+    if not PHRASEBOOK_AVAILABLE:
+        logger.warning("⚠️ Recueil de phrases non disponible, test ignoré")
+        return True
+
+    miner = PhraseMiner(max_length=40, max_tracked=50)
+    for i in range(30):
+        miner.add(f'a{i}', 'Merci  beaucoup ! ', 'fr')
+        miner.add(f'b{i}', 'ok', 'en')
+    for i in range(200):
+        miner.add(f'u{i}', f'message unique {i}', 'fr')
+    miner.add('long', 'x' * 41, 'fr')
+
+    phrases = miner.top(per_language=1, min_count=2)
+    assert sorted((language, text, count) for language, text, count, _ in phrases) == [
+        ('en', 'ok', 30), ('fr', 'Merci beaucoup !', 30)
+    ]
+    assert miner.prunes > 0 and len(miner.counts) <= 51
+
+    translations = [
+        {'messageId': 'a0', 'targetLanguage': 'en', 'translatedText': 'Thanks a lot!', 'translationModel': 'basic'},
+        {'messageId': 'a1', 'targetLanguage': 'en', 'translatedText': 'Thank you very much!', 'translationModel': 'premium'},
+        {'messageId': 'a2', 'targetLanguage': 'en', 'translatedText': 'Thanks a lot!', 'translationModel': 'basic'},
+        {'messageId': 'a0', 'targetLanguage': 'fr', 'translatedText': 'Merci beaucoup !', 'translationModel': 'basic'},
+        {'messageId': 'zz', 'targetLanguage': 'es', 'translatedText': 'Gracias', 'translationModel': 'basic'},
+    ]
+    entries = select_translations(phrases, translations, HIERARCHY)
+    assert entries == [('Merci beaucoup !', 'fr', 'en', 'Thank you very much!', 3)]
+
+    logger.info("✅ Extraction validée")
+    return True
+
+def test_lookup_and_hot_swap():
+    """Recherche normalisée avec niveau minimal, fichier remplacé rechargé"""
+    logger.info("🧪 Test 18.2: Recherche et remplacement à chaud")
+
+    if not PHRASEBOOK_AVAILABLE:
+        logger.warning("⚠️ Recueil de phrases non disponible, test ignoré")
+        return True
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'models', 'phrasebook.bin')
+        entries = [(f'phrase {i}', 'fr', 'en', f'sentence {i} ✅', 1 + i % 3) for i in range(5000)]
+        assert build_phrasebook(entries, path) == 5000
+        assert not os.path.exists(f'{path}.tmp')
+
+        phrasebook = Phrasebook(path)
+        # Traduction et niveau du modèle qui l'a produite
+        assert phrasebook.lookup(' phrase  7 ', 'fr', 'en') == ('sentence 7 ✅', 2)
+        assert phrasebook.lookup('phrase 7', 'fr', 'es') is None
+        assert phrasebook.lookup('phrase 7', 'fr', 'en', min_level=3) is None
+        assert phrasebook.lookup('phrase 8', 'fr', 'en', min_level=3) == ('sentence 8 ✅', 3)
+        assert all(phrasebook.lookup(f'phrase {i}', 'fr', 'en')[0] == f'sentence {i} ✅' for i in range(0, 5000, 7))
+        assert phrasebook.lookup('phrase 5000', 'fr', 'en') is None
+        assert phrasebook.max_length == len('phrase 4999')
+        phrasebook.close()
+
+        store = PhrasebookStore(path, check_interval=0)
+        assert store.lookup('phrase 1', 'fr', 'en') == ('sentence 1 ✅', 2)
+        build_phrasebook([('Bonjour', 'fr', 'en', 'Hello', 2)], path)
+        assert store.lookup('Bonjour', 'fr', 'en') == ('Hello', 2)
+        assert store.lookup('phrase 1', 'fr', 'en') is None
+        # Plus long que toute phrase du recueil: écarté sans empreinte, sauf s'il se réduit à une phrase
+        assert store.may_contain('Bonjour') and store.may_contain('  Bonjour   ')
+        assert not store.may_contain('Bonjour à toutes et à tous')
+        assert store.get_stats()['too_long'] == 1 and store.get_stats()['max_length'] == len('Bonjour')
+        assert store.stats['reloads'] == 2 and store.get_stats()['entries'] == 1
+        store.close()
+
+        missing = PhrasebookStore(os.path.join(directory, 'absent.bin'))
+        assert missing.lookup('Bonjour', 'fr', 'en') is None
+
+    logger.info("✅ Recherche et remplacement à chaud validés")
+    return True
+
+class FakeTranslationTable:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def find_many(self, where):
+        ids = set(where['messageId']['in'])
+        return [row for row in self.rows if row.messageId in ids]
+
+def test_translations_from_database():
+    """Lignes Prisma (champ translatedContent) relues pour le recueil"""
+    logger.info("🧪 Test 18.3: Traductions relues en base")
+
+    if not PHRASEBOOK_AVAILABLE:
+        logger.warning("⚠️ Recueil de phrases non disponible, test ignoré")
+        return True
+
+    DatabaseService = load_service('database_service').DatabaseService
+    database = DatabaseService()
+    database.is_connected = True
+    database.prisma = SimpleNamespace(messagetranslation=FakeTranslationTable([
+        SimpleNamespace(messageId='a0', targetLanguage='en', translatedContent='Thanks a lot!', translationModel='basic'),
+        SimpleNamespace(messageId='a1', targetLanguage='en', translatedContent='Thank you very much!', translationModel='medium'),
+        SimpleNamespace(messageId='zz', targetLanguage='en', translatedContent='Other', translationModel='premium'),
+    ]))
+
+    translations = asyncio.run(database.get_translations_for_messages(['a0', 'a1']))
+    assert [t['translatedText'] for t in translations] == ['Thanks a lot!', 'Thank you very much!']
+    phrases = [('fr', 'Merci beaucoup !', 2, ['a0', 'a1'])]
+    entries = select_translations(phrases, translations, HIERARCHY)
+    assert entries == [('Merci beaucoup !', 'fr', 'en', 'Thank you very much!', 2)]
+
+    logger.info("✅ Traductions relues en base validées")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests du recueil de phrases"""
+    logger.info("🚀 Démarrage des tests du recueil de phrases fréquentes (Test 18)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Extraction des phrases fréquentes", test_mining),
+        ("Recherche et remplacement à chaud", test_lookup_and_hot_swap),
+        ("Traductions relues en base", test_translations_from_database),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 18: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Test 20 - Amélioration des traductions en période d'inactivité
+Niveau: Simple - Condition d'inactivité et choix des traductions améliorées
+"""
+
+import sys
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+
+scheduler_module = load_service('translation_upgrade_scheduler')
+zmq_server = load_service('zmq_server')
+TranslationUpgradeScheduler = scheduler_module.TranslationUpgradeScheduler
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class FakePool:
+    def __init__(self, size=0):
+        self.size = size
+
+    def empty(self):
+        return self.size == 0
+
+class FakePoolManager:
+    def __init__(self, translation_service):
+        self.translation_service = translation_service
+        self.normal_pool = FakePool()
+        self.any_pool = FakePool()
+        self.stats = {'normal_workers_active': 0, 'any_workers_active': 0}
+
+class FakeDatabase:
+    """Lignes du plus récent au plus ancien, pagination par curseur (createdAt, id)"""
+
+    def __init__(self, candidates):
+        self.candidates = candidates
+        self.requested_models = None
+        self.cursors = []
+
+    def is_db_connected(self):
+        return True
+
+    async def get_upgradable_translations(self, models, max_age_hours, limit, before=None):
+        self.requested_models = models
+        self.cursors.append(before)
+        rows = [c for c in self.candidates if before is None or (c['createdAt'], c['translationId']) < before]
+        page = rows[:limit]
+        next_cursor = (page[-1]['createdAt'], page[-1]['translationId']) if len(page) >= limit else None
+        return page, next_cursor
+
+class FakeTranslationService:
+    def __init__(self, model_used):
+        self.is_initialized = True
+        self.models = {'basic': object(), 'medium': object()}
+        self.model_used = model_used
+        self.calls = []
+
+    async def translate_with_structure(self, text, source_language, target_language, model_type, source_channel):
+        self.calls.append((text, target_language, model_type, source_channel))
+        return {'translated_text': f'{text} ({model_type})', 'model_used': self.model_used.get(text, f'{model_type}_ml')}
+
+START = datetime(2026, 1, 1, 12)
+
+def _candidate(message_id, model='basic', text=None, age=0):
+    return {
+        'translationId': f't-{message_id}', 'createdAt': START - timedelta(minutes=age),
+        'messageId': message_id, 'targetLanguage': 'en', 'sourceLanguage': 'fr',
+        'sourceText': text or f'texte {message_id}', 'translatorModel': model, 'conversationId': 'c1'
+    }
+
+def test_idle_gate():
+    """Files, workers actifs ou CPU au-dessus du seuil: pas d'amélioration"""
+    logger.info("🧪 Test 20.1: Condition d'inactivité")
+
+    cpu = {'value': 5.0}
+    pool_manager = FakePoolManager(FakeTranslationService({}))
+    scheduler = TranslationUpgradeScheduler(pool_manager, FakeDatabase([]), None, cpu_usage=lambda: cpu['value'])
+    scheduler.cpu_threshold = 30
+
+    assert scheduler.is_idle()
+    pool_manager.normal_pool.size = 1
+    assert not scheduler.is_idle()
+    pool_manager.normal_pool.size = 0
+    pool_manager.stats['any_workers_active'] = 1
+    assert not scheduler.is_idle()
+    pool_manager.stats['any_workers_active'] = 0
+    cpu['value'] = 80.0
+    assert not scheduler.is_idle()
+
+    logger.info("✅ Condition d'inactivité validée")
+    return True
+
+def test_upgrade_selection():
+    """Meilleur modèle chargé, niveaux lus dans MODEL_HIERARCHY, repli ignoré, lot interrompu par le trafic"""
+    logger.info("🧪 Test 20.2: Choix des traductions améliorées")
+
+    published = []
+    service = FakeTranslationService({
+        # Le service a retenu un autre modèle (basic), un repli, ou un nom hors hiérarchie: ignorés
+        'texte m2': 'basic_ml_structured',
+        'texte m3': 'medium_fallback',
+        'texte m4': 'custom-engine'
+    })
+    pool_manager = FakePoolManager(service)
+    database = FakeDatabase([
+        _candidate('m1', age=1), _candidate('m2', age=2), _candidate('m3', age=3), _candidate('m4', age=4),
+        _candidate('m5', model='nllb-basic', age=5), _candidate('m6', age=6)
+    ])
+
+    async def publish(task_id, result, target_language):
+        published.append(result)
+
+    async def scenario():
+        scheduler = TranslationUpgradeScheduler(pool_manager, database, publish, cpu_usage=lambda: 0.0)
+        scheduler.running = True
+        scheduler.batch_size = 5
+        first = await scheduler.run_once()
+        # Les candidats déjà tentés ne sont pas repris; le trafic reprend avant m6
+        pool_manager.normal_pool.size = 1
+        second = await scheduler.run_once()
+        return scheduler, first, second
+
+    scheduler, first, second = asyncio.run(scenario())
+    # premium absent: cible = medium, seuls les modèles basic sont candidats
+    assert database.requested_models == ['basic']
+    assert all(call[2] == 'medium' and call[3] == 'upgrade' for call in service.calls)
+    assert first == 2 and second == 0
+    assert [result['messageId'] for result in published] == ['m1', 'm5']
+    assert all(result['modelType'] == 'medium' for result in published)
+    assert published[1]['upgradedFrom'] == 'nllb-basic'
+    assert scheduler.stats['upgrades_skipped'] == 3
+    assert len(service.calls) == 5
+
+    logger.info("✅ Choix des traductions améliorées validé")
+    return True
+
+def test_cursor_reaches_older_rows():
+    """Les lignes récentes déjà tentées ne bloquent plus la fenêtre: le parcours avance puis reboucle"""
+    logger.info("🧪 Test 20.3: Parcours de la fenêtre par curseur")
+
+    # Les plus récentes retombent en repli: jamais améliorées, elles remplissaient chaque page
+    service = FakeTranslationService({f'texte m{i}': 'medium_fallback' for i in range(1, 5)})
+    pool_manager = FakePoolManager(service)
+    database = FakeDatabase([_candidate(f'm{i}', age=i) for i in range(1, 12)])
+    published = []
+
+    async def publish(task_id, result, target_language):
+        published.append(result['messageId'])
+
+    async def scenario():
+        scheduler = TranslationUpgradeScheduler(pool_manager, database, publish, cpu_usage=lambda: 0.0)
+        scheduler.running = True
+        scheduler.batch_size = 2
+        for _ in range(7):
+            await scheduler.run_once()
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    # Pages de 8 lignes, lots de 2: chaque exécution reprend après la dernière ligne tentée
+    assert [call[0] for call in service.calls] == [f'texte m{i}' for i in range(1, 12)]
+    assert published == [f'm{i}' for i in range(5, 12)]
+    assert database.cursors[:3] == [None, (START - timedelta(minutes=2), 't-m2'), (START - timedelta(minutes=4), 't-m4')]
+    # Fin de la fenêtre: retour aux plus récentes, déjà tentées donc ignorées
+    assert scheduler.stats['window_passes'] >= 1 and database.cursors[-1] is None
+    assert scheduler.stats['upgrades_skipped'] == 4 and scheduler.stats['upgrades_completed'] == 7
+
+    logger.info("✅ Parcours de la fenêtre par curseur validé")
+    return True
+
+class FallbackTranslationService:
+    async def translate_with_structure(self, text, source_language, target_language, model_type, source_channel, **kwargs):
+        model_used = {'en': f'{model_type}_fallback', 'es': 'basic_ml_structured'}.get(target_language, f'{model_type}_ml')
+        return {'translated_text': f'{text} [{target_language}]', 'model_used': model_used, 'confidence': 0.9}
+
+class FakePersistBuffer:
+    def __init__(self):
+        self.items = []
+
+    async def put(self, item):
+        self.items.append(item)
+
+class FakePubSocket:
+    async def send_multipart(self, frames, copy=True):
+        pass
+
+def test_degraded_translation_saved_as_lower_tier():
+    """Repli ou modèle inférieur utilisé: la ligne est enregistrée au niveau réellement produit"""
+    logger.info("🧪 Test 20.4: Niveau réellement produit enregistré")
+
+    env = {'TRANSLATION_JOURNAL_ENABLED': 'false', 'PHRASEBOOK_ENABLED': 'false',
+           'TRANSLATION_MEMORY_ENABLED': 'false', 'RESULT_OUTBOX_ENABLED': 'false'}
+
+    async def scenario():
+        previous = {key: os.environ.get(key) for key in env}
+        os.environ.update(env)
+        try:
+            server = zmq_server.ZMQTranslationServer(translation_service=FallbackTranslationService())
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+        server.pub_socket = FakePubSocket()
+        server.persist_buffer = FakePersistBuffer()
+        server.database_service.is_connected = True
+        task = zmq_server.TranslationTask(
+            task_id='t1', message_id='m1', text='Bonjour', source_language='fr',
+            target_languages=['en', 'es', 'de'], conversation_id='c1', model_type='premium', read_through=False
+        )
+        await server.pool_manager._process_translation_task(task, 'w1')
+        return server
+
+    server = asyncio.run(scenario())
+    saved = {item['targetLanguage']: item['translatorModel'] for item in server.persist_buffer.items}
+    assert saved == {'en': 'basic', 'es': 'basic', 'de': 'premium'}
+
+    logger.info("✅ Niveau réellement produit enregistré validé")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests du planificateur d'amélioration"""
+    logger.info("🚀 Démarrage des tests du planificateur d'amélioration (Test 20)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Condition d'inactivité", test_idle_gate),
+        ("Choix des traductions améliorées", test_upgrade_selection),
+        ("Parcours de la fenêtre par curseur", test_cursor_reaches_older_rows),
+        ("Niveau réellement produit enregistré", test_degraded_translation_saved_as_lower_tier),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 20: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Test 22 - Écritures par lots en base de données
+Niveau: Simple - Lots de traductions sur un faux client Prisma, courses entre lecture et insertion
+"""
+
+import sys
+import os
+import asyncio
+import logging
+from types import SimpleNamespace
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+
+database_module = load_service('database_service')
+DatabaseService = database_module.DatabaseService
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class UniqueConstraintError(Exception):
+    pass
+
+class FakeTranslationTable:
+    """messagetranslation: clé unique (messageId, targetLanguage)"""
+
+    def __init__(self):
+        self.rows = {}
+        self.calls = []
+        # Lignes insérées par « un autre nœud » juste après la lecture du lot
+        self.inserted_after_read = []
+
+    @staticmethod
+    def _key(where):
+        unique = where["messageId_targetLanguage"]
+        return (unique["messageId"], unique["targetLanguage"])
+
+    async def find_many(self, where):
+        self.calls.append('find_many')
+        ids, languages = set(where["messageId"]["in"]), set(where["targetLanguage"]["in"])
+        found = [SimpleNamespace(**row) for key, row in self.rows.items() if key[0] in ids and key[1] in languages]
+        for row in self.inserted_after_read:
+            self.rows[(row["messageId"], row["targetLanguage"])] = dict(row)
+        self.inserted_after_read = []
+        return found
+
+    async def find_unique(self, where):
+        row = self.rows.get(self._key(where))
+        return SimpleNamespace(**row) if row else None
+
+    async def create_many(self, data):
+        self.calls.append('create_many')
+        if any((row["messageId"], row["targetLanguage"]) in self.rows for row in data):
+            raise UniqueConstraintError("Unique constraint failed on messageId_targetLanguage")
+        for row in data:
+            self.rows[(row["messageId"], row["targetLanguage"])] = dict(row)
+        return len(data)
+
+    async def upsert(self, where, data):
+        self.calls.append('upsert')
+        key = self._key(where)
+        if key in self.rows:
+            self.rows[key].update(data["update"])
+        else:
+            self.rows[key] = dict(data["create"])
+
+    def update(self, where, data):
+        self.rows[self._key(where)].update(data)
+
+class FakeMemoryTable:
+    """translationmemory: clé unique memoryKey"""
+
+    def __init__(self):
+        self.rows = {}
+        self.calls = []
+        self.inserted_after_read = []
+
+    async def find_many(self, where):
+        self.calls.append('find_many')
+        found = [SimpleNamespace(**self.rows[key]) for key in where["memoryKey"]["in"] if key in self.rows]
+        for row in self.inserted_after_read:
+            self.rows[row["memoryKey"]] = dict(row)
+        self.inserted_after_read = []
+        return found
+
+    async def create_many(self, data):
+        self.calls.append('create_many')
+        if any(row["memoryKey"] in self.rows for row in data):
+            raise UniqueConstraintError("Unique constraint failed on memoryKey")
+        for row in data:
+            self.rows[row["memoryKey"]] = dict(row)
+        return len(data)
+
+    async def upsert(self, where, data):
+        self.calls.append('upsert')
+        key = where["memoryKey"]
+        if key in self.rows:
+            self.rows[key].update(data["update"])
+        else:
+            self.rows[key] = dict(data["create"])
+
+    def update(self, where, data):
+        self.rows[where["memoryKey"]].update(data)
+
+    async def delete_many(self, where):
+        for key in where["memoryKey"]["in"]:
+            self.rows.pop(key, None)
+
+class FakeBatchTable:
+    """Mises à jour notées, appliquées à la validation de la transaction"""
+
+    def __init__(self, table, queued):
+        self.table = table
+        self.queued = queued
+
+    def update(self, where, data):
+        self.queued.append((self.table, where, data))
+
+class FakeBatch:
+    def __init__(self, prisma):
+        self.prisma = prisma
+        self.queued = []
+        self.messagetranslation = FakeBatchTable(prisma.messagetranslation, self.queued)
+        self.translationmemory = FakeBatchTable(prisma.translationmemory, self.queued)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, *args):
+        if exc_type:
+            return False
+        if self.prisma.batch_error:
+            # Transaction refusée: aucune mise à jour appliquée
+            error, self.prisma.batch_error = self.prisma.batch_error, None
+            raise error
+        for table, where, data in self.queued:
+            table.update(where, data)
+        return False
+
+class FakePrisma:
+    def __init__(self):
+        self.messagetranslation = FakeTranslationTable()
+        self.translationmemory = FakeMemoryTable()
+        self.batch_error = None
+
+    def batch_(self):
+        return FakeBatch(self)
+
+def _database(prisma):
+    database = DatabaseService()
+    database.prisma = prisma
+    database.is_connected = True
+    return database
+
+def _translation(message_id, model, text=None):
+    return {
+        'messageId': message_id, 'targetLanguage': 'en', 'sourceLanguage': 'fr',
+        'translatedText': text or f'{message_id} ({model})', 'modelType': model
+    }
+
+def test_batch_create_and_update():
+    """Un lot: créations en un create_many, mises à jour selon la hiérarchie des modèles"""
+    logger.info("🧪 Test 22.1: Lot de traductions")
+
+    prisma = FakePrisma()
+    table = prisma.messagetranslation
+    table.rows[('m1', 'en')] = {'messageId': 'm1', 'targetLanguage': 'en', 'translationModel': 'premium', 'translatedContent': 'old'}
+    database = _database(prisma)
+
+    saved = asyncio.run(database.save_translations([
+        _translation('m1', 'basic'), _translation('m2', 'basic'), _translation('m3', 'medium')
+    ]))
+    assert saved == 3
+    assert table.calls == ['find_many', 'create_many']
+    assert table.rows[('m1', 'en')]['translatedContent'] == 'old'
+    assert table.rows[('m3', 'en')]['translationModel'] == 'medium'
+
+    logger.info("✅ Lot de traductions validé")
+    return True
+
+def test_batch_survives_concurrent_insert():
+    """Ligne créée entre find_many et create_many: repli ligne par ligne, rien n'est perdu"""
+    logger.info("🧪 Test 22.2: Course entre lecture et insertion")
+
+    prisma = FakePrisma()
+    table = prisma.messagetranslation
+    table.inserted_after_read = [
+        {'messageId': 'm1', 'targetLanguage': 'en', 'translationModel': 'premium', 'translatedContent': 'autre nœud'},
+        {'messageId': 'm2', 'targetLanguage': 'en', 'translationModel': 'basic', 'translatedContent': 'autre nœud'}
+    ]
+    database = _database(prisma)
+
+    saved = asyncio.run(database.save_translations([
+        _translation('m1', 'basic'), _translation('m2', 'medium'), _translation('m3', 'basic')
+    ]))
+    assert saved == 3
+    assert table.calls == ['find_many', 'create_many', 'upsert', 'upsert']
+    # Niveau supérieur déjà en base conservé, niveau inférieur remplacé, ligne manquante créée
+    assert table.rows[('m1', 'en')]['translatedContent'] == 'autre nœud'
+    assert table.rows[('m2', 'en')]['translationModel'] == 'medium'
+    assert table.rows[('m3', 'en')]['translatedContent'] == 'm3 (basic)'
+
+    logger.info("✅ Course entre lecture et insertion validée")
+    return True
+
+def test_batch_update_failure_falls_back():
+    """Transaction des mises à jour refusée: repli ligne par ligne, créations comptées"""
+    logger.info("🧪 Test 22.3: Échec de la transaction des mises à jour")
+
+    prisma = FakePrisma()
+    table = prisma.messagetranslation
+    table.rows[('m1', 'en')] = {'messageId': 'm1', 'targetLanguage': 'en', 'translationModel': 'basic', 'translatedContent': 'old'}
+    prisma.batch_error = ConnectionError("transaction aborted")
+    database = _database(prisma)
+
+    saved = asyncio.run(database.save_translations([_translation('m1', 'medium'), _translation('m2', 'basic')]))
+    assert saved == 2
+    assert table.calls == ['find_many', 'create_many', 'upsert']
+    assert table.rows[('m1', 'en')]['translationModel'] == 'medium'
+    assert table.rows[('m2', 'en')]['translatedContent'] == 'm2 (basic)'
+
+    logger.info("✅ Échec de la transaction des mises à jour validé")
+    return True
+
+def _memory_entry(key, text):
+    return {
+        'memoryKey': key, 'contentHash': f'h-{key}', 'sourceLanguage': 'fr', 'targetLanguage': 'en',
+        'translatedContent': text, 'translationModel': 'basic', 'confidenceScore': 0.9
+    }
+
+def test_memory_survives_concurrent_insert():
+    """Mémoire de traduction: clé créée par un autre nœud après la lecture, lot rejoué par upsert"""
+    logger.info("🧪 Test 22.4: Course sur la mémoire de traduction")
+
+    prisma = FakePrisma()
+    table = prisma.translationmemory
+    table.inserted_after_read = [_memory_entry('k1', 'autre nœud')]
+    database = _database(prisma)
+
+    saved = asyncio.run(database.save_memory_entries([_memory_entry('k1', 'Hello'), _memory_entry('k2', 'World')]))
+    assert saved == 2
+    assert table.calls == ['find_many', 'create_many', 'upsert', 'upsert']
+    assert table.rows['k1']['translatedContent'] == 'Hello' and 'lastUsedAt' in table.rows['k1']
+    assert table.rows['k2']['translatedContent'] == 'World'
+
+    logger.info("✅ Course sur la mémoire de traduction validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests des écritures par lots"""
+    logger.info("🚀 Démarrage des tests des écritures par lots (Test 22)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Lot de traductions", test_batch_create_and_update),
+        ("Course entre lecture et insertion", test_batch_survives_concurrent_insert),
+        ("Échec de la transaction des mises à jour", test_batch_update_failure_falls_back),
+        ("Course sur la mémoire de traduction", test_memory_survives_concurrent_insert),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 22: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
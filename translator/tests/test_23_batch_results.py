@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test 23 - Publication groupée des résultats (translation_batch_completed)
+Niveau: Simple - Un envoi et une sauvegarde par tâche, fenêtre de regroupement entre tâches
+"""
+
+import sys
+import os
+import asyncio
+import logging
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+from utils.wire_protocol import decode_message
+
+zmq_server = load_service('zmq_server')
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Serveur sans journal, recueil ni mémoire de traduction: seul le chemin de publication est exercé
+SERVER_ENV = {
+    'TRANSLATION_JOURNAL_ENABLED': 'false',
+    'PHRASEBOOK_ENABLED': 'false',
+    'TRANSLATION_MEMORY_ENABLED': 'false',
+    'RESULT_OUTBOX_ENABLED': 'false'
+}
+
+class FakePubSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_multipart(self, frames, copy=True):
+        self.sent.append(decode_message(frames)[0])
+
+class FakePersistBuffer:
+    def __init__(self):
+        self.items = []
+
+    async def put(self, item):
+        self.items.append(item)
+
+class FakeTranslationService:
+    async def translate_with_structure(self, text, source_language, target_language, model_type, source_channel, **kwargs):
+        return {'translated_text': f'{text} [{target_language}]', 'model_used': f'{model_type}_ml', 'confidence': 0.9}
+
+def _server(**env):
+    previous = {key: os.environ.get(key) for key in {**SERVER_ENV, **env}}
+    os.environ.update({**SERVER_ENV, **env})
+    try:
+        server = zmq_server.ZMQTranslationServer(translation_service=FakeTranslationService())
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    server.pub_socket = FakePubSocket()
+    server.persist_buffer = FakePersistBuffer()
+    server.database_service.is_connected = True
+    return server
+
+def _task(message_id, targets, **kwargs):
+    return zmq_server.TranslationTask(
+        task_id=f'task-{message_id}', message_id=message_id, text='Bonjour',
+        source_language='fr', target_languages=targets, conversation_id='c1',
+        reply_topic='gw-1', read_through=False, **kwargs
+    )
+
+def test_one_message_per_task():
+    """Toutes les langues d'une tâche: un seul envoi PUB et une seule sauvegarde groupée"""
+    logger.info("🧪 Test 23.1: Un lot par tâche")
+
+    async def scenario():
+        server = _server()
+        await server.pool_manager._process_translation_task(_task('m1', ['en', 'es', 'de'], batch_results=True), 'w1')
+        await server.pool_manager._process_translation_task(_task('m2', ['en']), 'w1')
+        return server
+
+    server = asyncio.run(scenario())
+    sent = server.pub_socket.sent
+    assert [message['type'] for message in sent] == ['translation_batch_completed', 'translation_completed']
+    batch = sent[0]
+    assert batch['count'] == 3
+    assert [entry['targetLanguage'] for entry in batch['results']] == ['en', 'es', 'de']
+    assert batch['results'][1]['result']['translatedText'] == 'Bonjour [es]'
+    # Métriques système portées une seule fois par le lot
+    assert 'cpuUsage' in batch and 'cpuUsage' not in batch['results'][0]['result']
+    assert server.batch_stats['batch_persist_calls'] == 1
+    assert [item['messageId'] for item in server.persist_buffer.items] == ['m1', 'm1', 'm1', 'm2']
+
+    logger.info("✅ Un lot par tâche validé")
+    return True
+
+def test_flush_window_groups_tasks():
+    """Fenêtre de regroupement: les résultats de plusieurs tâches du même topic partent ensemble"""
+    logger.info("🧪 Test 23.2: Fenêtre de regroupement")
+
+    async def scenario():
+        server = _server(TRANSLATION_BATCH_FLUSH_MS='30')
+        for message_id in ('m1', 'm2', 'm3'):
+            await server.pool_manager._process_translation_task(_task(message_id, ['en', 'es'], batch_results=True), 'w1')
+        sent_before_flush = len(server.pub_socket.sent)
+        await asyncio.sleep(0.1)
+        return server, sent_before_flush
+
+    server, sent_before_flush = asyncio.run(scenario())
+    assert sent_before_flush == 0
+    assert len(server.pub_socket.sent) == 1
+    batch = server.pub_socket.sent[0]
+    assert batch['count'] == 6
+    assert {entry['taskId'] for entry in batch['results']} == {'task-m1', 'task-m2', 'task-m3'}
+    assert server.batch_stats == {'batches_published': 1, 'batched_results': 6, 'batch_persist_calls': 3}
+
+    logger.info("✅ Fenêtre de regroupement validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de la publication groupée"""
+    logger.info("🚀 Démarrage des tests de la publication groupée (Test 23)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Un lot par tâche", test_one_message_per_task),
+        ("Fenêtre de regroupement", test_flush_window_groups_tasks),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 23: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
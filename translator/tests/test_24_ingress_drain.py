@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test 24 - Entrée ZMQ vidée par lots
+Niveau: Simple - Réceptions non bloquantes bornées, décodage groupé, transport ipc:// et options de socket
+"""
+
+import sys
+import os
+import asyncio
+import json
+import logging
+import socket
+import tempfile
+
+import zmq
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+
+zmq_server = load_service('zmq_server')
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SERVER_ENV = {
+    'TRANSLATION_JOURNAL_ENABLED': 'false',
+    'PHRASEBOOK_ENABLED': 'false',
+    'TRANSLATION_MEMORY_ENABLED': 'false',
+    'RESULT_OUTBOX_ENABLED': 'false'
+}
+
+class FakePullSocket:
+    """Trames déjà reçues par le socket; zmq.Again quand il n'y en a plus"""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.nonblocking_receives = 0
+
+    async def recv_multipart(self, flags=0, copy=True):
+        assert flags == zmq.NOBLOCK
+        self.nonblocking_receives += 1
+        if not self.messages:
+            raise zmq.Again()
+        return self.messages.pop(0)
+
+class EnvironmentPatch:
+    def __init__(self, values):
+        self.values = values
+        self.previous = {}
+
+    def __enter__(self):
+        self.previous = {key: os.environ.get(key) for key in self.values}
+        os.environ.update(self.values)
+
+    def __exit__(self, *args):
+        for key, value in self.previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+def _request(i):
+    return [json.dumps({'type': 'translation', 'messageId': f'm{i}', 'text': 'Bonjour'}).encode()]
+
+def _capture_dispatch(server):
+    dispatched = []
+
+    async def dispatch(request_data, consumes_credit=False):
+        dispatched.append(request_data['messageId'])
+
+    server._dispatch_request = dispatch
+    return dispatched
+
+def test_bounded_drain_and_batch_decode():
+    """Au plus ZMQ_INGRESS_BATCH messages par réveil, trames illisibles écartées sans bloquer le lot"""
+    logger.info("🧪 Test 24.1: Vidage borné et décodage groupé")
+
+    async def scenario():
+        with EnvironmentPatch({**SERVER_ENV, 'ZMQ_INGRESS_BATCH': '3'}):
+            server = zmq_server.ZMQTranslationServer(host='127.0.0.1')
+        dispatched = _capture_dispatch(server)
+        server.pull_socket = FakePullSocket([_request(1), [b'{illisible'], _request(3), _request(4)])
+
+        first = await server._drain_ingress(_request(0))
+        await server._process_ingress_batch(first)
+        second = await server._drain_ingress(server.pull_socket.messages.pop(0))
+        await server._process_ingress_batch(second)
+        return server, first, second, dispatched
+
+    server, first, second, dispatched = asyncio.run(scenario())
+    assert len(first) == 3 and len(second) == 2
+    # Premier lot plein après deux réceptions; le second s'arrête sur zmq.Again
+    assert server.pull_socket.nonblocking_receives == 4
+    assert dispatched == ['m0', 'm1', 'm3', 'm4']
+    assert server.wire_stats['decode_errors'] == 1
+    stats = server.ingress_stats
+    assert stats['messages'] == 5 and stats['batches'] == 2 and stats['max_batch_size'] == 3
+    assert stats['decode_time'] > 0 and stats['dispatch_time'] > 0
+    assert server._ingress_rate() == 0.5
+
+    logger.info("✅ Vidage borné et décodage groupé validés")
+    return True
+
+def test_ipc_transport_and_socket_options():
+    """Gateway co-localisée via ipc://, options de socket appliquées avant le bind"""
+    logger.info("🧪 Test 24.2: Transport ipc:// et options de socket")
+
+    with tempfile.TemporaryDirectory() as ipc_dir:
+        async def scenario():
+            with EnvironmentPatch({**SERVER_ENV, 'ZMQ_IPC_DIR': ipc_dir, 'ZMQ_RCVHWM': '50', 'ZMQ_INGRESS_BATCH': '8'}):
+                server = zmq_server.ZMQTranslationServer(
+                    host='127.0.0.1', gateway_push_port=_free_port(), gateway_sub_port=_free_port()
+                )
+                server._bind_gateway_sockets()
+            dispatched = _capture_dispatch(server)
+            push = server.context.socket(zmq.PUSH)
+            push.connect(f"ipc://{os.path.join(ipc_dir, 'translator-pull')}.ipc")
+            try:
+                for i in range(12):
+                    await push.send_multipart(_request(i))
+                first = await asyncio.wait_for(server.pull_socket.recv_multipart(copy=False), 5)
+                # Laisser les messages suivants arriver dans la file du socket
+                await asyncio.sleep(0.1)
+                batch = await server._drain_ingress(first)
+                await server._process_ingress_batch(batch)
+                return server.pull_socket.getsockopt(zmq.RCVHWM), len(batch), dispatched
+            finally:
+                push.close(linger=0)
+                server.pull_socket.close(linger=0)
+                server.pub_socket.close(linger=0)
+                server.context.term()
+
+        rcvhwm, batch_size, dispatched = asyncio.run(scenario())
+    assert rcvhwm == 50
+    assert batch_size == 8
+    assert dispatched == [f'm{i}' for i in range(8)]
+
+    logger.info("✅ Transport ipc:// et options de socket validés")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de l'entrée ZMQ"""
+    logger.info("🚀 Démarrage des tests de l'entrée ZMQ (Test 24)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Vidage borné et décodage groupé", test_bounded_drain_and_batch_decode),
+        ("Transport ipc:// et options de socket", test_ipc_transport_and_socket_options),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 24: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test 25 - Publication découplée de la sauvegarde et de la télémétrie
+Niveau: Simple - Envoi PUB avant la sauvegarde en arrière-plan, métriques lues dans l'échantillonneur
+"""
+
+import sys
+import os
+import asyncio
+import logging
+import time
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+from utils.process_telemetry import ProcessTelemetry
+from utils.wire_protocol import decode_message
+
+zmq_server = load_service('zmq_server')
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SERVER_ENV = {
+    'TRANSLATION_JOURNAL_ENABLED': 'false',
+    'PHRASEBOOK_ENABLED': 'false',
+    'TRANSLATION_MEMORY_ENABLED': 'false',
+    'RESULT_OUTBOX_ENABLED': 'false',
+    'TRANSLATION_PERSIST_FLUSH_MS': '10'
+}
+
+class FakePubSocket:
+    def __init__(self, events):
+        self.events = events
+        self.sent = []
+
+    async def send_multipart(self, frames, copy=True):
+        message = decode_message(frames)[0]
+        self.events.append(('sent', message['result']['targetLanguage']))
+        self.sent.append(message)
+
+class NoSystemCalls:
+    """Processus psutil qui échoue à la moindre mesure"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"appel système {name}() sur le chemin de publication")
+
+def _server():
+    previous = {key: os.environ.get(key) for key in SERVER_ENV}
+    os.environ.update(SERVER_ENV)
+    try:
+        return zmq_server.ZMQTranslationServer()
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+def _result(target_language):
+    return {
+        'messageId': 'm1', 'translatedText': f'Hello [{target_language}]', 'sourceLanguage': 'fr',
+        'targetLanguage': target_language, 'confidenceScore': 0.9, 'modelType': 'basic',
+        'conversationId': 'c1', 'created_at': time.time()
+    }
+
+def test_telemetry_ring_buffer():
+    """Échantillonneur de fond: buffer circulaire borné, lecture sans mesure"""
+    logger.info("🧪 Test 25.1: Échantillonneur de télémétrie")
+
+    async def scenario():
+        telemetry = ProcessTelemetry(interval=0.01, size=3)
+        telemetry.start()
+        await asyncio.sleep(0.08)
+        await telemetry.stop()
+        sampled = len(telemetry.samples)
+        # Lecture des dernières valeurs: aucune mesure supplémentaire
+        telemetry._process = NoSystemCalls()
+        return telemetry, sampled
+
+    telemetry, sampled = asyncio.run(scenario())
+    assert sampled == 3
+    assert telemetry.cpu_usage >= 0 and telemetry.memory_usage > 0 and telemetry.system_cpu_usage >= 0
+    stats = telemetry.get_stats()
+    assert stats['samples'] == 3 and stats['interval'] == 0.01 and stats['window_seconds'] > 0
+
+    logger.info("✅ Échantillonneur de télémétrie validé")
+    return True
+
+def test_publish_before_persistence():
+    """Résultats envoyés tout de suite; la sauvegarde lente se fait ensuite, en lots"""
+    logger.info("🧪 Test 25.2: Publication avant la sauvegarde")
+
+    events = []
+    saved_batches = []
+
+    async def slow_save(batch):
+        await asyncio.sleep(0.2)
+        saved_batches.append([item['targetLanguage'] for item in batch])
+        events.append(('saved', len(batch)))
+        return len(batch)
+
+    async def scenario():
+        server = _server()
+        server.pub_socket = FakePubSocket(events)
+        server.telemetry._process = NoSystemCalls()
+        server.database_service.is_connected = True
+        server.persist_buffer.flush_fn = slow_save
+        server.persist_buffer.start()
+
+        started = time.time()
+        for target_language in ('en', 'es', 'de'):
+            await server._publish_translation_result('task-1', _result(target_language), target_language)
+        publish_time = time.time() - started
+        await server.persist_buffer.stop(timeout=5)
+        return server, publish_time
+
+    server, publish_time = asyncio.run(scenario())
+    assert publish_time < 0.1, f"publication bloquée {publish_time:.3f}s"
+    assert events[:3] == [('sent', 'en'), ('sent', 'es'), ('sent', 'de')]
+    assert saved_batches == [['en', 'es', 'de']]
+    assert server.pub_socket.sent[0]['result']['cpuUsage'] == server.telemetry.cpu_usage
+    assert server.persist_buffer.get_stats()['rows_flushed'] == 3
+
+    logger.info("✅ Publication avant la sauvegarde validée")
+    return True
+
+def test_publish_without_database():
+    """Base indisponible: le résultat est publié, la sauvegarde comptée comme ignorée"""
+    logger.info("🧪 Test 25.3: Publication sans base de données")
+
+    events = []
+
+    async def scenario():
+        server = _server()
+        server.pub_socket = FakePubSocket(events)
+        await server._publish_translation_result('task-1', _result('en'), 'en')
+        return server
+
+    server = asyncio.run(scenario())
+    assert events == [('sent', 'en')]
+    assert server.persist_skipped_no_db == 1 and server.persist_buffer.pending == 0
+
+    logger.info("✅ Publication sans base de données validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de la publication découplée"""
+    logger.info("🚀 Démarrage des tests de la publication découplée (Test 25)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Échantillonneur de télémétrie", test_telemetry_ring_buffer),
+        ("Publication avant la sauvegarde", test_publish_before_persistence),
+        ("Publication sans base de données", test_publish_without_database),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 25: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test 26 - Publication progressive (translation_partial)
+Niveau: Simple - Fragments ordonnés par chunkIndex, emojis restaurés, marqueur final, délai du premier fragment
+"""
+
+import sys
+import os
+import asyncio
+import logging
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+from utils.text_segmentation import TextSegmenter
+from utils.wire_protocol import decode_message
+
+zmq_server = load_service('zmq_server')
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SERVER_ENV = {
+    'TRANSLATION_JOURNAL_ENABLED': 'false',
+    'PHRASEBOOK_ENABLED': 'false',
+    'TRANSLATION_MEMORY_ENABLED': 'false',
+    'RESULT_OUTBOX_ENABLED': 'false'
+}
+
+LONG_TEXT = "Bonjour à tous 😊\n\nVoici le programme 🎉\n- premier point\n- second point\n\nÀ bientôt 🚀"
+
+class FakePubSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_multipart(self, frames, copy=True):
+        self.sent.append(decode_message(frames)[0])
+
+class FakePersistBuffer:
+    async def put(self, item):
+        pass
+
+class SegmentingTranslationService:
+    """Traduction ligne à ligne (majuscules) avec le découpage et le réassemblage du vrai segmenteur"""
+
+    def __init__(self, delay=0.02):
+        self.segmenter = TextSegmenter()
+        self.delay = delay
+        self.callbacks = []
+
+    async def translate_with_structure(self, text, source_language, target_language, model_type, source_channel,
+                                       cancel_check=None, segment_callback=None):
+        self.callbacks.append(segment_callback)
+        segments, emojis_map = self.segmenter.segment_text(text)
+        translated, emitted, chunk_index = [], 0, 0
+        for segment in segments:
+            if segment_callback and segment['type'] == 'line' and emitted < len(translated):
+                await self._emit(segment_callback, translated[emitted:], emojis_map, chunk_index, False)
+                chunk_index += 1
+                emitted = len(translated)
+            if segment['type'] == 'line':
+                await asyncio.sleep(self.delay)
+                segment = {**segment, 'text': segment['text'].upper()}
+            translated.append(segment)
+        final_text = self.segmenter.reassemble_text(translated, emojis_map)
+        if segment_callback:
+            await self._emit(segment_callback, translated[emitted:], emojis_map, chunk_index, True)
+        return {'translated_text': final_text, 'model_used': f'{model_type}_ml', 'confidence': 0.9,
+                'segments_count': len(segments), 'emojis_count': len(emojis_map)}
+
+    async def _emit(self, segment_callback, fragment_segments, emojis_map, chunk_index, final):
+        await segment_callback({
+            'chunkIndex': chunk_index,
+            'segments': [fragment_segments[0]['index'], fragment_segments[-1]['index']],
+            'text': self.segmenter.reassemble_fragment(fragment_segments, emojis_map),
+            'final': final
+        })
+
+def _server(translation_service):
+    previous = {key: os.environ.get(key) for key in SERVER_ENV}
+    os.environ.update(SERVER_ENV)
+    try:
+        server = zmq_server.ZMQTranslationServer(translation_service=translation_service)
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    server.pub_socket = FakePubSocket()
+    server.persist_buffer = FakePersistBuffer()
+    server.database_service.is_connected = True
+    return server
+
+def _task(message_id, progressive):
+    return zmq_server.TranslationTask(
+        task_id=f'task-{message_id}', message_id=message_id, text=LONG_TEXT,
+        source_language='fr', target_languages=['en'], conversation_id='c1',
+        reply_topic='gw-1', read_through=False, progressive=progressive
+    )
+
+def test_fragment_helpers():
+    """reassemble_fragment: concaténation des fragments = texte réassemblé, emojis du fragment seulement"""
+    logger.info("🧪 Test 26.1: Réassemblage des fragments")
+
+    segmenter = TextSegmenter()
+    segments, emojis_map = segmenter.segment_text(LONG_TEXT)
+    cut = next(i for i, segment in enumerate(segments) if i > 0 and segment['type'] == 'line')
+    first = segmenter.reassemble_fragment(segments[:cut], emojis_map)
+    rest = segmenter.reassemble_fragment(segments[cut:], emojis_map)
+    assert first + rest == segmenter.reassemble_text(segments, emojis_map) == LONG_TEXT
+    assert first == "Bonjour à tous 😊\n\n"
+    assert '🔹' not in rest and '🎉' in rest and '😊' not in rest
+
+    logger.info("✅ Réassemblage des fragments validé")
+    return True
+
+def test_progressive_publication():
+    """Requête progressive: fragments ordonnés puis translation_completed, texte identique"""
+    logger.info("🧪 Test 26.2: Publication progressive")
+
+    async def scenario():
+        server = _server(SegmentingTranslationService())
+        await server.pool_manager._process_translation_task(_task('m1', progressive=True), 'w1')
+        return server
+
+    server = asyncio.run(scenario())
+    sent = server.pub_socket.sent
+    partials = [message for message in sent if message['type'] == 'translation_partial']
+    assert [message['type'] for message in sent] == ['translation_partial'] * len(partials) + ['translation_completed']
+    assert len(partials) == 5
+    assert [message['chunkIndex'] for message in partials] == list(range(len(partials)))
+    assert [message['final'] for message in partials] == [False] * (len(partials) - 1) + [True]
+    assert partials[0]['text'] == "BONJOUR À TOUS 😊\n\n" and partials[0]['segments'][0] == 0
+    # Plages de segments contiguës et ordonnées
+    for previous, current in zip(partials, partials[1:]):
+        assert current['segments'][0] == previous['segments'][1] + 1
+    assert all(message['targetLanguage'] == 'en' and message['messageId'] == 'm1' for message in partials)
+
+    completed = sent[-1]['result']
+    assert ''.join(message['text'] for message in partials) == completed['translatedText']
+    assert completed['timeToFirstSegment'] is not None and completed['timeToFirstSegment'] <= partials[-1]['elapsed']
+    stats = server.pool_manager.stats
+    assert stats['progressive_translations'] == 1 and stats['partials_published'] == len(partials)
+    assert stats['avg_time_to_first_segment'] == completed['timeToFirstSegment']
+
+    logger.info("✅ Publication progressive validée")
+    return True
+
+def test_progressive_is_opt_in():
+    """Sans progressive: aucun callback transmis, seul le résultat complet est publié"""
+    logger.info("🧪 Test 26.3: Mode progressif sur demande")
+
+    async def scenario():
+        service = SegmentingTranslationService(delay=0)
+        server = _server(service)
+        await server.pool_manager._process_translation_task(_task('m1', progressive=False), 'w1')
+        return server, service
+
+    server, service = asyncio.run(scenario())
+    assert service.callbacks == [None]
+    assert [message['type'] for message in server.pub_socket.sent] == ['translation_completed']
+    assert 'timeToFirstSegment' not in server.pub_socket.sent[0]['result']
+    assert server.pool_manager.stats['partials_published'] == 0
+
+    logger.info("✅ Mode progressif sur demande validé")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de la publication progressive"""
+    logger.info("🚀 Démarrage des tests de la publication progressive (Test 26)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Réassemblage des fragments", test_fragment_helpers),
+        ("Publication progressive", test_progressive_publication),
+        ("Mode progressif sur demande", test_progressive_is_opt_in),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 26: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Test 27 - Pré-traduction des brouillons (draft_translate)
+Niveau: Simple - Anti-rebond, remplacement d'une version, cession aux tâches réelles, cache publié à l'envoi
+"""
+
+import sys
+import os
+import asyncio
+import logging
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+from utils.wire_protocol import decode_message
+
+draft_module = load_service('draft_translator')
+zmq_server = load_service('zmq_server')
+DraftTranslator = draft_module.DraftTranslator
+TranslationCancelledError = draft_module.TranslationCancelledError
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DRAFT_ENV = {
+    'DRAFT_TRANSLATION_ENABLED': 'true',
+    'DRAFT_DEBOUNCE_MS': '30',
+    'DRAFT_MAX_CPU_PERCENT': '100'
+}
+
+class EnvironmentPatch:
+    def __init__(self, values):
+        self.values = values
+        self.previous = {}
+
+    def __enter__(self):
+        self.previous = {key: os.environ.get(key) for key in self.values}
+        os.environ.update(self.values)
+
+    def __exit__(self, *args):
+        for key, value in self.previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+class SegmentedTranslationService:
+    """Traduction en plusieurs segments, cancel_check vérifié entre chaque segment"""
+
+    def __init__(self, segments=1, segment_delay=0.0):
+        self.segments = segments
+        self.segment_delay = segment_delay
+        self.started = []
+        self.completed = []
+
+    async def translate_with_structure(self, text, source_language, target_language, model_type, source_channel,
+                                       cancel_check=None, **kwargs):
+        self.started.append((text, target_language))
+        for _ in range(self.segments):
+            if cancel_check and cancel_check():
+                raise TranslationCancelledError(text)
+            await asyncio.sleep(self.segment_delay)
+        self.completed.append((text, target_language))
+        return {'translated_text': f'{text} [{target_language}]', 'model_used': f'{model_type}_ml', 'confidence': 0.9}
+
+class FakePubSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_multipart(self, frames, copy=True):
+        self.sent.append(decode_message(frames)[0])
+
+class FakePersistBuffer:
+    async def put(self, item):
+        pass
+
+def _draft(text, draft_id='d1', targets=('en', 'es')):
+    return {'type': 'draft_translate', 'draftId': draft_id, 'text': text, 'sourceLanguage': 'fr',
+            'targetLanguages': list(targets), 'modelType': 'basic'}
+
+def _translator(service, busy=lambda: False, cpu=lambda: 0.0, **env):
+    with EnvironmentPatch({**DRAFT_ENV, **env}):
+        return DraftTranslator(service, busy_check=busy, cpu_usage=cpu)
+
+def test_debounce_translates_stable_version():
+    """Frappe rapide: seule la dernière version, stable pendant l'anti-rebond, est traduite"""
+    logger.info("🧪 Test 27.1: Anti-rebond")
+
+    async def scenario():
+        service = SegmentedTranslationService()
+        drafts = _translator(service)
+        for text in ('Bon', 'Bonjour', 'Bonjour à tous'):
+            assert drafts.submit(_draft(text))
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.1)
+        await drafts.stop()
+        return drafts, service
+
+    drafts, service = asyncio.run(scenario())
+    assert service.started == [('Bonjour à tous', 'en'), ('Bonjour à tous', 'es')]
+    assert drafts.stats['drafts_debounced'] == 2 and drafts.stats['drafts_started'] == 1
+    assert drafts.lookup('Bonjour à tous', 'fr', 'es', 'basic')['translated_text'] == 'Bonjour à tous [es]'
+    assert drafts.lookup('Bonjour', 'fr', 'en', 'basic') is None
+    assert drafts.lookup('Bonjour à tous', 'fr', 'en', 'premium') is None
+    stats = drafts.get_stats()
+    assert stats['draft_translations'] == 2 and stats['cache_hits'] == 1 and stats['cache_misses'] == 2
+
+    logger.info("✅ Anti-rebond validé")
+    return True
+
+def test_new_version_supersedes_running_translation():
+    """Nouvelle version pendant la traduction: l'ancienne s'interrompt au segment suivant, rien n'est mis en cache"""
+    logger.info("🧪 Test 27.2: Remplacement d'une version en cours")
+
+    async def scenario():
+        service = SegmentedTranslationService(segments=10, segment_delay=0.01)
+        drafts = _translator(service)
+        drafts.submit(_draft('Bonjour', targets=['en']))
+        await asyncio.sleep(0.06)
+        assert service.started == [('Bonjour', 'en')] and not service.completed
+        drafts.submit(_draft('Bonjour à tous', targets=['en']))
+        await asyncio.sleep(0.25)
+        await drafts.stop()
+        return drafts, service
+
+    drafts, service = asyncio.run(scenario())
+    assert service.completed == [('Bonjour à tous', 'en')]
+    assert drafts.stats['drafts_superseded'] == 1
+    # Version remplacée: pas comptée comme cédée aux tâches réelles
+    assert drafts.stats['drafts_yielded'] == 0
+    assert drafts.lookup('Bonjour', 'fr', 'en', 'basic') is None
+    assert drafts.lookup('Bonjour à tous', 'fr', 'en', 'basic') is not None
+
+    logger.info("✅ Remplacement d'une version en cours validé")
+    return True
+
+def test_yields_to_real_work():
+    """Tâche réelle en cours de route: interruption; file occupée ou CPU saturé: pas de démarrage"""
+    logger.info("🧪 Test 27.3: Cession aux tâches réelles")
+
+    async def scenario():
+        busy = {'value': False}
+        service = SegmentedTranslationService(segments=10, segment_delay=0.01)
+        drafts = _translator(service, busy=lambda: busy['value'])
+        drafts.submit(_draft('Bonjour', targets=['en']))
+        await asyncio.sleep(0.06)
+        busy['value'] = True
+        await asyncio.sleep(0.05)
+        # File toujours occupée: la version suivante n'est pas traduite
+        drafts.submit(_draft('Bonjour à tous', targets=['en']))
+        await asyncio.sleep(0.08)
+        await drafts.stop()
+
+        hot = _translator(SegmentedTranslationService(), cpu=lambda: 95.0, DRAFT_MAX_CPU_PERCENT='50')
+        hot.submit(_draft('Salut'))
+        await asyncio.sleep(0.08)
+        await hot.stop()
+        return drafts, service, hot
+
+    drafts, service, hot = asyncio.run(scenario())
+    assert service.started == [('Bonjour', 'en')] and service.completed == []
+    assert drafts.stats['drafts_yielded'] == 1 and drafts.stats['drafts_skipped_busy'] == 1
+    assert drafts.get_stats()['cache_entries'] == 0
+    assert hot.stats['drafts_skipped_busy'] == 1 and hot.stats['drafts_started'] == 0
+
+    logger.info("✅ Cession aux tâches réelles validée")
+    return True
+
+def test_cache_bounds():
+    """Cache borné en taille (LRU) et en durée"""
+    logger.info("🧪 Test 27.4: Bornes du cache")
+
+    async def scenario():
+        drafts = _translator(SegmentedTranslationService(), DRAFT_CACHE_SIZE='2', DRAFT_CACHE_TTL='0.2')
+        for i, text in enumerate(('Un', 'Deux', 'Trois')):
+            drafts.submit(_draft(text, draft_id=f'd{i}', targets=['en']))
+        await asyncio.sleep(0.08)
+        evicted = drafts.lookup('Un', 'fr', 'en', 'basic')
+        kept = drafts.lookup('Trois', 'fr', 'en', 'basic')
+        await asyncio.sleep(0.2)
+        expired = drafts.lookup('Trois', 'fr', 'en', 'basic')
+        await drafts.stop()
+        return drafts, evicted, kept, expired
+
+    drafts, evicted, kept, expired = asyncio.run(scenario())
+    assert evicted is None and kept is not None and expired is None
+    assert drafts.get_stats()['cache_entries'] == 2
+
+    logger.info("✅ Bornes du cache validées")
+    return True
+
+def test_sent_message_served_from_draft():
+    """Message envoyé identique au brouillon: langues pré-traduites publiées, les autres restent à traduire"""
+    logger.info("🧪 Test 27.5: Publication depuis le brouillon")
+
+    async def scenario():
+        service = SegmentedTranslationService()
+        with EnvironmentPatch({**DRAFT_ENV, 'TRANSLATION_JOURNAL_ENABLED': 'false', 'PHRASEBOOK_ENABLED': 'false',
+                               'TRANSLATION_MEMORY_ENABLED': 'false', 'RESULT_OUTBOX_ENABLED': 'false'}):
+            server = zmq_server.ZMQTranslationServer(translation_service=service)
+        server.pub_socket = FakePubSocket()
+        server.persist_buffer = FakePersistBuffer()
+        server.database_service.is_connected = True
+        server.draft_translator.submit(_draft('Bonjour à tous'))
+        await asyncio.sleep(0.08)
+        request = {'messageId': 'm1', 'text': 'Bonjour à tous', 'sourceLanguage': 'fr', 'modelType': 'basic',
+                   'conversationId': 'c1', 'draftId': 'd1'}
+        server.draft_translator.cancel('d1')
+        remaining = await server._serve_from_drafts(request, ['en', 'es', 'de'])
+        await server.draft_translator.stop()
+        return server, remaining
+
+    server, remaining = asyncio.run(scenario())
+    assert remaining == ['de']
+    sent = server.pub_socket.sent
+    assert [message['result']['targetLanguage'] for message in sent] == ['en', 'es']
+    assert sent[0]['result']['fromDraft'] is True and sent[0]['result']['translatedText'] == 'Bonjour à tous [en]'
+    assert server.draft_translator.get_stats()['active_drafts'] == 0
+
+    logger.info("✅ Publication depuis le brouillon validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de la pré-traduction des brouillons"""
+    logger.info("🚀 Démarrage des tests de la pré-traduction des brouillons (Test 27)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Anti-rebond", test_debounce_translates_stable_version),
+        ("Remplacement d'une version en cours", test_new_version_supersedes_running_translation),
+        ("Cession aux tâches réelles", test_yields_to_real_work),
+        ("Bornes du cache", test_cache_bounds),
+        ("Publication depuis le brouillon", test_sent_message_served_from_draft),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 27: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Test 29 - Traduction de l'historique d'une conversation (translate_history)
+Niveau: Simple - Plus récents d'abord, traductions existantes ignorées, mémoire, priorité basse, remplacement
+"""
+
+import sys
+import os
+import asyncio
+import logging
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+from utils.wire_protocol import decode_message
+
+history_module = load_service('history_translator')
+zmq_server = load_service('zmq_server')
+HistoryTranslator = history_module.HistoryTranslator
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Du plus récent au plus ancien, comme get_recent_messages
+MESSAGES = [
+    {'id': 'm5', 'content': 'Cinq', 'originalLanguage': 'fr'},
+    {'id': 'm4', 'content': 'Quatre', 'originalLanguage': 'fr'},
+    {'id': 'm3', 'content': 'Three', 'originalLanguage': 'en'},
+    {'id': 'm2', 'content': 'Deux', 'originalLanguage': 'fr'},
+    {'id': 'm1', 'content': 'Un', 'originalLanguage': 'fr'}
+]
+
+class FakeDatabase:
+    def __init__(self, existing=None, connected=True):
+        self.existing = existing or {}
+        self.connected = connected
+        self.windows = []
+
+    def is_db_connected(self):
+        return self.connected
+
+    async def get_recent_messages(self, conversation_id, limit=50):
+        self.windows.append(limit)
+        await asyncio.sleep(0)
+        return MESSAGES[:limit]
+
+    async def get_translation_models(self, message_ids, target_languages):
+        return {key: model for key, model in self.existing.items() if key[0] in message_ids and key[1] in target_languages}
+
+class FakeTranslationService:
+    def __init__(self, delay=0.0, model_used=None):
+        self.delay = delay
+        self.model_used = model_used or {}
+        self.calls = []
+
+    async def translate_with_structure(self, text, source_language, target_language, model_type, source_channel, **kwargs):
+        self.calls.append(text)
+        await asyncio.sleep(self.delay)
+        model_used = self.model_used.get(text, f'{model_type}_ml_structured')
+        return {'translated_text': f'{text} [{target_language}]', 'model_used': model_used, 'confidence': 0.9}
+
+class FakeMemory:
+    def __init__(self, entries):
+        self.entries = entries
+        self.remembered = []
+
+    async def lookup(self, text, source_language, target_languages, model_type, message_id):
+        return {language: self.entries[text] for language in target_languages if text in self.entries}
+
+    async def remember(self, text, source_language, target_language, model_type, translated_text, confidence, message_id):
+        self.remembered.append((text, model_type))
+
+class Recorder:
+    def __init__(self):
+        self.results = []
+        self.summaries = []
+
+    async def publish_result(self, task_id, result, target_language):
+        self.results.append(result)
+
+    async def publish_summary(self, summary, reply_topic):
+        self.summaries.append((summary, reply_topic))
+
+def _history(database, service, recorder, live_queue_depth=lambda: 0, memory=None):
+    return HistoryTranslator(
+        translation_service=service,
+        database_service=database,
+        publish_result=recorder.publish_result,
+        publish_summary=recorder.publish_summary,
+        live_queue_depth=live_queue_depth,
+        translation_memory=memory
+    )
+
+async def _wait_jobs(history):
+    await asyncio.gather(*list(history._jobs.values()), return_exceptions=True)
+
+def test_newest_first_and_skip_existing():
+    """Plus récents publiés d'abord; niveau suffisant ignoré, niveau inférieur retraduit, mémoire avant inférence"""
+    logger.info("🧪 Test 29.1: Ordre de publication et traductions existantes")
+
+    async def scenario():
+        database = FakeDatabase(existing={('m4', 'en'): 'medium', ('m2', 'en'): 'basic'})
+        # Le service a retenu un modèle inférieur pour « Deux »
+        service = FakeTranslationService(model_used={'Deux': 'basic_ml_structured'})
+        memory = FakeMemory({'Un': {'translatedContent': 'One', 'confidenceScore': 0.95, 'translationModel': 'medium'}})
+        recorder = Recorder()
+        history = _history(database, service, recorder, memory=memory)
+        assert history.submit({'conversationId': 'c1', 'targetLanguage': 'en', 'modelType': 'medium',
+                               'requestId': 'h1', 'window': 10}, 'gw-1')
+        await _wait_jobs(history)
+        return history, service, memory, recorder, database
+
+    history, service, memory, recorder, database = asyncio.run(scenario())
+    assert database.windows == [10]
+    assert [result['messageId'] for result in recorder.results] == ['m5', 'm2', 'm1']
+    assert service.calls == ['Cinq', 'Deux']
+    # Niveau réellement produit, publié et mémorisé (pas le niveau demandé)
+    assert memory.remembered == [('Cinq', 'medium'), ('Deux', 'basic')]
+    assert [result['modelType'] for result in recorder.results[:2]] == ['medium', 'basic']
+    one = recorder.results[-1]
+    assert one['translatedText'] == 'One' and one['fromMemory'] is True and one['modelType'] == 'medium'
+    assert all(result['historyRequestId'] == 'h1' and result['replyTopic'] == 'gw-1' for result in recorder.results)
+
+    summary, reply_topic = recorder.summaries[0]
+    assert reply_topic == 'gw-1' and summary['type'] == 'history_translation_completed'
+    # m4 déjà en medium, m3 déjà en anglais
+    assert (summary['loaded'], summary['skipped'], summary['translated'], summary['failed']) == (5, 2, 3, 0)
+    assert summary['timeToFirstResult'] is not None
+    stats = history.get_stats()
+    assert stats['memory_hits'] == 1 and stats['messages_translated'] == 3 and stats['jobs_completed'] == 1
+    assert stats['active_jobs'] == 0
+
+    logger.info("✅ Ordre de publication et traductions existantes validés")
+    return True
+
+def test_yields_to_live_traffic():
+    """Tâches en direct en file: chaque lot attend qu'elles soient traitées"""
+    logger.info("🧪 Test 29.2: Priorité basse")
+
+    async def scenario():
+        depth = {'value': 2}
+        recorder = Recorder()
+        previous = os.environ.get('HISTORY_YIELD_MS')
+        os.environ['HISTORY_YIELD_MS'] = '10'
+        try:
+            history = _history(FakeDatabase(), FakeTranslationService(), recorder, live_queue_depth=lambda: depth['value'])
+        finally:
+            if previous is None:
+                os.environ.pop('HISTORY_YIELD_MS', None)
+            else:
+                os.environ['HISTORY_YIELD_MS'] = previous
+        history.submit({'conversationId': 'c1', 'targetLanguage': 'en'})
+        await asyncio.sleep(0.05)
+        published_while_busy = len(recorder.results)
+        depth['value'] = 0
+        await _wait_jobs(history)
+        return history, recorder, published_while_busy
+
+    history, recorder, published_while_busy = asyncio.run(scenario())
+    assert published_while_busy == 0
+    assert history.stats['live_yields'] >= 2
+    assert len(recorder.results) == 4
+
+    logger.info("✅ Priorité basse validée")
+    return True
+
+def test_new_request_supersedes_running_job():
+    """Même conversation et langue: la nouvelle demande remplace l'ancienne; base déconnectée: rejet"""
+    logger.info("🧪 Test 29.3: Remplacement d'une demande")
+
+    async def scenario():
+        recorder = Recorder()
+        history = _history(FakeDatabase(), FakeTranslationService(delay=0.02), recorder)
+        history.submit({'conversationId': 'c1', 'targetLanguage': 'en', 'requestId': 'h1'})
+        await asyncio.sleep(0.01)
+        history.submit({'conversationId': 'c1', 'targetLanguage': 'en', 'requestId': 'h2'})
+        history.submit({'conversationId': 'c1', 'targetLanguage': 'es', 'requestId': 'h3'})
+        await _wait_jobs(history)
+
+        offline = _history(FakeDatabase(connected=False), FakeTranslationService(), Recorder())
+        rejected = not offline.submit({'conversationId': 'c1', 'targetLanguage': 'en'})
+        return history, recorder, offline, rejected
+
+    history, recorder, offline, rejected = asyncio.run(scenario())
+    assert history.stats['jobs_superseded'] == 1
+    assert sorted(summary['requestId'] for summary, _ in recorder.summaries) == ['h2', 'h3']
+    assert 'h1' not in {result['historyRequestId'] for result in recorder.results}
+    assert rejected and offline.stats['requests_rejected'] == 1
+
+    logger.info("✅ Remplacement d'une demande validé")
+    return True
+
+class FakePubSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_multipart(self, frames, copy=True):
+        self.sent.append(decode_message(frames)[0])
+
+def test_server_publishes_history():
+    """Commande translate_history: résultats marqués historyRequestId puis résumé sur le topic de la gateway"""
+    logger.info("🧪 Test 29.4: Publication par le serveur")
+
+    async def scenario():
+        env = {'TRANSLATION_JOURNAL_ENABLED': 'false', 'PHRASEBOOK_ENABLED': 'false',
+               'TRANSLATION_MEMORY_ENABLED': 'false', 'RESULT_OUTBOX_ENABLED': 'false'}
+        previous = {key: os.environ.get(key) for key in env}
+        os.environ.update(env)
+        try:
+            server = zmq_server.ZMQTranslationServer(translation_service=FakeTranslationService())
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+        server.pub_socket = FakePubSocket()
+        database = FakeDatabase()
+        server.database_service.is_connected = True
+        server.database_service.get_recent_messages = database.get_recent_messages
+        server.database_service.get_translation_models = database.get_translation_models
+        server._enqueue_persistence = lambda items: asyncio.sleep(0, result=True)
+        assert server.history_translator.submit({'conversationId': 'c1', 'targetLanguage': 'en', 'requestId': 'h1', 'window': 2}, 'gw-1')
+        await _wait_jobs(server.history_translator)
+        return server
+
+    server = asyncio.run(scenario())
+    sent = server.pub_socket.sent
+    assert [message['type'] for message in sent] == ['translation_completed', 'translation_completed', 'history_translation_completed']
+    assert [message['result']['messageId'] for message in sent[:2]] == ['m5', 'm4']
+    assert all(message['result']['historyRequestId'] == 'h1' for message in sent[:2])
+    assert sent[-1]['translated'] == 2
+
+    logger.info("✅ Publication par le serveur validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de la traduction de l'historique"""
+    logger.info("🚀 Démarrage des tests de la traduction de l'historique (Test 29)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Ordre de publication et traductions existantes", test_newest_first_and_skip_existing),
+        ("Priorité basse", test_yields_to_live_traffic),
+        ("Remplacement d'une demande", test_new_request_supersedes_running_job),
+        ("Publication par le serveur", test_server_publishes_history),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 29: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test 30 - Annulation des traductions d'un message modifié ou supprimé
+Niveau: Simple - cancel/supersede sur les tâches en file, interruption entre segments, expiration en file
+"""
+
+import sys
+import os
+import asyncio
+import logging
+import time
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+from utils.wire_protocol import decode_message
+
+zmq_server = load_service('zmq_server')
+TranslationCancelledError = zmq_server.TranslationCancelledError
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SERVER_ENV = {
+    'TRANSLATION_JOURNAL_ENABLED': 'false',
+    'PHRASEBOOK_ENABLED': 'false',
+    'TRANSLATION_MEMORY_ENABLED': 'false',
+    'RESULT_OUTBOX_ENABLED': 'false',
+    'DRAFT_TRANSLATION_ENABLED': 'false'
+}
+
+class FakePubSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_multipart(self, frames, copy=True):
+        self.sent.append(decode_message(frames)[0])
+
+class FakePersistBuffer:
+    def __init__(self):
+        self.items = []
+
+    async def put(self, item):
+        self.items.append(item)
+
+class SegmentedTranslationService:
+    """Traduction en plusieurs segments, cancel_check vérifié entre chaque segment"""
+
+    def __init__(self, segments=1, segment_delay=0.0):
+        self.segments = segments
+        self.segment_delay = segment_delay
+        self.calls = []
+        self.segments_done = 0
+
+    async def translate_with_structure(self, text, source_language, target_language, model_type, source_channel,
+                                       cancel_check=None, **kwargs):
+        self.calls.append((text, target_language))
+        for _ in range(self.segments):
+            if cancel_check and cancel_check():
+                raise TranslationCancelledError(f"{text} -> {target_language}")
+            await asyncio.sleep(self.segment_delay)
+            self.segments_done += 1
+        return {'translated_text': f'{text} [{target_language}]', 'model_used': f'{model_type}_ml', 'confidence': 0.9}
+
+def _server(service, **env):
+    previous = {key: os.environ.get(key) for key in {**SERVER_ENV, **env}}
+    os.environ.update({**SERVER_ENV, **env})
+    try:
+        server = zmq_server.ZMQTranslationServer(translation_service=service)
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    server.pub_socket = FakePubSocket()
+    server.persist_buffer = FakePersistBuffer()
+    server.database_service.is_connected = True
+    return server
+
+def _task(message_id, text='Bonjour', targets=('en',), **kwargs):
+    return zmq_server.TranslationTask(
+        task_id=f'task-{message_id}-{text}', message_id=message_id, text=text, source_language='fr',
+        target_languages=list(targets), conversation_id='c1', reply_topic='gw-1', read_through=False, **kwargs
+    )
+
+async def _run_worker(server, duration):
+    """Un worker de la pool normale pendant `duration` secondes"""
+    pool_manager = server.pool_manager
+    pool_manager.normal_workers_running = True
+    worker = asyncio.create_task(pool_manager._normal_worker_loop('normal_worker_test'))
+    await asyncio.sleep(duration)
+    pool_manager.normal_workers_running = False
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+
+def test_cancel_and_supersede_drop_queued_tasks():
+    """cancel: tâches en file du message abandonnées; supersede: seul le nouveau texte est traduit"""
+    logger.info("🧪 Test 30.1: cancel et supersede sur les tâches en file")
+
+    async def scenario():
+        service = SegmentedTranslationService()
+        server = _server(service)
+        pool_manager = server.pool_manager
+        pool_manager.stats['avg_processing_time'] = 0.5
+        await pool_manager.enqueue_task(_task('m1', targets=['en', 'es']))
+        await pool_manager.enqueue_task(_task('m2'))
+        await pool_manager.enqueue_task(_task('m3', text='Ancien texte'))
+        await server._dispatch_request({'type': 'cancel', 'messageId': 'm1'})
+        await server._dispatch_request({
+            'type': 'supersede', 'messageId': 'm3', 'text': 'Nouveau texte', 'sourceLanguage': 'fr',
+            'targetLanguages': ['en'], 'conversationId': 'c1'
+        })
+        await _run_worker(server, 0.1)
+        return server, service
+
+    server, service = asyncio.run(scenario())
+    assert service.calls == [('Bonjour', 'en'), ('Nouveau texte', 'en')]
+    published = [(message['result']['messageId'], message['result']['translatedText']) for message in server.pub_socket.sent]
+    assert published == [('m2', 'Bonjour [en]'), ('m3', 'Nouveau texte [en]')]
+    stats = server.pool_manager.stats
+    assert stats['tasks_cancelled'] == 2
+    # Temps de calcul évité: coût moyen par langue de m1 (2 langues, moyenne 0.5s), puis de
+    # l'ancien texte de m3 à la moyenne recalculée après m2
+    assert 1.0 < stats['cpu_seconds_saved'] < 1.5
+    assert server.pool_manager.normal_pool.empty()
+
+    logger.info("✅ cancel et supersede sur les tâches en file validés")
+    return True
+
+def test_inflight_translation_aborts_between_segments():
+    """Message supprimé pendant la traduction: arrêt au segment suivant, rien n'est publié ni sauvegardé"""
+    logger.info("🧪 Test 30.2: Interruption d'une traduction en cours")
+
+    async def scenario():
+        service = SegmentedTranslationService(segments=10, segment_delay=0.01)
+        server = _server(service)
+        pool_manager = server.pool_manager
+        pool_manager.stats['avg_processing_time'] = 1.0
+        running = asyncio.create_task(pool_manager._process_translation_task(_task('m1', targets=['en', 'es']), 'w1'))
+        await asyncio.sleep(0.035)
+        await server._dispatch_request({'type': 'cancel', 'messageId': 'm1'})
+        await running
+        return server, service
+
+    server, service = asyncio.run(scenario())
+    assert len(service.calls) == 2 and service.segments_done < 20
+    assert server.pub_socket.sent == [] and server.persist_buffer.items == []
+    stats = server.pool_manager.stats
+    assert stats['inflight_aborted'] == 2 and stats['translations_completed'] == 0
+    assert 0 < stats['cpu_seconds_saved'] < 2.0
+
+    logger.info("✅ Interruption d'une traduction en cours validée")
+    return True
+
+def test_expired_task_is_skipped():
+    """Tâche restée en file au-delà de l'âge maximal: abandonnée, translation_skipped publié"""
+    logger.info("🧪 Test 30.3: Expiration en file")
+
+    async def scenario():
+        service = SegmentedTranslationService()
+        server = _server(service, TRANSLATION_MAX_QUEUE_AGE='0.5')
+        pool_manager = server.pool_manager
+        pool_manager.stats['avg_processing_time'] = 0.2
+        await pool_manager.enqueue_task(_task('m1', targets=['en', 'es', 'de'], created_at=time.time() - 2))
+        await pool_manager.enqueue_task(_task('m2'))
+        await _run_worker(server, 0.1)
+        return server, service
+
+    server, service = asyncio.run(scenario())
+    assert service.calls == [('Bonjour', 'en')]
+    skipped, completed = server.pub_socket.sent
+    assert skipped['type'] == 'translation_skipped' and skipped['reason'] == 'queue_timeout'
+    assert skipped['messageId'] == 'm1' and skipped['targetLanguages'] == ['en', 'es', 'de']
+    assert skipped['queueTime'] > skipped['maxQueueAge'] == 0.5
+    assert completed['type'] == 'translation_completed' and completed['result']['messageId'] == 'm2'
+    stats = server.pool_manager.stats
+    assert stats['tasks_expired'] == 1 and abs(stats['cpu_seconds_saved'] - 0.6) < 1e-9
+
+    logger.info("✅ Expiration en file validée")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests de l'annulation des traductions"""
+    logger.info("🚀 Démarrage des tests de l'annulation (Test 30)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("cancel et supersede sur les tâches en file", test_cancel_and_supersede_drop_queued_tasks),
+        ("Interruption d'une traduction en cours", test_inflight_translation_aborts_between_segments),
+        ("Expiration en file", test_expired_task_is_skipped),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 30: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
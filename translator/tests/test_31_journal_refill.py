@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test 31 - Remplissage des pools depuis le journal
+Niveau: Simple - Lecture SQLite hors de la boucle asyncio, ordre FIFO conservé, pas d'écriture par tâche terminée
+"""
+
+import sys
+import os
+import asyncio
+import logging
+import tempfile
+import threading
+
+# Ajouter le répertoire des tests au path (chargement des services sans dépendances ML)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from service_loader import load_service
+
+zmq_server = load_service('zmq_server')
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def _pool_manager(journal_path):
+    env = {'TRANSLATION_JOURNAL_ENABLED': 'true', 'TRANSLATION_JOURNAL_PATH': journal_path,
+           # Pas d'écriture par le thread du journal pendant le test
+           'TRANSLATION_JOURNAL_FLUSH_MS': '60000', 'PHRASEBOOK_ENABLED': 'false'}
+    previous = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        return zmq_server.TranslationPoolManager(normal_pool_size=2, enable_dynamic_scaling=False)
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+def _task(index):
+    return zmq_server.TranslationTask(
+        task_id=f't{index}', message_id=f'm{index}', text='Bonjour', source_language='fr',
+        target_languages=['en'], conversation_id='c1'
+    )
+
+def test_refill_off_loop_keeps_fifo():
+    """Tâches débordées lues dans l'exécuteur; débordement pendant la lecture: ordre conservé"""
+    logger.info("🧪 Test 31.1: Remplissage hors de la boucle asyncio")
+
+    async def scenario(journal_path):
+        pool_manager = _pool_manager(journal_path)
+        journal = pool_manager.journal
+        read_threads = []
+        pull_spilled = journal.pull_spilled
+
+        def recording_pull(pool_name, limit):
+            read_threads.append(threading.get_ident())
+            return pull_spilled(pool_name, limit)
+
+        journal.pull_spilled = recording_pull
+        for index in range(6):
+            assert await pool_manager.enqueue_task(_task(index))
+        assert pool_manager.stats['tasks_spilled'] == 4
+
+        order = []
+        first = True
+        while not pool_manager.normal_pool.empty() or pool_manager._refills:
+            task = await pool_manager.normal_pool.get()
+            order.append(task.task_id)
+            pool_manager._complete_task(task, 'normal')
+            if first:
+                # Lecture en cours: la tâche suivante déborde derrière celles déjà sur disque
+                assert 'normal' in pool_manager._refills
+                assert await pool_manager.enqueue_task(_task(6))
+                first = False
+            await asyncio.gather(*list(pool_manager._refills.values()))
+        stats = journal.get_stats()
+        journal.close()
+        return order, read_threads, stats
+
+    with tempfile.TemporaryDirectory() as tmp:
+        order, read_threads, stats = asyncio.run(scenario(os.path.join(tmp, 'journal.db')))
+    assert order == [f't{index}' for index in range(7)]
+    assert read_threads and threading.get_ident() not in read_threads
+    # Une seule écriture (les débordements), aucune par tâche terminée
+    assert stats['flushes'] == 1 and stats['spilled_pending'] == 0
+
+    logger.info("✅ Remplissage hors de la boucle asyncio validé")
+    return True
+
+def run_all_tests():
+    """Exécute tous les tests du remplissage depuis le journal"""
+    logger.info("🚀 Démarrage des tests du remplissage depuis le journal (Test 31)")
+    logger.info("=" * 50)
+
+    tests = [
+        ("Remplissage hors de la boucle asyncio", test_refill_off_loop_keeps_fifo),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        logger.info(f"\n📋 {test_name}...")
+        try:
+            if test_func():
+                passed += 1
+                logger.info(f"✅ {test_name} - RÉUSSI")
+        except AssertionError as e:
+            logger.error(f"❌ {test_name} - ÉCHOUÉ: {e}")
+
+    logger.info("\n" + "=" * 50)
+    logger.info(f"📊 Résultats Test 31: {passed}/{total} tests réussis")
+    return passed == total
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)